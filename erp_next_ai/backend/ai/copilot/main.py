@@ -12,8 +12,10 @@ from langchain.chains import LLMChain
 from langchain.prompts import PromptTemplate
 from langchain.memory import ConversationBufferMemory
 
-from core.database.connection import get_db_session
+from sqlalchemy import func, select
+from core.database import get_async_db_session
 from core.doctype.base import DOCTYPE_REGISTRY, get_doctype_model, get_doctype_meta
+from modules.projects.scheduling import get_project_schedule
 
 
 class ERPAICopilot:
@@ -163,6 +165,7 @@ ERP 모듈:
 - send_notification: 알림 발송
 - workflow_trigger: 워크플로 실행
 - ai_prediction: AI 예측 수행
+- project_schedule: 프로젝트 작업 일정/주공정 조회 (target: 프로젝트명)
 - generate_response: 사용자 응답 생성
 
 구체적인 실행 계획을 JSON 배열로 작성하세요.
@@ -228,6 +231,9 @@ ERP 모듈:
         elif action == "workflow_trigger":
             return await self._trigger_workflow(target, parameters)
         
+        elif action == "project_schedule":
+            return await self._execute_project_schedule(target)
+        
         elif action == "generate_response":
             return await self._generate_user_response(parameters, previous_results)
         
@@ -241,39 +247,46 @@ ERP 모듈:
         if not model_class:
             raise ValueError(f"DocType '{target}'을 찾을 수 없습니다.")
         
-        with get_db_session() as db:
-            query = db.query(model_class)
+        # 조회 전용이므로 읽기 복제본에서 실행
+        async with get_async_db_session(read_only=True) as db:
+            stmt = select(model_class)
             
             # 필터 적용
             if "filters" in parameters:
                 for field, value in parameters["filters"].items():
                     if hasattr(model_class, field):
-                        query = query.filter(getattr(model_class, field) == value)
+                        stmt = stmt.where(getattr(model_class, field) == value)
             
             # 정렬
             if "order_by" in parameters:
                 field_name = parameters["order_by"]
                 if hasattr(model_class, field_name):
-                    query = query.order_by(getattr(model_class, field_name))
+                    stmt = stmt.order_by(getattr(model_class, field_name))
             
             # 개수 제한
             if "limit" in parameters:
-                query = query.limit(parameters["limit"])
+                stmt = stmt.limit(parameters["limit"])
             
             if operation == "list":
-                results = query.all()
+                results = (await db.execute(stmt)).scalars().all()
                 return [item.to_dict() for item in results]
             
             elif operation == "count":
-                return query.count()
+                return (await db.execute(select(func.count()).select_from(stmt.subquery()))).scalar_one()
             
             elif operation == "first":
-                result = query.first()
+                result = (await db.execute(stmt.limit(1))).scalars().first()
                 return result.to_dict() if result else None
             
             else:
                 raise ValueError(f"지원하지 않는 데이터베이스 연산: {operation}")
     
+    async def _execute_project_schedule(self, project: str) -> Dict:
+        """프로젝트 작업 일정 (주공정, 작업별 여유) 조회"""
+        # 일정 캐시가 복제 지연으로 오래된 값을 담지 않도록 주 데이터베이스에서 계산
+        async with get_async_db_session() as db:
+            return await db.run_sync(lambda session: get_project_schedule(session, project))
+    
     async def _execute_data_analysis(self, target: str, operation: str, parameters: Dict, previous_results: Dict) -> Dict:
         """데이터 분석 실행"""
         
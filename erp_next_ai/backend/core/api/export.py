@@ -0,0 +1,79 @@
+"""
+DocType 스트리밍 내보내기
+비동기 세션의 서버 측 커서(stream + yield_per)로 행을 나눠 읽어 NDJSON/CSV로 흘려보냅니다.
+전체 결과를 메모리에 올리지 않으므로 테이블 크기와 관계없이 메모리 사용량이 일정합니다.
+"""
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, AsyncIterable, AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# 서버 측 커서에서 한 번에 가져올 행 수
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _json_default(value: Any):
+    """json.dumps가 처리하지 못하는 값 변환"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"직렬화할 수 없는 값: {type(value).__name__}")
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if value is None:
+        return ""
+    return value
+
+
+async def stream_rows(db: AsyncSession, stmt, batch_size: int = EXPORT_BATCH_SIZE) -> AsyncIterator[Any]:
+    """컬럼 단위 SELECT 문을 서버 측 커서로 조회 (ORM 객체를 만들지 않음)"""
+    result = await db.stream(stmt.execution_options(yield_per=batch_size))
+    async for row in result:
+        yield row
+
+
+async def iter_ndjson(rows: AsyncIterable[Any], serializer, batch_size: int = EXPORT_BATCH_SIZE) -> AsyncIterator[str]:
+    """행 목록을 NDJSON 청크로 변환 (batch_size 행마다 한 청크)"""
+    lines = []
+    async for row in rows:
+        lines.append(json.dumps(serializer.serialize_row(row), default=_json_default, ensure_ascii=False))
+        if len(lines) >= batch_size:
+            yield "\n".join(lines) + "\n"
+            lines = []
+
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+async def iter_csv(rows: AsyncIterable[Any], serializer, batch_size: int = EXPORT_BATCH_SIZE) -> AsyncIterator[str]:
+    """행 목록을 헤더 포함 CSV 청크로 변환 (batch_size 행마다 한 청크)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(serializer.fieldnames)
+
+    width = len(serializer.fieldnames)
+    count = 0
+    async for row in rows:
+        writer.writerow([_csv_value(value) for value in row[:width]])
+        count += 1
+        if count >= batch_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            count = 0
+
+    if buffer.tell():
+        yield buffer.getvalue()
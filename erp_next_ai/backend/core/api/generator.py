@@ -2,13 +2,32 @@
 DocType 기반 자동 API 생성기
 ERPNext 스타일의 REST API를 자동으로 생성합니다.
 """
+from datetime import datetime
 from typing import Dict, Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from core.database.connection import get_db
-from core.doctype.base import get_doctype_meta, get_doctype_model, DOCTYPE_REGISTRY
-from pydantic import BaseModel, create_model
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.database import get_async_db, get_async_read_db
+from core.doctype.base import (
+    get_doctype_meta, get_doctype_model, get_doctype_serializer, get_child_tables, load_child_rows, DOCTYPE_REGISTRY,
+    DocumentConflictError
+)
+from core.doctype.naming import make_autoname
+from core.doctype.search import search_condition
+from core.doctype.serializer import parse_fields
+from core.doctype.filters import compile_filters, apply_filters, index_report, FilterError
+from core.api.pagination import paginate_keyset, count_rows, build_page_info, CursorError
+from core.api.export import stream_rows, iter_ndjson, iter_csv, EXPORT_MEDIA_TYPES
+from core.doctype.bulk import BulkResult, bulk_insert, bulk_update, bulk_delete
+from pydantic import BaseModel, ValidationError, create_model
 import inspect
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 대량 작업 요청 한 번에 받을 수 있는 최대 행 수
+BULK_MAX_ROWS = 10000
 
 
 class APIGenerator:
@@ -41,7 +60,7 @@ class APIGenerator:
         
         for field in meta.fields:
             field_type = self._get_python_type(field.fieldtype)
-            if field.required:
+            if field.required and field.fieldtype != 'Table':
                 create_fields[field.fieldname] = (field_type, ...)
             else:
                 create_fields[field.fieldname] = (Optional[field_type], None)
@@ -49,9 +68,25 @@ class APIGenerator:
             # Update 모델은 모든 필드가 선택적
             update_fields[field.fieldname] = (Optional[field_type], None)
         
+        # 생성 요청의 name (autoname이 field:<필드명>인 DocType은 필드 값이 우선)
+        create_fields['name'] = (Optional[str], None)
+        
+        # 수정 요청에는 클라이언트가 읽은 문서 버전(modified)을 함께 보냄 (다르면 409)
+        update_fields['modified'] = (Optional[datetime], None)
+        
         CreateModel = create_model(create_model_name, **create_fields)
         UpdateModel = create_model(update_model_name, **update_fields)
         
+        # 등록 시 생성된 행 직렬화기 (키셋 페이징용 name/정렬 컬럼은 항상 함께 조회)
+        model_serializer = get_doctype_serializer(doctype_name)
+        key_fields = tuple(
+            fieldname for fieldname in ('name', meta.sort_field)
+            if fieldname in model_class.__table__.columns
+        )
+        
+        # 자식 테이블 필드 (?expand=items 로 함께 조회, 생성/수정 시 함께 저장)
+        child_tables = get_child_tables(model_class)
+        
         # 1. 목록 조회 API
         @router.get("/", response_model=Dict[str, Any])
         async def list_documents(
@@ -59,145 +94,243 @@ class APIGenerator:
             limit: int = Query(20, ge=1, le=100),
             search: Optional[str] = Query(None),
             filters: Optional[str] = Query(None),
-            db: Session = Depends(get_db)
+            paging: str = Query("offset", pattern="^(offset|cursor)$"),
+            cursor: Optional[str] = Query(None),
+            include_total: bool = Query(True),
+            fields: Optional[str] = Query(None),
+            expand: Optional[str] = Query(None),
+            db: AsyncSession = Depends(get_async_read_db)
         ):
             """문서 목록 조회"""
-            query = db.query(model_class)
+            expand_fields = self._parse_expand(child_tables, expand)
             
-            # 검색 조건 적용
-            if search and meta.search_fields:
-                search_conditions = []
-                for field_name in meta.search_fields:
-                    if hasattr(model_class, field_name):
-                        field = getattr(model_class, field_name)
-                        search_conditions.append(field.like(f"%{search}%"))
+            # 요청한 필드 + 페이징에 필요한 키 컬럼만 SQL로 조회
+            serializer = self._project(model_serializer, fields, extra=key_fields)
+            compiled_filters = self._compile_filters(meta, model_class, filters)
+            stmt = await self._apply_search(select(*serializer.columns), db, meta, model_class, search)
+            stmt = apply_filters(stmt, compiled_filters)
+            filter_info = self._filter_info(model_class, compiled_filters)
+            
+            # 커서 페이징: (정렬 필드, name) 키셋으로 조회하여 페이지 깊이와 무관하게 일정한 비용
+            if paging == "cursor" or cursor:
+                try:
+                    documents, next_cursor = await paginate_keyset(
+                        db, stmt, model_class, meta.sort_field, meta.sort_order, limit, cursor
+                    )
+                except CursorError as e:
+                    raise HTTPException(status_code=400, detail=str(e))
                 
-                if search_conditions:
-                    from sqlalchemy import or_
-                    query = query.filter(or_(*search_conditions))
+                return {
+                    "data": await self._expand(db, model_class, expand_fields, documents, serializer),
+                    "total": await count_rows(db, stmt) if include_total else None,
+                    "limit": limit,
+                    "next_cursor": next_cursor,
+                    **filter_info
+                }
             
             # 정렬
-            sort_field = getattr(model_class, meta.sort_field, None)
-            if sort_field:
-                if meta.sort_order.upper() == 'DESC':
-                    query = query.order_by(sort_field.desc())
-                else:
-                    query = query.order_by(sort_field.asc())
+            stmt = self._apply_sort(stmt, meta, model_class)
             
             # 페이징
-            total = query.count()
-            documents = query.offset((page - 1) * limit).limit(limit).all()
+            total = await count_rows(db, stmt) if include_total else None
+            documents = (await db.execute(stmt.offset((page - 1) * limit).limit(limit))).all()
             
             return {
-                "data": [doc.to_dict() for doc in documents],
-                "total": total,
-                "page": page,
-                "limit": limit,
-                "pages": (total + limit - 1) // limit
+                "data": await self._expand(db, model_class, expand_fields, documents, serializer),
+                **build_page_info(total, page, limit),
+                **filter_info
             }
         
+        # 내보내기 API (/{name} 경로보다 먼저 등록해야 함)
+        @router.get("/export")
+        async def export_documents(
+            format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+            search: Optional[str] = Query(None),
+            filters: Optional[str] = Query(None),
+            fields: Optional[str] = Query(None),
+            db: AsyncSession = Depends(get_async_read_db)
+        ):
+            """문서 전체를 NDJSON/CSV로 스트리밍 내보내기 (목록 API와 같은 검색/정렬 적용)"""
+            serializer = self._project(model_serializer, fields)
+            compiled_filters = self._compile_filters(meta, model_class, filters)
+            stmt = await self._apply_search(select(*serializer.columns), db, meta, model_class, search)
+            stmt = apply_filters(stmt, compiled_filters)
+            stmt = self._apply_sort(stmt, meta, model_class)
+            
+            rows = stream_rows(db, stmt)
+            chunks = iter_csv(rows, serializer) if format == "csv" else iter_ndjson(rows, serializer)
+            
+            filename = f"{doctype_name.replace(' ', '_')}.{format}"
+            return StreamingResponse(
+                chunks,
+                media_type=EXPORT_MEDIA_TYPES[format],
+                headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+            )
+        
+        # 대량 작업 API (/{name} 경로보다 먼저 등록해야 함, 읽기 전용 DocType은 만들지 않음)
+        if not meta.is_read_only:
+            @router.post("/bulk", response_model=Dict[str, Any])
+            async def bulk_create_documents(
+                rows: List[Dict[str, Any]] = Body(..., max_length=BULK_MAX_ROWS),
+                atomic: bool = Query(False),
+                db: AsyncSession = Depends(get_async_db)
+            ):
+                """문서 대량 생성"""
+                coerced, indexes, errors = self._coerce_rows(CreateModel, model_serializer, rows)
+                if atomic and errors:
+                    return BulkResult.from_errors(errors).to_dict()
+                
+                result = await db.run_sync(
+                    lambda session: bulk_insert(session, doctype_name, model_class, coerced, atomic=atomic)
+                )
+                return result.remap(indexes, errors).to_dict()
+            
+            @router.put("/bulk", response_model=Dict[str, Any])
+            async def bulk_update_documents(
+                rows: List[Dict[str, Any]] = Body(..., max_length=BULK_MAX_ROWS),
+                atomic: bool = Query(False),
+                db: AsyncSession = Depends(get_async_db)
+            ):
+                """문서 대량 수정 (각 행에 name 필수, modified를 보내면 그 버전일 때만 수정하고 아니면 status 409 행 오류)"""
+                coerced, indexes, errors = self._coerce_rows(UpdateModel, model_serializer, rows)
+                if atomic and errors:
+                    return BulkResult.from_errors(errors).to_dict()
+                
+                result = await db.run_sync(
+                    lambda session: bulk_update(session, model_class, coerced, atomic=atomic)
+                )
+                return result.remap(indexes, errors).to_dict()
+            
+            @router.delete("/bulk", response_model=Dict[str, Any])
+            async def bulk_delete_documents(
+                names: List[str] = Body(..., max_length=BULK_MAX_ROWS),
+                atomic: bool = Query(False),
+                db: AsyncSession = Depends(get_async_db)
+            ):
+                """문서 대량 삭제"""
+                result = await db.run_sync(
+                    lambda session: bulk_delete(session, model_class, names, atomic=atomic)
+                )
+                return result.to_dict()
+        
         # 2. 단건 조회 API
         @router.get("/{name}", response_model=Dict[str, Any])
-        async def get_document(name: str, db: Session = Depends(get_db)):
+        async def get_document(
+            name: str,
+            fields: Optional[str] = Query(None),
+            expand: Optional[str] = Query(None),
+            db: AsyncSession = Depends(get_async_read_db)
+        ):
             """문서 단건 조회"""
-            document = db.query(model_class).filter(model_class.name == name).first()
-            if not document:
+            expand_fields = self._parse_expand(child_tables, expand)
+            serializer = self._project(model_serializer, fields, extra=('name',) if expand_fields else ())
+            row = (await db.execute(select(*serializer.columns).where(model_class.name == name))).first()
+            if not row:
                 raise HTTPException(status_code=404, detail="문서를 찾을 수 없습니다.")
             
-            return document.to_dict()
+            return (await self._expand(db, model_class, expand_fields, [row], serializer))[0]
         
-        # 3. 생성 API
-        @router.post("/", response_model=Dict[str, Any])
-        async def create_document(data: CreateModel, db: Session = Depends(get_db)):
-            """문서 생성"""
-            try:
-                # 이름 자동 생성 (간단한 구현)
-                if not hasattr(data, 'name') or not data.name:
-                    import uuid
-                    name = f"{doctype_name}-{uuid.uuid4().hex[:8]}"
-                else:
-                    name = data.name
+        # 3. 생성/수정/삭제 API (읽기 전용 DocType은 만들지 않음)
+        if not meta.is_read_only:
+            @router.post("/", response_model=Dict[str, Any])
+            async def create_document(data: CreateModel, db: AsyncSession = Depends(get_async_db)):
+                """문서 생성"""
+                try:
+                    # 이름 결정 (autoname field:<필드명>이면 그 필드 값, 아니면 요청의 name 또는 자동 생성)
+                    values = data.dict()
+                    name = values.pop('name', None)
+                    document_data = model_serializer.deserialize(values)
+                    document_data['name'] = make_autoname(doctype_name, meta, {**document_data, 'name': name})
+                    if await db.get(model_class, document_data['name']) is not None:
+                        raise ValueError(f"'{document_data['name']}' 문서가 이미 존재합니다.")
+                    children = self._pop_children(child_tables, document_data)
+                    
+                    document = model_class(**document_data)
+                    for fieldname, rows in children.items():
+                        document.set_children(fieldname, rows)
+                    document = await db.run_sync(document.save)
+                    
+                    return self._with_children(document, children)
                 
-                document_data = data.dict()
-                document_data['name'] = name
+                except ValueError as e:
+                    raise HTTPException(status_code=400, detail=str(e))
+                except Exception as e:
+                    raise HTTPException(status_code=500, detail="문서 생성 중 오류가 발생했습니다.")
+            
+            # 4. 수정 API
+            @router.put("/{name}", response_model=Dict[str, Any])
+            async def update_document(
+                name: str, 
+                data: UpdateModel, 
+                db: AsyncSession = Depends(get_async_db)
+            ):
+                """
+                문서 수정
                 
-                document = model_class(**document_data)
-                document = document.save(db)
+                modified를 보내면 그 버전 이후 다른 요청이 수정했을 때 409 (보내지 않으면 이 요청에서 읽은 버전 기준)
+                """
+                document = await self._get_document(db, model_class, name)
                 
-                return document.to_dict()
+                try:
+                    # 수정된 필드만 업데이트
+                    values = data.dict()
+                    expected_modified = values.pop('modified', None)
+                    update_data = model_serializer.deserialize({k: v for k, v in values.items() if v is not None})
+                    children = self._pop_children(child_tables, update_data)
+                    document.from_dict(update_data)
+                    for fieldname, rows in children.items():
+                        document.set_children(fieldname, rows)
+                    if expected_modified is not None:
+                        document.expect_modified(expected_modified)
+                    document = await db.run_sync(document.save)
+                    
+                    return self._with_children(document, children)
                 
-            except ValueError as e:
-                raise HTTPException(status_code=400, detail=str(e))
-            except Exception as e:
-                raise HTTPException(status_code=500, detail="문서 생성 중 오류가 발생했습니다.")
-        
-        # 4. 수정 API
-        @router.put("/{name}", response_model=Dict[str, Any])
-        async def update_document(
-            name: str, 
-            data: UpdateModel, 
-            db: Session = Depends(get_db)
-        ):
-            """문서 수정"""
-            document = db.query(model_class).filter(model_class.name == name).first()
-            if not document:
-                raise HTTPException(status_code=404, detail="문서를 찾을 수 없습니다.")
+                except DocumentConflictError as e:
+                    raise HTTPException(status_code=409, detail=str(e))
+                except ValueError as e:
+                    raise HTTPException(status_code=400, detail=str(e))
+                except Exception as e:
+                    raise HTTPException(status_code=500, detail="문서 수정 중 오류가 발생했습니다.")
             
-            try:
-                # 수정된 필드만 업데이트
-                update_data = {k: v for k, v in data.dict().items() if v is not None}
-                document.from_dict(update_data)
-                document = document.save(db)
-                
-                return document.to_dict()
+            # 5. 삭제 API
+            @router.delete("/{name}")
+            async def delete_document(name: str, db: AsyncSession = Depends(get_async_db)):
+                """문서 삭제"""
+                document = await self._get_document(db, model_class, name)
                 
-            except ValueError as e:
-                raise HTTPException(status_code=400, detail=str(e))
-            except Exception as e:
-                raise HTTPException(status_code=500, detail="문서 수정 중 오류가 발생했습니다.")
-        
-        # 5. 삭제 API
-        @router.delete("/{name}")
-        async def delete_document(name: str, db: Session = Depends(get_db)):
-            """문서 삭제"""
-            document = db.query(model_class).filter(model_class.name == name).first()
-            if not document:
-                raise HTTPException(status_code=404, detail="문서를 찾을 수 없습니다.")
-            
-            try:
-                db.delete(document)
-                db.commit()
-                return {"message": "문서가 삭제되었습니다."}
+                try:
+                    await db.run_sync(document.delete)
+                    return {"message": "문서가 삭제되었습니다."}
                 
-            except Exception as e:
-                db.rollback()
-                raise HTTPException(status_code=500, detail="문서 삭제 중 오류가 발생했습니다.")
+                except Exception as e:
+                    raise HTTPException(status_code=500, detail="문서 삭제 중 오류가 발생했습니다.")
         
         # 6. 제출 API (제출 가능한 문서인 경우)
         if meta.is_submittable:
             @router.post("/{name}/submit")
-            async def submit_document(name: str, db: Session = Depends(get_db)):
+            async def submit_document(name: str, db: AsyncSession = Depends(get_async_db)):
                 """문서 제출"""
-                document = db.query(model_class).filter(model_class.name == name).first()
-                if not document:
-                    raise HTTPException(status_code=404, detail="문서를 찾을 수 없습니다.")
+                document = await self._get_document(db, model_class, name)
                 
                 try:
-                    document = document.submit(db)
+                    document = await db.run_sync(document.submit)
                     return {"message": "문서가 제출되었습니다.", "data": document.to_dict()}
+                except DocumentConflictError as e:
+                    raise HTTPException(status_code=409, detail=str(e))
                 except ValueError as e:
                     raise HTTPException(status_code=400, detail=str(e))
             
             @router.post("/{name}/cancel")
-            async def cancel_document(name: str, db: Session = Depends(get_db)):
+            async def cancel_document(name: str, db: AsyncSession = Depends(get_async_db)):
                 """문서 취소"""
-                document = db.query(model_class).filter(model_class.name == name).first()
-                if not document:
-                    raise HTTPException(status_code=404, detail="문서를 찾을 수 없습니다.")
+                document = await self._get_document(db, model_class, name)
                 
                 try:
-                    document = document.cancel(db)
+                    document = await db.run_sync(document.cancel)
                     return {"message": "문서가 취소되었습니다.", "data": document.to_dict()}
+                except DocumentConflictError as e:
+                    raise HTTPException(status_code=409, detail=str(e))
                 except ValueError as e:
                     raise HTTPException(status_code=400, detail=str(e))
         
@@ -216,6 +349,136 @@ class APIGenerator:
         
         return routers
     
+    def _project(self, serializer, fields: Optional[str], extra=()):
+        """?fields= 파라미터에 맞는 직렬화기 선택 (없는 필드는 400)"""
+        try:
+            return serializer.project(parse_fields(fields), extra=extra)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    def _compile_filters(self, meta, model_class, filters: Optional[str]):
+        """filters 파라미터 컴파일 (잘못된 필터는 400)"""
+        try:
+            return compile_filters(meta, model_class, filters)
+        except FilterError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    def _filter_info(self, model_class, compiled_filters) -> Dict[str, Any]:
+        """필터 필드별 사용 가능한 인덱스 보고 (인덱스가 없는 필드는 경고 로그)"""
+        if not compiled_filters:
+            return {}
+        
+        report = index_report(model_class, compiled_filters)
+        unindexed = [fieldname for fieldname, index_name in report.items() if index_name is None]
+        if unindexed:
+            logger.info(
+                f"{model_class.__tablename__}: 인덱스를 사용할 수 없는 필터 필드 {', '.join(unindexed)}"
+            )
+        
+        return {"filter_indexes": report}
+    
+    def _parse_expand(self, child_tables: Dict[str, type], expand: Optional[str]) -> List[str]:
+        """?expand=items 파라미터 파싱 (자식 테이블 필드가 아니면 400)"""
+        expand_fields = parse_fields(expand) or []
+        unknown = [fieldname for fieldname in expand_fields if fieldname not in child_tables]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"자식 테이블 필드가 아닙니다: {', '.join(unknown)}")
+        
+        return expand_fields
+    
+    async def _expand(self, db: AsyncSession, model_class, expand_fields: List[str], rows, serializer) -> List[Dict[str, Any]]:
+        """조회한 행을 직렬화하고 요청한 자식 테이블 행을 필드별 IN 쿼리 한 번으로 붙임"""
+        documents = serializer.serialize_rows(rows)
+        if not expand_fields:
+            return documents
+        
+        # name은 항상 조회 컬럼에 포함되어 있음 (key_fields / extra)
+        name_index = [column.key for column in serializer.columns].index('name')
+        names = [row[name_index] for row in rows]
+        for fieldname in expand_fields:
+            children = await db.run_sync(
+                lambda session: load_child_rows(session, model_class, fieldname, names)
+            )
+            for document, name in zip(documents, names):
+                document[fieldname] = children.get(name, [])
+        
+        return documents
+    
+    def _pop_children(self, child_tables: Dict[str, type], data: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+        """요청 데이터에서 자식 테이블 행 분리 (지정하지 않은 테이블은 기존 행 유지)"""
+        children = {}
+        for fieldname in child_tables:
+            rows = data.pop(fieldname, None)
+            if rows is not None:
+                children[fieldname] = rows
+        
+        return children
+    
+    def _with_children(self, document, children: Dict[str, Any]) -> Dict[str, Any]:
+        """저장한 문서 응답에 함께 저장한 자식 행 포함"""
+        result = document.to_dict()
+        for fieldname in children:
+            result[fieldname] = [child.to_dict() for child in document.get_children(fieldname)]
+        
+        return result
+    
+    async def _get_document(self, db: AsyncSession, model_class, name: str):
+        """name으로 ORM 문서 조회 (없으면 404)"""
+        document = (await db.execute(select(model_class).where(model_class.name == name))).scalar_one_or_none()
+        if not document:
+            raise HTTPException(status_code=404, detail="문서를 찾을 수 없습니다.")
+        
+        return document
+    
+    async def _apply_search(self, stmt, db: AsyncSession, meta, model_class, search: Optional[str]):
+        """검색어를 DocType 검색 백엔드(트라이그램 인덱스/역색인) 조건으로 적용"""
+        if not search:
+            return stmt
+        
+        # 검색 백엔드(역색인 적재 포함)는 동기 세션 API로 작성되어 있어 run_sync로 실행
+        condition = await db.run_sync(search_condition, meta, model_class, search)
+        if condition is not None:
+            stmt = stmt.where(condition)
+        
+        return stmt
+    
+    def _apply_sort(self, stmt, meta, model_class):
+        """meta.sort_field 기준 정렬 (동일 값은 name으로 정렬해 순서를 고정)"""
+        sort_field = getattr(model_class, meta.sort_field, None)
+        if sort_field:
+            if meta.sort_order.upper() == 'DESC':
+                stmt = stmt.order_by(sort_field.desc(), model_class.name.desc())
+            else:
+                stmt = stmt.order_by(sort_field.asc(), model_class.name.asc())
+        
+        return stmt
+    
+    def _coerce_rows(self, row_model, serializer, rows: List[Dict[str, Any]]):
+        """대량 요청의 각 행을 Pydantic 모델로 검증하고 컬럼 타입으로 변환 (실패한 행은 행별 오류로 분리)"""
+        coerced, indexes, errors = [], [], []
+        
+        for index, row in enumerate(rows):
+            try:
+                values = {k: v for k, v in row_model(**row).dict().items() if k in row}
+                values = serializer.deserialize(values)
+            except ValidationError as e:
+                errors.append({
+                    "index": index,
+                    "name": row.get('name'),
+                    "errors": [f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in e.errors()]
+                })
+                continue
+            except ValueError as e:
+                errors.append({"index": index, "name": row.get('name'), "errors": [str(e)]})
+                continue
+            
+            if row.get('name'):
+                values['name'] = row['name']
+            coerced.append(values)
+            indexes.append(index)
+        
+        return coerced, indexes, errors
+    
     def _create_pydantic_model(self, meta) -> BaseModel:
         """DocType 메타데이터에서 Pydantic 모델 생성"""
         fields = {}
@@ -241,6 +504,7 @@ class APIGenerator:
             'Select': str,
             'Date': str,  # ISO 날짜 형식 문자열
             'Datetime': str,  # ISO 날짜시간 형식 문자열
+            'Table': List[Dict[str, Any]],  # 자식 테이블 행 목록
         }
         
         return type_mapping.get(fieldtype, str)
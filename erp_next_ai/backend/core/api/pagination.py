@@ -0,0 +1,158 @@
+"""
+목록 API 페이징 도구
+OFFSET 대신 (정렬 필드, name) 기준의 키셋(커서) 페이징을 제공합니다.
+"""
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class CursorError(ValueError):
+    """잘못된 커서 값"""
+
+
+def encode_cursor(sort_field: str, value: Any, name: str) -> str:
+    """마지막 행의 (정렬값, name)을 불투명한 커서 문자열로 변환"""
+    if isinstance(value, (datetime, date)):
+        value = value.isoformat()
+
+    payload = {
+        "f": sort_field,
+        "v": value,
+        "n": name,
+        # 정렬값이 NULL인 행 구간에 진입했는지 여부
+        "z": value is None,
+    }
+    raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_field: str, sort_column) -> Tuple[Any, str, bool]:
+    """커서 문자열을 (정렬값, name, NULL 구간 여부)로 복원"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        value, name, in_nulls = payload["v"], payload["n"], bool(payload["z"])
+        cursor_field = payload["f"]
+    except (ValueError, KeyError, TypeError):
+        raise CursorError("잘못된 커서입니다.")
+
+    if cursor_field != sort_field:
+        raise CursorError("정렬 기준이 다른 커서입니다.")
+
+    if value is not None and sort_column is not None:
+        value = _parse_value(value, sort_column)
+
+    return value, name, in_nulls
+
+
+def _parse_value(value: Any, sort_column) -> Any:
+    """커서에 저장된 값을 컬럼 타입으로 복원"""
+    try:
+        python_type = sort_column.type.python_type
+    except NotImplementedError:
+        return value
+
+    try:
+        if python_type is datetime:
+            return datetime.fromisoformat(value)
+        if python_type is date:
+            return date.fromisoformat(value[:10])
+    except (TypeError, ValueError):
+        raise CursorError("잘못된 커서입니다.")
+
+    return value
+
+
+async def count_rows(db: AsyncSession, stmt) -> int:
+    """SELECT 문의 전체 행 수 (정렬은 제거하고 COUNT만 실행)"""
+    count_stmt = select(func.count()).select_from(stmt.order_by(None).subquery())
+    return (await db.execute(count_stmt)).scalar_one()
+
+
+async def paginate_keyset(
+    db: AsyncSession,
+    stmt,
+    model_class,
+    sort_field: str,
+    sort_order: str,
+    limit: int,
+    cursor: Optional[str] = None
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    키셋 페이징 실행
+
+    (정렬 필드, name) 복합 키의 마지막 값 이후 행만 조회하므로
+    페이지 깊이와 관계없이 인덱스 범위 스캔 한 번으로 끝납니다.
+    정렬값이 NULL인 행은 값이 있는 행 다음에 name 순으로 이어집니다.
+
+    반환값: (문서 목록, 다음 커서 또는 None)
+    """
+    name_column = model_class.name
+    sort_column = getattr(model_class, sort_field, None)
+    if sort_column is None or sort_field == "name":
+        sort_field, sort_column = "name", None
+
+    descending = sort_order.upper() == "DESC"
+
+    value, last_name, in_nulls = (None, None, False)
+    if cursor:
+        value, last_name, in_nulls = decode_cursor(cursor, sort_field, sort_column)
+
+    documents: List[Any] = []
+
+    # 1단계: 정렬값이 있는 구간
+    if not in_nulls:
+        key_columns = [sort_column, name_column] if sort_column is not None else [name_column]
+        phase_stmt = stmt
+        if sort_column is not None:
+            phase_stmt = phase_stmt.where(sort_column.isnot(None))
+        if last_name is not None:
+            phase_stmt = phase_stmt.where(
+                _after(key_columns, [value, last_name] if sort_column is not None else [last_name], descending)
+            )
+        order = [column.desc() if descending else column.asc() for column in key_columns]
+        documents = list((await db.execute(phase_stmt.order_by(*order).limit(limit + 1))).all())
+
+    # 2단계: 정렬값이 NULL인 구간 (1단계에서 페이지를 다 채우지 못한 경우)
+    if sort_column is not None and len(documents) <= limit:
+        phase_stmt = stmt.where(sort_column.is_(None))
+        if in_nulls and last_name is not None:
+            phase_stmt = phase_stmt.where(
+                name_column < last_name if descending else name_column > last_name
+            )
+        order = name_column.desc() if descending else name_column.asc()
+        documents += (await db.execute(phase_stmt.order_by(order).limit(limit + 1 - len(documents)))).all()
+
+    next_cursor = None
+    if len(documents) > limit:
+        documents = documents[:limit]
+        last = documents[-1]
+        last_value = getattr(last, sort_field) if sort_column is not None else last.name
+        next_cursor = encode_cursor(sort_field, last_value, last.name)
+
+    return documents, next_cursor
+
+
+def _after(columns: List[Any], values: List[Any], descending: bool):
+    """(c1, c2, ...) > (v1, v2, ...) 형태의 행 비교 조건 생성"""
+    conditions = []
+    for index, column in enumerate(columns):
+        equals = [columns[i] == values[i] for i in range(index)]
+        compare = column < values[index] if descending else column > values[index]
+        conditions.append(and_(*equals, compare))
+    return or_(*conditions)
+
+
+def build_page_info(total: Optional[int], page: int, limit: int) -> Dict[str, Any]:
+    """OFFSET 페이징 응답의 페이지 정보"""
+    return {
+        "total": total,
+        "page": page,
+        "limit": limit,
+        "pages": (total + limit - 1) // limit if total is not None else None
+    }
@@ -2,10 +2,19 @@
 ERPNext AI System - 데이터베이스 기본 설정
 """
 
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+from fastapi import Request
 from sqlalchemy import create_engine, MetaData
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from core.config import get_database_url
+from core.config import settings, get_database_url, get_async_database_url, get_replica_database_urls
+from core.replica import ReplicaRouter, RoutingSession, client_key_for
+from core.pool import (
+    AdaptivePoolPolicy, InstrumentedAsyncQueuePool, InstrumentedQueuePool,
+    attach_monitor, pool_health, pool_metrics
+)
 
 # SQLAlchemy Base 클래스
 Base = declarative_base()
@@ -14,8 +23,40 @@ Base = declarative_base()
 metadata = MetaData()
 
 # 데이터베이스 엔진 (lazy initialization)
+# 동기 엔진은 스크립트/마이그레이션용, 비동기 엔진은 FastAPI 요청 처리용
 engine = None
 SessionLocal = None
+async_engine = None
+AsyncSessionLocal = None
+replica_router = None
+
+
+def _pool_options(database_url: str, is_async: bool) -> Dict[str, Any]:
+    """Settings의 연결 풀 설정 (메모리 SQLite는 기본 풀 유지)"""
+    if database_url.startswith("sqlite") and database_url.partition("://")[2] in ("", "/:memory:"):
+        return {}
+    
+    pool_size = settings.DATABASE_POOL_SIZE
+    if settings.DATABASE_POOL_ADAPTIVE:
+        pool_size = min(max(pool_size, settings.DATABASE_POOL_MIN_SIZE), settings.DATABASE_POOL_MAX_SIZE)
+    
+    return {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": pool_size,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+    }
+
+
+def _pool_policy() -> Optional[AdaptivePoolPolicy]:
+    if not settings.DATABASE_POOL_ADAPTIVE:
+        return None
+    return AdaptivePoolPolicy(
+        settings.DATABASE_POOL_MIN_SIZE,
+        settings.DATABASE_POOL_MAX_SIZE,
+        grow_wait_ms=settings.DATABASE_POOL_GROW_WAIT_MS
+    )
 
 
 def init_database():
@@ -27,11 +68,10 @@ def init_database():
     engine = create_engine(
         database_url,
         echo=False,  # SQL 쿼리 로깅
-        pool_size=10,
-        max_overflow=20,
-        pool_recycle=3600,
-        pool_pre_ping=True
+        pool_pre_ping=True,
+        **_pool_options(database_url, is_async=False)
     )
+    attach_monitor(engine, "sync", _pool_policy())
     
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     
@@ -43,6 +83,93 @@ def init_database():
         print(f"⚠️ Database table creation warning: {e}")
 
 
+def _create_async_engine(database_url: str, name: str):
+    async_url = get_async_database_url(database_url)
+    
+    async_engine = create_async_engine(
+        async_url,
+        echo=False,
+        pool_pre_ping=True,
+        **_pool_options(async_url, is_async=True)
+    )
+    attach_monitor(async_engine, name, _pool_policy())
+    return async_engine
+
+
+def init_async_database(database_url: Optional[str] = None, replica_urls: Optional[List[str]] = None):
+    """비동기 데이터베이스 엔진 초기화 (읽기 복제본이 설정되어 있으면 라우터 구성)"""
+    global async_engine, AsyncSessionLocal, replica_router
+    
+    if replica_urls is None:
+        replica_urls = get_replica_database_urls()
+    
+    async_engine = _create_async_engine(database_url or get_database_url(), "primary")
+    replica_router = ReplicaRouter(
+        async_engine,
+        [_create_async_engine(url, f"replica-{index}") for index, url in enumerate(replica_urls)],
+        health_interval=settings.DATABASE_REPLICA_HEALTH_INTERVAL,
+        read_your_writes_seconds=settings.DATABASE_READ_YOUR_WRITES_SECONDS
+    )
+    
+    # 커밋 후에도 응답 직렬화에서 속성을 읽을 수 있도록 만료시키지 않음
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine,
+        class_=AsyncSession,
+        sync_session_class=RoutingSession,
+        autoflush=False,
+        expire_on_commit=False
+    )
+
+
+def _open_async_session(read_only: bool, client_key: Optional[str] = None) -> AsyncSession:
+    if AsyncSessionLocal is None:
+        init_async_database()
+    
+    db = AsyncSessionLocal()
+    db.info['router'] = replica_router
+    db.info['primary'] = not read_only
+    db.info['client_key'] = client_key
+    return db
+
+
+async def get_async_db(request: Request):
+    """비동기 데이터베이스 세션 생성 (FastAPI 의존성, 주 데이터베이스 전용 - 쓰기 요청용)"""
+    async with _open_async_session(read_only=False, client_key=client_key_for(request)) as db:
+        yield db
+
+
+async def get_async_read_db(request: Request):
+    """읽기 전용 비동기 세션 (FastAPI 의존성, 읽기는 복제본으로 라우팅)"""
+    if replica_router is not None:
+        await replica_router.check_health_if_due()
+    
+    async with _open_async_session(read_only=True, client_key=client_key_for(request)) as db:
+        yield db
+
+
+@asynccontextmanager
+async def get_async_db_session(read_only: bool = False):
+    """비동기 데이터베이스 세션 컨텍스트 (라우터 외부용, read_only면 복제본 사용)"""
+    if read_only and replica_router is not None:
+        await replica_router.check_health_if_due()
+    
+    async with _open_async_session(read_only=read_only) as db:
+        yield db
+
+
+async def close_async_database():
+    """비동기 엔진의 연결 풀 정리 (애플리케이션 종료 시)"""
+    global async_engine, AsyncSessionLocal, replica_router
+    
+    if replica_router is not None:
+        await replica_router.dispose()
+    if async_engine is not None:
+        await async_engine.dispose()
+    async_engine = None
+    AsyncSessionLocal = None
+    replica_router = None
+
+
 def get_db():
     """데이터베이스 세션 생성"""
     if SessionLocal is None:
@@ -55,15 +182,40 @@ def get_db():
         db.close()
 
 
-def check_database_connection() -> bool:
-    """데이터베이스 연결 확인"""
+def get_pool_metrics() -> Dict[str, Any]:
+    """초기화된 엔진별 연결 풀 계측 정보"""
+    pools = {}
+    if engine is not None:
+        pools["sync"] = pool_metrics(engine)
+    if async_engine is not None:
+        pools["primary"] = pool_metrics(async_engine)
+    if replica_router is not None:
+        for node in replica_router.replicas:
+            pools[node.name] = pool_metrics(node.engine)
+    
+    return {
+        name: {**metrics, "health": pool_health(metrics)} if metrics else {"health": "unknown"}
+        for name, metrics in pools.items()
+    }
+
+
+def check_database_connection() -> Dict[str, Any]:
+    """데이터베이스 연결 및 연결 풀 상태 확인"""
     try:
         if engine is None:
             init_database()
         
-        with engine.connect() as connection:
-            connection.execute("SELECT 1")
-        return True
+        # 풀에서 연결을 꺼내면 pool_pre_ping이 연결 상태를 확인함
+        with engine.connect():
+            pass
+        
+        pools = get_pool_metrics()
+        degraded = [name for name, metrics in pools.items() if metrics["health"] == "degraded"]
+        return {
+            "connected": True,
+            "status": "degraded" if degraded else "healthy",
+            "pools": pools
+        }
     except Exception as e:
         print(f"Database connection failed: {e}")
-        return False
\ No newline at end of file
+        return {"connected": False, "status": "error", "error": str(e)}
\ No newline at end of file
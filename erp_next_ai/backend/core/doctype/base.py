@@ -1,30 +1,125 @@
 """
 ERPNext 스타일 DocType 시스템의 기본 클래스
 """
-from typing import Dict, List, Any, Optional
-from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Text, Boolean, Integer, Float
+from typing import Callable, Dict, Iterable, List, Any, Optional, Tuple
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from sqlalchemy import Column, String, DateTime, Text, Boolean, Integer, Float, DDL, event, inspect, update
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Session
 import json
+from core.doctype.serializer import RowSerializer, get_serializer
+from core.doctype.indexes import declare_doctype_indexes, declare_search_indexes
+from core.doctype.children import delete_children, load_children, replace_children
+from core.doctype.validation import DocValidator, LinkCheck, compile_validator, shared_link_cache
+import importlib
 
 Base = declarative_base()
 
+# 검색 필드용 트라이그램 인덱스에 필요한 확장 (PostgreSQL 전용)
+event.listen(
+    Base.metadata,
+    'before_create',
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect='postgresql')
+)
+
+
+class DocumentConflictError(ValueError):
+    """읽은 뒤 다른 요청이 먼저 문서를 수정함 (낙관적 동시성 검사 실패)"""
+
+
+def conflict_message(name: str) -> str:
+    return f"다른 사용자가 문서를 먼저 수정했습니다. 새로 불러온 뒤 다시 저장하세요: {name}"
+
+
+def naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """시간대가 있는 시각을 저장 형식(시간대 없는 UTC)으로 변환"""
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+# 세션에서 문장 단위로 실행한 쓰기 (테이블명 → 횟수, 텍스트 SQL 등 대상을 알 수 없으면 '*')
+STATEMENT_WRITES_KEY = 'statement_writes'
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _count_statement_writes(orm_execute_state):
+    if orm_execute_state.is_select:
+        return
+    table = getattr(orm_execute_state.statement, 'table', None)
+    writes = orm_execute_state.session.info.setdefault(STATEMENT_WRITES_KEY, Counter())
+    writes[getattr(table, 'name', None) or '*'] += 1
+
+
+def statement_writes(db: Session, table_name: str) -> int:
+    """세션에서 지금까지 table_name에 실행된 문장 단위 쓰기 횟수"""
+    writes = db.info.get(STATEMENT_WRITES_KEY)
+    if not writes:
+        return 0
+    return writes[table_name] + writes['*']
+
+
+# 저장으로 바뀐 필드의 이전 값 ((테이블명, 필드명) → 값 집합)
+# 모델의 previous_value_fields에 지정한 필드만 기록하며, after_save 핸들러가 이전 값 기준 캐시도 무효화할 때 사용
+PREVIOUS_VALUES_KEY = 'previous_values'
+
+
+def note_previous_value(db: Session, model_class: type, fieldname: str, value: Any):
+    if value is not None:
+        previous = db.info.setdefault(PREVIOUS_VALUES_KEY, {})
+        previous.setdefault((model_class.__tablename__, fieldname), set()).add(value)
+
+
+def pop_previous_values(db: Session, model_class: type, fieldname: str) -> set:
+    """커밋된 저장에서 바뀌기 전 값 (읽은 값은 세션에서 제거)"""
+    previous = db.info.get(PREVIOUS_VALUES_KEY)
+    if not previous:
+        return set()
+    return previous.pop((model_class.__tablename__, fieldname), set())
+
+
+@event.listens_for(Session, 'after_rollback')
+def _clear_previous_values(session):
+    session.info.pop(PREVIOUS_VALUES_KEY, None)
+
+
+@lru_cache(maxsize=None)
+def has_server_defaults(model_class: type) -> bool:
+    """데이터베이스에서만 정해지는 값(서버 기본값/갱신값) 컬럼이 있는지 (있으면 저장 후 다시 읽어야 함)"""
+    return any(
+        column.server_default is not None or column.server_onupdate is not None
+        for column in model_class.__table__.columns
+    )
+
 
 class DocTypeField:
-    """DocType 필드 정의"""
+    """DocType 필드 정의 (생성 후 변경 불가)"""
+    
+    __slots__ = (
+        'fieldname', 'fieldtype', 'label', 'required', 'options', 'default',
+        'length', 'precision', 'read_only', 'hidden'
+    )
     
     def __init__(self, definition: Dict[str, Any]):
-        self.fieldname = definition.get('fieldname')
-        self.fieldtype = definition.get('fieldtype')
-        self.label = definition.get('label')
-        self.required = definition.get('reqd', 0)
-        self.options = definition.get('options')
-        self.default = definition.get('default')
-        self.length = definition.get('length')
-        self.precision = definition.get('precision')
-        self.read_only = definition.get('read_only', 0)
-        self.hidden = definition.get('hidden', 0)
+        set_value = object.__setattr__
+        set_value(self, 'fieldname', definition.get('fieldname'))
+        set_value(self, 'fieldtype', definition.get('fieldtype'))
+        set_value(self, 'label', definition.get('label'))
+        set_value(self, 'required', definition.get('reqd', 0))
+        set_value(self, 'options', definition.get('options'))
+        set_value(self, 'default', definition.get('default'))
+        set_value(self, 'length', definition.get('length'))
+        set_value(self, 'precision', definition.get('precision'))
+        set_value(self, 'read_only', definition.get('read_only', 0))
+        set_value(self, 'hidden', definition.get('hidden', 0))
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"DocType 필드 정의는 변경할 수 없습니다: {self.fieldname}.{name}")
+    
+    def __repr__(self) -> str:
+        return f"DocTypeField({self.fieldname!r}, {self.fieldtype!r})"
 
 
 class DocTypeBase:
@@ -39,20 +134,17 @@ class DocTypeBase:
     docstatus = Column(Integer, default=0)  # 0=Draft, 1=Submitted, 2=Cancelled
     idx = Column(Integer, default=0)
     
+    # 저장 시 이전 값을 세션에 기록할 필드 (pop_previous_values로 after_save 핸들러에서 조회)
+    previous_value_fields: Tuple[str, ...] = ()
+    
     def __init__(self, **kwargs):
         for key, value in kwargs.items():
             if hasattr(self, key):
                 setattr(self, key, value)
     
-    def to_dict(self) -> Dict[str, Any]:
-        """객체를 딕셔너리로 변환"""
-        result = {}
-        for column in self.__table__.columns:
-            value = getattr(self, column.name)
-            if isinstance(value, datetime):
-                value = value.isoformat()
-            result[column.name] = value
-        return result
+    def to_dict(self, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """객체를 딕셔너리로 변환 (fields 지정 시 해당 필드만)"""
+        return get_serializer(type(self)).project(fields).serialize(self)
     
     def from_dict(self, data: Dict[str, Any]):
         """딕셔너리에서 객체 업데이트"""
@@ -61,91 +153,389 @@ class DocTypeBase:
                 setattr(self, key, value)
     
     def validate(self) -> List[str]:
-        """데이터 유효성 검사"""
-        errors = []
-        
-        # 필수 필드 검사
-        for field_name in self.get_required_fields():
-            value = getattr(self, field_name, None)
-            if value is None or (isinstance(value, str) and not value.strip()):
-                errors.append(f"{field_name}은(는) 필수 항목입니다.")
-        
-        return errors
+        """데이터 유효성 검사 (DocType별로 컴파일된 필수/길이/Select 옵션 검사, 모듈 규칙은 서브클래스에서 덧붙임)"""
+        return get_validator(type(self), self)(self)
     
     def get_required_fields(self) -> List[str]:
         """필수 필드 목록 반환 (서브클래스에서 구현)"""
         return []
     
-    def save(self, db: Session):
-        """문서 저장"""
-        errors = self.validate()
+    def set_children(self, fieldname: str, rows: List[Any]):
+        """자식 테이블(Table 필드) 행 지정 (save 시 같은 트랜잭션에서 기존 행을 교체)"""
+        child_model = get_child_model(type(self), fieldname)
+        if child_model is None:
+            raise ValueError(f"자식 테이블 필드가 아닙니다: {fieldname}")
+        
+        serializer = get_serializer(child_model)
+        children = [
+            row if isinstance(row, child_model) else child_model(**serializer.deserialize(row))
+            for row in rows
+        ]
+        pending = self.__dict__.setdefault('_pending_children', {})
+        pending[fieldname] = children
+    
+    def get_children(self, fieldname: str) -> List[Any]:
+        """set_children으로 지정했거나 저장한 자식 행 (조회하지 않은 경우 빈 목록)"""
+        return self.__dict__.get('_pending_children', {}).get(fieldname, [])
+    
+    def get_child_docs(self, db: Session, fieldname: str) -> List[Any]:
+        """자식 행 ORM 객체 (지정된 행이 없으면 데이터베이스에서 조회)"""
+        pending = self.__dict__.get('_pending_children', {})
+        if fieldname in pending:
+            return pending[fieldname]
+        
+        child_model = get_child_model(type(self), fieldname)
+        children = load_children(db, child_model, get_doctype_name(type(self)), [self.name])
+        return children[self.name]
+    
+    def validate_children(self) -> List[str]:
+        """지정된 자식 행의 유효성 검사"""
+        errors = []
+        for fieldname, children in self.__dict__.get('_pending_children', {}).items():
+            for idx, child in enumerate(children, start=1):
+                errors.extend(f"{fieldname} {idx}행: {error}" for error in child.validate())
+        return errors
+    
+    def collect_links(self, check: Optional[LinkCheck] = None) -> LinkCheck:
+        """저장할 링크 값 수집 (기존 문서는 바뀐 링크 필드만, 지정된 자식 행은 전부, flush 전에 호출)"""
+        check = check if check is not None else LinkCheck()
+        model_class = type(self)
+        state = inspect(self)
+        changed = None
+        if state.has_identity:
+            changed = {
+                fieldname for fieldname in get_link_fields(model_class)
+                if fieldname in state.attrs and state.attrs[fieldname].history.has_changes()
+            }
+        add_links(check, self, model_class, lambda fieldname: getattr(self, fieldname, None), fieldnames=changed)
+        
+        for fieldname, children in self.__dict__.get('_pending_children', {}).items():
+            child_model = get_child_model(model_class, fieldname)
+            for idx, child in enumerate(children, start=1):
+                add_links(
+                    check, self, child_model, lambda name, child=child: getattr(child, name, None),
+                    prefix=f"{fieldname} {idx}행: "
+                )
+        return check
+    
+    def check_valid(self):
+        """유효성 검사 (오류가 있으면 ValueError)"""
+        errors = self.validate() + self.validate_children()
         if errors:
             raise ValueError(f"유효성 검사 실패: {', '.join(errors)}")
+    
+    def expect_modified(self, modified: Optional[datetime]):
+        """클라이언트가 읽은 문서 버전(modified) 지정 (그 뒤 다른 요청이 수정했으면 저장 시 충돌)"""
+        self.__dict__['_expected_modified'] = naive_utc(modified)
+    
+    def claim_version(self, db: Session):
+        """
+        낙관적 동시성 검사 후 새 modified 지정
+        
+        기존 문서는 UPDATE ... SET modified=새 값 WHERE name=? AND modified=읽은 값 한 번으로
+        버전을 선점합니다. 그 사이 다른 트랜잭션이 수정했다면 바뀐 행이 없으므로
+        DocumentConflictError이고, 동시에 저장 중인 트랜잭션은 이 행의 쓰기 잠금이 풀린 뒤
+        같은 검사에서 충돌합니다 (SELECT ... FOR UPDATE 없음).
+        """
+        expected = self.__dict__.pop('_expected_modified', None)
+        now = datetime.utcnow()
+        state = inspect(self)
+        if not state.has_identity:
+            self.modified = now
+            return
         
-        self.modified = datetime.utcnow()
+        if expected is None:
+            # 변경 중인 필드가 onupdate로 modified를 먼저 바꾸지 않도록 autoflush 없이 읽음
+            with db.no_autoflush:
+                history = state.attrs.modified.load_history()
+                loaded = history.deleted or history.unchanged
+                expected = loaded[0] if loaded else None
+        if expected is None:
+            # 버전 정보가 없는 기존 행 (이관 데이터 등)
+            self.modified = now
+            return
+        
+        # 같은 시각에 두 번 저장해도 버전이 바뀌도록 항상 증가
+        if now <= expected:
+            now = expected + timedelta(microseconds=1)
+        table = type(self).__table__
+        with db.no_autoflush:
+            result = db.execute(
+                update(table).where(table.c.name == self.name, table.c.modified == expected).values(modified=now)
+            )
+        if result.rowcount == 0:
+            raise DocumentConflictError(conflict_message(self.name))
+        self.modified = now
+    
+    def note_previous_values(self, db: Session):
+        """previous_value_fields 중 바뀐 필드의 이전 값 기록"""
+        state = inspect(self)
+        if not self.previous_value_fields or not state.has_identity:
+            return
+        with db.no_autoflush:
+            for fieldname in self.previous_value_fields:
+                history = state.attrs[fieldname].load_history()
+                for value in history.deleted:
+                    if value != getattr(self, fieldname):
+                        note_previous_value(db, type(self), fieldname, value)
+    
+    def stage(self, db: Session):
+        """버전 선점과 저장 전 처리 후 문서와 지정된 자식 행을 세션에 올림 (flush/커밋하지 않음)"""
+        self.claim_version(db)
+        self.note_previous_values(db)
+        self.before_save(db)
         db.add(self)
-        db.commit()
-        db.refresh(self)
+        
+        parenttype = get_doctype_name(type(self))
+        for fieldname, children in self.__dict__.get('_pending_children', {}).items():
+            replace_children(db, get_child_model(type(self), fieldname), parenttype, self, children)
+    
+    def run_save_hooks(self, db: Session, action: Optional[str] = None):
+        """저장/제출/취소 후속 처리 (트리 번호, 원장 기록 등, 커밋하지 않음)"""
+        self.on_update(db)
+        if action == 'submit':
+            self.on_submit(db)
+        elif action == 'cancel':
+            self.on_cancel(db)
+    
+    def set_docstatus_for(self, action: Optional[str]):
+        """제출/취소 전 상태 확인 후 docstatus 변경"""
+        if action == 'submit':
+            if self.docstatus != 0:
+                raise ValueError("초안 상태의 문서만 제출할 수 있습니다.")
+            self.docstatus = 1
+        elif action == 'cancel':
+            if self.docstatus != 1:
+                raise ValueError("제출된 문서만 취소할 수 있습니다.")
+            self.docstatus = 2
+    
+    def save(self, db: Session):
+        """문서 저장 (지정된 자식 행도 같은 트랜잭션에서 저장)"""
+        action = self.__dict__.pop('_doc_action', None)
+        # 만료된 속성을 읽다가 변경 사항이 autoflush되면 onupdate로 modified가 먼저 바뀌어
+        # 버전 선점이 자기 자신의 변경과 충돌하므로 검사는 autoflush 없이 실행
+        with db.no_autoflush:
+            self.check_valid()
+            links = self.collect_links()
+        
+        try:
+            self.stage(db)
+            # 후속 처리의 조회가 저장 중인 문서와 자식 행을 보도록 먼저 flush (세션 autoflush와 무관)
+            db.flush()
+            link_errors = links.run(db).get(self)
+            if link_errors:
+                raise ValueError(f"유효성 검사 실패: {', '.join(link_errors)}")
+            writes_before = statement_writes(db, self.__tablename__)
+            self.run_save_hooks(db, action)
+            hooks_wrote_row = statement_writes(db, self.__tablename__) != writes_before
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        
+        # 새 modified는 이미 알고 있으므로, 후속 처리가 이 테이블을 직접 갱신했거나(집계/트리 번호 등)
+        # 서버 기본값이 있을 때만 다시 읽음
+        if hooks_wrote_row or has_server_defaults(type(self)):
+            db.refresh(self)
+        run_doc_event('after_save', type(self), db, [self.name])
         return self
     
+    def stage_delete(self, db: Session):
+        """삭제 전 처리 후 문서와 자식 행 삭제 (커밋하지 않음)"""
+        self.on_trash(db)
+        delete_child_rows(db, type(self), [self.name])
+        db.delete(self)
+    
+    def delete(self, db: Session):
+        """문서 삭제 (자식 행도 같은 트랜잭션에서 삭제)"""
+        name = self.name
+        try:
+            self.stage_delete(db)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        
+        run_doc_event('after_delete', type(self), db, [name])
+    
     def submit(self, db: Session):
         """문서 제출 (승인)"""
-        if self.docstatus != 0:
-            raise ValueError("초안 상태의 문서만 제출할 수 있습니다.")
-        
-        self.docstatus = 1
+        with db.no_autoflush:
+            self.set_docstatus_for('submit')
+        self.__dict__['_doc_action'] = 'submit'
         return self.save(db)
     
     def cancel(self, db: Session):
         """문서 취소"""
-        if self.docstatus != 1:
-            raise ValueError("제출된 문서만 취소할 수 있습니다.")
-        
-        self.docstatus = 2
+        with db.no_autoflush:
+            self.set_docstatus_for('cancel')
+        self.__dict__['_doc_action'] = 'cancel'
         return self.save(db)
+    
+    def before_save(self, db: Session):
+        """저장 전 처리 (서브클래스에서 구현, 자식 행 교체 전에 같은 트랜잭션에서 호출)"""
+        pass
+    
+    def on_update(self, db: Session):
+        """저장 시 후속 처리 (서브클래스에서 구현, 커밋 전에 호출)"""
+        pass
+    
+    def on_trash(self, db: Session):
+        """삭제 전 처리 (서브클래스에서 구현, 삭제와 같은 트랜잭션에서 호출)"""
+        pass
+    
+    def on_submit(self, db: Session):
+        """제출 시 후속 처리 (서브클래스에서 구현, 커밋 전에 호출)"""
+        pass
+    
+    def on_cancel(self, db: Session):
+        """취소 시 후속 처리 (서브클래스에서 구현, 커밋 전에 호출)"""
+        pass
+
+
+# 문서 이벤트 핸들러 (이벤트명 → [handler(model_class, db, names)])
+# after_save: 커밋된 생성/수정 (단건 save 및 대량 작업), after_delete: 커밋된 삭제
+DOC_EVENT_HANDLERS: Dict[str, List[Callable]] = {}
+
+
+def register_doc_event(event: str, handler: Callable):
+    """문서 이벤트 핸들러 등록"""
+    handlers = DOC_EVENT_HANDLERS.setdefault(event, [])
+    if handler not in handlers:
+        handlers.append(handler)
+
+
+def run_doc_event(event: str, model_class: type, db: Session, names: List[str]):
+    """문서 이벤트 실행 (핸들러 오류는 저장 결과에 영향을 주지 않음)"""
+    for handler in DOC_EVENT_HANDLERS.get(event, []):
+        try:
+            handler(model_class, db, names)
+        except Exception as e:
+            print(f"문서 이벤트 '{event}' 처리 실패 ({model_class.__name__}): {e}")
+
+
+def _evict_deleted_links(model_class: type, db: Session, names: List[str]):
+    """삭제된 마스터 문서를 공용 링크 캐시에서 제거"""
+    doctype = DOCTYPE_NAMES.get(model_class)
+    if doctype and shared_link_cache.enabled_for(doctype):
+        shared_link_cache.invalidate(doctype, names)
+
+
+register_doc_event('after_delete', _evict_deleted_links)
 
 
 class DocTypeMeta:
-    """DocType 메타데이터 관리"""
+    """
+    DocType 메타데이터 관리
+    
+    필드명 → 필드 사전과 목록/폼/필수/링크/자식 테이블 필드를 생성 시 한 번 계산해 두므로
+    행마다 호출하는 조회가 모두 O(1)입니다. register_doctype에서 freeze()되면 변경할 수 없습니다.
+    """
+    
+    # 목록 화면에 표시할 최대 필드 수
+    LIST_FIELD_LIMIT = 8
     
     def __init__(self, definition: Dict[str, Any]):
         self.name = definition.get('name')
         self.module = definition.get('module')
         self.autoname = definition.get('autoname')
         self.title_field = definition.get('title_field')
-        self.search_fields = definition.get('search_fields', [])
+        self.search_fields = tuple(definition.get('search_fields', []))
         self.sort_field = definition.get('sort_field', 'modified')
         self.sort_order = definition.get('sort_order', 'DESC')
         self.is_submittable = definition.get('is_submittable', 0)
-        self.fields = [DocTypeField(field) for field in definition.get('fields', [])]
-        self.permissions = definition.get('permissions', [])
+        self.is_child_table = definition.get('is_child_table', 0)
+        # 시스템이 기록하는 원장/집계 DocType (조회 API만 생성하고 생성/수정/삭제/대량 작업 API는 만들지 않음)
+        self.is_read_only = definition.get('is_read_only', 0)
+        self.fields = tuple(DocTypeField(field) for field in definition.get('fields', []))
+        self.permissions = tuple(definition.get('permissions', []))
+        
+        self.fields_by_name: Dict[str, DocTypeField] = {field.fieldname: field for field in self.fields}
+        self.fieldnames = tuple(self.fields_by_name)
+        self.form_fields = tuple(field for field in self.fields if not field.hidden)
+        self.list_fields = self.form_fields[:self.LIST_FIELD_LIMIT]
+        self.table_fields = tuple(field for field in self.fields if field.fieldtype == 'Table')
+        self.required_fieldnames = frozenset(
+            field.fieldname for field in self.fields if field.required and field.fieldtype != 'Table'
+        )
+        # 링크 필드명 → 대상 DocType
+        self.link_fields: Dict[str, str] = {
+            field.fieldname: field.options for field in self.fields if field.fieldtype == 'Link' and field.options
+        }
+        self._frozen = False
+    
+    def freeze(self):
+        """등록 후 메타데이터 변경 금지 (미리 계산한 조회 결과가 정의와 어긋나지 않도록)"""
+        self._frozen = True
+        return self
+    
+    def __setattr__(self, name, value):
+        if getattr(self, '_frozen', False):
+            raise AttributeError(f"등록된 DocType 메타데이터는 변경할 수 없습니다: {self.name}.{name}")
+        object.__setattr__(self, name, value)
     
     def get_field(self, fieldname: str) -> Optional[DocTypeField]:
         """필드명으로 필드 정보 조회"""
-        for field in self.fields:
-            if field.fieldname == fieldname:
-                return field
-        return None
+        return self.fields_by_name.get(fieldname)
     
-    def get_list_fields(self) -> List[DocTypeField]:
+    def get_list_fields(self) -> Tuple[DocTypeField, ...]:
         """목록 화면에 표시할 필드들"""
-        return [field for field in self.fields if not field.hidden][:8]
+        return self.list_fields
     
-    def get_form_fields(self) -> List[DocTypeField]:
+    def get_form_fields(self) -> Tuple[DocTypeField, ...]:
         """폼 화면에 표시할 필드들"""
-        return [field for field in self.fields if not field.hidden]
+        return self.form_fields
+    
+    def get_table_fields(self) -> Tuple[DocTypeField, ...]:
+        """자식 테이블 필드들 (options = 자식 DocType)"""
+        return self.table_fields
 
 
 # DocType 레지스트리
 DOCTYPE_REGISTRY = {}
 
+# 모델 클래스 → DocType 이름
+DOCTYPE_NAMES: Dict[type, str] = {}
+
+
+# DocType 모델이 정의된 모듈 (스크립트/마이그레이션에서 전체 등록용)
+DOCTYPE_MODULES = [
+    'modules.accounts.account',
+    'modules.accounts.customer',
+    'modules.accounts.general_ledger',
+    'modules.accounts.item',
+    'modules.crm.lead',
+    'modules.hr.employee',
+    'modules.projects.project',
+    'modules.purchase.supplier',
+    'modules.sales.sales_invoice',
+    'modules.sales.sales_order',
+    'modules.stock.warehouse',
+    'modules.stock.stock_ledger',
+    'modules.stock.reorder',
+]
+
+
+# 모델 클래스 → 컴파일된 유효성 검사 (첫 검사 때 생성)
+DOCTYPE_VALIDATORS: Dict[type, DocValidator] = {}
+
 
 def register_doctype(name: str, meta: DocTypeMeta, model_class: type):
-    """DocType 등록"""
+    """DocType 등록 (메타데이터를 고정하고, 행 직렬화기와 메타데이터 기반 인덱스도 이 시점에 한 번 생성)"""
     DOCTYPE_REGISTRY[name] = {
-        'meta': meta,
-        'model': model_class
+        'meta': meta.freeze() if meta else None,
+        'model': model_class,
+        'serializer': get_serializer(model_class),
+        'indexes': declare_doctype_indexes(meta, model_class) + declare_search_indexes(meta, model_class)
     }
+    DOCTYPE_NAMES[model_class] = name
+    DOCTYPE_VALIDATORS.pop(model_class, None)
+
+
+def load_doctype_modules():
+    """모든 DocType 모듈을 임포트해 레지스트리와 테이블 메타데이터를 채움"""
+    for module_name in DOCTYPE_MODULES:
+        importlib.import_module(module_name)
 
 
 def get_doctype_meta(name: str) -> Optional[DocTypeMeta]:
@@ -160,6 +550,12 @@ def get_doctype_model(name: str) -> Optional[type]:
     return doctype_info['model'] if doctype_info else None
 
 
+def get_doctype_serializer(name: str) -> Optional[RowSerializer]:
+    """DocType 행 직렬화기 조회"""
+    doctype_info = DOCTYPE_REGISTRY.get(name)
+    return doctype_info['serializer'] if doctype_info else None
+
+
 def create_doctype_from_json(definition_path: str):
     """JSON 파일에서 DocType 생성"""
     with open(definition_path, 'r', encoding='utf-8') as f:
@@ -212,4 +608,81 @@ def _create_column_from_field(field: DocTypeField) -> Optional[Column]:
     elif field.fieldtype == 'Datetime':
         return Column(DateTime, **kwargs)
     else:
-        return Column(Text, **kwargs)  # 기본값
\ No newline at end of file
+        return Column(Text, **kwargs)  # 기본값
+
+
+def get_doctype_name(model_class: type) -> Optional[str]:
+    """모델 클래스의 DocType 이름 조회"""
+    return DOCTYPE_NAMES.get(model_class)
+
+
+def get_validator(model_class: type, doc: DocTypeBase) -> DocValidator:
+    """모델의 컴파일된 유효성 검사 조회 (없으면 메타데이터와 모델의 필수 필드로 생성)"""
+    validator = DOCTYPE_VALIDATORS.get(model_class)
+    if validator is None:
+        meta = get_doctype_meta(get_doctype_name(model_class))
+        validator = DOCTYPE_VALIDATORS[model_class] = compile_validator(model_class, meta, doc.get_required_fields())
+    return validator
+
+
+def get_link_fields(model_class: type) -> Dict[str, str]:
+    """모델의 링크 필드명 → 대상 DocType (메타데이터가 없으면 빈 사전)"""
+    meta = get_doctype_meta(get_doctype_name(model_class))
+    return meta.link_fields if meta else {}
+
+
+def add_links(
+    check: LinkCheck,
+    owner: Any,
+    model_class: type,
+    get_value: Callable[[str], Any],
+    prefix: str = "",
+    fieldnames: Optional[Iterable[str]] = None
+):
+    """
+    링크 값을 LinkCheck에 추가 (fieldnames를 주면 그 필드만)
+    
+    대상 DocType이 등록되지 않은 링크(Currency, UOM 등)는 확인하지 않습니다.
+    """
+    for fieldname, doctype in get_link_fields(model_class).items():
+        if fieldnames is not None and fieldname not in fieldnames:
+            continue
+        value = get_value(fieldname)
+        if value is None or value == '':
+            continue
+        target_model = get_doctype_model(doctype)
+        if target_model is not None:
+            check.add(owner, f"{prefix}{fieldname}", doctype, target_model, value)
+
+
+def get_child_model(model_class: type, fieldname: str) -> Optional[type]:
+    """부모 모델의 Table 필드에 연결된 자식 모델 조회"""
+    meta = get_doctype_meta(get_doctype_name(model_class))
+    field = meta.get_field(fieldname) if meta else None
+    if not field or field.fieldtype != 'Table':
+        return None
+    return get_doctype_model(field.options)
+
+
+def get_child_tables(model_class: type) -> Dict[str, type]:
+    """부모 모델의 자식 테이블 필드명 → 자식 모델"""
+    meta = get_doctype_meta(get_doctype_name(model_class))
+    if not meta:
+        return {}
+    tables = {field.fieldname: get_doctype_model(field.options) for field in meta.get_table_fields()}
+    return {fieldname: child_model for fieldname, child_model in tables.items() if child_model is not None}
+
+
+def load_child_rows(db: Session, model_class: type, fieldname: str, parent_names: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """부모 문서들의 자식 행을 IN 쿼리 한 번으로 조회해 딕셔너리로 반환"""
+    child_model = get_child_model(model_class, fieldname)
+    return load_children(
+        db, child_model, get_doctype_name(model_class), parent_names, serializer=get_serializer(child_model)
+    )
+
+
+def delete_child_rows(db: Session, model_class: type, parent_names: List[str]):
+    """부모 문서들의 모든 자식 테이블 행 삭제 (커밋하지 않음)"""
+    parenttype = get_doctype_name(model_class)
+    for child_model in get_child_tables(model_class).values():
+        delete_children(db, child_model, parenttype, parent_names)
@@ -0,0 +1,182 @@
+"""
+DocType 작업 단위 (Unit of Work)
+여러 문서의 저장/제출/취소/삭제를 모아 한 트랜잭션으로 실행합니다.
+
+    with doc_batch(db) as batch:
+        batch.save(sales_order)
+        batch.submit(stock_entry)
+
+- 모든 문서의 유효성 검사와 상태 확인을 먼저 하고, 하나라도 실패하면 아무것도 기록하지 않음
+- 링크 값 존재 확인은 전체 문서를 모아 대상 DocType마다 IN 쿼리 한 번
+- 문서와 자식 행을 세션에 올린 뒤 한 번에 flush, 후속 처리(원장 기록 등) 후 한 번만 커밋
+- 서버 기본값 컬럼이 없고 후속 처리가 테이블을 직접 갱신하지 않은 모델은 커밋 후 refresh를 생략
+- after_save/after_delete 이벤트는 커밋 후 모델별로 한 번씩 실행
+"""
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from core.doctype.base import get_doctype_name, has_server_defaults, run_doc_event, statement_writes
+from core.doctype.validation import LinkCheck
+
+SAVE_ACTIONS = (None, 'submit', 'cancel')
+DELETE = 'delete'
+
+
+def _label(doc) -> str:
+    return f"{get_doctype_name(type(doc)) or type(doc).__name__} {doc.name or '(새 문서)'}"
+
+
+class DocBatch:
+    """한 트랜잭션으로 실행할 문서 작업 목록"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._operations: Dict[int, List[Any]] = {}  # id(doc) → [doc, action] (추가 순서 유지)
+        self._docstatus: Dict[int, Tuple[Any, int]] = {}  # id(doc) → (doc, 커밋 전 docstatus)
+        self.committed = False
+
+    def _add(self, doc, action: Optional[str]):
+        if self.committed:
+            raise ValueError("이미 커밋된 배치입니다.")
+        operation = self._operations.get(id(doc))
+        if operation is None:
+            self._operations[id(doc)] = [doc, action]
+            return
+        current = operation[1]
+        if action is None or current == action:
+            return
+        if current is None:
+            operation[1] = action
+            return
+        raise ValueError(f"한 배치에서 같은 문서에 서로 다른 작업을 지정할 수 없습니다: {_label(doc)}")
+
+    def save(self, doc):
+        self._add(doc, None)
+        return doc
+
+    def submit(self, doc):
+        self._add(doc, 'submit')
+        return doc
+
+    def cancel(self, doc):
+        self._add(doc, 'cancel')
+        return doc
+
+    def delete(self, doc):
+        self._add(doc, DELETE)
+
+    def __len__(self) -> int:
+        return len(self._operations)
+
+    def _validate_all(self, links: LinkCheck) -> List[Tuple[Any, Optional[str]]]:
+        """
+        전체 문서 상태 확인과 유효성 검사, 링크 값 수집 (하나라도 실패하면 모아서 ValueError)
+
+        제출/취소할 문서의 docstatus를 바꾸기 전 값은 _docstatus에 보관해 두고 커밋이 실패하면 되돌립니다.
+        """
+        operations = [(doc, action) for doc, action in self._operations.values()]
+        errors = []
+        # 버전 선점 전에 변경 사항이 autoflush되지 않도록 (DocTypeBase.save와 같음)
+        with self.db.no_autoflush:
+            for doc, action in operations:
+                if action == DELETE:
+                    continue
+                self._docstatus.setdefault(id(doc), (doc, doc.docstatus))
+                try:
+                    doc.set_docstatus_for(action)
+                    doc.check_valid()
+                except ValueError as e:
+                    errors.append(f"{_label(doc)}: {e}")
+                doc.collect_links(links)
+        if errors:
+            raise ValueError("; ".join(errors))
+        return operations
+
+    def commit(self) -> List[Any]:
+        """
+        모아 둔 작업 실행 후 커밋
+
+        반환값: 저장/제출/취소한 문서 목록
+        """
+        if self.committed:
+            raise ValueError("이미 커밋된 배치입니다.")
+        db = self.db
+        try:
+            links = LinkCheck()
+            operations = self._validate_all(links)
+            saved = [(doc, action) for doc, action in operations if action in SAVE_ACTIONS]
+            deleted = [doc for doc, action in operations if action == DELETE]
+
+            # 1) 문서/자식 행을 세션에 올리고 한 번에 flush
+            for doc, _ in saved:
+                doc.stage(db)
+            db.flush()
+
+            # 링크 값은 배치 안에서 함께 만든 문서도 보이도록 flush 후 대상 DocType마다 한 번씩 확인
+            link_errors = links.run(db)
+            if link_errors:
+                raise ValueError("; ".join(
+                    f"{_label(doc)}: 유효성 검사 실패: {', '.join(errors)}" for doc, errors in link_errors.items()
+                ))
+
+            # 2) 후속 처리 (앞 문서의 후속 처리가 만든 행을 다음 문서가 볼 수 있도록 변경이 있을 때만 flush)
+            tables = {doc.__tablename__ for doc, _ in saved}
+            writes_before = {table: statement_writes(db, table) for table in tables}
+            for doc, action in saved:
+                doc.run_save_hooks(db, action)
+                if db.new or db.dirty or db.deleted:
+                    db.flush()
+
+            rewritten = {table for table in tables if statement_writes(db, table) != writes_before[table]}
+
+            deleted_names = [(type(doc), doc.name) for doc in deleted]
+            for doc in deleted:
+                doc.stage_delete(db)
+
+            db.commit()
+        except Exception:
+            # 같은 문서로 다시 시도할 수 있도록 제출/취소 전 상태로 되돌린 뒤 롤백
+            for doc, docstatus in self._docstatus.values():
+                doc.docstatus = docstatus
+            self._docstatus.clear()
+            db.rollback()
+            raise
+        self._docstatus.clear()
+        self.committed = True
+
+        for doc, _ in saved:
+            doc.__dict__.pop('_doc_action', None)
+            if doc.__tablename__ in rewritten or has_server_defaults(type(doc)):
+                db.refresh(doc)
+
+        for event, items in (
+            ('after_save', [(type(doc), doc.name) for doc, _ in saved]),
+            ('after_delete', deleted_names),
+        ):
+            by_model: Dict[type, List[str]] = {}
+            for model_class, name in items:
+                by_model.setdefault(model_class, []).append(name)
+            for model_class, names in by_model.items():
+                run_doc_event(event, model_class, db, names)
+
+        return [doc for doc, _ in saved]
+
+
+@contextmanager
+def doc_batch(db: Session):
+    """
+    문서 작업 단위 컨텍스트
+
+    블록이 정상 종료되면 모아 둔 작업을 한 트랜잭션으로 커밋하고,
+    블록 안에서 예외가 나면 아무것도 기록하지 않습니다.
+    """
+    batch = DocBatch(db)
+    try:
+        yield batch
+    except Exception:
+        db.rollback()
+        raise
+    if not batch.committed:
+        batch.commit()
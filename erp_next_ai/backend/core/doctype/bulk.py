@@ -0,0 +1,502 @@
+"""
+DocType 대량 작업
+여러 문서를 한 번에 검증하고, 다중 행 INSERT/UPDATE/DELETE로 단일 트랜잭션에 기록합니다.
+
+- 대량 작업은 초안(docstatus 0) 문서만 생성/수정하고 제출된 문서는 삭제하지 않음 (제출/취소는 문서 API로)
+- 저장/삭제 훅(원장 기록, 집계, 순환 검사 등)이 있는 DocType은 다중 행 구문 대신 문서마다
+  stage/run_save_hooks(삭제는 stage_delete)를 거침: atomic이면 한 트랜잭션, 아니면 문서마다 트랜잭션
+- 트리 번호 훅만 있는 트리 DocType은 다중 행 구문 뒤 rebuild_tree로 번호를 다시 매김
+"""
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from core.doctype.base import (
+    DocTypeBase, DocumentConflictError, add_links, conflict_message, delete_child_rows, get_doctype_meta,
+    naive_utc, note_previous_value, run_doc_event
+)
+from core.doctype.chunks import chunks
+from core.doctype.naming import make_autoname
+from core.doctype.nestedset import NestedSetMixin, rebuild_tree
+from core.doctype.validation import LinkCheck
+
+# 재정의하면 대량 작업도 문서 단위로 처리하는 훅
+DOCUMENT_HOOKS = ('before_save', 'on_update', 'on_trash', 'on_submit', 'on_cancel')
+
+DRAFT_ONLY_MESSAGE = "대량 작업으로는 초안 문서만 생성/수정할 수 있습니다. 제출/취소는 문서 API를 사용하세요."
+
+
+class BulkResult:
+    """대량 작업 결과 (행별 오류 포함)"""
+
+    def __init__(self):
+        self.succeeded: List[str] = []
+        self.errors: List[Dict[str, Any]] = []
+
+    def add_error(self, index: int, name: Optional[str], messages: List[str], status: Optional[int] = None):
+        error = {"index": index, "name": name, "errors": messages}
+        if status is not None:
+            error["status"] = status
+        self.errors.append(error)
+
+    @classmethod
+    def from_errors(cls, errors: List[Dict[str, Any]]) -> 'BulkResult':
+        result = cls()
+        result.errors = list(errors)
+        return result
+
+    def remap(self, indexes: List[int], extra_errors: List[Dict[str, Any]] = None) -> 'BulkResult':
+        """부분 목록 기준의 행 번호를 원래 요청의 행 번호로 되돌리고 사전 오류와 합침"""
+        for error in self.errors:
+            error["index"] = indexes[error["index"]]
+        self.errors = sorted(self.errors + list(extra_errors or []), key=lambda error: error["index"])
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "succeeded": self.succeeded,
+            "success_count": len(self.succeeded),
+            "error_count": len(self.errors),
+            "errors": self.errors
+        }
+
+
+def _existing_names(db: Session, model_class, names: List[str]) -> set:
+    """이미 존재하는 name 집합을 IN 조회로 확인"""
+    return set(_docstatus_by_name(db, model_class, names))
+
+
+def _docstatus_by_name(db: Session, model_class, names: List[str]) -> Dict[str, int]:
+    """존재하는 문서의 name → docstatus (IN 조회)"""
+    found = {}
+    for chunk in chunks(names):
+        stmt = select(model_class.name, model_class.docstatus).where(model_class.name.in_(chunk))
+        found.update({name: docstatus or 0 for name, docstatus in db.execute(stmt)})
+    return found
+
+
+def has_document_hooks(model_class) -> bool:
+    """저장/삭제 훅을 재정의한 DocType인지 (트리 번호만 관리하는 NestedSetMixin 훅은 제외)"""
+    for hook in DOCUMENT_HOOKS:
+        owner = next(klass for klass in model_class.__mro__ if hook in klass.__dict__)
+        if owner not in (DocTypeBase, NestedSetMixin):
+            return True
+    return False
+
+
+def _document_error(result: 'BulkResult', index: int, name: Optional[str], error: ValueError):
+    status = 409 if isinstance(error, DocumentConflictError) else None
+    result.add_error(index, name, [str(error)], status=status)
+
+
+def _save_documents(
+    db: Session,
+    model_class,
+    rows: List[Tuple[int, Dict[str, Any]]],
+    prepare: Callable[[Dict[str, Any]], Any],
+    result: 'BulkResult',
+    atomic: bool
+):
+    """
+    훅이 있는 DocType의 문서 저장 (검증과 링크 확인은 호출 전에 끝난 상태)
+
+    prepare(values)는 저장할 문서를 만들거나 읽어 변경을 적용합니다. 앞 문서의 커밋/롤백이
+    아직 저장하지 않은 문서의 변경을 flush하거나 버리지 않도록 저장 직전에 호출합니다.
+    atomic이면 한 트랜잭션에서 문서마다 stage → flush → run_save_hooks 후 한 번 커밋하고,
+    한 문서라도 실패하면 롤백합니다. 아니면 문서마다 save()로 따로 커밋합니다.
+    """
+    if not atomic:
+        for index, values in rows:
+            try:
+                prepare(values).save(db)
+            except ValueError as e:
+                db.rollback()
+                _document_error(result, index, values['name'], e)
+                continue
+            result.succeeded.append(values['name'])
+        result.errors.sort(key=lambda error: error["index"])
+        return
+
+    try:
+        for index, values in rows:
+            try:
+                doc = prepare(values)
+                doc.check_valid()
+                doc.stage(db)
+                db.flush()
+                doc.run_save_hooks(db)
+            except ValueError as e:
+                db.rollback()
+                _document_error(result, index, values['name'], e)
+                result.errors.sort(key=lambda error: error["index"])
+                return
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    result.succeeded = [values['name'] for _, values in rows]
+    run_doc_event('after_save', model_class, db, result.succeeded)
+
+
+def _delete_documents(db: Session, model_class, names: List[Tuple[int, str]], result: 'BulkResult', atomic: bool):
+    """훅이 있는 DocType의 문서 삭제 (on_trash 실행, atomic이 아니면 문서마다 커밋)"""
+    docs = []
+    for chunk in chunks([name for _, name in names]):
+        docs.extend(db.execute(select(model_class).where(model_class.name.in_(chunk))).scalars())
+    by_name = {doc.name: doc for doc in docs}
+
+    if not atomic:
+        for index, name in names:
+            try:
+                by_name[name].delete(db)
+            except ValueError as e:
+                _document_error(result, index, name, e)
+                continue
+            result.succeeded.append(name)
+        result.errors.sort(key=lambda error: error["index"])
+        return
+
+    try:
+        for index, name in names:
+            try:
+                by_name[name].stage_delete(db)
+                db.flush()
+            except ValueError as e:
+                db.rollback()
+                _document_error(result, index, name, e)
+                result.errors.sort(key=lambda error: error["index"])
+                return
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    result.succeeded = [name for _, name in names]
+    run_doc_event('after_delete', model_class, db, result.succeeded)
+
+
+def _tree_delete_errors(db: Session, model_class, targets: List[str]) -> Dict[str, List[str]]:
+    """함께 삭제하지 않는 하위 항목이 있는 트리 항목 (remove_from_tree와 같은 규칙)"""
+    if not issubclass(model_class, NestedSetMixin):
+        return {}
+    parent_column = getattr(model_class, model_class.nsm_parent_field)
+    children: Dict[str, List[str]] = {}
+    for chunk in chunks(targets):
+        stmt = select(model_class.name, parent_column).where(parent_column.in_(chunk))
+        for name, parent in db.execute(stmt):
+            children.setdefault(parent, []).append(name)
+
+    # 삭제할 수 없게 된 하위 항목의 상위 항목도 삭제할 수 없으므로 더 바뀌지 않을 때까지 반복
+    deleting = set(targets)
+    changed = True
+    while changed:
+        blocked = {name for name in deleting if any(child not in deleting for child in children.get(name, ()))}
+        deleting -= blocked
+        changed = bool(blocked)
+    return {name: ["하위 항목이 있는 항목은 삭제할 수 없습니다."] for name in targets if name not in deleting}
+
+
+def _column_names(model_class) -> set:
+    return {column.name for column in model_class.__table__.columns}
+
+
+def _rebuild_tree_if_needed(db: Session, model_class):
+    """트리 DocType은 저장 훅을 거치지 않았으므로 같은 트랜잭션에서 트리 번호를 다시 매김"""
+    if issubclass(model_class, NestedSetMixin):
+        rebuild_tree(db, model_class)
+
+
+def _validate_document(model_class, values: Dict[str, Any]) -> List[str]:
+    """저장하지 않은 임시 인스턴스로 DocType 유효성 검사 실행"""
+    return model_class(**values).validate()
+
+
+def _link_errors(
+    db: Session,
+    model_class,
+    rows: List[Tuple[int, Dict[str, Any]]],
+    created: Iterable[str] = ()
+) -> Dict[int, List[str]]:
+    """행에 지정된 링크 값의 존재 확인 (대상 DocType마다 IN 쿼리 한 번): 행 번호 → 오류"""
+    check = LinkCheck()
+    check.assume_exists(model_class, created)
+    for index, values in rows:
+        add_links(check, index, model_class, values.get, fieldnames=values)
+    return check.run(db)
+
+
+def _with_indexes(
+    candidates: List[Tuple[int, Dict[str, Any]]],
+    valid_rows: List[Dict[str, Any]]
+) -> List[Tuple[int, Dict[str, Any]]]:
+    """검증을 통과한 행 값에 원래 요청의 행 번호를 다시 붙임"""
+    indexes = {values['name']: index for index, values in candidates}
+    return [(indexes[values['name']], values) for values in valid_rows]
+
+
+def _drop_link_errors(
+    db: Session,
+    model_class,
+    rows: List[Tuple[int, Dict[str, Any]]],
+    result: BulkResult,
+    created: Iterable[str] = ()
+) -> List[Dict[str, Any]]:
+    """링크 오류가 있는 행을 결과 오류로 옮기고 나머지 행 값 목록 반환"""
+    link_errors = _link_errors(db, model_class, rows, created)
+    valid_rows = []
+    for index, values in rows:
+        if index in link_errors:
+            result.add_error(index, values['name'], link_errors[index])
+        else:
+            valid_rows.append(values)
+    return valid_rows
+
+
+def bulk_insert(
+    db: Session,
+    doctype_name: str,
+    model_class,
+    rows: List[Dict[str, Any]],
+    atomic: bool = False
+) -> BulkResult:
+    """
+    문서 대량 생성
+
+    모든 행을 먼저 검증한 뒤(링크 값은 대상 DocType마다 IN 쿼리 한 번) 통과한 행만 다중 행 INSERT로 기록합니다.
+    atomic=True이면 한 행이라도 실패할 경우 아무것도 기록하지 않습니다.
+    훅이 있는 DocType은 통과한 행을 문서마다 저장합니다 (_save_documents).
+    """
+    result = BulkResult()
+    columns = _column_names(model_class)
+    meta = get_doctype_meta(doctype_name)
+    now = datetime.utcnow()
+
+    prepared = []
+    for index, row in enumerate(rows):
+        values = {key: value for key, value in row.items() if key in columns}
+        values['name'] = make_autoname(doctype_name, meta, values)
+        prepared.append((index, values))
+
+    existing = _existing_names(db, model_class, [values['name'] for _, values in prepared])
+
+    candidates = []
+    seen = set()
+    for index, values in prepared:
+        name = values['name']
+        errors = []
+        if name in existing:
+            errors.append(f"'{name}' 문서가 이미 존재합니다.")
+        elif name in seen:
+            errors.append(f"'{name}' 이름이 요청 안에서 중복됩니다.")
+        if values.get('docstatus'):
+            errors.append(DRAFT_ONLY_MESSAGE)
+        errors.extend(_validate_document(model_class, values))
+
+        if errors:
+            result.add_error(index, name, errors)
+            continue
+
+        seen.add(name)
+        values.setdefault('creation', now)
+        values['modified'] = now
+        values.setdefault('docstatus', 0)
+        candidates.append((index, values))
+
+    # 같은 요청에서 생성하는 문서를 가리키는 링크(상위 창고 등)는 있는 것으로 취급
+    valid_rows = _drop_link_errors(db, model_class, candidates, result, created=seen)
+
+    if atomic and result.errors:
+        return result
+
+    if valid_rows and has_document_hooks(model_class):
+        rows_to_save = _with_indexes(candidates, valid_rows)
+        _save_documents(db, model_class, rows_to_save, lambda values: model_class(**values), result, atomic)
+    elif valid_rows:
+        try:
+            for chunk in chunks(valid_rows):
+                db.execute(insert(model_class), chunk)
+            _rebuild_tree_if_needed(db, model_class)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        result.succeeded = [values['name'] for values in valid_rows]
+        run_doc_event('after_save', model_class, db, result.succeeded)
+
+    return result
+
+
+def bulk_update(
+    db: Session,
+    model_class,
+    rows: List[Dict[str, Any]],
+    atomic: bool = False
+) -> BulkResult:
+    """
+    문서 대량 수정
+
+    대상 문서를 IN 조회로 한 번에 읽어와 변경 사항을 병합한 상태로 검증하고,
+    기본 키 기준 다중 행 UPDATE로 기록합니다. None 값은 변경하지 않습니다.
+    행에 modified(클라이언트가 읽은 버전)가 있으면 단건 수정과 같이 그 버전일 때만
+    UPDATE ... WHERE modified=읽은 값으로 기록하고, 그 사이 수정된 행은 status 409 행 오류로 보고합니다.
+    초안이 아닌 문서와 docstatus 변경은 행 오류이고, 훅이 있는 DocType은 문서마다 저장합니다.
+    """
+    result = BulkResult()
+    columns = _column_names(model_class) - {'name', 'creation', 'owner'}
+    table = model_class.__table__
+    now = datetime.utcnow()
+
+    names = [row.get('name') for row in rows if row.get('name')]
+    current = {}
+    for chunk in chunks(names):
+        for record in db.execute(select(table).where(table.c.name.in_(chunk))).mappings():
+            current[record['name']] = dict(record)
+
+    candidates = []
+    seen = set()
+    expected_versions = {}
+    for index, row in enumerate(rows):
+        name = row.get('name')
+        if not name:
+            result.add_error(index, None, ["name은(는) 필수 항목입니다."])
+            continue
+        if name not in current:
+            result.add_error(index, name, ["문서를 찾을 수 없습니다."])
+            continue
+        if name in seen:
+            result.add_error(index, name, [f"'{name}' 이름이 요청 안에서 중복됩니다."])
+            continue
+
+        changes = {key: value for key, value in row.items() if key in columns and value is not None}
+        expected = naive_utc(changes.pop('modified', None))
+        if (current[name]['docstatus'] or 0) != 0 or changes.pop('docstatus', 0) != 0:
+            result.add_error(index, name, [DRAFT_ONLY_MESSAGE])
+            continue
+        if expected is not None and current[name]['modified'] != expected:
+            result.add_error(index, name, [conflict_message(name)], status=409)
+            continue
+        errors = _validate_document(model_class, {**current[name], **changes})
+        if errors:
+            result.add_error(index, name, errors)
+            continue
+
+        seen.add(name)
+        if expected is not None:
+            expected_versions[name] = expected
+        changes['name'] = name
+        changes['modified'] = now
+        candidates.append((index, changes))
+
+    valid_rows = _drop_link_errors(db, model_class, candidates, result)
+
+    if atomic and result.errors:
+        return result
+
+    if valid_rows and has_document_hooks(model_class):
+        def prepare(values):
+            doc = db.get(model_class, values['name'])
+            if doc is None:
+                raise ValueError("문서를 찾을 수 없습니다.")
+            doc.from_dict({key: value for key, value in values.items() if key not in ('name', 'modified')})
+            if values['name'] in expected_versions:
+                doc.expect_modified(expected_versions[values['name']])
+            return doc
+
+        _save_documents(db, model_class, _with_indexes(candidates, valid_rows), prepare, result, atomic)
+    elif valid_rows:
+        try:
+            for values in valid_rows:
+                for fieldname in model_class.previous_value_fields:
+                    previous = current[values['name']].get(fieldname)
+                    if fieldname in values and values[fieldname] != previous:
+                        note_previous_value(db, model_class, fieldname, previous)
+            unversioned = [values for values in valid_rows if values['name'] not in expected_versions]
+            for chunk in chunks(unversioned):
+                db.execute(update(model_class), chunk)
+
+            # 버전을 지정한 행은 검증 뒤 다른 요청이 먼저 수정했을 수 있으므로 행마다 조건부 UPDATE
+            conflicts = set()
+            for values in valid_rows:
+                name = values['name']
+                if name not in expected_versions:
+                    continue
+                stmt = update(table).where(
+                    table.c.name == name, table.c.modified == expected_versions[name]
+                ).values({key: value for key, value in values.items() if key != 'name'})
+                if db.execute(stmt).rowcount == 0:
+                    conflicts.add(name)
+
+            if conflicts:
+                indexes = {values['name']: index for index, values in candidates}
+                for name in sorted(conflicts, key=indexes.get):
+                    result.add_error(indexes[name], name, [conflict_message(name)], status=409)
+                result.errors.sort(key=lambda error: error["index"])
+                if atomic:
+                    db.rollback()
+                    return result
+                valid_rows = [values for values in valid_rows if values['name'] not in conflicts]
+
+            _rebuild_tree_if_needed(db, model_class)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        result.succeeded = [values['name'] for values in valid_rows]
+        run_doc_event('after_save', model_class, db, result.succeeded)
+
+    return result
+
+
+def bulk_delete(
+    db: Session,
+    model_class,
+    names: List[str],
+    atomic: bool = False
+) -> BulkResult:
+    """
+    문서 대량 삭제 (존재하지 않는 문서, 제출된 문서, 남는 하위 항목이 있는 트리 항목은 행별 오류로 보고)
+
+    훅이 있는 DocType은 문서마다 on_trash를 거쳐 삭제합니다.
+    """
+    result = BulkResult()
+    existing = _docstatus_by_name(db, model_class, names)
+
+    candidates = []
+    seen = set()
+    for index, name in enumerate(names):
+        if name not in existing:
+            result.add_error(index, name, ["문서를 찾을 수 없습니다."])
+        elif existing[name] == 1:
+            result.add_error(index, name, ["제출된 문서는 삭제할 수 없습니다. 먼저 취소하세요."])
+        elif name not in seen:
+            seen.add(name)
+            candidates.append((index, name))
+
+    tree_errors = _tree_delete_errors(db, model_class, [name for _, name in candidates])
+    for index, name in candidates:
+        if name in tree_errors:
+            result.add_error(index, name, tree_errors[name])
+    result.errors.sort(key=lambda error: error["index"])
+    candidates = [(index, name) for index, name in candidates if name not in tree_errors]
+    targets = [name for _, name in candidates]
+
+    if atomic and result.errors:
+        return result
+
+    if targets and has_document_hooks(model_class):
+        _delete_documents(db, model_class, candidates, result, atomic)
+    elif targets:
+        try:
+            for chunk in chunks(targets):
+                delete_child_rows(db, model_class, chunk)
+                db.execute(delete(model_class).where(model_class.name.in_(chunk)))
+            _rebuild_tree_if_needed(db, model_class)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        result.succeeded = targets
+        run_doc_event('after_delete', model_class, db, targets)
+
+    return result
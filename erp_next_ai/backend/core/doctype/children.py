@@ -0,0 +1,86 @@
+"""
+DocType 자식 테이블 처리
+부모 DocType 메타데이터의 Table 필드(options = 자식 DocType)로 부모/자식 관계를 정의하고,
+자식 행은 parent/parenttype 컬럼으로 부모 문서에 연결됩니다.
+
+- 조회: 한 페이지 부모 문서들의 자식 행을 parent IN (...) 쿼리 한 번으로 읽음
+- 저장: 부모 저장과 같은 트랜잭션에서 기존 자식 행을 교체
+"""
+import uuid
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, inspect, select
+from sqlalchemy.orm import Session
+
+from core.doctype.chunks import chunks
+
+
+def _parent_condition(child_model, parenttype: Optional[str], parent_names: List[str]):
+    condition = child_model.parent.in_(parent_names)
+    if parenttype and 'parenttype' in child_model.__table__.columns:
+        condition = condition & (child_model.parenttype == parenttype)
+    return condition
+
+
+def load_children(
+    db: Session,
+    child_model,
+    parenttype: Optional[str],
+    parent_names: Iterable[str],
+    serializer=None
+) -> Dict[str, List[Any]]:
+    """
+    부모 문서들의 자식 행을 한 번에 조회
+
+    반환값: {부모 name: [자식 행(딕셔너리, serializer 없으면 ORM 객체)]} (idx 순)
+    """
+    names = list(dict.fromkeys(parent_names))
+    children: Dict[str, List[Any]] = {name: [] for name in names}
+    if not names:
+        return children
+
+    for chunk in chunks(names):
+        if serializer is not None:
+            stmt = select(*serializer.columns, child_model.parent)
+        else:
+            stmt = select(child_model)
+        stmt = stmt.where(_parent_condition(child_model, parenttype, chunk)).order_by(
+            child_model.parent, child_model.idx, child_model.name
+        )
+
+        if serializer is not None:
+            for row in db.execute(stmt):
+                children[row[-1]].append(serializer.serialize_row(row))
+        else:
+            for child in db.execute(stmt).scalars():
+                children[child.parent].append(child)
+
+    return children
+
+
+def replace_children(db: Session, child_model, parenttype: Optional[str], parent, children: List[Any]):
+    """부모 문서의 기존 자식 행을 삭제하고 새 자식 행으로 교체 (커밋하지 않음)"""
+    # 이미 저장된 자식 객체(같은 문서를 다시 저장/제출하는 경우)는 지우지 않고 갱신
+    kept = [child.name for child in children if inspect(child).persistent]
+    condition = _parent_condition(child_model, parenttype, [parent.name])
+    if kept:
+        condition = condition & child_model.name.notin_(kept)
+    db.execute(delete(child_model).where(condition))
+
+    has_parenttype = 'parenttype' in child_model.__table__.columns
+    for idx, child in enumerate(children, start=1):
+        if not child.name:
+            child.name = uuid.uuid4().hex[:10]
+        child.parent = parent.name
+        if has_parenttype and parenttype:
+            child.parenttype = parenttype
+        child.idx = idx
+        child.docstatus = parent.docstatus
+        child.modified = parent.modified
+        db.add(child)
+
+
+def delete_children(db: Session, child_model, parenttype: Optional[str], parent_names: List[str]):
+    """부모 문서들의 자식 행 삭제 (커밋하지 않음)"""
+    for chunk in chunks(list(parent_names)):
+        db.execute(delete(child_model).where(_parent_condition(child_model, parenttype, chunk)))
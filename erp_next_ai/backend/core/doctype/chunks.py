@@ -0,0 +1,15 @@
+"""
+IN 목록/다중 행 구문 분할
+값이 많을 때 IN 조건 하나나 다중 행 INSERT/UPDATE 한 번에 넣을 개수를 제한합니다 (DB 파라미터 수 제한).
+"""
+from typing import Any, Iterator, List, Sequence
+
+# 구문 하나에 넣을 기본 최대 값(행) 수
+IN_CHUNK_SIZE = 1000
+
+
+def chunks(values: Sequence[Any], size: int = IN_CHUNK_SIZE) -> Iterator[List[Any]]:
+    """values를 size개씩 나눈 목록"""
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
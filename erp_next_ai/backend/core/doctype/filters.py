@@ -0,0 +1,232 @@
+"""
+DocType 필터 컴파일러
+ERPNext 형식의 filters 값([field, op, value] 목록 또는 {field: value} 딕셔너리)을
+DocTypeMeta로 검증한 뒤 SQLAlchemy 조건식으로 변환합니다.
+"""
+import json
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import UniqueConstraint, and_
+
+# 메타데이터에 없어도 필터할 수 있는 표준 필드
+STANDARD_FILTER_FIELDS = ('name', 'creation', 'modified', 'modified_by', 'owner', 'docstatus', 'idx')
+
+# 지원 연산자 (동의어 포함)
+FILTER_OPERATORS = {
+    '=': '=', '==': '=',
+    '!=': '!=', '<>': '!=',
+    '<': '<', '>': '>', '<=': '<=', '>=': '>=',
+    'in': 'in', 'not in': 'not in',
+    'between': 'between',
+    'like': 'like', 'not like': 'not like',
+    'is': 'is',
+}
+
+
+class FilterError(ValueError):
+    """잘못된 필터 정의"""
+
+
+class CompiledFilter:
+    """컴파일된 단일 필터 조건"""
+
+    __slots__ = ('fieldname', 'operator', 'value', 'condition')
+
+    def __init__(self, fieldname: str, operator: str, value: Any, condition):
+        self.fieldname = fieldname
+        self.operator = operator
+        self.value = value
+        self.condition = condition
+
+
+def parse_filters(filters: Any) -> List[Tuple[str, str, Any]]:
+    """
+    필터 값을 (field, op, value) 목록으로 정규화
+
+    지원 형식:
+    - '[["status", "=", "Open"], ["grand_total", ">", 1000]]' (JSON 문자열)
+    - [["Sales Order", "status", "=", "Open"]] (doctype 접두 포함)
+    - {"status": "Open", "grand_total": [">", 1000]}
+    """
+    if filters is None or filters == '':
+        return []
+
+    if isinstance(filters, str):
+        try:
+            filters = json.loads(filters)
+        except ValueError:
+            raise FilterError("filters는 JSON 형식이어야 합니다.")
+
+    if isinstance(filters, dict):
+        normalized = []
+        for fieldname, value in filters.items():
+            if isinstance(value, (list, tuple)) and len(value) == 2 and isinstance(value[0], str) \
+                    and value[0].lower() in FILTER_OPERATORS:
+                normalized.append((fieldname, value[0], value[1]))
+            else:
+                normalized.append((fieldname, '=', value))
+        return normalized
+
+    if not isinstance(filters, list):
+        raise FilterError("filters는 목록 또는 객체여야 합니다.")
+
+    normalized = []
+    for item in filters:
+        if not isinstance(item, (list, tuple)) or len(item) not in (3, 4):
+            raise FilterError(f"잘못된 필터 항목: {item}")
+        if len(item) == 4:
+            item = item[1:]
+        normalized.append((item[0], item[1], item[2]))
+    return normalized
+
+
+# 모델 클래스 → 필터 가능한 필드명/컬럼 (메타데이터는 등록 후 바뀌지 않으므로 한 번만 계산)
+_FILTERABLE_COLUMNS: Dict[Any, Dict[str, Any]] = {}
+
+
+def _filterable_columns(meta, model_class) -> Dict[str, Any]:
+    """필터 가능한 필드명 → 모델 컬럼"""
+    columns = _FILTERABLE_COLUMNS.get(model_class)
+    if columns is None:
+        table_columns = model_class.__table__.columns
+        fieldnames = meta.fieldnames if meta else ()
+        columns = _FILTERABLE_COLUMNS[model_class] = {
+            fieldname: getattr(model_class, fieldname)
+            for fieldname in (*STANDARD_FILTER_FIELDS, *fieldnames)
+            if fieldname in table_columns
+        }
+    return columns
+
+
+def _coerce(column, value: Any) -> Any:
+    """JSON 값을 컬럼 타입에 맞게 변환 (날짜 문자열 등)"""
+    if value is None or not isinstance(value, str):
+        return value
+
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+
+    try:
+        if python_type is datetime:
+            return datetime.fromisoformat(value)
+        if python_type is date:
+            return date.fromisoformat(value[:10])
+    except ValueError:
+        raise FilterError(f"날짜 형식이 올바르지 않습니다: {value}")
+    return value
+
+
+def _condition(column, operator: str, value: Any):
+    if operator in ('in', 'not in'):
+        if isinstance(value, str):
+            value = [part.strip() for part in value.split(',') if part.strip()]
+        if not isinstance(value, (list, tuple)):
+            raise FilterError(f"'{operator}' 연산자의 값은 목록이어야 합니다.")
+        values = [_coerce(column, item) for item in value]
+        return column.in_(values) if operator == 'in' else column.notin_(values)
+
+    if operator == 'between':
+        if not isinstance(value, (list, tuple)) or len(value) != 2:
+            raise FilterError("'between' 연산자의 값은 [시작, 끝] 형식이어야 합니다.")
+        return column.between(_coerce(column, value[0]), _coerce(column, value[1]))
+
+    if operator in ('like', 'not like'):
+        if not isinstance(value, str):
+            raise FilterError(f"'{operator}' 연산자의 값은 문자열이어야 합니다.")
+        return column.like(value) if operator == 'like' else column.notlike(value)
+
+    if operator == 'is':
+        # ERPNext 호환: ["field", "is", "set" | "not set"]
+        if value == 'set':
+            return column.isnot(None)
+        if value == 'not set':
+            return column.is_(None)
+        raise FilterError("'is' 연산자의 값은 'set' 또는 'not set'이어야 합니다.")
+
+    value = _coerce(column, value)
+    if value is None:
+        return column.is_(None) if operator == '=' else column.isnot(None)
+
+    return {
+        '=': column.__eq__,
+        '!=': column.__ne__,
+        '<': column.__lt__,
+        '>': column.__gt__,
+        '<=': column.__le__,
+        '>=': column.__ge__,
+    }[operator](value)
+
+
+def compile_filters(meta, model_class, filters: Any) -> List[CompiledFilter]:
+    """필터를 검증하고 SQLAlchemy 조건식으로 컴파일"""
+    columns = _filterable_columns(meta, model_class)
+
+    compiled = []
+    for fieldname, operator, value in parse_filters(filters):
+        column = columns.get(fieldname)
+        if column is None:
+            raise FilterError(f"필터할 수 없는 필드입니다: {fieldname}")
+
+        normalized = FILTER_OPERATORS.get(str(operator).lower())
+        if normalized is None:
+            raise FilterError(f"지원하지 않는 연산자입니다: {operator}")
+
+        compiled.append(CompiledFilter(fieldname, normalized, value, _condition(column, normalized, value)))
+
+    return compiled
+
+
+def apply_filters(query, compiled: List[CompiledFilter]):
+    """컴파일된 필터를 쿼리에 AND 조건으로 적용"""
+    if compiled:
+        query = query.filter(and_(*[item.condition for item in compiled]))
+    return query
+
+
+def leading_index_columns(model_class) -> Dict[str, str]:
+    """각 인덱스의 선두 컬럼 → 인덱스 이름 (B-tree 인덱스가 조건 검색에 쓰일 수 있는 컬럼)"""
+    table = model_class.__table__
+    leading: Dict[str, str] = {}
+
+    primary_key = list(table.primary_key.columns)
+    if primary_key:
+        leading[primary_key[0].name] = 'PRIMARY'
+
+    for index in sorted(table.indexes, key=lambda index: index.name or ''):
+        if index.info.get('search'):
+            continue
+        index_columns = list(index.columns)
+        if index_columns:
+            leading.setdefault(index_columns[0].name, index.name)
+
+    for constraint in table.constraints:
+        if isinstance(constraint, UniqueConstraint) and len(constraint.columns):
+            first = list(constraint.columns)[0].name
+            leading.setdefault(first, constraint.name or f"uq_{first}")
+
+    return leading
+
+
+def index_report(model_class, compiled: List[CompiledFilter]) -> Dict[str, Optional[str]]:
+    """
+    필터 필드별로 사용할 수 있는 인덱스 이름을 보고 (없으면 None)
+
+    선행 와일드카드가 있는 LIKE('%abc')나 부정 조건은 B-tree 인덱스를 쓸 수 없으므로 None으로 보고합니다.
+    """
+    leading = leading_index_columns(model_class)
+
+    report: Dict[str, Optional[str]] = {}
+    for item in compiled:
+        index_name = leading.get(item.fieldname)
+        if item.operator in ('!=', 'not in', 'not like'):
+            index_name = None
+        elif item.operator == 'like' and str(item.value).startswith(('%', '_')):
+            index_name = None
+
+        if item.fieldname not in report or report[item.fieldname] is None:
+            report[item.fieldname] = index_name
+
+    return report
@@ -0,0 +1,198 @@
+"""
+DocType 인덱스 자동 생성
+DocTypeMeta의 정렬/Link/검색 필드와 자식 테이블의 parent 컬럼에서 인덱스를 도출해
+테이블 메타데이터에 선언합니다. 선언된 인덱스는 create_all과 alembic autogenerate에 그대로 반영됩니다.
+"""
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Index, UniqueConstraint, inspect, text
+
+# PostgreSQL 식별자 최대 길이
+MAX_INDEX_NAME_LENGTH = 63
+
+
+def index_name_for(table_name: str, columns: Tuple[str, ...]) -> str:
+    """ix_<테이블>_<컬럼들> 형식의 인덱스 이름 (길면 해시로 축약)"""
+    base = "ix_" + table_name.replace(" ", "_").lower() + "_" + "_".join(columns)
+    if len(base) <= MAX_INDEX_NAME_LENGTH:
+        return base
+    digest = hashlib.sha1(base.encode("utf-8")).hexdigest()[:8]
+    return base[:MAX_INDEX_NAME_LENGTH - 9] + "_" + digest
+
+
+def _existing_column_sets(table) -> List[Tuple[str, ...]]:
+    """테이블에 이미 선언된 인덱스/기본 키/유니크 제약의 컬럼 순서"""
+    column_sets = []
+    primary_key = tuple(column.name for column in table.primary_key.columns)
+    if primary_key:
+        column_sets.append(primary_key)
+    for index in table.indexes:
+        if index.info.get('search'):
+            continue
+        column_sets.append(tuple(column.name for column in index.columns))
+    for constraint in table.constraints:
+        if isinstance(constraint, UniqueConstraint) and len(constraint.columns):
+            column_sets.append(tuple(column.name for column in constraint.columns))
+    return column_sets
+
+
+def _is_covered(columns: Tuple[str, ...], column_sets: List[Tuple[str, ...]]) -> bool:
+    """같은 컬럼 순서로 시작하는 인덱스가 이미 있으면 새 인덱스가 필요 없음"""
+    return any(existing[:len(columns)] == columns for existing in column_sets)
+
+
+def derive_index_columns(meta, model_class) -> List[Tuple[str, ...]]:
+    """
+    메타데이터에서 필요한 인덱스 컬럼 조합 도출
+
+    - (sort_field, name): 목록 정렬과 키셋 페이징 (자식 테이블 제외)
+    - parent: 자식 테이블의 부모 문서별 조회
+    - 각 Link 필드: 연결 문서 기준 조회/필터
+    """
+    table_columns = model_class.__table__.columns
+    candidates: List[Tuple[str, ...]] = []
+
+    # 자식 테이블은 항상 parent로 조회하므로 정렬 인덱스가 필요 없음
+    sort_field = meta.sort_field if meta and not meta.is_child_table else None
+    if sort_field and sort_field != 'name' and sort_field in table_columns:
+        candidates.append((sort_field, 'name'))
+
+    if 'parent' in table_columns:
+        candidates.append(('parent',))
+
+    if meta:
+        for field in meta.fields:
+            if field.fieldtype == 'Link' and field.fieldname in table_columns:
+                candidates.append((field.fieldname,))
+
+    # 더 긴 조합이 앞에 오도록 정렬해 접두사로 포함되는 조합은 생략
+    unique: List[Tuple[str, ...]] = []
+    for columns in sorted(dict.fromkeys(candidates), key=len, reverse=True):
+        if not _is_covered(columns, unique):
+            unique.append(columns)
+    return unique
+
+
+def declare_doctype_indexes(meta, model_class) -> List[Index]:
+    """도출한 인덱스를 모델 테이블에 선언 (이미 같은 선두 컬럼의 인덱스가 있으면 생략)"""
+    table = model_class.__table__
+    declared = []
+
+    for columns in derive_index_columns(meta, model_class):
+        if _is_covered(columns, _existing_column_sets(table)):
+            continue
+        index = Index(index_name_for(table.name, columns), *[table.c[name] for name in columns])
+        index.info['doctype_auto'] = True
+        declared.append(index)
+
+    return declared
+
+
+def declare_search_indexes(meta, model_class) -> List[Index]:
+    """
+    search_fields용 PostgreSQL 트라이그램(GIN) 인덱스 선언
+
+    '%검색어%' 형태의 부분 일치 검색은 B-tree 인덱스를 쓸 수 없으므로
+    pg_trgm 인덱스로 처리합니다. PostgreSQL이 아닌 데이터베이스에서는 생성되지 않습니다.
+    """
+    if not meta or not meta.search_fields:
+        return []
+
+    table = model_class.__table__
+    declared = []
+    for fieldname in meta.search_fields:
+        if fieldname not in table.c:
+            continue
+        index = Index(
+            index_name_for(table.name, (fieldname, 'trgm')),
+            table.c[fieldname],
+            postgresql_using='gin',
+            postgresql_ops={fieldname: 'gin_trgm_ops'}
+        ).ddl_if(dialect='postgresql')
+        index.info['doctype_auto'] = True
+        index.info['search'] = True
+        index.info['dialect'] = 'postgresql'
+        declared.append(index)
+
+    return declared
+
+
+def _database_column_sets(inspector, table_name: str) -> Dict[Tuple[str, ...], Optional[str]]:
+    """데이터베이스에 실제로 존재하는 인덱스 컬럼 조합 → 이름"""
+    found: Dict[Tuple[str, ...], Optional[str]] = {}
+
+    primary_key = inspector.get_pk_constraint(table_name)
+    if primary_key and primary_key.get('constrained_columns'):
+        found[tuple(primary_key['constrained_columns'])] = primary_key.get('name') or 'PRIMARY'
+
+    for index in inspector.get_indexes(table_name):
+        found[tuple(index['column_names'])] = index['name']
+
+    for constraint in inspector.get_unique_constraints(table_name):
+        found.setdefault(tuple(constraint['column_names']), constraint['name'])
+
+    return found
+
+
+def compare_indexes(engine, metadata) -> Dict[str, Dict[str, Any]]:
+    """
+    선언된 인덱스와 데이터베이스의 실제 인덱스 비교
+
+    반환값: {테이블명: {"missing": [...], "extra": [...], "present": [...]} 또는 {"table_missing": True}}
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+
+    report: Dict[str, Dict[str, Any]] = {}
+    for table_name, table in sorted(metadata.tables.items()):
+        if table_name not in existing_tables:
+            report[table_name] = {"table_missing": True}
+            continue
+
+        actual = _database_column_sets(inspector, table_name)
+        declared = {
+            tuple(column.name for column in index.columns): index.name
+            for index in table.indexes
+            if index.info.get('dialect', engine.dialect.name) == engine.dialect.name
+        }
+
+        report[table_name] = {
+            "missing": [
+                {"name": name, "columns": list(columns)}
+                for columns, name in declared.items() if columns not in actual
+            ],
+            "extra": [
+                {"name": name, "columns": list(columns)}
+                for columns, name in actual.items()
+                if columns not in declared and not _is_covered(columns, _existing_column_sets(table))
+            ],
+            "present": [
+                {"name": name, "columns": list(columns)}
+                for columns, name in declared.items() if columns in actual
+            ],
+        }
+
+    return report
+
+
+def create_missing_indexes(engine, metadata, dry_run: bool = False) -> List[str]:
+    """비교 결과 누락된 인덱스 생성 (dry_run이면 이름만 반환)"""
+    report = compare_indexes(engine, metadata)
+    created = []
+
+    if engine.dialect.name == 'postgresql' and not dry_run:
+        with engine.begin() as connection:
+            connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
+    for table_name, table_report in report.items():
+        missing = {item["name"] for item in table_report.get("missing", [])}
+        if not missing:
+            continue
+        for index in metadata.tables[table_name].indexes:
+            if index.name in missing:
+                if not dry_run:
+                    index.create(bind=engine, checkfirst=True)
+                created.append(index.name)
+
+    return created
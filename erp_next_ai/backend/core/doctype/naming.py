@@ -0,0 +1,33 @@
+"""
+DocType 문서 이름(name) 결정
+ERPNext의 autoname 규칙 중 field:<필드명>을 지원합니다.
+
+- field:<필드명>: 그 필드 값을 문서 이름으로 사용 (품목 코드, 창고명 등 사용자가 아는 값으로 링크 가능)
+- 그 외(naming_series 등)이거나 필드 값이 비어 있으면 요청의 name, 없으면 '<DocType>-<임의 8자리>'
+"""
+import uuid
+from typing import Any, Dict, Optional
+
+from core.doctype.validation import is_empty
+
+FIELD_PREFIX = 'field:'
+
+
+def autoname_field(meta) -> Optional[str]:
+    """autoname이 field:<필드명>이면 그 필드명"""
+    autoname = meta.autoname if meta else None
+    if autoname and autoname.startswith(FIELD_PREFIX):
+        return autoname[len(FIELD_PREFIX):].strip() or None
+    return None
+
+
+def make_autoname(doctype_name: str, meta, values: Dict[str, Any]) -> str:
+    """새 문서 이름 (field: 규칙이 요청의 name보다 우선)"""
+    fieldname = autoname_field(meta)
+    if fieldname:
+        value = values.get(fieldname)
+        if not is_empty(value):
+            return str(value).strip()
+    if values.get('name'):
+        return values['name']
+    return f"{doctype_name}-{uuid.uuid4().hex[:8]}"
@@ -0,0 +1,267 @@
+"""
+DocType 트리 구조 (Nested Set)
+ERPNext의 NestedSet과 같은 방식으로, 상위 필드(parent_account, parent_warehouse 등)로 이루어진
+트리를 lft/rgt 번호로 함께 저장합니다.
+
+- 하위 항목 전체: lft BETWEEN 노드.lft AND 노드.rgt 범위 조회 한 번
+- 상위 항목 체인: lft < 노드.lft AND rgt > 노드.rgt
+- 저장 시 상위가 바뀌면 번호를 갱신하고, 대량 작업 뒤에는 rebuild_tree로 전체를 다시 번호 매김
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Column, Integer, String, and_, func, select, update
+from sqlalchemy.orm import Session, aliased
+
+from core.doctype.chunks import chunks
+
+
+class NestedSetMixin:
+    """
+    lft/rgt 트리 번호를 관리하는 DocType 믹스인
+
+    서브클래스는 nsm_parent_field에 상위 항목 필드명을 지정합니다.
+    """
+
+    nsm_parent_field: str = ''
+
+    lft = Column(Integer, index=True)
+    rgt = Column(Integer, index=True)
+    old_parent = Column(String(140))
+
+    def get_nsm_parent(self) -> Optional[str]:
+        return getattr(self, self.nsm_parent_field, None) or None
+
+    def on_update(self, db: Session):
+        super().on_update(db)
+        update_nsm(db, self)
+
+    def on_trash(self, db: Session):
+        super().on_trash(db)
+        remove_from_tree(db, self)
+
+
+def _expire_tree_bounds(db: Session, doc):
+    """범위 UPDATE로 바뀐 번호를 세션의 다른 객체가 다시 읽도록 만료"""
+    model_class = type(doc)
+    for obj in list(db.identity_map.values()):
+        if isinstance(obj, model_class) and obj is not doc:
+            db.expire(obj, ['lft', 'rgt'])
+
+
+def _bounds(db: Session, model_class, name: str, for_update: bool = False) -> Optional[Tuple[int, int]]:
+    stmt = select(model_class.lft, model_class.rgt).where(model_class.name == name)
+    if for_update:
+        stmt = stmt.with_for_update()
+    row = db.execute(stmt).first()
+    return (row[0], row[1]) if row else None
+
+
+def _max_rgt(db: Session, model_class) -> int:
+    return db.execute(select(func.max(model_class.rgt))).scalar() or 0
+
+
+def _shift(db: Session, model_class, threshold: int, width: int, inclusive_rgt: bool = True):
+    """threshold 이후 번호를 width만큼 이동 (음수 번호인 이동 중 하위 트리는 제외)"""
+    table = model_class.__table__
+    rgt_condition = table.c.rgt >= threshold if inclusive_rgt else table.c.rgt > threshold
+    db.execute(update(table).where(rgt_condition, table.c.rgt > 0).values(rgt=table.c.rgt + width))
+    db.execute(update(table).where(table.c.lft > threshold, table.c.lft > 0).values(lft=table.c.lft + width))
+
+
+def update_nsm(db: Session, doc):
+    """
+    저장 시 트리 번호 갱신 (커밋하지 않음)
+
+    새 문서는 상위 항목의 마지막 자식 자리에 끼워 넣고, 상위가 바뀐 문서는
+    하위 트리 전체를 새 상위 아래로 옮깁니다.
+    """
+    model_class = type(doc)
+    parent = doc.get_nsm_parent()
+
+    if parent is not None and parent == doc.name:
+        raise ValueError("자기 자신을 상위 항목으로 지정할 수 없습니다.")
+
+    if doc.lft is None or doc.rgt is None:
+        _insert_node(db, doc, parent)
+    elif parent != (doc.old_parent or None):
+        _move_node(db, doc, parent)
+    else:
+        return
+
+    doc.old_parent = parent
+    _expire_tree_bounds(db, doc)
+
+
+def _insert_node(db: Session, doc, parent: Optional[str]):
+    model_class = type(doc)
+    if parent is None:
+        position = _max_rgt(db, model_class) + 1
+    else:
+        bounds = _bounds(db, model_class, parent, for_update=True)
+        if bounds is None or bounds[1] is None:
+            raise ValueError(f"상위 항목을 찾을 수 없습니다: {parent}")
+        position = bounds[1]
+        _shift(db, model_class, position, 2)
+
+    doc.lft = position
+    doc.rgt = position + 1
+
+
+def _move_node(db: Session, doc, parent: Optional[str]):
+    model_class = type(doc)
+    table = model_class.__table__
+    current = _bounds(db, model_class, doc.name, for_update=True)
+    lft, rgt = current if current else (doc.lft, doc.rgt)
+    width = rgt - lft + 1
+
+    if parent is not None:
+        bounds = _bounds(db, model_class, parent, for_update=True)
+        if bounds is None or bounds[1] is None:
+            raise ValueError(f"상위 항목을 찾을 수 없습니다: {parent}")
+        if lft <= bounds[0] <= rgt:
+            raise ValueError("하위 항목을 상위 항목으로 지정할 수 없습니다.")
+
+    # 1) 옮길 하위 트리를 음수 번호로 떼어 놓음
+    db.execute(
+        update(table).where(table.c.lft >= lft, table.c.rgt <= rgt)
+        .values(lft=-table.c.lft, rgt=-table.c.rgt)
+    )
+    # 2) 빠진 자리를 메움
+    _shift(db, model_class, rgt, -width, inclusive_rgt=False)
+
+    # 3) 새 자리를 만들고 하위 트리를 그 자리로 이동
+    if parent is None:
+        position = _max_rgt(db, model_class) + 1
+    else:
+        position = _bounds(db, model_class, parent)[1]
+        _shift(db, model_class, position, width)
+
+    offset = position - lft
+    db.execute(
+        update(table).where(table.c.lft < 0)
+        .values(lft=-table.c.lft + offset, rgt=-table.c.rgt + offset)
+    )
+
+    doc.lft = lft + offset
+    doc.rgt = rgt + offset
+
+
+def remove_from_tree(db: Session, doc):
+    """삭제 시 트리 번호 정리 (하위 항목이 있으면 삭제 불가, 커밋하지 않음)"""
+    model_class = type(doc)
+    bounds = _bounds(db, model_class, doc.name, for_update=True)
+    if bounds is None or bounds[0] is None:
+        return
+
+    lft, rgt = bounds
+    if rgt - lft > 1:
+        raise ValueError("하위 항목이 있는 항목은 삭제할 수 없습니다.")
+
+    _shift(db, model_class, rgt, -2, inclusive_rgt=False)
+    _expire_tree_bounds(db, doc)
+
+
+def rebuild_tree(db: Session, model_class) -> int:
+    """
+    상위 필드로 트리 전체 번호를 다시 매김 (커밋하지 않음)
+
+    대량 작업이나 데이터 이관처럼 저장 훅을 거치지 않은 변경 뒤에 사용합니다.
+    상위 항목이 없거나 순환하는 항목은 루트로 취급합니다.
+    """
+    parent_column = getattr(model_class, model_class.nsm_parent_field)
+    rows = db.execute(
+        select(model_class.name, parent_column).order_by(model_class.idx, model_class.name)
+    ).all()
+
+    names = {name for name, _ in rows}
+    children: Dict[Optional[str], List[str]] = {}
+    for name, parent in rows:
+        children.setdefault(parent if parent in names and parent != name else None, []).append(name)
+
+    values = []
+    counter = 0
+    visited = set()
+
+    def number_from(root: str):
+        nonlocal counter
+        counter += 1
+        visited.add(root)
+        bounds = {root: counter}
+        stack = [(root, iter(children.get(root, [])))]
+        while stack:
+            node, pending = stack[-1]
+            child = next((child for child in pending if child not in visited), None)
+            if child is None:
+                counter += 1
+                parent = stack[-2][0] if len(stack) > 1 else None
+                values.append({"name": node, "lft": bounds[node], "rgt": counter, "old_parent": parent})
+                stack.pop()
+                continue
+            counter += 1
+            visited.add(child)
+            bounds[child] = counter
+            stack.append((child, iter(children.get(child, []))))
+
+    for root in children.get(None, []):
+        number_from(root)
+    # 순환으로 루트에 닿지 않는 항목
+    for name, _ in rows:
+        if name not in visited:
+            number_from(name)
+
+    for chunk in chunks(values):
+        db.execute(update(model_class), chunk)
+    return len(values)
+
+
+def subtree_query(model_class, name: str, include_self: bool = True):
+    """노드와 모든 하위 항목의 name을 고르는 SELECT (IN 조건에 바로 사용 가능)"""
+    node = aliased(model_class)
+    condition = and_(model_class.lft >= node.lft, model_class.rgt <= node.rgt)
+    if not include_self:
+        condition = and_(model_class.lft > node.lft, model_class.rgt < node.rgt)
+    return select(model_class.name).join(node, condition).where(node.name == name)
+
+
+def get_descendants(db: Session, model_class, name: str, include_self: bool = True) -> List[str]:
+    """모든 하위 항목 (트리 순서)"""
+    stmt = subtree_query(model_class, name, include_self).order_by(model_class.lft)
+    return list(db.execute(stmt).scalars())
+
+
+def get_ancestors(db: Session, model_class, name: str, include_self: bool = False) -> List[str]:
+    """루트부터 상위 항목 체인"""
+    node = aliased(model_class)
+    if include_self:
+        condition = and_(model_class.lft <= node.lft, model_class.rgt >= node.rgt)
+    else:
+        condition = and_(model_class.lft < node.lft, model_class.rgt > node.rgt)
+    stmt = select(model_class.name).join(node, condition).where(node.name == name).order_by(model_class.lft)
+    return list(db.execute(stmt).scalars())
+
+
+def rollup(db: Session, model_class, values: Dict[str, Any], names: Optional[List[str]] = None) -> Dict[str, float]:
+    """
+    항목별 값을 상위 항목으로 합산 (그룹 항목의 합계 = 자신 + 모든 하위 항목)
+
+    트리 번호 순으로 한 번 훑으면서 열린 상위 항목 스택에 값을 더합니다.
+    names를 주면 해당 항목들의 하위 트리만 읽습니다.
+    """
+    stmt = select(model_class.name, model_class.lft, model_class.rgt).order_by(model_class.lft)
+    if names:
+        node = aliased(model_class)
+        stmt = stmt.join(node, and_(model_class.lft >= node.lft, model_class.rgt <= node.rgt)).where(
+            node.name.in_(names)
+        ).distinct()
+
+    totals: Dict[str, float] = {}
+    stack: List[Tuple[str, int]] = []
+    for name, lft, rgt in db.execute(stmt):
+        while stack and stack[-1][1] < lft:
+            stack.pop()
+        amount = values.get(name) or 0
+        totals[name] = totals.get(name, 0) + amount
+        for ancestor, _ in stack:
+            totals[ancestor] += amount
+        stack.append((name, rgt))
+    return totals
@@ -0,0 +1,201 @@
+"""
+DocType 검색 백엔드
+목록/내보내기 API의 search 파라미터를 처리합니다.
+
+- PostgreSQL: search_fields마다 선언된 pg_trgm GIN 인덱스를 쓰는 ILIKE 조건
+- 그 외(SQLite/테스트): 프로세스 내 트라이그램 역색인으로 후보 name을 찾은 뒤 name IN 조건
+
+역색인은 문서 이벤트(after_save/after_delete)로 갱신됩니다.
+"""
+import threading
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import false, or_, select
+from sqlalchemy.orm import Session
+
+from core.doctype.base import register_doc_event
+
+# 역색인 결과가 이보다 많으면 IN 목록 대신 LIKE 조건으로 처리
+MAX_IN_LIST_SIZE = 10000
+
+
+def _escape_like(term: str) -> str:
+    """LIKE 패턴 특수문자 이스케이프"""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _search_columns(meta, model_class) -> List:
+    return [getattr(model_class, fieldname) for fieldname in meta.search_fields if hasattr(model_class, fieldname)]
+
+
+class SearchBackend:
+    """검색 백엔드 기본 클래스"""
+
+    def condition(self, db: Session, meta, model_class, term: str):
+        """검색어에 해당하는 SQL 조건식 (조건이 없으면 None)"""
+        raise NotImplementedError
+
+
+class LikeSearchBackend(SearchBackend):
+    """LIKE/ILIKE 부분 일치 (PostgreSQL에서는 트라이그램 인덱스 사용)"""
+
+    def __init__(self, case_insensitive: bool = True):
+        self.case_insensitive = case_insensitive
+
+    def condition(self, db: Session, meta, model_class, term: str):
+        columns = _search_columns(meta, model_class)
+        if not columns:
+            return None
+
+        pattern = f"%{_escape_like(term)}%"
+        if self.case_insensitive:
+            return or_(*[column.ilike(pattern, escape="\\") for column in columns])
+        return or_(*[column.like(pattern, escape="\\") for column in columns])
+
+
+class InvertedSearchIndex:
+    """DocType 하나의 프로세스 내 트라이그램 역색인"""
+
+    def __init__(self, model_class, fieldnames: List[str]):
+        self.model_class = model_class
+        self.fieldnames = fieldnames
+        self.documents: Dict[str, str] = {}
+        self.postings: Dict[str, Set[str]] = {}
+        self.loaded = False
+        self.lock = threading.RLock()
+
+    def _text(self, values: Iterable) -> str:
+        # 필드 경계를 넘는 일치를 막기 위해 구분 문자로 연결
+        return "\x00".join("" if value is None else str(value).lower() for value in values)
+
+    def _add(self, name: str, text: str):
+        self.documents[name] = text
+        for gram in _trigrams(text):
+            self.postings.setdefault(gram, set()).add(name)
+
+    def _remove(self, name: str):
+        text = self.documents.pop(name, None)
+        if text is None:
+            return
+        for gram in _trigrams(text):
+            names = self.postings.get(gram)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del self.postings[gram]
+
+    def _select(self):
+        columns = [getattr(self.model_class, fieldname) for fieldname in self.fieldnames]
+        return select(self.model_class.name, *columns)
+
+    def ensure_loaded(self, db: Session):
+        """처음 검색할 때 전체 문서를 한 번 읽어 색인 구성"""
+        if self.loaded:
+            return
+        with self.lock:
+            if self.loaded:
+                return
+            for row in db.execute(self._select()):
+                self._add(row[0], self._text(row[1:]))
+            self.loaded = True
+
+    def refresh(self, db: Session, names: List[str]):
+        """변경된 문서만 다시 읽어 색인 갱신"""
+        if not self.loaded or not names:
+            return
+        with self.lock:
+            found = set()
+            for row in db.execute(self._select().where(self.model_class.name.in_(names))):
+                self._remove(row[0])
+                self._add(row[0], self._text(row[1:]))
+                found.add(row[0])
+            for name in names:
+                if name not in found:
+                    self._remove(name)
+
+    def remove(self, names: List[str]):
+        with self.lock:
+            for name in names:
+                self._remove(name)
+
+    def search(self, term: str) -> Set[str]:
+        """검색어를 부분 문자열로 포함하는 문서 name 집합"""
+        needle = term.lower()
+        with self.lock:
+            grams = _trigrams(needle)
+            if grams:
+                posting_lists = sorted((self.postings.get(gram, set()) for gram in grams), key=len)
+                candidates = set(posting_lists[0])
+                for names in posting_lists[1:]:
+                    candidates &= names
+                    if not candidates:
+                        break
+            else:
+                candidates = self.documents.keys()
+            return {name for name in candidates if needle in self.documents[name]}
+
+
+class InMemorySearchBackend(SearchBackend):
+    """프로세스 내 역색인 백엔드 (SQLite/테스트용)"""
+
+    def __init__(self):
+        self.indexes: Dict[type, InvertedSearchIndex] = {}
+        self.fallback = LikeSearchBackend(case_insensitive=False)
+
+    def get_index(self, meta, model_class) -> Optional[InvertedSearchIndex]:
+        index = self.indexes.get(model_class)
+        if index is None:
+            fieldnames = [fieldname for fieldname in meta.search_fields if hasattr(model_class, fieldname)]
+            if not fieldnames:
+                return None
+            index = self.indexes.setdefault(model_class, InvertedSearchIndex(model_class, fieldnames))
+        return index
+
+    def condition(self, db: Session, meta, model_class, term: str):
+        index = self.get_index(meta, model_class)
+        if index is None:
+            return None
+
+        index.ensure_loaded(db)
+        names = index.search(term)
+        if not names:
+            return false()
+        if len(names) > MAX_IN_LIST_SIZE:
+            return self.fallback.condition(db, meta, model_class, term)
+        return model_class.name.in_(sorted(names))
+
+    def on_save(self, model_class, db: Session, names: List[str]):
+        index = self.indexes.get(model_class)
+        if index is not None:
+            index.refresh(db, names)
+
+    def on_delete(self, model_class, db: Session, names: List[str]):
+        index = self.indexes.get(model_class)
+        if index is not None:
+            index.remove(names)
+
+
+# 데이터베이스 종류별 검색 백엔드
+postgres_search_backend = LikeSearchBackend(case_insensitive=True)
+memory_search_backend = InMemorySearchBackend()
+
+register_doc_event('after_save', memory_search_backend.on_save)
+register_doc_event('after_delete', memory_search_backend.on_delete)
+
+
+def get_search_backend(db: Session) -> SearchBackend:
+    """세션이 연결된 데이터베이스에 맞는 검색 백엔드"""
+    if db.get_bind().dialect.name == 'postgresql':
+        return postgres_search_backend
+    return memory_search_backend
+
+
+def search_condition(db: Session, meta, model_class, term: Optional[str]):
+    """검색어에 대한 SQL 조건식 (검색어나 검색 필드가 없으면 None)"""
+    if not term or not meta or not meta.search_fields:
+        return None
+    return get_search_backend(db).condition(db, meta, model_class, term)
@@ -0,0 +1,183 @@
+"""
+DocType 행 직렬화기
+모델 클래스마다 한 번만 컬럼 목록과 타입별 변환기를 계산해 두고,
+행마다 컬럼 순회/isinstance 검사 없이 딕셔너리를 만듭니다.
+"""
+from datetime import date, datetime, time
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Date, DateTime, Time
+
+# 보관할 필드 선택 직렬화기 수 (필드 조합은 정렬해 키로 쓰므로 순서만 다른 요청은 같은 항목을 씀)
+PROJECTION_CACHE_SIZE = 128
+
+
+def _isoformat(value):
+    return value.isoformat()
+
+
+def _converter_for(column):
+    """컬럼 타입에 필요한 값 변환 함수 (변환이 필요 없으면 None)"""
+    if isinstance(column.type, (DateTime, Date, Time)):
+        return _isoformat
+    return None
+
+
+def _parse_datetime(value):
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return datetime.combine(value, time())
+    return value
+
+
+def _parse_date(value):
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def _parse_time(value):
+    return time.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _parser_for(column):
+    """API 입력값(ISO 문자열)을 컬럼 타입 값으로 바꾸는 함수 (필요 없으면 None)"""
+    if isinstance(column.type, DateTime):
+        return _parse_datetime
+    if isinstance(column.type, Date):
+        return _parse_date
+    if isinstance(column.type, Time):
+        return _parse_time
+    return None
+
+
+class RowSerializer:
+    """특정 모델(및 필드 선택)에 맞춰 미리 구성된 직렬화기"""
+
+    __slots__ = ('model_class', 'fieldnames', 'columns', '_getter', '_converters', '_parsers', '_width')
+
+    def __init__(self, model_class, fieldnames: Optional[Sequence[str]] = None, extra: Sequence[str] = ()):
+        table_columns = {column.name: column for column in model_class.__table__.columns}
+
+        if fieldnames is None:
+            fieldnames = list(table_columns)
+        unknown = [name for name in list(fieldnames) + list(extra) if name not in table_columns]
+        if unknown:
+            raise ValueError(f"존재하지 않는 필드: {', '.join(unknown)}")
+
+        self.model_class = model_class
+        self.fieldnames: Tuple[str, ...] = tuple(fieldnames)
+        selected = self.fieldnames + tuple(name for name in extra if name not in self.fieldnames)
+
+        # 조회할 컬럼: 응답 필드가 앞에 오고, 페이징 등에 필요한 추가 컬럼이 뒤에 붙음
+        self.columns = [getattr(model_class, name) for name in selected]
+        self._getter = attrgetter(*self.fieldnames) if self.fieldnames else None
+        self._width = len(self.fieldnames)
+        self._converters = [
+            (index, converter)
+            for index, converter in enumerate(_converter_for(table_columns[name]) for name in self.fieldnames)
+            if converter is not None
+        ]
+        self._parsers = {
+            name: parser
+            for name, parser in ((name, _parser_for(column)) for name, column in table_columns.items())
+            if parser is not None
+        }
+
+    def project(self, fields: Optional[Sequence[str]] = None, extra: Sequence[str] = ()) -> 'RowSerializer':
+        """
+        필드 선택용 직렬화기
+
+        필드 조합을 정렬한 키로 최근 PROJECTION_CACHE_SIZE개만 보관하고,
+        요청 순서가 정렬 순서와 다르면 캐시된 직렬화기의 컬럼/변환기를 요청 순서로 재배열해 돌려줍니다.
+        """
+        fieldnames = tuple(dict.fromkeys(fields)) if fields else self.fieldnames
+        extra = tuple(extra)
+        if fieldnames == self.fieldnames and not extra:
+            return self
+
+        projection = _projection(self, tuple(sorted(set(fieldnames))), extra)
+        if projection.fieldnames == fieldnames:
+            return projection
+        return projection._reordered(fieldnames)
+
+    def _reordered(self, fieldnames: Tuple[str, ...]) -> 'RowSerializer':
+        """같은 필드를 fieldnames 순서로 조회/직렬화하는 사본 (테이블 메타데이터를 다시 읽지 않음)"""
+        positions = {name: index for index, name in enumerate(self.fieldnames)}
+        converters = dict(self._converters)
+        view = object.__new__(RowSerializer)
+        view.model_class = self.model_class
+        view.fieldnames = fieldnames
+        view.columns = [self.columns[positions[name]] for name in fieldnames] + self.columns[self._width:]
+        view._getter = attrgetter(*fieldnames)
+        view._width = self._width
+        view._converters = [
+            (index, converters[positions[name]])
+            for index, name in enumerate(fieldnames) if positions[name] in converters
+        ]
+        view._parsers = self._parsers
+        return view
+
+    def _build(self, values: List[Any]) -> Dict[str, Any]:
+        for index, converter in self._converters:
+            value = values[index]
+            if value is not None:
+                values[index] = converter(value)
+        return dict(zip(self.fieldnames, values))
+
+    def serialize_row(self, row: Sequence[Any]) -> Dict[str, Any]:
+        """self.columns 순서로 조회한 행(Row/tuple) 직렬화"""
+        return self._build(list(row[:self._width]))
+
+    def serialize_rows(self, rows: Iterable[Sequence[Any]]) -> List[Dict[str, Any]]:
+        return [self.serialize_row(row) for row in rows]
+
+    def deserialize(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """API 입력 딕셔너리의 날짜/시간 문자열을 컬럼 타입으로 변환 (형식 오류는 ValueError)"""
+        values = dict(data)
+        for name, parser in self._parsers.items():
+            value = values.get(name)
+            if value is not None:
+                try:
+                    values[name] = parser(value)
+                except ValueError:
+                    raise ValueError(f"{name}: 날짜/시간 형식이 올바르지 않습니다: {value}")
+        return values
+
+    def serialize(self, document) -> Dict[str, Any]:
+        """ORM 인스턴스 직렬화"""
+        if self._width == 0:
+            return {}
+        values = self._getter(document)
+        return self._build([values] if self._width == 1 else list(values))
+
+
+@lru_cache(maxsize=PROJECTION_CACHE_SIZE)
+def _projection(serializer: RowSerializer, fieldnames: Tuple[str, ...], extra: Tuple[str, ...]) -> RowSerializer:
+    return RowSerializer(serializer.model_class, fieldnames, extra)
+
+
+# 모델 클래스별 직렬화기 캐시
+_SERIALIZERS: Dict[type, RowSerializer] = {}
+
+
+def get_serializer(model_class) -> RowSerializer:
+    """모델 클래스의 전체 컬럼 직렬화기 조회 (없으면 생성)"""
+    serializer = _SERIALIZERS.get(model_class)
+    if serializer is None:
+        serializer = RowSerializer(model_class)
+        _SERIALIZERS[model_class] = serializer
+    return serializer
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """?fields=name,customer,grand_total 형식 파싱"""
+    if not fields:
+        return None
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    return list(dict.fromkeys(names)) or None
@@ -0,0 +1,51 @@
+"""
+유일 키 집계 행 생성
+(품목, 창고) Bin이나 (계정, 회사, 월) 기간 잔액처럼 유일 키마다 한 행만 있어야 하는 집계 행을
+처음 만들 때 사용합니다.
+
+SELECT ... FOR UPDATE는 이미 있는 행만 잠그므로, 두 트랜잭션이 같은 키의 첫 행을 동시에 INSERT하면
+나중 트랜잭션이 유일 제약 위반으로 실패합니다. INSERT ... ON CONFLICT DO NOTHING으로 없는 행만 만들고
+다시 FOR UPDATE로 읽으면, 먼저 커밋된 행이든 직접 만든 행이든 잠금을 잡은 뒤 증분 갱신할 수 있습니다.
+"""
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.orm import Session
+
+from core.doctype.chunks import chunks
+
+
+def insert_missing(
+    db: Session,
+    model_class,
+    rows: List[Dict[str, Any]],
+    key_columns: Sequence[str],
+    chunk_size: int = 500
+):
+    """
+    유일 키(key_columns)가 아직 없는 행만 다중 행 INSERT (커밋하지 않음)
+
+    PostgreSQL/SQLite는 ON CONFLICT DO NOTHING으로 동시에 만든 행과의 충돌을 건너뜁니다.
+    그 외 데이터베이스는 키를 조회해 없는 행만 넣으므로 동시 생성 충돌은 막지 못합니다.
+    """
+    if not rows:
+        return
+    table = model_class.__table__
+    dialect = db.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        dialect_insert = None
+
+    for chunk in chunks(rows, chunk_size):
+        if dialect_insert is not None:
+            db.execute(dialect_insert(table).on_conflict_do_nothing(index_elements=list(key_columns)), chunk)
+            continue
+        columns = [table.c[column] for column in key_columns]
+        keys = [tuple(row[column] for column in key_columns) for row in chunk]
+        existing = {tuple(row) for row in db.execute(select(*columns).where(tuple_(*columns).in_(keys)))}
+        missing = [row for row, key in zip(chunk, keys) if key not in existing]
+        if missing:
+            db.execute(insert(table), missing)
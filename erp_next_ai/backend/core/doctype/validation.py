@@ -0,0 +1,276 @@
+"""
+DocType 유효성 검사 컴파일러
+DocType마다 메타데이터(필수, 길이, Select 옵션)에서 검사 함수를 한 번 만들어 두고 문서마다 재사용합니다.
+
+- 필드별 검사는 컴파일 시점에 (필드명, 검사 함수) 목록으로 만들어 두므로 검사 시 메타데이터 조회 없음
+- 링크(Link) 존재 확인은 LinkCheck에 모아 대상 DocType마다 IN 쿼리 한 번으로 실행 (대량 작업/배치 저장용)
+- 확인된 링크 값은 세션(요청) 캐시에 두고 커밋되지 않은 트랜잭션 종료/삭제 시 버림, 마스터 DocType(LINK_CACHE_DOCTYPES)은
+  커밋 후 프로세스 공용 캐시에 LINK_CACHE_TTL초 동안 보관 (존재하지 않는 값은 캐시하지 않음)
+- 모듈별 규칙(날짜 순서, 합계 등)은 각 모델의 validate()에서 컴파일된 검사 결과에 덧붙임
+"""
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from core.config import get_link_cache_doctypes, settings
+from core.doctype.chunks import chunks
+
+# 이메일 주소 형식 (모듈 검사에서 공용)
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+# 세션에서 확인된 링크 값 (테이블명 → 존재하는 name 집합)
+SESSION_LINK_CACHE_KEY = 'link_cache'
+
+# 커밋 후 공용 캐시에 넣을 링크 값 (DocType → name 집합)
+SHARED_LINK_PENDING_KEY = 'shared_link_pending'
+LINK_COMMITTED_KEY = 'link_committed'
+
+
+def is_valid_email(value: str) -> bool:
+    return EMAIL_PATTERN.match(value) is not None
+
+
+def is_empty(value: Any) -> bool:
+    return value is None or (isinstance(value, str) and not value.strip())
+
+
+def _length_check(fieldname: str, limit: int) -> Callable[[Any], Optional[str]]:
+    def check(value):
+        if isinstance(value, str) and len(value) > limit:
+            return f"{fieldname}은(는) {limit}자를 넘을 수 없습니다."
+        return None
+    return check
+
+
+def _options_check(fieldname: str, options: frozenset) -> Callable[[Any], Optional[str]]:
+    def check(value):
+        if value not in options:
+            return f"{fieldname}: 허용되지 않는 값입니다: {value}"
+        return None
+    return check
+
+
+class DocValidator:
+    """DocType 하나의 컴파일된 필드 검사"""
+
+    __slots__ = ('required', 'checks')
+
+    def __init__(self, required: Tuple[str, ...], checks: Tuple[Tuple[str, Callable[[Any], Optional[str]]], ...]):
+        self.required = required
+        self.checks = checks
+
+    def __call__(self, doc) -> List[str]:
+        errors = []
+        for fieldname in self.required:
+            if is_empty(getattr(doc, fieldname, None)):
+                errors.append(f"{fieldname}은(는) 필수 항목입니다.")
+
+        for fieldname, check in self.checks:
+            value = getattr(doc, fieldname, None)
+            if value is None or value == '':
+                continue
+            error = check(value)
+            if error:
+                errors.append(error)
+        return errors
+
+
+def compile_validator(model_class: type, meta, required_fields: Iterable[str]) -> DocValidator:
+    """
+    모델과 메타데이터로 검사 함수 생성
+
+    required_fields: 모델의 get_required_fields() (항상 필수)
+    메타데이터 필수(reqd) 필드는 컬럼 기본값이 없을 때만 저장 전 필수로 검사합니다.
+    """
+    columns = model_class.__table__.columns
+    required = list(dict.fromkeys(required_fields))
+    checks = []
+    for field in (meta.fields if meta else ()):
+        column = columns.get(field.fieldname)
+        if column is None:
+            continue
+        if field.fieldname in meta.required_fieldnames and field.fieldname not in required and column.default is None:
+            required.append(field.fieldname)
+
+        limit = field.length or getattr(column.type, 'length', None)
+        if limit and field.fieldtype in ('Data', 'Link', 'Select'):
+            checks.append((field.fieldname, _length_check(field.fieldname, limit)))
+        if field.fieldtype == 'Select' and field.options:
+            options = frozenset(option for option in field.options.split('\n') if option)
+            checks.append((field.fieldname, _options_check(field.fieldname, options)))
+    return DocValidator(tuple(required), tuple(checks))
+
+
+class SharedLinkCache:
+    """
+    마스터 DocType 링크 값 공용 캐시 (프로세스 단위, 존재하는 값만 TTL 동안 보관)
+
+    다른 프로세스에서 삭제된 마스터는 TTL이 지날 때까지 있는 것으로 보일 수 있으므로
+    자주 삭제되지 않는 등록된 마스터 DocType(창고, 계정 등, LINK_CACHE_DOCTYPES)에만 사용합니다.
+    """
+
+    def __init__(self, ttl: float, doctypes: Iterable[str]):
+        self.ttl = ttl
+        self.doctypes = frozenset(doctypes)
+        self._expires: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def enabled_for(self, doctype: str) -> bool:
+        return self.ttl > 0 and doctype in self.doctypes
+
+    def known(self, doctype: str, names: Iterable[str]) -> Set[str]:
+        """names 중 캐시에 있고 만료되지 않은 값"""
+        now = time.monotonic()
+        with self._lock:
+            expires = self._expires.get(doctype)
+            if not expires:
+                return set()
+            return {name for name in names if expires.get(name, 0) > now}
+
+    def add(self, doctype: str, names: Iterable[str]):
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            expires = self._expires.setdefault(doctype, {})
+            for name in names:
+                expires[name] = expires_at
+
+    def invalidate(self, doctype: Optional[str] = None, names: Optional[Iterable[str]] = None):
+        """지정한 DocType(과 name)의 캐시 삭제 (인자가 없으면 전체)"""
+        with self._lock:
+            if doctype is None:
+                self._expires.clear()
+            elif names is None:
+                self._expires.pop(doctype, None)
+            else:
+                expires = self._expires.get(doctype, {})
+                for name in names:
+                    expires.pop(name, None)
+
+
+shared_link_cache = SharedLinkCache(settings.LINK_CACHE_TTL, get_link_cache_doctypes())
+
+
+def _session_cache(db: Session, table_name: str) -> Set[str]:
+    return db.info.setdefault(SESSION_LINK_CACHE_KEY, {}).setdefault(table_name, set())
+
+
+@event.listens_for(Session, 'after_commit')
+def _publish_shared_links(session):
+    # 조회한 값이 이 트랜잭션에서 flush만 된 문서일 수 있으므로 커밋된 뒤에 공용 캐시에 넣음
+    pending = session.info.pop(SHARED_LINK_PENDING_KEY, None)
+    for doctype, names in (pending or {}).items():
+        shared_link_cache.add(doctype, names)
+    session.info[LINK_COMMITTED_KEY] = True
+
+
+@event.listens_for(Session, 'after_transaction_end')
+def _clear_uncommitted_links(session, transaction):
+    # 커밋되지 않고 끝난 트랜잭션(롤백, 커밋 없이 close)에서 만든 문서를 가리키는 링크가 남지 않도록 전체 삭제
+    if transaction.parent is not None:
+        return
+    if not session.info.pop(LINK_COMMITTED_KEY, False):
+        session.info.pop(SESSION_LINK_CACHE_KEY, None)
+        session.info.pop(SHARED_LINK_PENDING_KEY, None)
+
+
+@event.listens_for(Session, 'after_flush')
+def _evict_flushed_deletes(session, flush_context):
+    cache = session.info.get(SESSION_LINK_CACHE_KEY)
+    if cache:
+        for instance in session.deleted:
+            names = cache.get(getattr(instance, '__tablename__', None))
+            if names:
+                names.discard(getattr(instance, 'name', None))
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _evict_statement_deletes(orm_execute_state):
+    # DELETE 문(대량 삭제, 자식 행 교체)은 어떤 행이 지워졌는지 모르므로 그 테이블 캐시를 버림
+    if not orm_execute_state.is_delete:
+        return
+    cache = orm_execute_state.session.info.get(SESSION_LINK_CACHE_KEY)
+    table = getattr(orm_execute_state.statement, 'table', None)
+    if cache and table is not None:
+        cache.pop(table.name, None)
+
+
+def existing_names(db: Session, target_model: type, names: Iterable[str], doctype: Optional[str] = None) -> Set[str]:
+    """
+    names 중 존재하는 문서 name
+
+    세션 캐시 → 공용 캐시(마스터 DocType) 순으로 확인하고 나머지만 IN 쿼리로 조회해 캐시에 추가합니다.
+    공용 캐시에는 세션이 커밋된 뒤에 넣습니다 (롤백되면 버림).
+    """
+    names = set(names)
+    session_cache = _session_cache(db, target_model.__tablename__)
+    found = names & session_cache
+    remaining = names - found
+
+    shared = doctype is not None and shared_link_cache.enabled_for(doctype)
+    if shared and remaining:
+        known = shared_link_cache.known(doctype, remaining)
+        session_cache.update(known)
+        found |= known
+        remaining -= known
+
+    if remaining:
+        fetched = set()
+        for chunk in chunks(sorted(remaining)):
+            fetched.update(db.execute(select(target_model.name).where(target_model.name.in_(chunk))).scalars())
+        session_cache.update(fetched)
+        if shared and fetched:
+            db.info.setdefault(SHARED_LINK_PENDING_KEY, {}).setdefault(doctype, set()).update(fetched)
+        found |= fetched
+    return found
+
+
+class LinkCheck:
+    """
+    링크 값 존재 여부 일괄 확인
+
+    add()로 (소유자, 필드, 대상 DocType, 값)을 모은 뒤 run()을 한 번 호출하면
+    대상 DocType마다 캐시에 없는 값만 IN 쿼리 한 번으로 확인하고 소유자(문서/행 번호)별 오류를 돌려줍니다.
+    """
+
+    def __init__(self):
+        self._refs: List[Tuple[Any, str, str, type, str]] = []
+        self._values: Dict[type, Set[str]] = {}
+        self._doctypes: Dict[type, str] = {}
+        self._pending: Dict[type, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._refs)
+
+    def add(self, owner: Any, label: str, doctype: str, target_model: type, value: str):
+        self._refs.append((owner, label, doctype, target_model, value))
+        self._values.setdefault(target_model, set()).add(value)
+        self._doctypes[target_model] = doctype
+
+    def assume_exists(self, target_model: type, names: Iterable[str]):
+        """같은 요청에서 함께 생성하는 문서 (조회하지 않고 있는 것으로 취급)"""
+        self._pending.setdefault(target_model, set()).update(names)
+
+    def missing(self, db: Session) -> Dict[type, Set[str]]:
+        """대상 모델별 존재하지 않는 링크 값"""
+        missing = {}
+        for target_model, values in self._values.items():
+            values = values - self._pending.get(target_model, set())
+            absent = values - existing_names(db, target_model, values, self._doctypes[target_model])
+            if absent:
+                missing[target_model] = absent
+        return missing
+
+    def run(self, db: Session) -> Dict[Any, List[str]]:
+        """소유자 → 링크 오류 목록 (오류가 없는 소유자는 포함하지 않음)"""
+        if not self._refs:
+            return {}
+        missing = self.missing(db)
+        errors: Dict[Any, List[str]] = {}
+        for owner, label, doctype, target_model, value in self._refs:
+            if value in missing.get(target_model, ()):
+                errors.setdefault(owner, []).append(f"{label}: {doctype} '{value}'을(를) 찾을 수 없습니다.")
+        return errors
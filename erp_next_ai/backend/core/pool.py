@@ -0,0 +1,245 @@
+"""
+데이터베이스 연결 풀 계측 및 적응형 크기 조정
+풀에서 연결을 꺼낼 때의 대기 시간, 사용 중/초과(overflow) 연결 수, 연결 나이를 기록하고
+적응형 모드에서는 관측한 대기 시간에 따라 풀 크기를 최소/최대 범위 안에서 늘리거나 줄입니다.
+"""
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# 대기 시간 히스토그램 구간 상한(ms), 마지막 구간은 그 이상
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+# 백분위 계산에 사용할 최근 대기 시간 표본 수
+RECENT_WAIT_SAMPLES = 1024
+
+
+def _percentile(values: List[float], ratio: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))]
+
+
+class AdaptivePoolPolicy:
+    """관측한 대기 시간으로 풀 크기를 조정하는 정책"""
+
+    def __init__(
+        self,
+        min_size: int,
+        max_size: int,
+        grow_wait_ms: float = 50,
+        shrink_wait_ms: float = 1,
+        step: int = 2,
+        interval: float = 30
+    ):
+        self.min_size = min_size
+        self.max_size = max(max_size, min_size)
+        self.grow_wait_ms = grow_wait_ms
+        self.shrink_wait_ms = shrink_wait_ms
+        self.step = step
+        self.interval = interval
+
+    def target_size(self, current: int, p95_wait_ms: float, peak_checked_out: int) -> int:
+        """다음 풀 크기 (변경이 없으면 current)"""
+        if p95_wait_ms >= self.grow_wait_ms:
+            return min(self.max_size, current + self.step)
+        # 대기가 거의 없고 최대 사용량이 절반 이하로 유지되면 줄임
+        if p95_wait_ms <= self.shrink_wait_ms and peak_checked_out * 2 <= current:
+            return max(self.min_size, current - self.step)
+        return current
+
+
+class PoolMonitor:
+    """풀 하나의 계측 정보"""
+
+    def __init__(self, name: str, policy: Optional[AdaptivePoolPolicy] = None):
+        self.name = name
+        self.policy = policy
+        self.histogram = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.recent_waits = deque(maxlen=RECENT_WAIT_SAMPLES)
+        self.connections: Dict[int, float] = {}
+        self.resizes: deque = deque(maxlen=20)
+        self._window_waits: List[float] = []
+        self._window_peak = 0
+        self._window_started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record_wait(self, pool, seconds: float):
+        wait_ms = seconds * 1000
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += wait_ms
+            self.wait_max = max(self.wait_max, wait_ms)
+            self.histogram[bisect_left(WAIT_BUCKETS_MS, wait_ms)] += 1
+            self.recent_waits.append(wait_ms)
+            if self.policy is not None:
+                self._window_waits.append(wait_ms)
+                self._window_peak = max(self._window_peak, pool.checkedout())
+        if self.policy is not None:
+            self._maybe_resize(pool)
+
+    def record_timeout(self, pool):
+        with self._lock:
+            self.timeouts += 1
+            if self.policy is not None:
+                # 시간 초과는 최대 대기로 간주해 확장을 유도
+                self._window_waits.append(float('inf'))
+        if self.policy is not None:
+            self._maybe_resize(pool)
+
+    def _maybe_resize(self, pool):
+        now = time.monotonic()
+        with self._lock:
+            if now - self._window_started < self.policy.interval:
+                return
+            p95 = _percentile(self._window_waits, 0.95)
+            peak = self._window_peak
+            self._window_waits = []
+            self._window_peak = 0
+            self._window_started = now
+
+        current = pool.size()
+        target = self.policy.target_size(current, p95, peak)
+        if target != current:
+            pool.resize(target)
+            self.resizes.append({"at": time.time(), "from": current, "to": target, "p95_wait_ms": p95})
+
+    def connection_ages(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        ages = [now - created for created in list(self.connections.values())]
+        return {
+            "count": len(ages),
+            "oldest_seconds": round(max(ages), 1) if ages else 0,
+            "average_seconds": round(sum(ages) / len(ages), 1) if ages else 0,
+        }
+
+    def metrics(self, pool) -> Dict[str, Any]:
+        with self._lock:
+            recent = list(self.recent_waits)
+            histogram = list(self.histogram)
+            checkouts, timeouts = self.checkouts, self.timeouts
+            wait_total, wait_max = self.wait_total, self.wait_max
+
+        labels = [f"<={bound}ms" for bound in WAIT_BUCKETS_MS] + [f">{WAIT_BUCKETS_MS[-1]}ms"]
+        return {
+            "name": self.name,
+            "pool_size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+            "adaptive": self.policy is not None,
+            "checkouts": checkouts,
+            "timeouts": timeouts,
+            "wait_ms": {
+                "average": round(wait_total / checkouts, 3) if checkouts else 0,
+                "p50": round(_percentile(recent, 0.5), 3),
+                "p95": round(_percentile(recent, 0.95), 3),
+                "max": round(wait_max, 3),
+                "histogram": dict(zip(labels, histogram)),
+            },
+            "connection_age": self.connection_ages(),
+            "resizes": list(self.resizes),
+        }
+
+
+class InstrumentedPoolMixin:
+    """연결 대기 시간을 기록하고 크기 조정을 지원하는 QueuePool 확장"""
+
+    monitor: Optional[PoolMonitor] = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            if self.monitor is not None:
+                self.monitor.record_timeout(self)
+            raise
+        if self.monitor is not None:
+            self.monitor.record_wait(self, time.perf_counter() - start)
+        return connection
+
+    def resize(self, pool_size: int):
+        """
+        유지할 연결 수(pool_size) 변경
+
+        QueuePool은 전체 연결 수를 (_overflow + 큐 크기)로 관리하므로
+        큐 크기를 바꿀 때 _overflow도 같은 만큼 옮겨 현재 연결 수를 보존합니다.
+        줄어든 만큼의 연결은 반환될 때 초과 연결로 취급되어 닫힙니다.
+        """
+        with self._overflow_lock:
+            delta = pool_size - self._pool.maxsize
+            self._pool.maxsize = pool_size
+            self._overflow -= delta
+
+    def recreate(self):
+        # engine.dispose() 등으로 풀을 다시 만들 때 계측 정보 유지
+        pool = super().recreate()
+        pool.monitor = self.monitor
+        return pool
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    """동기 엔진용 계측 풀"""
+
+
+class InstrumentedAsyncQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """비동기 엔진용 계측 풀"""
+
+
+def attach_monitor(engine, name: str, policy: Optional[AdaptivePoolPolicy] = None) -> Optional[PoolMonitor]:
+    """엔진의 풀에 계측기 연결 (계측 풀이 아니면 None)"""
+    sync_engine = getattr(engine, 'sync_engine', engine)
+    pool = sync_engine.pool
+    if not isinstance(pool, InstrumentedPoolMixin):
+        return None
+
+    monitor = PoolMonitor(name, policy)
+    pool.monitor = monitor
+
+    @event.listens_for(pool, 'connect')
+    def on_connect(dbapi_connection, connection_record):
+        monitor.connections[id(connection_record)] = time.monotonic()
+
+    @event.listens_for(pool, 'close')
+    def on_close(dbapi_connection, connection_record):
+        monitor.connections.pop(id(connection_record), None)
+
+    @event.listens_for(pool, 'detach')
+    def on_detach(dbapi_connection, connection_record):
+        monitor.connections.pop(id(connection_record), None)
+
+    return monitor
+
+
+def pool_metrics(engine) -> Optional[Dict[str, Any]]:
+    """엔진 풀의 현재 계측 정보 (계측되지 않은 풀이면 None)"""
+    sync_engine = getattr(engine, 'sync_engine', engine)
+    pool = sync_engine.pool
+    monitor = getattr(pool, 'monitor', None)
+    if monitor is None:
+        return None
+    return monitor.metrics(pool)
+
+
+def pool_health(metrics: Optional[Dict[str, Any]], slow_wait_ms: float = 100) -> str:
+    """계측 정보로 풀 상태 판단 (healthy/degraded/unknown)"""
+    if metrics is None:
+        return "unknown"
+    capacity = metrics["pool_size"] + max(metrics["max_overflow"], 0)
+    if metrics["timeouts"] or metrics["wait_ms"]["p95"] >= slow_wait_ms:
+        return "degraded"
+    if capacity and metrics["checked_out"] >= capacity:
+        return "degraded"
+    return "healthy"
@@ -0,0 +1,182 @@
+"""
+읽기 복제본 라우팅
+목록/단건 조회, 내보내기, 코파일럿 조회, 분석 쿼리 같은 읽기를 복제본으로 보내고
+쓰기(flush, INSERT/UPDATE/DELETE)와 제출/취소는 주 데이터베이스에서 처리합니다.
+
+- 복제본은 라운드 로빈으로 선택하며, 상태 확인에 실패하거나 연결이 끊긴 복제본은 건너뜁니다.
+- 쓰기를 커밋한 클라이언트는 일정 시간(read-your-writes 구간) 동안 읽기도 주 데이터베이스로 보냅니다.
+- 복제본이 없거나 모두 비정상이면 주 데이터베이스로 읽습니다.
+"""
+import asyncio
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+# 상태 확인 쿼리 제한 시간(초)
+HEALTH_CHECK_TIMEOUT = 3.0
+
+
+class ReplicaNode:
+    """읽기 복제본 하나의 엔진과 상태"""
+
+    __slots__ = ('name', 'engine', 'healthy', 'last_error')
+
+    def __init__(self, name: str, engine):
+        self.name = name
+        self.engine = engine
+        self.healthy = True
+        self.last_error: Optional[str] = None
+
+
+class ReplicaRouter:
+    """주 데이터베이스/복제본 엔진 선택기"""
+
+    def __init__(
+        self,
+        primary,
+        replicas: Optional[List] = None,
+        health_interval: float = 30,
+        read_your_writes_seconds: float = 5.0
+    ):
+        self.primary = primary
+        self.replicas = [ReplicaNode(f"replica-{index}", engine) for index, engine in enumerate(replicas or [])]
+        self.health_interval = health_interval
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self._next = 0
+        self._recent_writes: Dict[str, float] = {}
+        self._last_health_check = time.monotonic()
+        self._lock = threading.Lock()
+
+        for node in self.replicas:
+            event.listen(node.engine.sync_engine, 'handle_error', self._error_listener(node))
+
+    def _error_listener(self, node: ReplicaNode):
+        def on_error(context):
+            # 연결 끊김은 다음 상태 확인까지 해당 복제본을 제외
+            if context.is_disconnect:
+                self.mark_unhealthy(node, str(context.original_exception))
+        return on_error
+
+    def mark_unhealthy(self, node: ReplicaNode, error: str):
+        node.healthy = False
+        node.last_error = error
+
+    def choose_replica(self) -> Optional[ReplicaNode]:
+        """정상 복제본을 라운드 로빈으로 선택 (없으면 None)"""
+        with self._lock:
+            for _ in range(len(self.replicas)):
+                node = self.replicas[self._next % len(self.replicas)]
+                self._next += 1
+                if node.healthy:
+                    return node
+        return None
+
+    def mark_write(self, client_key: Optional[str]):
+        """클라이언트의 쓰기 커밋 시각 기록"""
+        if client_key is None or not self.replicas:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._recent_writes[client_key] = now + self.read_your_writes_seconds
+            # 만료된 기록 정리
+            if len(self._recent_writes) > 1024:
+                self._recent_writes = {key: until for key, until in self._recent_writes.items() if until > now}
+
+    def recently_wrote(self, client_key: Optional[str]) -> bool:
+        """read-your-writes 구간 안에 있는 클라이언트인지"""
+        if client_key is None:
+            return False
+        until = self._recent_writes.get(client_key)
+        return until is not None and until > time.monotonic()
+
+    async def check_health(self):
+        """모든 복제본에 SELECT 1을 보내 상태 갱신"""
+        self._last_health_check = time.monotonic()
+        for node in self.replicas:
+            try:
+                async with node.engine.connect() as connection:
+                    await asyncio.wait_for(connection.execute(text("SELECT 1")), HEALTH_CHECK_TIMEOUT)
+                node.healthy = True
+                node.last_error = None
+            except Exception as e:
+                self.mark_unhealthy(node, str(e))
+
+    async def check_health_if_due(self):
+        """상태 확인 주기가 지났으면 상태 확인 실행"""
+        if self.replicas and time.monotonic() - self._last_health_check >= self.health_interval:
+            await self.check_health()
+
+    def status(self) -> List[Dict[str, Any]]:
+        return [
+            {"name": node.name, "healthy": node.healthy, "last_error": node.last_error}
+            for node in self.replicas
+        ]
+
+    async def dispose(self):
+        for node in self.replicas:
+            await node.engine.dispose()
+
+
+class RoutingSession(Session):
+    """
+    문장 종류에 따라 주 데이터베이스/복제본을 고르는 세션
+
+    session.info 키:
+    - router: ReplicaRouter (없으면 기본 bind 사용)
+    - primary: True면 모든 문장을 주 데이터베이스에서 실행 (쓰기 요청용)
+    - client_key: read-your-writes 구간 판단용 클라이언트 식별자
+    """
+
+    def get_bind(self, mapper=None, *, clause=None, **kw):
+        router = self.info.get('router')
+        if router is None:
+            return super().get_bind(mapper, clause=clause, **kw)
+
+        primary = router.primary.sync_engine
+        if self._flushing or self.info.get('primary') or self.info.get('wrote'):
+            return primary
+        if clause is not None and not getattr(clause, 'is_select', False):
+            return primary
+        if router.recently_wrote(self.info.get('client_key')):
+            return primary
+
+        # 같은 세션 안의 읽기는 한 복제본에서 실행 (개수/페이지 조회 간 일관성)
+        node = self.info.get('replica')
+        if node is None or not node.healthy:
+            node = router.choose_replica()
+            if node is None:
+                return primary
+            self.info['replica'] = node
+        return node.engine.sync_engine
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _after_flush(session, flush_context):
+    session.info['wrote'] = True
+
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _do_orm_execute(orm_execute_state):
+    # session.execute(update(...)) 같은 대량 DML도 쓰기로 취급
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info['wrote'] = True
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _after_commit(session):
+    router = session.info.get('router')
+    if router is not None and session.info.get('wrote'):
+        router.mark_write(session.info.get('client_key'))
+
+
+def client_key_for(request) -> Optional[str]:
+    """요청의 클라이언트 식별자 (X-Client-Id 헤더, 없으면 접속 주소)"""
+    if request is None:
+        return None
+    client_id = request.headers.get("X-Client-Id")
+    if client_id:
+        return client_id
+    return request.client.host if request.client else None
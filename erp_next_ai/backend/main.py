@@ -7,9 +7,11 @@ import os
 import sys
 import logging
 from contextlib import asynccontextmanager
+from datetime import date, datetime
 from pathlib import Path
+from typing import List, Optional
 
-from fastapi import FastAPI, HTTPException, Depends, Request
+from fastapi import FastAPI, HTTPException, Depends, Request, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
@@ -58,6 +60,12 @@ async def lifespan(app: FastAPI):
     
     # 종료 시 실행
     logger.info("🔄 ERPNext AI System 종료 중...")
+    if DATABASE_URL:
+        try:
+            from core.database import close_async_database
+            await close_async_database()
+        except Exception as e:
+            logger.warning(f"데이터베이스 연결 정리 실패: {e}")
 
 
 # FastAPI 애플리케이션 생성
@@ -199,6 +207,28 @@ async def database_status():
             "message": f"Database connection failed: {str(e)}"
         }
 
+@app.get("/api/system/db-pool")
+async def database_pool_metrics():
+    """데이터베이스 연결 풀 계측 정보 (사용 중/초과 연결, 대기 시간 분포, 연결 나이)"""
+    if not DATABASE_URL:
+        return {
+            "status": "not_configured",
+            "pools": {}
+        }
+    
+    try:
+        from core.database import get_pool_metrics
+        return {
+            "status": "ok",
+            "pools": get_pool_metrics()
+        }
+    except Exception as e:
+        logger.error(f"Database pool metrics failed: {e}")
+        return {
+            "status": "error",
+            "message": f"연결 풀 정보 조회 실패: {str(e)}"
+        }
+
 @app.get("/api/db-health")
 async def db_health_check():
     """데이터베이스 헬스체크 전용 엔드포인트"""
@@ -279,6 +309,162 @@ async def list_doctypes():
         ]
     }
 
+# 캐시 조회 공용 실행
+async def run_cached_query(fn):
+    """
+    프로세스 캐시를 채우는 조회를 세션에서 실행
+
+    읽기 복제본에서 읽으면 복제 지연으로 오래된 값이 캐시에 남을 수 있으므로 항상 주 데이터베이스를 사용합니다.
+    """
+    from core.database import get_async_db_session
+    
+    async with get_async_db_session() as db:
+        return await db.run_sync(fn)
+
+# 재고 조회 엔드포인트
+@app.get("/api/stock/balance")
+async def stock_balance(
+    item_code: Optional[List[str]] = Query(None),
+    warehouse: Optional[List[str]] = Query(None),
+    warehouse_group: Optional[str] = None,
+    as_of: Optional[datetime] = None
+):
+    """품목/창고별 재고 잔액 (as_of를 주면 그 시점 기준으로 원장에서 계산, warehouse_group은 하위 창고 포함)"""
+    if not DATABASE_URL:
+        raise HTTPException(status_code=503, detail="데이터베이스가 구성되지 않았습니다")
+    
+    from core.database import get_async_db_session
+    from modules.stock.stock_ledger import get_stock_balances
+    
+    async with get_async_db_session(read_only=True) as db:
+        balances = await db.run_sync(lambda session: get_stock_balances(session, as_of, item_code, warehouse, warehouse_group))
+    
+    return {
+        "as_of": as_of,
+        "data": balances
+    }
+
+@app.post("/api/stock/reorder")
+async def stock_reorder(full: bool = False, dry_run: bool = False):
+    """재주문 검사 실행 (마지막 실행 이후 재고가 바뀐 품목만, full이면 전체) 후 공급업체별 임시 구매주문 생성"""
+    if not DATABASE_URL:
+        raise HTTPException(status_code=503, detail="데이터베이스가 구성되지 않았습니다")
+    
+    from core.database import get_async_db_session
+    from modules.stock.reorder import run_reorder
+    
+    async with get_async_db_session() as db:
+        result = await db.run_sync(lambda session: run_reorder(session, full=full, dry_run=dry_run))
+    
+    return result
+
+# 회계 보고서 엔드포인트
+@app.get("/api/accounts/trial-balance")
+async def trial_balance(company: str, from_date: date, to_date: date):
+    """시산표 (계정 기간 잔액 기반)"""
+    if not DATABASE_URL:
+        raise HTTPException(status_code=503, detail="데이터베이스가 구성되지 않았습니다")
+    
+    from core.database import get_async_db_session
+    from modules.accounts.general_ledger import get_trial_balance
+    
+    async with get_async_db_session(read_only=True) as db:
+        rows = await db.run_sync(lambda session: get_trial_balance(session, company, from_date, to_date))
+    
+    return {
+        "company": company,
+        "from_date": from_date,
+        "to_date": to_date,
+        "data": rows
+    }
+
+@app.get("/api/accounts/profit-and-loss")
+async def profit_and_loss(company: str, from_date: date, to_date: date):
+    """손익계산서 (계정 기간 잔액 기반)"""
+    if not DATABASE_URL:
+        raise HTTPException(status_code=503, detail="데이터베이스가 구성되지 않았습니다")
+    
+    from core.database import get_async_db_session
+    from modules.accounts.general_ledger import get_profit_and_loss
+    
+    async with get_async_db_session(read_only=True) as db:
+        report = await db.run_sync(lambda session: get_profit_and_loss(session, company, from_date, to_date))
+    
+    return {
+        "company": company,
+        "from_date": from_date,
+        "to_date": to_date,
+        **report
+    }
+
+@app.get("/api/accounts/receivables-aging")
+async def receivables_aging(
+    company: str,
+    report_date: Optional[date] = None,
+    ageing_based_on: str = "due_date",
+    customer: Optional[str] = None
+):
+    """매출채권 연령 분석 (고객별 0-30/31-60/61-90/90+일)"""
+    if not DATABASE_URL:
+        raise HTTPException(status_code=503, detail="데이터베이스가 구성되지 않았습니다")
+    
+    from modules.accounts.receivables import get_receivables_aging
+    
+    try:
+        return await run_cached_query(
+            lambda session: get_receivables_aging(session, company, report_date, ageing_based_on, customer)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# 프로젝트 일정 엔드포인트
+@app.get("/api/projects/{project}/schedule")
+async def project_schedule(project: str):
+    """프로젝트 작업 의존성 일정 (가장 이른/늦은 시작·종료, 여유, 주공정)"""
+    if not DATABASE_URL:
+        raise HTTPException(status_code=503, detail="데이터베이스가 구성되지 않았습니다")
+    
+    from modules.projects.scheduling import get_project_schedule
+    
+    try:
+        return await run_cached_query(lambda session: get_project_schedule(session, project))
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+# 조직도 엔드포인트
+@app.get("/api/hr/employees/{employee}/org")
+async def employee_org(employee: str):
+    """직원의 상급자 체인, 직속/전체 하위 조직, 하위 조직 부서별 인원"""
+    if not DATABASE_URL:
+        raise HTTPException(status_code=503, detail="데이터베이스가 구성되지 않았습니다")
+    
+    from modules.hr.org_chart import get_org_summary
+    
+    try:
+        return await run_cached_query(lambda session: get_org_summary(session, employee))
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@app.get("/api/hr/headcount")
+async def department_headcount(company: str, manager: Optional[str] = None):
+    """회사(manager를 주면 그 하위 조직)의 부서별 재직 인원"""
+    if not DATABASE_URL:
+        raise HTTPException(status_code=503, detail="데이터베이스가 구성되지 않았습니다")
+    
+    from modules.hr.org_chart import get_department_headcount
+    
+    try:
+        counts = await run_cached_query(lambda session: get_department_headcount(session, company, manager))
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    
+    return {
+        "company": company,
+        "manager": manager,
+        "data": counts,
+        "total": sum(counts.values())
+    }
+
 # AI 관련 엔드포인트들
 @app.get("/api/ai/status")
 async def ai_status():
@@ -53,7 +53,10 @@ if config.config_file_name is not None:
 config.set_main_option('sqlalchemy.url', settings.DATABASE_URL)
 
 # Add your model's MetaData object here for 'autogenerate' support
-target_metadata = Base.metadata
+# DocType 모델(및 메타데이터에서 자동 선언된 인덱스)은 core.doctype.base.Base에 등록됨
+from core.doctype.base import Base as DocTypeModelBase, load_doctype_modules
+load_doctype_modules()
+target_metadata = [Base.metadata, DocTypeModelBase.metadata]
 
 
 def run_migrations_offline() -> None:
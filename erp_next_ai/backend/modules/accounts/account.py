@@ -4,12 +4,14 @@ ERPNext의 Account 모듈과 동일한 구조
 """
 from sqlalchemy import Column, String, Float, Boolean, DateTime, Text
 from core.doctype.base import DocTypeBase, Base, DocTypeMeta, register_doctype
+from core.doctype.nestedset import NestedSetMixin
 
 
-class Account(DocTypeBase, Base):
+class Account(NestedSetMixin, DocTypeBase, Base):
     """계정과목 마스터"""
     
     __tablename__ = 'tabAccount'
+    nsm_parent_field = 'parent_account'
     
     # 기본 정보
     account_name = Column(String(100), nullable=False)
@@ -4,6 +4,7 @@ ERPNext의 Customer 모듈과 동일한 구조
 """
 from sqlalchemy import Column, String, Integer, Float, Text, Boolean, DateTime
 from core.doctype.base import DocTypeBase, Base, DocTypeMeta, register_doctype
+from core.doctype.validation import is_valid_email
 
 
 class Customer(DocTypeBase, Base):
@@ -58,9 +59,7 @@ class Customer(DocTypeBase, Base):
         
         # 이메일 유효성 검사
         if self.email_id:
-            import re
-            email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-            if not re.match(email_pattern, self.email_id):
+            if not is_valid_email(self.email_id):
                 errors.append("올바른 이메일 주소를 입력하세요.")
         
         # 중복 검사
@@ -0,0 +1,616 @@
+"""
+총계정원장(GL Entry)과 계정 기간 잔액 DocType 정의
+ERPNext의 GL Entry와 동일한 구조
+
+- 전표(Sales Invoice, Purchase Order)를 제출하면 분개를 GL Entry로 기록
+- (계정, 회사, 월)별 차변/대변 합계(Account Period Balance)를 같은 트랜잭션에서 증분 갱신
+- 시산표/손익계산서는 월 잔액에서 읽고, 기간 경계의 일부 월만 원장 행을 합산
+"""
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import (
+    Column, String, Float, Boolean, Date, DateTime, Text, Index, UniqueConstraint,
+    delete, false, func, insert, select, tuple_
+)
+from sqlalchemy.orm import Session
+from core.config import get_fiscal_year_start
+from core.doctype.base import DocTypeBase, Base, DocTypeMeta, register_doctype
+from core.doctype.chunks import chunks
+from core.doctype.nestedset import rollup
+from core.doctype.upsert import insert_missing
+from modules.accounts.account import Account
+
+# 차변/대변 합계 비교 허용 오차 (원 단위 반올림)
+DEBIT_CREDIT_TOLERANCE = 0.005
+
+# IN 목록 하나에 넣을 최대 (계정, 회사, 월) 키 수 (키마다 파라미터 3개)
+GL_CHUNK_SIZE = 500
+
+BALANCE_SHEET_ROOT_TYPES = ('Asset', 'Liability', 'Equity')
+PROFIT_AND_LOSS_ROOT_TYPES = ('Income', 'Expense')
+
+
+class GLEntry(DocTypeBase, Base):
+    """총계정원장"""
+
+    __tablename__ = 'tabGLEntry'
+    __table_args__ = (
+        Index('ix_tabglentry_account_company_posting', 'account', 'company', 'posting_date'),
+        Index('ix_tabglentry_voucher', 'voucher_type', 'voucher_no'),
+        Index('ix_tabglentry_party', 'party_type', 'party'),
+    )
+
+    posting_date = Column(Date, nullable=False)
+
+    # 계정
+    account = Column(String(140), nullable=False)
+    account_currency = Column(String(10), default='KRW')
+    against = Column(Text)
+
+    # 거래처
+    party_type = Column(String(50))
+    party = Column(String(140))
+
+    # 금액
+    debit = Column(Float, default=0)
+    credit = Column(Float, default=0)
+
+    # 원천 전표
+    voucher_type = Column(String(50), nullable=False)
+    voucher_no = Column(String(140), nullable=False)
+
+    # 회사/원가 정보
+    company = Column(String(100), nullable=False)
+    cost_center = Column(String(140))
+    project = Column(String(140))
+
+    remarks = Column(Text)
+
+    # 취소된 전표의 원장 행 (취소 시 반대 분개와 함께 표시)
+    is_cancelled = Column(Boolean, default=False)
+
+    def get_required_fields(self):
+        return ['posting_date', 'account', 'voucher_type', 'voucher_no', 'company']
+
+
+class AccountPeriodBalance(DocTypeBase, Base):
+    """(계정, 회사, 월)별 차변/대변 합계 (GL Entry에서 증분 갱신되는 집계 테이블)"""
+
+    __tablename__ = 'tabAccountPeriodBalance'
+    __table_args__ = (
+        UniqueConstraint('account', 'company', 'period_start', name='uq_tabaccountperiodbalance_account_company_period'),
+        Index('ix_tabaccountperiodbalance_company_period', 'company', 'period_start'),
+    )
+
+    account = Column(String(140), nullable=False)
+    company = Column(String(100), nullable=False)
+    period_start = Column(Date, nullable=False)  # 해당 월 1일
+
+    debit = Column(Float, default=0)
+    credit = Column(Float, default=0)
+
+    def get_required_fields(self):
+        return ['account', 'company', 'period_start']
+
+
+def _to_date(value) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+def period_start_of(value) -> date:
+    """날짜가 속한 월의 1일"""
+    value = _to_date(value)
+    return date(value.year, value.month, 1)
+
+
+def fiscal_year_start_of(value) -> date:
+    """날짜가 속한 회계연도의 시작일 (설정 FISCAL_YEAR_START 기준)"""
+    value = _to_date(value)
+    month, day = get_fiscal_year_start()
+    start = date(value.year, month, day)
+    return start if start <= value else date(value.year - 1, month, day)
+
+
+def _next_period(period_start: date) -> date:
+    if period_start.month == 12:
+        return date(period_start.year + 1, 1, 1)
+    return date(period_start.year, period_start.month + 1, 1)
+
+
+def _validate_accounts(db: Session, entries: List[Dict[str, Any]]):
+    """분개 계정이 존재하고 그룹 계정이 아니며 전표 회사 소속인지 IN 조회로 한 번에 확인"""
+    names = list({entry['account'] for entry in entries})
+    accounts = {}
+    for chunk in chunks(names):
+        stmt = select(Account.name, Account.is_group, Account.company).where(Account.name.in_(chunk))
+        accounts.update({name: (is_group, company) for name, is_group, company in db.execute(stmt)})
+
+    errors = []
+    for entry in entries:
+        account = accounts.get(entry['account'])
+        if account is None:
+            errors.append(f"계정을 찾을 수 없습니다: {entry['account']}")
+        elif account[0]:
+            errors.append(f"그룹 계정에는 분개할 수 없습니다: {entry['account']}")
+        elif account[1] != entry['company']:
+            errors.append(f"'{entry['account']}' 계정은 {entry['company']} 회사 소속이 아닙니다.")
+    if errors:
+        raise ValueError(f"분개 오류: {', '.join(dict.fromkeys(errors))}")
+
+
+def update_period_balances(db: Session, deltas: Dict[Tuple[str, str, date], Tuple[float, float]]):
+    """
+    (계정, 회사, 월)별 차변/대변 변동을 기간 잔액에 반영 (커밋하지 않음)
+
+    없는 행은 INSERT ... ON CONFLICT DO NOTHING으로 0 잔액 행을 만든 뒤 다시 잠금 조회하므로, 같은 달의 첫 전기가
+    동시에 들어와도 유일 제약 위반 없이 한 트랜잭션씩 증분 갱신합니다.
+    """
+    keys = list(deltas)
+    existing = {}
+
+    def lock(chunk_keys):
+        for chunk in chunks(chunk_keys, GL_CHUNK_SIZE):
+            stmt = select(AccountPeriodBalance).where(
+                tuple_(AccountPeriodBalance.account, AccountPeriodBalance.company, AccountPeriodBalance.period_start).in_(chunk)
+            ).with_for_update()
+            for balance in db.execute(stmt).scalars():
+                existing[(balance.account, balance.company, balance.period_start)] = balance
+
+    lock(keys)
+    now = datetime.utcnow()
+    missing = [key for key in keys if key not in existing]
+    if missing:
+        insert_missing(db, AccountPeriodBalance, [
+            {
+                "name": uuid.uuid4().hex[:10], "account": account, "company": company, "period_start": period_start,
+                "debit": 0, "credit": 0, "creation": now, "modified": now,
+            }
+            for account, company, period_start in missing
+        ], ('account', 'company', 'period_start'), GL_CHUNK_SIZE)
+        lock(missing)
+
+    for key, (debit, credit) in deltas.items():
+        balance = existing[key]
+        balance.debit = (balance.debit or 0) + debit
+        balance.credit = (balance.credit or 0) + credit
+        balance.modified = now
+
+
+def _period_deltas(entries: Iterable[Dict[str, Any]], sign: int = 1) -> Dict[Tuple[str, str, date], Tuple[float, float]]:
+    deltas: Dict[Tuple[str, str, date], Tuple[float, float]] = {}
+    for entry in entries:
+        key = (entry['account'], entry['company'], period_start_of(entry['posting_date']))
+        debit, credit = deltas.get(key, (0.0, 0.0))
+        deltas[key] = (debit + sign * (entry.get('debit') or 0), credit + sign * (entry.get('credit') or 0))
+    return deltas
+
+
+def make_gl_entries(db: Session, entries: List[Dict[str, Any]]) -> List[GLEntry]:
+    """
+    분개 기록과 기간 잔액 갱신 (커밋하지 않음)
+
+    entries 항목: posting_date, account, debit, credit, voucher_type, voucher_no, company,
+    party_type, party, against, cost_center, project, remarks
+    차변과 대변 합계가 다르거나 계정이 올바르지 않으면 ValueError를 발생시킵니다.
+    """
+    entries = [entry for entry in entries if (entry.get('debit') or 0) or (entry.get('credit') or 0)]
+    if not entries:
+        return []
+
+    total_debit = sum(entry.get('debit') or 0 for entry in entries)
+    total_credit = sum(entry.get('credit') or 0 for entry in entries)
+    if abs(total_debit - total_credit) > DEBIT_CREDIT_TOLERANCE:
+        raise ValueError(f"차변 합계({total_debit:,.2f})와 대변 합계({total_credit:,.2f})가 일치하지 않습니다.")
+    _validate_accounts(db, entries)
+
+    now = datetime.utcnow()
+    columns = {column.name for column in GLEntry.__table__.columns}
+    gl_entries = []
+    for entry in entries:
+        values = {key: value for key, value in entry.items() if key in columns}
+        values['posting_date'] = _to_date(values['posting_date'])
+        gl_entry = GLEntry(
+            name=uuid.uuid4().hex[:10], is_cancelled=False, docstatus=1, creation=now, modified=now, **values
+        )
+        db.add(gl_entry)
+        gl_entries.append(gl_entry)
+
+    update_period_balances(db, _period_deltas(entries))
+    return gl_entries
+
+
+def cancel_gl_entries(db: Session, voucher_type: str, voucher_no: str) -> int:
+    """
+    전표 분개 취소 (커밋하지 않음)
+
+    원래 분개와 차변/대변을 바꾼 반대 분개를 같은 전기일로 기록하고 둘 다 취소 표시합니다.
+    기간 잔액에서는 원래 분개만큼 차감합니다.
+    """
+    stmt = select(GLEntry).where(
+        GLEntry.voucher_type == voucher_type,
+        GLEntry.voucher_no == voucher_no,
+        GLEntry.is_cancelled == false()
+    )
+    originals = list(db.execute(stmt).scalars())
+    if not originals:
+        return 0
+
+    now = datetime.utcnow()
+    copied = [column.name for column in GLEntry.__table__.columns if column.name not in ('name', 'debit', 'credit')]
+    for original in originals:
+        values = {column: getattr(original, column) for column in copied}
+        values.update(name=uuid.uuid4().hex[:10], debit=original.credit, credit=original.debit,
+                      is_cancelled=True, docstatus=2, creation=now, modified=now)
+        db.add(GLEntry(**values))
+        original.is_cancelled = True
+        original.docstatus = 2
+        original.modified = now
+
+    update_period_balances(db, _period_deltas(
+        ({"account": gl.account, "company": gl.company, "posting_date": gl.posting_date,
+          "debit": gl.debit, "credit": gl.credit} for gl in originals),
+        sign=-1
+    ))
+    return len(originals)
+
+
+def _raw_sums(db: Session, company: str, start: date, end: date) -> Dict[str, Tuple[float, float]]:
+    """기간 [start, end]의 계정별 차변/대변 합계를 원장 행에서 직접 계산"""
+    if start > end:
+        return {}
+    stmt = select(GLEntry.account, func.sum(GLEntry.debit), func.sum(GLEntry.credit)).where(
+        GLEntry.company == company,
+        GLEntry.is_cancelled == false(),
+        GLEntry.posting_date >= start,
+        GLEntry.posting_date <= end
+    ).group_by(GLEntry.account)
+    return {account: (debit or 0, credit or 0) for account, debit, credit in db.execute(stmt)}
+
+
+def _cached_sums(db: Session, company: str, start_period: Optional[date], end_period: date) -> Dict[str, Tuple[float, float]]:
+    """월 [start_period, end_period)의 계정별 차변/대변 합계를 기간 잔액에서 계산"""
+    stmt = select(
+        AccountPeriodBalance.account, func.sum(AccountPeriodBalance.debit), func.sum(AccountPeriodBalance.credit)
+    ).where(
+        AccountPeriodBalance.company == company,
+        AccountPeriodBalance.period_start < end_period
+    )
+    if start_period is not None:
+        stmt = stmt.where(AccountPeriodBalance.period_start >= start_period)
+    stmt = stmt.group_by(AccountPeriodBalance.account)
+    return {account: (debit or 0, credit or 0) for account, debit, credit in db.execute(stmt)}
+
+
+def _merge(*sums: Dict[str, Tuple[float, float]]) -> Dict[str, Tuple[float, float]]:
+    merged: Dict[str, Tuple[float, float]] = {}
+    for part in sums:
+        for account, (debit, credit) in part.items():
+            current = merged.get(account, (0.0, 0.0))
+            merged[account] = (current[0] + debit, current[1] + credit)
+    return merged
+
+
+def get_period_sums(db: Session, company: str, from_date: Optional[date], to_date: date) -> Dict[str, Tuple[float, float]]:
+    """
+    기간 [from_date, to_date]의 계정별 차변/대변 합계 (from_date가 없으면 처음부터)
+
+    온전한 월은 기간 잔액에서 읽고, 월 중간에서 시작/끝나는 경계 월만 원장 행을 합산합니다.
+    """
+    to_date = _to_date(to_date)
+    end_period = period_start_of(to_date)
+    if to_date + timedelta(days=1) == _next_period(end_period):
+        # 월말까지면 마지막 월도 기간 잔액 사용
+        end_period = _next_period(end_period)
+        tail = {}
+    else:
+        tail = None
+
+    if from_date is None:
+        start_period, head = None, {}
+    else:
+        from_date = _to_date(from_date)
+        start_period = period_start_of(from_date)
+        if from_date != start_period:
+            start_period = _next_period(start_period)
+        head = None
+
+    if start_period is not None and start_period >= end_period:
+        # 한 달 안의 기간은 원장 행만 합산
+        return _raw_sums(db, company, from_date, to_date)
+
+    if head is None:
+        head = _raw_sums(db, company, from_date, start_period - timedelta(days=1))
+    if tail is None:
+        tail = _raw_sums(db, company, end_period, to_date)
+    return _merge(head, _cached_sums(db, company, start_period, end_period), tail)
+
+
+def _account_rows(db: Session, company: str) -> List[Any]:
+    stmt = select(
+        Account.name, Account.account_name, Account.parent_account, Account.root_type,
+        Account.is_group, Account.lft
+    ).where(Account.company == company).order_by(Account.lft, Account.name)
+    return db.execute(stmt).all()
+
+
+def get_trial_balance(db: Session, company: str, from_date: date, to_date: date) -> List[Dict[str, Any]]:
+    """
+    시산표 (계정별 기초/기간 차변·대변/기말, 그룹 계정은 하위 계정 합계)
+
+    ERPNext와 같이 자산/부채/자본 계정의 기초 잔액은 from_date 이전 누계이고,
+    수익/비용 계정의 기초 잔액은 from_date가 속한 회계연도 시작일부터의 누계입니다 (회계연도마다 0부터 시작).
+    """
+    from_date, to_date = _to_date(from_date), _to_date(to_date)
+    accounts = _account_rows(db, company)
+    root_types = {row.name: row.root_type for row in accounts}
+
+    balance_sheet_opening = get_period_sums(db, company, None, from_date - timedelta(days=1))
+    year_start = fiscal_year_start_of(from_date)
+    if year_start < from_date:
+        profit_and_loss_opening = get_period_sums(db, company, year_start, from_date - timedelta(days=1))
+    else:
+        profit_and_loss_opening = {}
+    opening = {
+        account: values for account, values in balance_sheet_opening.items()
+        if root_types.get(account) not in PROFIT_AND_LOSS_ROOT_TYPES
+    }
+    opening.update(
+        (account, values) for account, values in profit_and_loss_opening.items()
+        if root_types.get(account) in PROFIT_AND_LOSS_ROOT_TYPES
+    )
+    period = get_period_sums(db, company, from_date, to_date)
+
+    names = [row.name for row in accounts]
+    totals = {
+        key: rollup(db, Account, {account: values[index] for account, values in source.items()}, names)
+        for key, source, index in (
+            ('opening', opening, 0), ('opening_credit', opening, 1),
+            ('debit', period, 0), ('credit', period, 1),
+        )
+    }
+
+    rows = []
+    for account in accounts:
+        opening_balance = totals['opening'].get(account.name, 0) - totals['opening_credit'].get(account.name, 0)
+        debit = totals['debit'].get(account.name, 0)
+        credit = totals['credit'].get(account.name, 0)
+        rows.append({
+            "account": account.name,
+            "account_name": account.account_name,
+            "parent_account": account.parent_account,
+            "root_type": account.root_type,
+            "is_group": bool(account.is_group),
+            "opening_debit": max(opening_balance, 0),
+            "opening_credit": max(-opening_balance, 0),
+            "debit": debit,
+            "credit": credit,
+            "closing_debit": max(opening_balance + debit - credit, 0),
+            "closing_credit": max(-(opening_balance + debit - credit), 0),
+        })
+    return rows
+
+
+def get_profit_and_loss(db: Session, company: str, from_date: date, to_date: date) -> Dict[str, Any]:
+    """손익계산서 (수익은 대변-차변, 비용은 차변-대변, 그룹 계정은 하위 계정 합계)"""
+    period = get_period_sums(db, company, from_date, to_date)
+    accounts = [row for row in _account_rows(db, company) if row.root_type in PROFIT_AND_LOSS_ROOT_TYPES]
+    root_types = {row.name: row.root_type for row in accounts}
+
+    amounts = {}
+    for account, (debit, credit) in period.items():
+        root_type = root_types.get(account)
+        if root_type == 'Income':
+            amounts[account] = credit - debit
+        elif root_type == 'Expense':
+            amounts[account] = debit - credit
+    totals = rollup(db, Account, amounts, [row.name for row in accounts])
+
+    income = sum(amount for account, amount in amounts.items() if root_types[account] == 'Income')
+    expense = sum(amount for account, amount in amounts.items() if root_types[account] == 'Expense')
+    return {
+        "income": [
+            {"account": row.name, "account_name": row.account_name, "is_group": bool(row.is_group),
+             "amount": totals.get(row.name, 0)}
+            for row in accounts if row.root_type == 'Income'
+        ],
+        "expense": [
+            {"account": row.name, "account_name": row.account_name, "is_group": bool(row.is_group),
+             "amount": totals.get(row.name, 0)}
+            for row in accounts if row.root_type == 'Expense'
+        ],
+        "total_income": income,
+        "total_expense": expense,
+        "net_profit": income - expense,
+    }
+
+
+def rebuild_period_balances(db: Session, company: Optional[str] = None) -> int:
+    """
+    원장에서 기간 잔액 일괄 재계산 (회사를 지정하면 해당 회사만)
+
+    유효한 원장 행을 (계정, 회사, 전기일)별로 합산한 뒤 월 단위로 묶어 다중 행 INSERT로 다시 기록합니다.
+    """
+    stmt = select(
+        GLEntry.account, GLEntry.company, GLEntry.posting_date, func.sum(GLEntry.debit), func.sum(GLEntry.credit)
+    ).where(GLEntry.is_cancelled == false())
+    if company:
+        stmt = stmt.where(GLEntry.company == company)
+    stmt = stmt.group_by(GLEntry.account, GLEntry.company, GLEntry.posting_date)
+
+    sums: Dict[Tuple[str, str, date], List[float]] = {}
+    for account, row_company, posting_date, debit, credit in db.execute(stmt):
+        key = (account, row_company, period_start_of(posting_date))
+        current = sums.setdefault(key, [0.0, 0.0])
+        current[0] += debit or 0
+        current[1] += credit or 0
+
+    scope = delete(AccountPeriodBalance)
+    if company:
+        scope = scope.where(AccountPeriodBalance.company == company)
+
+    now = datetime.utcnow()
+    rows = [
+        {
+            "name": uuid.uuid4().hex[:10], "account": account, "company": row_company, "period_start": period_start,
+            "debit": debit, "credit": credit, "creation": now, "modified": now, "docstatus": 0,
+        }
+        for (account, row_company, period_start), (debit, credit) in sums.items()
+    ]
+
+    try:
+        db.execute(scope)
+        for chunk in chunks(rows):
+            db.execute(insert(AccountPeriodBalance), chunk)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return len(rows)
+
+
+# GL Entry DocType 메타데이터
+gl_entry_meta = DocTypeMeta({
+    "name": "GL Entry",
+    "module": "Accounts",
+    "search_fields": ["account", "voucher_no", "party"],
+    "sort_field": "posting_date",
+    "sort_order": "DESC",
+    "is_read_only": 1,
+    "fields": [
+        {
+            "fieldname": "posting_date",
+            "fieldtype": "Date",
+            "label": "전기일자",
+            "reqd": 1
+        },
+        {
+            "fieldname": "account",
+            "fieldtype": "Link",
+            "label": "계정",
+            "options": "Account",
+            "reqd": 1
+        },
+        {
+            "fieldname": "party_type",
+            "fieldtype": "Data",
+            "label": "거래처 유형"
+        },
+        {
+            "fieldname": "party",
+            "fieldtype": "Data",
+            "label": "거래처"
+        },
+        {
+            "fieldname": "debit",
+            "fieldtype": "Currency",
+            "label": "차변",
+            "precision": 2,
+            "read_only": 1
+        },
+        {
+            "fieldname": "credit",
+            "fieldtype": "Currency",
+            "label": "대변",
+            "precision": 2,
+            "read_only": 1
+        },
+        {
+            "fieldname": "voucher_type",
+            "fieldtype": "Data",
+            "label": "전표 유형",
+            "reqd": 1
+        },
+        {
+            "fieldname": "voucher_no",
+            "fieldtype": "Data",
+            "label": "전표 번호",
+            "reqd": 1
+        },
+        {
+            "fieldname": "company",
+            "fieldtype": "Link",
+            "label": "회사",
+            "options": "Company",
+            "reqd": 1
+        },
+        {
+            "fieldname": "is_cancelled",
+            "fieldtype": "Check",
+            "label": "취소됨",
+            "read_only": 1
+        }
+    ],
+    "permissions": [
+        {
+            "role": "Accounts User",
+            "read": 1
+        },
+        {
+            "role": "Accounts Manager",
+            "read": 1
+        }
+    ]
+})
+
+# Account Period Balance DocType 메타데이터
+account_period_balance_meta = DocTypeMeta({
+    "name": "Account Period Balance",
+    "module": "Accounts",
+    "search_fields": ["account"],
+    "sort_field": "period_start",
+    "sort_order": "DESC",
+    "is_read_only": 1,
+    "fields": [
+        {
+            "fieldname": "account",
+            "fieldtype": "Link",
+            "label": "계정",
+            "options": "Account",
+            "reqd": 1
+        },
+        {
+            "fieldname": "company",
+            "fieldtype": "Link",
+            "label": "회사",
+            "options": "Company",
+            "reqd": 1
+        },
+        {
+            "fieldname": "period_start",
+            "fieldtype": "Date",
+            "label": "기간 시작일",
+            "reqd": 1
+        },
+        {
+            "fieldname": "debit",
+            "fieldtype": "Currency",
+            "label": "차변 합계",
+            "precision": 2,
+            "read_only": 1
+        },
+        {
+            "fieldname": "credit",
+            "fieldtype": "Currency",
+            "label": "대변 합계",
+            "precision": 2,
+            "read_only": 1
+        }
+    ],
+    "permissions": [
+        {
+            "role": "Accounts User",
+            "read": 1
+        },
+        {
+            "role": "Accounts Manager",
+            "read": 1
+        }
+    ]
+})
+
+# DocType 등록
+register_doctype("GL Entry", gl_entry_meta, GLEntry)
+register_doctype("Account Period Balance", account_period_balance_meta, AccountPeriodBalance)
@@ -41,6 +41,7 @@ class Item(DocTypeBase, Base):
     reorder_level = Column(Float, default=0)
     reorder_qty = Column(Float, default=0)
     min_order_qty = Column(Float, default=0)
+    default_supplier = Column(String(140))  # 재주문 시 구매주문을 낼 공급업체
     max_discount = Column(Float, default=0)
     
     # 판매 설정
@@ -209,6 +210,12 @@ item_meta = DocTypeMeta({
             "precision": 2,
             "default": 0
         },
+        {
+            "fieldname": "default_supplier",
+            "fieldtype": "Link",
+            "label": "기본 공급업체",
+            "options": "Supplier"
+        },
         {
             "fieldname": "is_sales_item",
             "fieldtype": "Check",
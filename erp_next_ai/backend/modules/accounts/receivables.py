@@ -0,0 +1,246 @@
+"""
+매출채권 연령 분석 (Accounts Receivable Ageing)
+제출된 판매송장의 미수금을 고객별 0-30/31-60/61-90/90+일 구간으로 집계합니다.
+
+- 구간 경계를 기준일에서 날짜로 계산해 SUM(CASE ...) + GROUP BY customer 한 번으로 집계
+  (판매송장의 (company, docstatus, customer, due_date, posting_date, outstanding_amount) 커버링 인덱스 사용)
+- 결과는 (회사, 기준일, 기준 날짜 필드)별로 고객 단위 캐시에 보관하고,
+  판매송장이 저장/삭제되면 해당 고객 행만 무효화해 다음 조회 때 그 고객들만 다시 집계
+"""
+import threading
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from core.doctype.base import DOCTYPE_NAMES, get_doctype_model, pop_previous_values, register_doc_event
+from core.doctype.chunks import chunks
+
+# 연령 구간 상한(일), 마지막 구간은 그 이상
+AGEING_RANGES = (30, 60, 90)
+BUCKET_LABELS = ("0-30", "31-60", "61-90", "90+")
+AGEING_BASES = ('due_date', 'posting_date')
+
+# 보관할 (회사, 기준일, 기준 필드) 조합 수
+MAX_CACHED_REPORTS = 32
+
+
+def _aging_statement(model, company: str, report_date: date, ageing_based_on: str):
+    """고객별 구간 합계 SELECT (구간 경계는 기준일에서 뺀 날짜로 비교)"""
+    if ageing_based_on == 'due_date':
+        ageing_date = func.coalesce(model.due_date, model.posting_date)
+    else:
+        ageing_date = model.posting_date
+
+    bounds = [report_date - timedelta(days=days) for days in AGEING_RANGES]
+    bucket = case(
+        (ageing_date >= bounds[0], 0),
+        (ageing_date >= bounds[1], 1),
+        (ageing_date >= bounds[2], 2),
+        else_=3
+    )
+    columns = [
+        func.sum(case((bucket == index, model.outstanding_amount), else_=0)).label(f"range{index}")
+        for index in range(len(BUCKET_LABELS))
+    ]
+    return select(
+        model.customer,
+        *columns,
+        func.sum(model.outstanding_amount).label("total"),
+        func.count().label("invoice_count")
+    ).where(
+        model.company == company,
+        model.docstatus == 1,
+        model.outstanding_amount > 0,
+        model.posting_date <= report_date
+    ).group_by(model.customer)
+
+
+def compute_aging(
+    db: Session,
+    company: str,
+    report_date: date,
+    ageing_based_on: str = 'due_date',
+    customers: Optional[List[str]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """고객별 연령 구간 집계 (customers를 주면 해당 고객만)"""
+    model = get_doctype_model("Sales Invoice")
+    stmt = _aging_statement(model, company, report_date, ageing_based_on)
+
+    rows = {}
+    batches = chunks(customers) if customers is not None else [None]
+    for batch in batches:
+        batch_stmt = stmt if batch is None else stmt.where(model.customer.in_(batch))
+        for row in db.execute(batch_stmt):
+            rows[row.customer] = {
+                "customer": row.customer,
+                **{label: row[index + 1] or 0 for index, label in enumerate(BUCKET_LABELS)},
+                "total": row.total or 0,
+                "invoice_count": row.invoice_count,
+            }
+    return rows
+
+
+class AgingCache:
+    """
+    (회사, 기준일, 기준 필드)별 고객 단위 집계 캐시
+
+    무효화마다 버전을 올리고 고객별 마지막 무효화 버전을 기록해, 집계 도중 다시 무효화된
+    고객의 결과는 저장하지 않습니다.
+    """
+
+    def __init__(self, max_reports: int = MAX_CACHED_REPORTS):
+        self.max_reports = max_reports
+        self._reports: 'OrderedDict[Tuple[str, date, str], Dict[str, Dict[str, Any]]]' = OrderedDict()
+        self._stale: Dict[Tuple[str, date, str], Set[str]] = {}
+        self._version = 0
+        self._invalidated_at: Dict[str, int] = {}
+        self._cleared_at = 0
+        self._lock = threading.Lock()
+
+    def get(self, key) -> Tuple[Optional[Dict[str, Dict[str, Any]]], Set[str], int]:
+        """캐시된 행, 다시 집계해야 할 고객, 현재 버전 (캐시가 없으면 행은 None)"""
+        with self._lock:
+            rows = self._reports.get(key)
+            if rows is None:
+                return None, set(), self._version
+            self._reports.move_to_end(key)
+            return dict(rows), set(self._stale.get(key, ())), self._version
+
+    def put(self, key, rows: Dict[str, Dict[str, Any]], version: int, refreshed: Optional[Set[str]] = None):
+        """
+        집계 결과 저장
+
+        refreshed가 없으면 전체 결과, 있으면 해당 고객만 다시 집계한 결과입니다.
+        version 이후 무효화된 고객은 저장하지 않고 다시 집계 대상으로 남깁니다.
+        """
+        with self._lock:
+            if version < self._cleared_at:
+                # 집계 도중 전체 무효화됨
+                return
+            if refreshed is None:
+                report = self._reports[key] = {}
+                stale = self._stale[key] = set()
+                customers = set(rows)
+            else:
+                report = self._reports.get(key)
+                if report is None:
+                    return
+                stale = self._stale.setdefault(key, set())
+                customers = refreshed
+
+            for customer in customers:
+                if self._invalidated_at.get(customer, 0) > version:
+                    stale.add(customer)
+                    report.pop(customer, None)
+                    continue
+                stale.discard(customer)
+                if customer in rows:
+                    report[customer] = rows[customer]
+                else:
+                    report.pop(customer, None)
+
+            if refreshed is None:
+                # 전체 집계 도중 무효화된 고객 (집계 결과에 없던 고객 포함)
+                stale.update(
+                    customer for customer, invalidated in self._invalidated_at.items() if invalidated > version
+                )
+
+            self._reports.move_to_end(key)
+            while len(self._reports) > self.max_reports:
+                old_key, _ = self._reports.popitem(last=False)
+                self._stale.pop(old_key, None)
+
+    def invalidate(self, customers: Iterable[str]):
+        """고객들의 캐시 행 무효화"""
+        customers = set(customers)
+        if not customers:
+            return
+        with self._lock:
+            self._version += 1
+            for customer in customers:
+                self._invalidated_at[customer] = self._version
+            for key, report in self._reports.items():
+                for customer in customers:
+                    report.pop(customer, None)
+                self._stale.setdefault(key, set()).update(customers)
+
+    def clear(self):
+        with self._lock:
+            self._version += 1
+            self._cleared_at = self._version
+            self._reports.clear()
+            self._stale.clear()
+
+
+aging_cache = AgingCache()
+
+
+def get_receivables_aging(
+    db: Session,
+    company: str,
+    report_date: Optional[date] = None,
+    ageing_based_on: str = 'due_date',
+    customer: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    매출채권 연령 분석 보고서
+
+    캐시가 있으면 무효화된 고객만 다시 집계해 합치고, 없으면 전체를 한 번에 집계합니다.
+    """
+    if ageing_based_on not in AGEING_BASES:
+        raise ValueError(f"연령 기준은 {', '.join(AGEING_BASES)} 중 하나여야 합니다.")
+    report_date = report_date or date.today()
+    key = (company, report_date, ageing_based_on)
+
+    rows, stale, version = aging_cache.get(key)
+    if rows is None:
+        rows = compute_aging(db, company, report_date, ageing_based_on)
+        aging_cache.put(key, rows, version)
+    elif stale:
+        fresh = compute_aging(db, company, report_date, ageing_based_on, sorted(stale))
+        for name in stale:
+            rows.pop(name, None)
+        rows.update(fresh)
+        aging_cache.put(key, fresh, version, refreshed=stale)
+
+    data = sorted(rows.values(), key=lambda row: row["customer"] or "")
+    if customer:
+        data = [row for row in data if row["customer"] == customer]
+
+    totals = {label: sum(row[label] for row in data) for label in BUCKET_LABELS}
+    totals["total"] = sum(row["total"] for row in data)
+    return {
+        "company": company,
+        "report_date": report_date,
+        "ageing_based_on": ageing_based_on,
+        "ranges": list(BUCKET_LABELS),
+        "data": data,
+        "totals": totals,
+    }
+
+
+def _is_sales_invoice(model_class) -> bool:
+    return DOCTYPE_NAMES.get(model_class) == "Sales Invoice"
+
+
+def on_invoice_save(model_class, db: Session, names: List[str]):
+    """저장된 판매송장의 고객과, 고객이 바뀐 송장의 이전 고객 캐시 무효화"""
+    if not _is_sales_invoice(model_class):
+        return
+    customers = pop_previous_values(db, model_class, 'customer')
+    for chunk in chunks(list(names)):
+        customers.update(db.execute(select(model_class.customer).where(model_class.name.in_(chunk))).scalars())
+    aging_cache.invalidate(customers)
+
+
+def on_invoice_delete(model_class, db: Session, names: List[str]):
+    """삭제된 송장은 고객을 알 수 없으므로 전체 캐시를 비움"""
+    if _is_sales_invoice(model_class):
+        aging_cache.clear()
+
+
+register_doc_event('after_save', on_invoice_save)
+register_doc_event('after_delete', on_invoice_delete)
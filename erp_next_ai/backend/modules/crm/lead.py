@@ -4,6 +4,7 @@ ERPNext의 Lead와 동일한 구조
 """
 from sqlalchemy import Column, String, Integer, Float, Text, Boolean, DateTime, Date
 from core.doctype.base import DocTypeBase, Base, DocTypeMeta, register_doctype
+from core.doctype.validation import is_valid_email
 from datetime import datetime
 
 
@@ -71,9 +72,7 @@ class Lead(DocTypeBase, Base):
         
         # 이메일 유효성 검사
         if self.email_id:
-            import re
-            email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-            if not re.match(email_pattern, self.email_id):
+            if not is_valid_email(self.email_id):
                 errors.append("올바른 이메일 주소를 입력하세요.")
         
         # 조직 리드인 경우 회사명 필수
@@ -132,9 +131,7 @@ class Opportunity(DocTypeBase, Base):
         
         # 이메일 유효성 검사
         if self.contact_email:
-            import re
-            email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-            if not re.match(email_pattern, self.contact_email):
+            if not is_valid_email(self.contact_email):
                 errors.append("올바른 이메일 주소를 입력하세요.")
         
         return errors
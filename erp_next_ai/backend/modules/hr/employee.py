@@ -4,6 +4,8 @@ ERPNext의 Employee와 동일한 구조
 """
 from sqlalchemy import Column, String, Integer, Float, Text, Boolean, DateTime, Date
 from core.doctype.base import DocTypeBase, Base, DocTypeMeta, register_doctype
+from core.doctype.validation import is_valid_email
+from modules.hr.org_chart import check_reports_to_cycle
 from datetime import datetime
 
 
@@ -89,12 +91,18 @@ class Employee(DocTypeBase, Base):
         
         # 이메일 유효성 검사
         if self.personal_email:
-            import re
-            email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-            if not re.match(email_pattern, self.personal_email):
+            if not is_valid_email(self.personal_email):
                 errors.append("올바른 이메일 주소를 입력하세요.")
         
+        # 상급자 검증
+        if self.reports_to and self.reports_to == self.name:
+            errors.append("자기 자신을 상급자로 지정할 수 없습니다.")
+        
         return errors
+    
+    def on_update(self, db):
+        super().on_update(db)
+        check_reports_to_cycle(db, self.name, self.reports_to)
 
 
 class Attendance(DocTypeBase, Base):
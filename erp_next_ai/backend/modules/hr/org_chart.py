@@ -0,0 +1,303 @@
+"""
+조직도 인덱스 (Employee.reports_to)
+회사별로 직원의 상급자 관계를 쿼리 한 번으로 읽어 재직 직원의 메모리 트리로 만들고 캐시합니다.
+
+- 트리를 전위 순회하며 직원마다 진입/이탈 번호(tin/tout)를 매겨, 하위 조직 전체가
+  순회 순서 목록의 연속 구간이 되도록 함 (인원 수와 포함 여부는 O(1), 목록은 구간 슬라이스)
+- 부서별로 직원의 순회 번호를 정렬해 두고 이진 탐색으로 하위 조직의 부서별 인원을 계산 (부서당 O(log n))
+- 직원이 저장/삭제되면 해당 회사 인덱스만 버리고 다음 조회 때 다시 만듦
+"""
+import threading
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from core.doctype.base import DOCTYPE_NAMES, get_doctype_model, register_doc_event
+from core.doctype.chunks import chunks
+
+# 인덱스에 포함하는 재직 상태
+ACTIVE_STATUS = 'Active'
+
+
+def check_reports_to_cycle(db: Session, employee: str, reports_to: Optional[str]):
+    """상급자를 따라 올라가며 자기 자신에 닿으면 ValueError (단계마다 조회 한 번)"""
+    employee_model = get_doctype_model("Employee")
+    seen = {employee}
+    chain = [employee]
+    current = reports_to
+    while current:
+        chain.append(current)
+        if current in seen:
+            raise ValueError(f"상급자 관계에 순환이 있습니다: {' → '.join(chain)}")
+        seen.add(current)
+        current = db.execute(select(employee_model.reports_to).where(employee_model.name == current)).scalar()
+
+
+class OrgChart:
+    """
+    회사 하나의 재직 직원 조직 트리
+
+    상급자가 퇴직/비활성 직원이면 그 위의 가장 가까운 재직 상급자 아래에 두고,
+    상급자가 없거나 다른 회사 직원이면 최상위로 둡니다.
+    """
+
+    def __init__(self, company: str, rows: Iterable[Any], inactive: Optional[Dict[str, Optional[str]]] = None):
+        self.company = company
+        self.info: Dict[str, Dict[str, Any]] = {}
+        self.parent: Dict[str, Optional[str]] = {}
+        self.children: Dict[Optional[str], List[str]] = {}
+
+        rows = list(rows)
+        names = {row.name for row in rows}
+        inactive = inactive or {}
+        for row in rows:
+            parent = row.reports_to
+            skipped = set()
+            while parent in inactive and parent not in skipped:
+                skipped.add(parent)
+                parent = inactive[parent]
+            if parent not in names or parent == row.name:
+                parent = None
+            self.parent[row.name] = parent
+            self.children.setdefault(parent, []).append(row.name)
+            self.info[row.name] = {
+                "employee": row.name,
+                "employee_name": row.employee_name,
+                "department": row.department,
+                "designation": row.designation,
+                "reports_to": parent,
+            }
+
+        self.order: List[str] = []
+        self.tin: Dict[str, int] = {}
+        self.tout: Dict[str, int] = {}
+        for root in self.children.get(None, []):
+            self._number_from(root)
+        # 순환으로 최상위에 닿지 않는 직원은 최상위로 취급
+        for row in rows:
+            if row.name not in self.tin:
+                self.parent[row.name] = None
+                self.info[row.name]["reports_to"] = None
+                self._number_from(row.name)
+
+        self.department_positions: Dict[Optional[str], List[int]] = {}
+        for position, name in enumerate(self.order):
+            self.department_positions.setdefault(self.info[name]["department"], []).append(position)
+
+    def _number_from(self, root: str):
+        self.tin[root] = len(self.order)
+        self.order.append(root)
+        stack = [(root, iter(self.children.get(root, [])))]
+        while stack:
+            node, pending = stack[-1]
+            child = next((child for child in pending if child not in self.tin), None)
+            if child is None:
+                self.tout[node] = len(self.order)
+                stack.pop()
+                continue
+            self.tin[child] = len(self.order)
+            self.order.append(child)
+            stack.append((child, iter(self.children.get(child, []))))
+
+    def __contains__(self, employee: str) -> bool:
+        return employee in self.tin
+
+    def _require(self, employee: str):
+        if employee not in self.tin:
+            raise ValueError(f"조직도에 없는 직원입니다: {employee}")
+
+    def subtree_size(self, employee: str, include_self: bool = False) -> int:
+        self._require(employee)
+        size = self.tout[employee] - self.tin[employee]
+        return size if include_self else size - 1
+
+    def is_under(self, employee: str, manager: str) -> bool:
+        """employee가 manager의 하위 조직(자신 제외)에 속하는지"""
+        if employee not in self.tin or manager not in self.tin or employee == manager:
+            return False
+        return self.tin[manager] < self.tin[employee] < self.tout[manager]
+
+    def subordinates(self, employee: str, include_self: bool = False) -> List[str]:
+        """하위 조직 전체 (조직도 순서)"""
+        self._require(employee)
+        start = self.tin[employee] if include_self else self.tin[employee] + 1
+        return self.order[start:self.tout[employee]]
+
+    def direct_reports(self, employee: str) -> List[str]:
+        self._require(employee)
+        return list(self.children.get(employee, []))
+
+    def ancestors(self, employee: str) -> List[str]:
+        """최상위부터 직속 상급자까지"""
+        self._require(employee)
+        chain = []
+        current = self.parent[employee]
+        while current is not None:
+            chain.append(current)
+            current = self.parent[current]
+        chain.reverse()
+        return chain
+
+    def headcount_by_department(self, manager: Optional[str] = None) -> Dict[str, int]:
+        """부서별 인원 (manager를 주면 그 직원을 포함한 하위 조직만)"""
+        if manager is None:
+            start, end = 0, len(self.order)
+        else:
+            self._require(manager)
+            start, end = self.tin[manager], self.tout[manager]
+
+        counts = {}
+        for department, positions in self.department_positions.items():
+            count = bisect_left(positions, end) - bisect_left(positions, start)
+            if count:
+                counts[department or ""] = count
+        return counts
+
+
+def build_org_chart(db: Session, company: str) -> OrgChart:
+    employee_model = get_doctype_model("Employee")
+    rows = db.execute(select(
+        employee_model.name, employee_model.employee_name, employee_model.reports_to,
+        employee_model.department, employee_model.designation, employee_model.status, employee_model.disabled
+    ).where(employee_model.company == company).order_by(employee_model.employee_name, employee_model.name)).all()
+
+    active = [row for row in rows if (row.status or ACTIVE_STATUS) == ACTIVE_STATUS and not row.disabled]
+    active_names = {row.name for row in active}
+    inactive = {row.name: row.reports_to for row in rows if row.name not in active_names}
+    return OrgChart(company, active, inactive)
+
+
+class OrgChartCache:
+    """
+    회사별 조직도 캐시 (직원이 바뀌면 해당 회사 조직도를 버림)
+
+    조직도 구성(쿼리)은 잠금 밖에서 하고 잠금은 캐시에 넣을 때만 잡습니다
+    (run_sync는 이벤트 루프 스레드에서 실행되므로 잠금을 잡은 채 I/O를 기다리면 교착 상태).
+    구성 도중 그 회사나 조직도에 든 직원이 무효화되었으면 결과를 캐시하지 않습니다.
+    """
+
+    def __init__(self):
+        self._charts: Dict[str, OrgChart] = {}
+        self._building: Dict[str, List[List[Any]]] = {}  # 회사 → 구성 중인 요청별 [무효화 여부, 바뀐 직원]
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, company: str) -> OrgChart:
+        with self._lock:
+            chart = self._charts.get(company)
+            if chart is not None:
+                return chart
+            pending = [False, set()]
+            self._building.setdefault(company, []).append(pending)
+
+        try:
+            chart = build_org_chart(db, company)
+        except BaseException:
+            with self._lock:
+                self._release(company, pending)
+            raise
+
+        with self._lock:
+            self._release(company, pending)
+            invalidated, employees = pending
+            if not invalidated and not any(employee in chart for employee in employees):
+                chart = self._charts.setdefault(company, chart)
+        return chart
+
+    def _release(self, company: str, pending: List[Any]):
+        building = self._building.get(company, [])
+        for index, item in enumerate(building):
+            if item is pending:
+                del building[index]
+                break
+        if not building:
+            self._building.pop(company, None)
+
+    def invalidate(self, companies: Iterable[str] = (), employees: Iterable[str] = ()):
+        """지정한 회사와, 지정한 직원이 들어 있는 회사의 조직도 삭제"""
+        employees = set(employees)
+        with self._lock:
+            targets = set(companies)
+            targets.update(
+                company for company, chart in self._charts.items()
+                if any(employee in chart for employee in employees)
+            )
+            for company in targets:
+                self._charts.pop(company, None)
+            for company, building in self._building.items():
+                for pending in building:
+                    pending[0] = pending[0] or company in targets
+                    pending[1].update(employees)
+
+    def clear(self):
+        with self._lock:
+            self._charts.clear()
+            for building in self._building.values():
+                for pending in building:
+                    pending[0] = True
+
+
+org_chart_cache = OrgChartCache()
+
+
+def get_org_chart(db: Session, company: str) -> OrgChart:
+    return org_chart_cache.get(db, company)
+
+
+def _chart_for_employee(db: Session, employee: str) -> OrgChart:
+    employee_model = get_doctype_model("Employee")
+    company = db.execute(select(employee_model.company).where(employee_model.name == employee)).scalar()
+    if company is None:
+        raise ValueError(f"직원을 찾을 수 없습니다: {employee}")
+    chart = get_org_chart(db, company)
+    chart._require(employee)
+    return chart
+
+
+def get_subordinates(db: Session, employee: str, include_self: bool = False) -> List[str]:
+    """직원 아래 전체 하위 조직 (결재/보고 범위용)"""
+    return _chart_for_employee(db, employee).subordinates(employee, include_self)
+
+
+def get_reporting_chain(db: Session, employee: str) -> List[str]:
+    """최상위부터 직속 상급자까지의 상급자 체인"""
+    return _chart_for_employee(db, employee).ancestors(employee)
+
+
+def get_org_summary(db: Session, employee: str) -> Dict[str, Any]:
+    """직원의 상급자 체인, 직속/전체 하위 조직, 하위 조직 부서별 인원"""
+    chart = _chart_for_employee(db, employee)
+    return {
+        **chart.info[employee],
+        "company": chart.company,
+        "reporting_chain": [chart.info[name] for name in chart.ancestors(employee)],
+        "direct_reports": [chart.info[name] for name in chart.direct_reports(employee)],
+        "subordinates": chart.subordinates(employee),
+        "subordinate_count": chart.subtree_size(employee),
+        "headcount_by_department": chart.headcount_by_department(employee),
+    }
+
+
+def get_department_headcount(db: Session, company: str, manager: Optional[str] = None) -> Dict[str, int]:
+    """회사(또는 관리자 하위 조직)의 부서별 재직 인원"""
+    return get_org_chart(db, company).headcount_by_department(manager)
+
+
+def on_employee_save(model_class, db: Session, names: List[str]):
+    """저장된 직원의 현재 회사와 캐시에 들어 있던 회사(회사 이동)의 조직도 삭제"""
+    if DOCTYPE_NAMES.get(model_class) != "Employee":
+        return
+    companies = set()
+    for chunk in chunks(names):
+        companies.update(db.execute(select(model_class.company).where(model_class.name.in_(chunk))).scalars())
+    org_chart_cache.invalidate(companies, names)
+
+
+def on_employee_delete(model_class, db: Session, names: List[str]):
+    if DOCTYPE_NAMES.get(model_class) == "Employee":
+        org_chart_cache.invalidate(employees=names)
+
+
+register_doc_event('after_save', on_employee_save)
+register_doc_event('after_delete', on_employee_delete)
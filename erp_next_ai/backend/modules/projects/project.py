@@ -2,8 +2,12 @@
 프로젝트(Project) DocType 정의
 ERPNext의 Project와 동일한 구조
 """
-from sqlalchemy import Column, String, Integer, Float, Text, Boolean, DateTime, Date
-from core.doctype.base import DocTypeBase, Base, DocTypeMeta, register_doctype
+from sqlalchemy import Column, String, Integer, Float, Text, Boolean, DateTime, Date, select
+from core.doctype.base import DocTypeBase, Base, DocTypeMeta, register_doctype, delete_child_rows
+from modules.projects.rollup import (
+    get_timesheet_links, update_project_rollups, update_rollups_for_timesheets, update_task_rollups
+)
+from modules.projects.scheduling import check_dependency_cycle
 from datetime import datetime
 
 
@@ -43,6 +47,9 @@ class Project(DocTypeBase, Base):
     total_billed_amount = Column(Float, default=0)
     total_expense_claim = Column(Float, default=0)
     
+    # 실제 시간 (제출된 근무시간 합계)
+    actual_time = Column(Float, default=0)
+    
     # 진행률
     percent_complete = Column(Float, default=0)
     percent_complete_method = Column(String(50), default='Manual')
@@ -74,6 +81,11 @@ class Project(DocTypeBase, Base):
             errors.append("진행률은 0-100 사이의 값이어야 합니다.")
         
         return errors
+    
+    def on_update(self, db):
+        # 진행률 계산 방법이 바뀌었을 수 있으므로 다시 집계
+        super().on_update(db)
+        update_project_rollups(db, [self.name])
 
 
 class Task(DocTypeBase, Base):
@@ -105,9 +117,10 @@ class Task(DocTypeBase, Base):
     duration = Column(Float, default=0)  # in hours
     expected_time = Column(Float, default=0)
     actual_time = Column(Float, default=0)
+    task_weight = Column(Float, default=0)  # 프로젝트 진행률(Task Weight) 가중치
     
-    # 의존성
-    depends_on = Column(String(140))  # 의존하는 작업
+    # 의존성 (여러 작업은 depends_on_tasks 자식 테이블, depends_on은 기존 단일 의존 필드)
+    depends_on = Column(String(140))
     
     # 회사 정보
     company = Column(String(140))
@@ -135,6 +148,46 @@ class Task(DocTypeBase, Base):
             errors.append("진행률은 0-100 사이의 값이어야 합니다.")
         
         return errors
+    
+    def before_save(self, db):
+        # 프로젝트가 바뀌면 이전 프로젝트도 다시 집계
+        with db.no_autoflush:
+            self.__dict__['_previous_project'] = db.execute(
+                select(Task.project).where(Task.name == self.name)
+            ).scalar()
+    
+    def on_update(self, db):
+        super().on_update(db)
+        depends_on = [row.task for row in self.get_child_docs(db, 'depends_on_tasks') if row.task]
+        if self.depends_on:
+            depends_on.append(self.depends_on)
+        check_dependency_cycle(db, self.name, depends_on)
+        
+        projects = update_task_rollups(db, [self.name])
+        projects.add(self.__dict__.pop('_previous_project', None))
+        update_project_rollups(db, projects)
+    
+    def on_trash(self, db):
+        super().on_trash(db)
+        update_project_rollups(db, [self.project], exclude_tasks=[self.name])
+
+
+class TaskDependsOn(DocTypeBase, Base):
+    """작업 의존성 (선행 작업)"""
+    
+    __tablename__ = 'tabTaskDependsOn'
+    
+    # 부모 문서 연결
+    parent = Column(String(140), nullable=False, index=True)
+    parenttype = Column(String(50), default='Task')
+    
+    # 선행 작업
+    task = Column(String(140), nullable=False, index=True)
+    subject = Column(String(140))
+    project = Column(String(140))
+    
+    def get_required_fields(self):
+        return ['task']
 
 
 class Timesheet(DocTypeBase, Base):
@@ -176,6 +229,23 @@ class Timesheet(DocTypeBase, Base):
             errors.append("종료일은 시작일보다 늦어야 합니다.")
         
         return errors
+    
+    def before_save(self, db):
+        # 상세 행 교체 전 연결된 작업/프로젝트 (행이 빠진 작업/프로젝트도 다시 집계)
+        with db.no_autoflush:
+            self.__dict__['_previous_links'] = get_timesheet_links(db, [self.name])
+    
+    def on_update(self, db):
+        super().on_update(db)
+        previous_tasks, previous_projects = self.__dict__.pop('_previous_links', (set(), set()))
+        tasks, projects = get_timesheet_links(db, [self.name])
+        update_rollups_for_timesheets(db, (tasks | previous_tasks, projects | previous_projects))
+    
+    def on_trash(self, db):
+        super().on_trash(db)
+        links = get_timesheet_links(db, [self.name])
+        delete_child_rows(db, Timesheet, [self.name])
+        update_rollups_for_timesheets(db, links)
 
 
 class TimesheetDetail(DocTypeBase, Base):
@@ -184,7 +254,7 @@ class TimesheetDetail(DocTypeBase, Base):
     __tablename__ = 'tabTimesheetDetail'
     
     # 부모 문서 연결
-    parent = Column(String(140), nullable=False)
+    parent = Column(String(140), nullable=False, index=True)
     parenttype = Column(String(50), default='Timesheet')
     
     # 활동 정보
@@ -193,9 +263,9 @@ class TimesheetDetail(DocTypeBase, Base):
     to_time = Column(DateTime, nullable=False)
     hours = Column(Float, nullable=False, default=0)
     
-    # 프로젝트/작업 연결
-    project = Column(String(140))
-    task = Column(String(140))
+    # 프로젝트/작업 연결 (작업/프로젝트별 집계 조회)
+    project = Column(String(140), index=True)
+    task = Column(String(140), index=True)
     
     # 설명
     description = Column(Text)
@@ -317,6 +387,13 @@ project_meta = DocTypeMeta({
             "label": "진행률(%)",
             "precision": 2
         },
+        {
+            "fieldname": "actual_time",
+            "fieldtype": "Float",
+            "label": "실제 시간",
+            "read_only": 1,
+            "precision": 2
+        },
         {
             "fieldname": "percent_complete_method",
             "fieldtype": "Select",
@@ -433,11 +510,23 @@ task_meta = DocTypeMeta({
             "read_only": 1,
             "precision": 2
         },
+        {
+            "fieldname": "task_weight",
+            "fieldtype": "Float",
+            "label": "작업 가중치",
+            "precision": 2
+        },
         {
             "fieldname": "is_group",
             "fieldtype": "Check",
             "label": "그룹 작업",
             "default": 0
+        },
+        {
+            "fieldname": "depends_on_tasks",
+            "fieldtype": "Table",
+            "label": "선행 작업",
+            "options": "Task Depends On"
         }
     ],
     "permissions": [
@@ -457,6 +546,36 @@ task_meta = DocTypeMeta({
     ]
 })
 
+# Task Depends On DocType 메타데이터
+task_depends_on_meta = DocTypeMeta({
+    "name": "Task Depends On",
+    "module": "Projects",
+    "is_child_table": 1,
+    "fields": [
+        {
+            "fieldname": "task",
+            "fieldtype": "Link",
+            "label": "선행 작업",
+            "options": "Task",
+            "reqd": 1
+        },
+        {
+            "fieldname": "subject",
+            "fieldtype": "Data",
+            "label": "제목",
+            "read_only": 1,
+            "length": 140
+        },
+        {
+            "fieldname": "project",
+            "fieldtype": "Link",
+            "label": "프로젝트",
+            "options": "Project",
+            "read_only": 1
+        }
+    ]
+})
+
 # Timesheet DocType 메타데이터
 timesheet_meta = DocTypeMeta({
     "name": "Timesheet",
@@ -526,6 +645,12 @@ timesheet_meta = DocTypeMeta({
             "label": "상태",
             "options": "Draft\nSubmitted\nBilled\nCancelled",
             "default": "Draft"
+        },
+        {
+            "fieldname": "time_logs",
+            "fieldtype": "Table",
+            "label": "근무시간 상세",
+            "options": "Timesheet Detail"
         }
     ],
     "permissions": [
@@ -550,5 +675,6 @@ timesheet_meta = DocTypeMeta({
 # DocType 등록
 register_doctype("Project", project_meta, Project)
 register_doctype("Task", task_meta, Task)
+register_doctype("Task Depends On", task_depends_on_meta, TaskDependsOn)
 register_doctype("Timesheet", timesheet_meta, Timesheet)
 register_doctype("Timesheet Detail", None, TimesheetDetail)
\ No newline at end of file
@@ -0,0 +1,226 @@
+"""
+프로젝트 진행 집계 (Roll-up)
+ERPNext의 Task.update_time_and_costing / Project.update_project와 같은 규칙으로,
+제출된 근무시간 상세를 작업과 프로젝트에, 작업 진행률을 프로젝트 진행률에 반영합니다.
+
+- 근무시간표/작업이 저장되면 영향받는 작업/프로젝트만 GROUP BY 한 번씩으로 다시 집계 (커밋 전, 같은 트랜잭션)
+- 값이 바뀐 행만 다중 행 UPDATE로 기록
+- 데이터 이관이나 대량 작업 뒤에는 rebuild_project_rollups로 전체를 다시 집계
+"""
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import case, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from core.doctype.base import get_doctype_model
+from core.doctype.chunks import chunks
+
+# 진행률 비교 허용 오차
+PRECISION = 1e-6
+
+
+def _clean(names: Iterable[Optional[str]]) -> List[str]:
+    return sorted({name for name in names if name})
+
+
+def _changed(current: Dict[str, Any], values: Dict[str, Any]) -> bool:
+    for field, value in values.items():
+        old = current.get(field)
+        if isinstance(value, float) or isinstance(old, float):
+            if abs((old or 0) - (value or 0)) > PRECISION:
+                return True
+        elif old != value:
+            return True
+    return False
+
+
+def get_timesheet_links(db: Session, timesheet_names: Iterable[str]) -> Tuple[Set[str], Set[str]]:
+    """근무시간표들의 상세 행이 가리키는 (작업, 프로젝트) 집합"""
+    detail = get_doctype_model("Timesheet Detail")
+    tasks, projects = set(), set()
+    for chunk in chunks(_clean(timesheet_names)):
+        stmt = select(detail.task, detail.project).where(detail.parent.in_(chunk)).distinct()
+        for task, project in db.execute(stmt):
+            if task:
+                tasks.add(task)
+            if project:
+                projects.add(project)
+    return tasks, projects
+
+
+def _timesheet_totals(db: Session, group_column, names: List[str]) -> Dict[str, Any]:
+    """제출된 근무시간 상세의 작업/프로젝트별 시간, 원가, 청구 금액, 기간"""
+    detail = get_doctype_model("Timesheet Detail")
+    timesheet = get_doctype_model("Timesheet")
+    stmt = select(
+        group_column.label("key"),
+        func.sum(detail.hours).label("hours"),
+        func.sum(detail.costing_amount).label("costing_amount"),
+        func.sum(case((detail.is_billable == True, detail.billing_amount), else_=0)).label("billing_amount"),  # noqa: E712
+        func.min(detail.from_time).label("from_time"),
+        func.max(detail.to_time).label("to_time"),
+    ).join(timesheet, timesheet.name == detail.parent).where(
+        timesheet.docstatus == 1
+    ).group_by(group_column)
+
+    totals = {}
+    for chunk in chunks(names):
+        for row in db.execute(stmt.where(group_column.in_(chunk))):
+            totals[row.key] = row
+    return totals
+
+
+def _as_date(value):
+    return value.date() if value is not None and hasattr(value, 'date') else value
+
+
+def task_progress(status: Optional[str], expected_time: float, actual_time: float, progress: float) -> float:
+    """완료된 작업은 100, 예상 시간이 있으면 실제 시간 비율(최대 100), 아니면 입력한 진행률 유지"""
+    if status == 'Completed':
+        return 100.0
+    if expected_time and expected_time > 0:
+        return round(min(100.0, actual_time / expected_time * 100), 2)
+    return progress or 0.0
+
+
+def update_task_rollups(db: Session, task_names: Iterable[str]) -> Set[str]:
+    """
+    작업의 실제 시간, 실제 시작/종료일, 진행률을 근무시간에서 다시 집계 (커밋하지 않음)
+
+    반환값: 집계한 작업들이 속한 프로젝트 (프로젝트 집계 대상)
+    """
+    task_model = get_doctype_model("Task")
+    detail = get_doctype_model("Timesheet Detail")
+    names = _clean(task_names)
+    totals = _timesheet_totals(db, detail.task, names)
+
+    projects = set()
+    updates = []
+    for chunk in chunks(names):
+        rows = db.execute(select(
+            task_model.name, task_model.project, task_model.status, task_model.expected_time,
+            task_model.progress, task_model.actual_time, task_model.act_start_date, task_model.act_end_date
+        ).where(task_model.name.in_(chunk))).all()
+
+        for row in rows:
+            if row.project:
+                projects.add(row.project)
+            total = totals.get(row.name)
+            actual_time = (total.hours or 0) if total else 0.0
+            values = {
+                "actual_time": actual_time,
+                "progress": task_progress(row.status, row.expected_time, actual_time, row.progress),
+            }
+            if total is not None:
+                values["act_start_date"] = _as_date(total.from_time)
+                values["act_end_date"] = _as_date(total.to_time)
+            if _changed(row._asdict(), values):
+                updates.append({"name": row.name, **values})
+
+    for batch in chunks(updates):
+        db.execute(update(task_model), batch)
+    return projects
+
+
+def project_percent_complete(method: Optional[str], stats, current: float) -> float:
+    """프로젝트 진행률 계산 방법(percent_complete_method)에 따른 진행률"""
+    if not method or method == 'Manual':
+        return current or 0.0
+    if stats is None or not stats.task_count:
+        return 0.0
+    if method == 'Task Completion':
+        return round(stats.completed / stats.task_count * 100, 2)
+    if method == 'Task Weight' and stats.total_weight:
+        return round(stats.weighted_progress / stats.total_weight, 2)
+    return round(stats.average_progress or 0, 2)
+
+
+def update_project_rollups(
+    db: Session,
+    project_names: Iterable[str],
+    exclude_tasks: Iterable[str] = ()
+) -> int:
+    """
+    프로젝트의 실제 시간, 원가/청구 합계, 진행률을 다시 집계 (커밋하지 않음)
+
+    exclude_tasks: 삭제 중인 작업처럼 진행률 집계에서 뺄 작업
+    반환값: 갱신한 프로젝트 수
+    """
+    project_model = get_doctype_model("Project")
+    task_model = get_doctype_model("Task")
+    detail = get_doctype_model("Timesheet Detail")
+    names = _clean(project_names)
+    totals = _timesheet_totals(db, detail.project, names)
+
+    task_stats_stmt = select(
+        task_model.project,
+        func.count().label("task_count"),
+        func.sum(case((task_model.status == 'Completed', 1), else_=0)).label("completed"),
+        func.avg(func.coalesce(task_model.progress, 0)).label("average_progress"),
+        func.sum(func.coalesce(task_model.progress, 0) * func.coalesce(task_model.task_weight, 0)).label("weighted_progress"),
+        func.sum(func.coalesce(task_model.task_weight, 0)).label("total_weight"),
+    ).where(or_(task_model.status.is_(None), task_model.status != 'Cancelled')).group_by(task_model.project)
+    exclude_tasks = _clean(exclude_tasks)
+    if exclude_tasks:
+        task_stats_stmt = task_stats_stmt.where(task_model.name.notin_(exclude_tasks))
+
+    updates = []
+    for chunk in chunks(names):
+        task_stats = {
+            row.project: row for row in db.execute(task_stats_stmt.where(task_model.project.in_(chunk)))
+        }
+        rows = db.execute(select(
+            project_model.name, project_model.percent_complete_method, project_model.percent_complete,
+            project_model.actual_time, project_model.total_costing_amount, project_model.total_billable_amount
+        ).where(project_model.name.in_(chunk))).all()
+
+        for row in rows:
+            total = totals.get(row.name)
+            values = {
+                "actual_time": (total.hours or 0) if total else 0.0,
+                "total_costing_amount": (total.costing_amount or 0) if total else 0.0,
+                "total_billable_amount": (total.billing_amount or 0) if total else 0.0,
+                "percent_complete": project_percent_complete(
+                    row.percent_complete_method, task_stats.get(row.name), row.percent_complete
+                ),
+            }
+            if _changed(row._asdict(), values):
+                updates.append({"name": row.name, **values})
+
+    for batch in chunks(updates):
+        db.execute(update(project_model), batch)
+    return len(updates)
+
+
+def update_rollups_for_timesheets(db: Session, links: Tuple[Set[str], Set[str]]):
+    """근무시간표 변경 전/후에 연결된 작업과 프로젝트 집계 (커밋하지 않음)"""
+    tasks, projects = links
+    projects = set(projects) | update_task_rollups(db, tasks)
+    update_project_rollups(db, projects)
+
+
+def rebuild_project_rollups(db: Session, project_names: Optional[List[str]] = None) -> Dict[str, int]:
+    """
+    작업/프로젝트 집계 일괄 재계산 후 커밋 (범위를 지정하면 해당 프로젝트와 그 작업만)
+
+    데이터 이관이나 대량 작업처럼 저장 훅을 거치지 않은 변경 뒤에 사용합니다.
+    """
+    project_model = get_doctype_model("Project")
+    task_model = get_doctype_model("Task")
+
+    if project_names is None:
+        project_names = list(db.execute(select(project_model.name)).scalars())
+        task_names = list(db.execute(select(task_model.name)).scalars())
+    else:
+        task_names = []
+        for chunk in chunks(_clean(project_names)):
+            task_names.extend(db.execute(select(task_model.name).where(task_model.project.in_(chunk))).scalars())
+
+    try:
+        update_task_rollups(db, task_names)
+        update_project_rollups(db, project_names)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return {"tasks": len(task_names), "projects": len(project_names)}
@@ -0,0 +1,463 @@
+"""
+작업 의존성 그래프와 주공정(Critical Path) 일정
+ERPNext의 Task Depends On과 같은 구조로, 프로젝트별 작업 의존성 그래프를 메모리에 만들고
+CPM(Critical Path Method)으로 작업별 가장 이른 시작/종료, 가장 늦은 시작/종료, 여유(slack)를 계산합니다.
+
+- 작업 행과 의존성 행을 쿼리 두 번으로 읽어 그래프 구성, 위상 정렬(Kahn)로 순환 검출
+- 전진/후진 계산은 위상 순서로 한 번씩 (O(V+E))
+- 결과는 프로젝트별로 캐시하고, 작업이 저장/삭제되면 바뀐 작업만 다시 읽어
+  영향받는 하위 그래프(후속 작업 / 선행 작업)만 다시 계산
+"""
+import math
+import threading
+from collections import OrderedDict, deque
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from core.doctype.base import DOCTYPE_NAMES, get_doctype_model, register_doc_event
+from core.doctype.chunks import chunks
+
+# 예상 시작/종료일이 없는 작업의 기간 계산용 하루 근무시간
+WORKING_HOURS_PER_DAY = 8
+
+# 보관할 프로젝트 일정 수
+MAX_CACHED_SCHEDULES = 64
+
+# 여유 비교 허용 오차
+PRECISION = 1e-9
+
+
+def task_duration(exp_start_date, exp_end_date, expected_time) -> float:
+    """작업 기간(일): 예상 시작/종료일이 있으면 그 간격, 없으면 예상 시간 / 하루 근무시간"""
+    if exp_start_date and exp_end_date:
+        return float(max((exp_end_date - exp_start_date).days, 0))
+    return (expected_time or 0) / WORKING_HOURS_PER_DAY
+
+
+def load_dependencies(db: Session, task_names: Iterable[str]) -> Dict[str, List[str]]:
+    """작업별 선행 작업 목록 (의존성 테이블 + 기존 단일 depends_on 필드)"""
+    task_model = get_doctype_model("Task")
+    depends_model = get_doctype_model("Task Depends On")
+    names = sorted(set(task_names))
+    dependencies: Dict[str, List[str]] = {name: [] for name in names}
+
+    for chunk in chunks(names):
+        rows = db.execute(
+            select(depends_model.parent, depends_model.task).where(
+                depends_model.parent.in_(chunk), depends_model.task.isnot(None)
+            ).order_by(depends_model.parent, depends_model.idx)
+        )
+        for parent, task in rows:
+            if task not in dependencies[parent]:
+                dependencies[parent].append(task)
+
+        legacy = db.execute(
+            select(task_model.name, task_model.depends_on).where(
+                task_model.name.in_(chunk), task_model.depends_on.isnot(None), task_model.depends_on != ''
+            )
+        )
+        for name, task in legacy:
+            if task not in dependencies[name]:
+                dependencies[name].append(task)
+
+    return dependencies
+
+
+def check_dependency_cycle(db: Session, task_name: str, depends_on: Iterable[str]):
+    """
+    의존성 순환 검사 (순환이 있으면 ValueError)
+
+    선행 작업에서 의존성을 단계별로 거슬러 올라가며(단계마다 IN 조회 한 번) 자기 자신에 닿는지 확인합니다.
+    """
+    parents: Dict[str, Optional[str]] = {}
+    frontier = []
+    for dependency in depends_on:
+        if dependency == task_name:
+            raise ValueError("작업은 자기 자신에 의존할 수 없습니다.")
+        if dependency not in parents:
+            parents[dependency] = None
+            frontier.append(dependency)
+
+    while frontier:
+        next_frontier = []
+        for name, dependencies in load_dependencies(db, frontier).items():
+            for dependency in dependencies:
+                if dependency == task_name:
+                    chain = [name]
+                    while parents[chain[-1]] is not None:
+                        chain.append(parents[chain[-1]])
+                    path = " → ".join([task_name] + list(reversed(chain)) + [task_name])
+                    raise ValueError(f"작업 의존성에 순환이 있습니다: {path}")
+                if dependency not in parents:
+                    parents[dependency] = name
+                    next_frontier.append(dependency)
+        frontier = next_frontier
+
+
+class TaskNode:
+    """일정 그래프의 작업 하나"""
+
+    __slots__ = ('name', 'subject', 'status', 'duration', 'depends_on', 'es', 'ef', 'ls', 'lf')
+
+    def __init__(self, name: str, subject: Optional[str], status: Optional[str], duration: float, depends_on: List[str]):
+        self.name = name
+        self.subject = subject
+        self.status = status
+        self.duration = duration
+        self.depends_on = depends_on
+        self.es = self.ef = self.ls = self.lf = None
+
+
+class ProjectSchedule:
+    """
+    프로젝트 하나의 작업 의존성 그래프와 CPM 결과
+
+    의존성 목록(depends_on)은 그래프에 없는 작업(다른 프로젝트 등)을 가리킬 수 있으며,
+    양쪽 작업이 모두 그래프에 있을 때만 간선으로 취급합니다.
+    """
+
+    def __init__(self, project: str, start_date: Optional[date]):
+        self.project = project
+        self.start_date = start_date
+        self.nodes: Dict[str, TaskNode] = {}
+        self.dependents: Dict[str, Set[str]] = {}  # 작업 → 그 작업에 의존하는 작업 (그래프 밖 이름 포함)
+        self.order: List[str] = []
+        self.position: Dict[str, int] = {}
+        self.cycle: List[str] = []
+        self.finish = 0.0
+
+    # 그래프 변경
+
+    def upsert(self, node: TaskNode) -> Set[str]:
+        """작업 추가/갱신, 반환값: 이전/새 선행 작업 (후진 계산 영향 범위)"""
+        previous = self.nodes.get(node.name)
+        old_depends = previous.depends_on if previous else []
+        for dependency in old_depends:
+            self.dependents.get(dependency, set()).discard(node.name)
+        for dependency in node.depends_on:
+            self.dependents.setdefault(dependency, set()).add(node.name)
+        self.nodes[node.name] = node
+        return set(old_depends) | set(node.depends_on)
+
+    def remove(self, name: str) -> Set[str]:
+        node = self.nodes.pop(name, None)
+        if node is None:
+            return set()
+        for dependency in node.depends_on:
+            self.dependents.get(dependency, set()).discard(name)
+        return set(node.depends_on)
+
+    def predecessors(self, name: str) -> List[str]:
+        return [dependency for dependency in self.nodes[name].depends_on if dependency in self.nodes]
+
+    def successors(self, name: str) -> List[str]:
+        return [dependent for dependent in self.dependents.get(name, ()) if dependent in self.nodes]
+
+    # 계산
+
+    def sort(self):
+        """위상 정렬 (Kahn), 정렬되지 않고 남은 작업은 순환에 포함되거나 순환 뒤에 있어 계산할 수 없는 작업"""
+        indegree = {name: len(self.predecessors(name)) for name in self.nodes}
+        queue = deque(sorted(name for name, count in indegree.items() if count == 0))
+        order = []
+        while queue:
+            name = queue.popleft()
+            order.append(name)
+            for successor in self.successors(name):
+                indegree[successor] -= 1
+                if indegree[successor] == 0:
+                    queue.append(successor)
+
+        self.order = order
+        self.position = {name: index for index, name in enumerate(order)}
+        self.cycle = sorted(name for name in self.nodes if name not in self.position)
+        for name in self.cycle:
+            node = self.nodes[name]
+            node.es = node.ef = node.ls = node.lf = None
+
+    def _closure(self, names: Iterable[str], step) -> Set[str]:
+        seen = set()
+        stack = [name for name in names if name in self.position]
+        while stack:
+            name = stack.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            stack.extend(other for other in step(name) if other in self.position and other not in seen)
+        return seen
+
+    def forward(self, names: Optional[Iterable[str]] = None):
+        """가장 이른 시작/종료 계산 (names를 주면 그 작업과 모든 후속 작업만)"""
+        targets = self.order if names is None else sorted(self._closure(names, self.successors), key=self.position.get)
+        for name in targets:
+            node = self.nodes[name]
+            node.es = max((self.nodes[dependency].ef for dependency in self.predecessors(name)), default=0.0)
+            node.ef = node.es + node.duration
+
+    def backward(self, names: Optional[Iterable[str]] = None):
+        """가장 늦은 시작/종료 계산 (names를 주면 그 작업과 모든 선행 작업만)"""
+        targets = self.order if names is None else sorted(self._closure(names, self.predecessors), key=self.position.get)
+        for name in reversed(targets):
+            node = self.nodes[name]
+            node.lf = min(
+                (self.nodes[successor].ls for successor in self.successors(name) if successor in self.position),
+                default=self.finish
+            )
+            node.ls = node.lf - node.duration
+
+    def compute(self, changed: Optional[Set[str]] = None, upstream: Optional[Set[str]] = None, resort: bool = True):
+        """
+        CPM 계산
+
+        changed가 없으면 전체를 계산하고, 있으면 바뀐 작업의 후속 작업만 전진 계산한 뒤
+        프로젝트 종료 시점이 그대로면 바뀐 작업과 upstream(이전/새 선행 작업)의 선행 작업만 후진 계산합니다.
+        """
+        if resort:
+            had_cycle = bool(self.cycle)
+            self.sort()
+            if had_cycle or self.cycle:
+                # 순환에서 빠지거나 새로 생긴 작업은 값이 없으므로 전체 계산
+                changed = None
+        if changed is None:
+            self.forward()
+            self.finish = max((self.nodes[name].ef for name in self.order), default=0.0)
+            self.backward()
+            return
+
+        self.forward(changed)
+        finish = max((self.nodes[name].ef for name in self.order), default=0.0)
+        if abs(finish - self.finish) > PRECISION:
+            self.finish = finish
+            self.backward()
+        else:
+            self.backward(set(changed) | set(upstream or ()))
+
+    # 결과
+
+    def _date(self, offset: Optional[float]) -> Optional[date]:
+        if self.start_date is None or offset is None:
+            return None
+        return self.start_date + timedelta(days=math.floor(offset + PRECISION))
+
+    def to_dict(self) -> Dict[str, Any]:
+        tasks = []
+        for name in self.order:
+            node = self.nodes[name]
+            slack = node.ls - node.es
+            tasks.append({
+                "task": name,
+                "subject": node.subject,
+                "status": node.status,
+                "duration": node.duration,
+                "depends_on": self.predecessors(name),
+                "earliest_start": node.es,
+                "earliest_finish": node.ef,
+                "latest_start": node.ls,
+                "latest_finish": node.lf,
+                "slack": slack if abs(slack) > PRECISION else 0.0,
+                "is_critical": abs(slack) <= PRECISION,
+                "earliest_start_date": self._date(node.es),
+                "earliest_finish_date": self._date(node.ef),
+            })
+        return {
+            "project": self.project,
+            "start_date": self.start_date,
+            "duration": self.finish,
+            "finish_date": self._date(self.finish),
+            "critical_path": [task["task"] for task in tasks if task["is_critical"]],
+            "cycle": list(self.cycle),
+            "tasks": tasks,
+        }
+
+
+def _load_nodes(db: Session, conditions) -> Dict[str, Tuple[Optional[str], TaskNode]]:
+    """조건에 맞는 작업과 선행 작업 목록 (반환값: {작업: (프로젝트, 노드)})"""
+    task_model = get_doctype_model("Task")
+    rows = db.execute(select(
+        task_model.name, task_model.project, task_model.subject, task_model.status,
+        task_model.exp_start_date, task_model.exp_end_date, task_model.expected_time
+    ).where(*conditions)).all()
+
+    dependencies = load_dependencies(db, [row.name for row in rows])
+    return {
+        row.name: (row.project, TaskNode(
+            row.name, row.subject, row.status,
+            task_duration(row.exp_start_date, row.exp_end_date, row.expected_time),
+            dependencies.get(row.name, [])
+        ))
+        for row in rows
+    }
+
+
+def _project_start_date(db: Session, project: str) -> Optional[date]:
+    """프로젝트 예상 시작일 (없으면 작업의 가장 이른 예상 시작일)"""
+    project_model = get_doctype_model("Project")
+    task_model = get_doctype_model("Task")
+    start = db.execute(select(project_model.expected_start_date).where(project_model.name == project)).scalar()
+    if start is None:
+        start = db.execute(select(func.min(task_model.exp_start_date)).where(task_model.project == project)).scalar()
+    return start
+
+
+def build_schedule(db: Session, project: str) -> ProjectSchedule:
+    """프로젝트 작업 전체로 일정 그래프를 만들고 계산"""
+    task_model = get_doctype_model("Task")
+    schedule = ProjectSchedule(project, _project_start_date(db, project))
+    conditions = [task_model.project == project]
+    for _, node in _load_nodes(db, conditions).values():
+        schedule.upsert(node)
+    schedule.compute()
+    return schedule
+
+
+def refresh_schedule(db: Session, schedule: ProjectSchedule, task_names: Set[str]):
+    """바뀐 작업만 다시 읽어 그래프에 반영하고 영향받는 하위 그래프만 다시 계산"""
+    task_model = get_doctype_model("Task")
+    loaded: Dict[str, Tuple[Optional[str], TaskNode]] = {}
+    for chunk in chunks(sorted(task_names)):
+        loaded.update(_load_nodes(db, [task_model.name.in_(chunk)]))
+
+    changed: Set[str] = set()
+    upstream: Set[str] = set()
+    resort = False
+    for name in task_names:
+        project, node = loaded.get(name, (None, None))
+        previous = schedule.nodes.get(name)
+        if node is None or project != schedule.project:
+            if previous is not None:
+                upstream |= schedule.remove(name)
+                # 빠진 작업의 후속 작업은 선행 작업이 줄었으므로 다시 계산
+                changed.update(schedule.dependents.get(name, ()))
+                resort = True
+            continue
+        if previous is None or previous.depends_on != node.depends_on:
+            resort = True
+        upstream |= schedule.upsert(node)
+        changed.add(name)
+
+    changed = {name for name in changed if name in schedule.nodes}
+    schedule.compute(changed, upstream, resort=resort)
+
+
+class ScheduleCache:
+    """
+    프로젝트별 일정 캐시
+
+    작업이 바뀌면 캐시된 모든 프로젝트에 해당 작업을 다시 읽을 대상으로 표시하고
+    (작업이 다른 프로젝트로 옮겨졌을 수 있으므로), 다음 조회 때 반영합니다.
+
+    잠금은 캐시 딕셔너리를 읽고 바꿀 때만 잡고, 일정 구성/갱신(쿼리)은 잠금 밖에서 합니다.
+    비동기 세션의 run_sync는 이벤트 루프 스레드에서 실행되므로 잠금을 잡은 채 I/O를 기다리면
+    같은 스레드의 다른 요청이 잠금에서 멈춰 교착 상태가 됩니다.
+    구성 중인 일정은 꺼내 두고 그동안 바뀐 작업을 따로 모았다가, 저장할 때 다시 읽을 대상으로 남깁니다.
+    """
+
+    def __init__(self, max_schedules: int = MAX_CACHED_SCHEDULES):
+        self.max_schedules = max_schedules
+        self._schedules: 'OrderedDict[str, ProjectSchedule]' = OrderedDict()
+        self._stale: Dict[str, Set[str]] = {}
+        self._building: Dict[str, List[Set[str]]] = {}  # 프로젝트 → 구성 중인 요청별 바뀐 작업
+        self._lock = threading.Lock()
+
+    def _checkout(self, project: str) -> Tuple[Optional[ProjectSchedule], Set[str], Set[str]]:
+        """캐시된 일정과 다시 읽을 작업을 꺼내고, 구성 중에 바뀌는 작업을 모을 집합을 등록"""
+        with self._lock:
+            schedule = self._schedules.pop(project, None)
+            stale = self._stale.pop(project, set())
+            if schedule is None:
+                # 새로 구성하면 현재 작업을 모두 읽으므로 이전 표시는 필요 없음
+                stale = set()
+            changed: Set[str] = set()
+            self._building.setdefault(project, []).append(changed)
+            return schedule, stale, changed
+
+    def _release(self, project: str, changed: Set[str]) -> bool:
+        """구성 중 집합 등록 해제 (구성 도중 프로젝트가 무효화되었으면 False)"""
+        pending = self._building.get(project, [])
+        for index, item in enumerate(pending):
+            if item is changed:
+                del pending[index]
+                if not pending:
+                    del self._building[project]
+                return True
+        return False
+
+    def get(self, db: Session, project: str) -> Dict[str, Any]:
+        schedule, stale, changed = self._checkout(project)
+        try:
+            if schedule is None:
+                schedule = build_schedule(db, project)
+            elif stale:
+                refresh_schedule(db, schedule, stale)
+            result = schedule.to_dict()
+        except BaseException:
+            with self._lock:
+                self._release(project, changed)
+            raise
+
+        with self._lock:
+            if self._release(project, changed):
+                # 동시에 구성한 일정이 먼저 저장되었으면 덮어쓰고, 양쪽에서 바뀐 작업을 모두 다시 읽을 대상으로 남김
+                self._schedules[project] = schedule
+                self._schedules.move_to_end(project)
+                if changed:
+                    self._stale.setdefault(project, set()).update(changed)
+                while len(self._schedules) > self.max_schedules:
+                    old_project, _ = self._schedules.popitem(last=False)
+                    self._stale.pop(old_project, None)
+        return result
+
+    def invalidate_tasks(self, task_names: Iterable[str]):
+        task_names = set(task_names)
+        if not task_names:
+            return
+        with self._lock:
+            for project in self._schedules:
+                self._stale.setdefault(project, set()).update(task_names)
+            for pending in self._building.values():
+                for changed in pending:
+                    changed.update(task_names)
+
+    def invalidate_project(self, project: str):
+        with self._lock:
+            self._schedules.pop(project, None)
+            self._stale.pop(project, None)
+            self._building.pop(project, None)
+
+    def clear(self):
+        with self._lock:
+            self._schedules.clear()
+            self._stale.clear()
+            self._building.clear()
+
+
+schedule_cache = ScheduleCache()
+
+
+def get_project_schedule(db: Session, project: str) -> Dict[str, Any]:
+    """프로젝트 작업 일정 (가장 이른/늦은 시작·종료, 여유, 주공정, 순환 작업)"""
+    project_model = get_doctype_model("Project")
+    if db.get(project_model, project) is None:
+        raise ValueError(f"프로젝트를 찾을 수 없습니다: {project}")
+    return schedule_cache.get(db, project)
+
+
+def on_task_save(model_class, db: Session, names: List[str]):
+    """저장된 작업을 일정 캐시에서 다시 읽도록 표시 (프로젝트 시작일이 바뀌면 그 프로젝트 캐시 삭제)"""
+    doctype = DOCTYPE_NAMES.get(model_class)
+    if doctype == "Task":
+        schedule_cache.invalidate_tasks(names)
+    elif doctype == "Project":
+        for name in names:
+            schedule_cache.invalidate_project(name)
+
+
+def on_task_delete(model_class, db: Session, names: List[str]):
+    on_task_save(model_class, db, names)
+
+
+register_doc_event('after_save', on_task_save)
+register_doc_event('after_delete', on_task_delete)
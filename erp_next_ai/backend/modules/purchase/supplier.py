@@ -2,8 +2,10 @@
 공급업체(Supplier) DocType 정의
 ERPNext의 Supplier와 동일한 구조
 """
-from sqlalchemy import Column, String, Integer, Float, Text, Boolean, DateTime
+from sqlalchemy import Column, String, Integer, Float, Text, Boolean, DateTime, ForeignKey
 from core.doctype.base import DocTypeBase, Base, DocTypeMeta, register_doctype
+from core.doctype.validation import is_valid_email
+from modules.accounts.general_ledger import make_gl_entries, cancel_gl_entries
 
 
 class Supplier(DocTypeBase, Base):
@@ -55,9 +57,7 @@ class Supplier(DocTypeBase, Base):
         
         # 이메일 유효성 검사
         if self.email_id:
-            import re
-            email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-            if not re.match(email_pattern, self.email_id):
+            if not is_valid_email(self.email_id):
                 errors.append("올바른 이메일 주소를 입력하세요.")
         
         return errors
@@ -92,6 +92,12 @@ class PurchaseOrder(DocTypeBase, Base):
     currency = Column(String(10), default='KRW')
     conversion_rate = Column(Float, default=1.0)
     
+    # 회계 정보
+    company = Column(String(100))
+    credit_to = Column(String(140))         # 매입채무 계정
+    expense_account = Column(String(140))   # 비용(매입) 계정
+    tax_account = Column(String(140))       # 부가세 대급금 계정
+    
     # 상태
     status = Column(String(50), default='Draft')
     per_received = Column(Float, default=0)
@@ -136,6 +142,77 @@ class PurchaseOrder(DocTypeBase, Base):
             errors.append("총 금액은 0 이상이어야 합니다.")
         
         return errors
+    
+    def validate_gl_accounts(self):
+        """분개에 필요한 계정 확인 (제출 시)"""
+        errors = []
+        if not self.company:
+            errors.append("회사는 제출 시 필수입니다.")
+        if not self.credit_to:
+            errors.append("매입채무 계정은 제출 시 필수입니다.")
+        if not self.expense_account:
+            errors.append("비용 계정은 제출 시 필수입니다.")
+        if (self.total_taxes_and_charges or 0) and not self.tax_account:
+            errors.append("세금이 있으면 부가세 계정이 필요합니다.")
+        if errors:
+            raise ValueError(f"유효성 검사 실패: {', '.join(errors)}")
+    
+    def get_gl_entries(self) -> list:
+        """분개: 차변 비용(총액 - 세금), 부가세 / 대변 매입채무(총액)"""
+        taxes = self.total_taxes_and_charges or 0
+        grand_total = self.grand_total or 0
+        common = {
+            "posting_date": self.transaction_date,
+            "voucher_type": "Purchase Order",
+            "voucher_no": self.name,
+            "company": self.company,
+        }
+        return [
+            {**common, "account": self.credit_to, "credit": grand_total, "party_type": "Supplier",
+             "party": self.supplier, "against": self.expense_account},
+            {**common, "account": self.expense_account, "debit": grand_total - taxes, "against": self.supplier},
+            {**common, "account": self.tax_account, "debit": taxes, "against": self.supplier},
+        ]
+    
+    def on_submit(self, db):
+        self.validate_gl_accounts()
+        make_gl_entries(db, self.get_gl_entries())
+    
+    def on_cancel(self, db):
+        cancel_gl_entries(db, "Purchase Order", self.name)
+
+
+class PurchaseOrderItem(DocTypeBase, Base):
+    """구매주문 아이템"""
+    
+    __tablename__ = 'tabPurchaseOrderItem'
+    
+    # 부모 문서 연결
+    parent = Column(String(140), ForeignKey('tabPurchaseOrder.name'), nullable=False, index=True)
+    parenttype = Column(String(50), default='Purchase Order')
+    
+    # 아이템 정보
+    item_code = Column(String(140), nullable=False, index=True)
+    item_name = Column(String(140))
+    description = Column(Text)
+    
+    # 수량 및 단위
+    qty = Column(Float, nullable=False, default=1)
+    received_qty = Column(Float, default=0)
+    stock_uom = Column(String(50))
+    uom = Column(String(50))
+    conversion_factor = Column(Float, default=1)
+    
+    # 가격 정보
+    rate = Column(Float, nullable=False, default=0)
+    amount = Column(Float, default=0)
+    
+    # 입고 정보
+    schedule_date = Column(DateTime)
+    warehouse = Column(String(140))
+    
+    def get_required_fields(self):
+        return ['item_code', 'qty']
 
 
 # Supplier DocType 메타데이터
@@ -324,6 +401,30 @@ purchase_order_meta = DocTypeMeta({
             "default": 1.0,
             "precision": 9
         },
+        {
+            "fieldname": "company",
+            "fieldtype": "Link",
+            "label": "회사",
+            "options": "Company"
+        },
+        {
+            "fieldname": "credit_to",
+            "fieldtype": "Link",
+            "label": "매입채무 계정",
+            "options": "Account"
+        },
+        {
+            "fieldname": "expense_account",
+            "fieldtype": "Link",
+            "label": "비용 계정",
+            "options": "Account"
+        },
+        {
+            "fieldname": "tax_account",
+            "fieldtype": "Link",
+            "label": "부가세 계정",
+            "options": "Account"
+        },
         {
             "fieldname": "total_qty",
             "fieldtype": "Float",
@@ -400,6 +501,12 @@ purchase_order_meta = DocTypeMeta({
             "fieldname": "terms",
             "fieldtype": "Text",
             "label": "계약조건"
+        },
+        {
+            "fieldname": "items",
+            "fieldtype": "Table",
+            "label": "주문 품목",
+            "options": "Purchase Order Item"
         }
     ],
     "permissions": [
@@ -424,6 +531,73 @@ purchase_order_meta = DocTypeMeta({
     ]
 })
 
+# Purchase Order Item DocType 메타데이터
+purchase_order_item_meta = DocTypeMeta({
+    "name": "Purchase Order Item",
+    "module": "Purchase",
+    "is_child_table": 1,
+    "fields": [
+        {
+            "fieldname": "item_code",
+            "fieldtype": "Link",
+            "label": "제품 코드",
+            "options": "Item",
+            "reqd": 1
+        },
+        {
+            "fieldname": "item_name",
+            "fieldtype": "Data",
+            "label": "제품명",
+            "length": 140
+        },
+        {
+            "fieldname": "qty",
+            "fieldtype": "Float",
+            "label": "수량",
+            "reqd": 1,
+            "precision": 2
+        },
+        {
+            "fieldname": "received_qty",
+            "fieldtype": "Float",
+            "label": "입고 수량",
+            "read_only": 1,
+            "precision": 2
+        },
+        {
+            "fieldname": "uom",
+            "fieldtype": "Link",
+            "label": "단위",
+            "options": "UOM"
+        },
+        {
+            "fieldname": "rate",
+            "fieldtype": "Float",
+            "label": "단가",
+            "precision": 2
+        },
+        {
+            "fieldname": "amount",
+            "fieldtype": "Float",
+            "label": "금액",
+            "read_only": 1,
+            "precision": 2
+        },
+        {
+            "fieldname": "schedule_date",
+            "fieldtype": "Date",
+            "label": "입고 예정일"
+        },
+        {
+            "fieldname": "warehouse",
+            "fieldtype": "Link",
+            "label": "입고 창고",
+            "options": "Warehouse"
+        }
+    ]
+})
+
 # DocType 등록
 register_doctype("Supplier", supplier_meta, Supplier)
-register_doctype("Purchase Order", purchase_order_meta, PurchaseOrder)
\ No newline at end of file
+register_doctype("Purchase Order", purchase_order_meta, PurchaseOrder)
+register_doctype("Purchase Order Item", purchase_order_item_meta, PurchaseOrderItem)
\ No newline at end of file
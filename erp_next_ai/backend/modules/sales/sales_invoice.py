@@ -2,14 +2,30 @@
 판매송장(Sales Invoice) DocType 정의
 ERPNext의 Sales Invoice 모듈과 동일한 구조
 """
-from sqlalchemy import Column, String, Float, Integer, Boolean, DateTime, Text, Date
+from sqlalchemy import Column, String, Float, Integer, Boolean, DateTime, Text, Date, Index
 from core.doctype.base import DocTypeBase, Base, DocTypeMeta, register_doctype
+from core.doctype.indexes import index_name_for
+from modules.accounts.general_ledger import make_gl_entries, cancel_gl_entries
+import modules.accounts.receivables  # 판매송장 저장 시 연령 분석 캐시 무효화 핸들러 등록
+
+# 매출채권 연령 분석 커버링 인덱스 컬럼
+RECEIVABLES_INDEX_COLUMNS = ('company', 'docstatus', 'customer', 'due_date', 'posting_date', 'outstanding_amount')
 
 
 class SalesInvoice(DocTypeBase, Base):
     """판매송장"""
     
     __tablename__ = 'tabSales Invoice'
+    __table_args__ = (
+        # 매출채권 연령 분석용 커버링 인덱스 (회사/상태/고객 조건 후 날짜·미수금을 인덱스에서 바로 읽음)
+        Index(
+            index_name_for('tabSales Invoice', RECEIVABLES_INDEX_COLUMNS),
+            *RECEIVABLES_INDEX_COLUMNS
+        ),
+    )
+    
+    # 고객이 바뀌면 이전 고객의 매출채권 연령 분석 캐시도 무효화
+    previous_value_fields = ('customer',)
     
     # 기본 정보
     customer = Column(String(140), nullable=False)
@@ -58,6 +74,9 @@ class SalesInvoice(DocTypeBase, Base):
     company = Column(String(100), nullable=False)
     cost_center = Column(String(140))
     project = Column(String(140))
+    debit_to = Column(String(140))          # 매출채권 계정
+    income_account = Column(String(140))    # 매출 계정
+    tax_account = Column(String(140))       # 부가세 예수금 계정
     
     # 통화 정보
     currency = Column(String(10), default='KRW')
@@ -94,6 +113,47 @@ class SalesInvoice(DocTypeBase, Base):
             errors.append("총액은 0 이상이어야 합니다.")
         
         return errors
+    
+    def validate_gl_accounts(self):
+        """분개에 필요한 계정 확인 (제출 시)"""
+        errors = []
+        if not self.debit_to:
+            errors.append("매출채권 계정은 제출 시 필수입니다.")
+        if not self.income_account:
+            errors.append("매출 계정은 제출 시 필수입니다.")
+        if (self.total_taxes_and_charges or 0) and not self.tax_account:
+            errors.append("세금이 있으면 부가세 계정이 필요합니다.")
+        if errors:
+            raise ValueError(f"유효성 검사 실패: {', '.join(errors)}")
+    
+    def get_gl_entries(self) -> list:
+        """분개: 차변 매출채권(총액) / 대변 매출(총액 - 세금), 부가세"""
+        taxes = self.total_taxes_and_charges or 0
+        grand_total = self.grand_total or 0
+        common = {
+            "posting_date": self.posting_date,
+            "voucher_type": "Sales Invoice",
+            "voucher_no": self.name,
+            "company": self.company,
+            "cost_center": self.cost_center,
+            "project": self.project,
+            "remarks": self.remarks,
+        }
+        return [
+            {**common, "account": self.debit_to, "debit": grand_total, "party_type": "Customer",
+             "party": self.customer, "against": self.income_account},
+            {**common, "account": self.income_account, "credit": grand_total - taxes, "against": self.customer},
+            {**common, "account": self.tax_account, "credit": taxes, "against": self.customer},
+        ]
+    
+    def on_submit(self, db):
+        self.validate_gl_accounts()
+        make_gl_entries(db, self.get_gl_entries())
+        self.status = 'Submitted'
+    
+    def on_cancel(self, db):
+        cancel_gl_entries(db, "Sales Invoice", self.name)
+        self.status = 'Cancelled'
 
 
 # DocType 메타데이터
@@ -105,6 +165,7 @@ sales_invoice_meta = DocTypeMeta({
     "search_fields": ["customer", "customer_name", "po_no"],
     "sort_field": "posting_date",
     "sort_order": "DESC",
+    "is_submittable": 1,
     "fields": [
         {
             "fieldname": "customer",
@@ -150,6 +211,24 @@ sales_invoice_meta = DocTypeMeta({
             "options": "Company",
             "reqd": 1
         },
+        {
+            "fieldname": "debit_to",
+            "fieldtype": "Link",
+            "label": "매출채권 계정",
+            "options": "Account"
+        },
+        {
+            "fieldname": "income_account",
+            "fieldtype": "Link",
+            "label": "매출 계정",
+            "options": "Account"
+        },
+        {
+            "fieldname": "tax_account",
+            "fieldtype": "Link",
+            "label": "부가세 계정",
+            "options": "Account"
+        },
         {
             "fieldname": "currency",
             "fieldtype": "Link",
@@ -281,6 +281,12 @@ sales_order_meta = DocTypeMeta({
             "fieldname": "terms",
             "fieldtype": "Text",
             "label": "계약조건"
+        },
+        {
+            "fieldname": "items",
+            "fieldtype": "Table",
+            "label": "주문 품목",
+            "options": "Sales Order Item"
         }
     ],
     "permissions": [
@@ -0,0 +1,327 @@
+"""
+재주문(Reorder) 검사
+ERPNext의 reorder_item 스케줄러 작업과 같은 규칙으로, 예상 재고가 재주문 수준 아래로 내려간
+품목을 찾아 공급업체별 임시 구매주문을 만듭니다.
+
+- 품목 + 창고별 Bin 잔액 + 미입고 구매주문 수량을 집계 SELECT 한 번으로 조인해 부족 품목만 읽음
+  (품목별 루프 없음, 기본 창고가 있으면 그 창고 재고만 사용)
+- 마지막 실행 이후 Bin/품목/구매주문이 바뀐 품목과 지난 실행에서 공급업체가 없어 주문하지 못한 품목만
+  다시 검사 (첫 실행 또는 full=True면 전체)
+- 구매주문은 공급업체와 회사(기본 창고의 회사)별로 나눠 생성
+- 실행 기록은 Reorder Run에 남기며, 주기 실행은 scripts/run_reorder.py를 cron에 등록해 사용
+"""
+import json
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Column, DateTime, Integer, Text, func, or_, select, union
+from sqlalchemy.orm import Session
+
+from core.doctype.base import DocTypeBase, Base, DocTypeMeta, register_doctype, get_doctype_model, run_doc_event
+from core.doctype.chunks import chunks
+from modules.accounts.item import Item
+from modules.stock.stock_ledger import Bin
+
+# 실행 도중 커밋된 재고 변동을 놓치지 않도록 이전 실행 시작 시각보다 앞당겨 다시 검사하는 구간
+RESCAN_OVERLAP = timedelta(minutes=5)
+
+# 부동소수점 비교 허용 오차
+PRECISION = 1e-9
+
+
+class ReorderRun(DocTypeBase, Base):
+    """재주문 검사 실행 기록"""
+
+    __tablename__ = 'tabReorderRun'
+
+    started_at = Column(DateTime, nullable=False, index=True)
+    since = Column(DateTime)                    # 이 시각 이후 변경된 품목만 검사 (없으면 전체)
+    items_below_level = Column(Integer, default=0)
+    purchase_orders = Column(Text)              # 생성한 구매주문 name 목록 (JSON)
+    items_without_supplier = Column(Text)       # 기본 공급업체가 없어 주문하지 못한 품목 (JSON)
+
+    def get_required_fields(self):
+        return ['started_at']
+
+
+def _warehouse_condition(warehouse_column):
+    """기본 창고가 지정된 품목은 그 창고만, 아니면 모든 창고"""
+    return or_(Item.default_warehouse.is_(None), Item.default_warehouse == '', warehouse_column == Item.default_warehouse)
+
+
+def _changed_items_query(since: datetime):
+    """since 이후 재고, 품목 설정, 구매주문이 바뀐 품목 코드"""
+    po_model = get_doctype_model("Purchase Order")
+    po_item_model = get_doctype_model("Purchase Order Item")
+    return union(
+        select(Bin.item_code).where(Bin.modified > since),
+        select(Item.name).where(Item.modified > since),
+        select(po_item_model.item_code).join(po_model, po_model.name == po_item_model.parent).where(
+            po_model.modified > since
+        ),
+    )
+
+
+def reorder_statement(since: Optional[datetime] = None, recheck: Iterable[str] = ()):
+    """
+    재주문이 필요한 품목 SELECT
+
+    예상 재고(projected_qty) = 실제 재고 + 미입고 구매주문 수량 (취소되지 않은 임시/제출 주문)
+    임시 주문도 포함해 아직 처리되지 않은 재주문 주문서를 다음 실행에서 중복 생성하지 않습니다.
+    since가 있으면 그 이후 바뀐 품목과 recheck 품목만 검사합니다.
+    company는 기본 창고의 회사입니다 (기본 창고가 없으면 None).
+    """
+    po_model = get_doctype_model("Purchase Order")
+    po_item_model = get_doctype_model("Purchase Order Item")
+    warehouse_model = get_doctype_model("Warehouse")
+
+    actual = select(
+        Bin.item_code, func.sum(Bin.actual_qty).label("actual_qty")
+    ).join(Item, Item.name == Bin.item_code).where(
+        _warehouse_condition(Bin.warehouse)
+    ).group_by(Bin.item_code).subquery()
+
+    pending_qty = po_item_model.qty - func.coalesce(po_item_model.received_qty, 0)
+    ordered = select(
+        po_item_model.item_code, func.sum(pending_qty).label("ordered_qty")
+    ).join(po_model, po_model.name == po_item_model.parent).join(
+        Item, Item.name == po_item_model.item_code
+    ).where(
+        po_model.docstatus < 2,
+        pending_qty > 0,
+        or_(po_item_model.warehouse.is_(None), _warehouse_condition(po_item_model.warehouse))
+    ).group_by(po_item_model.item_code).subquery()
+
+    actual_qty = func.coalesce(actual.c.actual_qty, 0)
+    ordered_qty = func.coalesce(ordered.c.ordered_qty, 0)
+    projected_qty = actual_qty + ordered_qty
+
+    stmt = select(
+        Item.name.label("item_code"),
+        Item.item_name,
+        Item.stock_uom,
+        Item.default_supplier,
+        Item.default_warehouse,
+        warehouse_model.company,
+        Item.reorder_level,
+        Item.reorder_qty,
+        Item.min_order_qty,
+        func.coalesce(func.nullif(Item.valuation_rate, 0), Item.standard_rate, 0).label("rate"),
+        actual_qty.label("actual_qty"),
+        ordered_qty.label("ordered_qty"),
+        projected_qty.label("projected_qty"),
+    ).outerjoin(actual, actual.c.item_code == Item.name).outerjoin(
+        ordered, ordered.c.item_code == Item.name
+    ).outerjoin(
+        warehouse_model, warehouse_model.name == Item.default_warehouse
+    ).where(
+        Item.reorder_level > 0,
+        or_(Item.disabled.is_(None), Item.disabled == False),  # noqa: E712
+        or_(Item.is_stock_item.is_(None), Item.is_stock_item == True),  # noqa: E712
+        or_(Item.is_purchase_item.is_(None), Item.is_purchase_item == True),  # noqa: E712
+        projected_qty < Item.reorder_level,
+    )
+    if since is not None:
+        recheck = list(dict.fromkeys(recheck))
+        stmt = stmt.where(or_(
+            Item.name.in_(_changed_items_query(since)),
+            *[Item.name.in_(chunk) for chunk in chunks(recheck)]
+        ))
+    return stmt.order_by(Item.default_supplier, Item.name)
+
+
+def get_reorder_qty(row) -> float:
+    """주문 수량 = max(재주문 수량, 부족분), 최소 주문 수량 이상"""
+    deficiency = (row.reorder_level or 0) - (row.projected_qty or 0)
+    qty = max(row.reorder_qty or 0, deficiency)
+    return max(qty, row.min_order_qty or 0)
+
+
+def get_items_to_reorder(
+    db: Session,
+    since: Optional[datetime] = None,
+    recheck: Iterable[str] = ()
+) -> List[Dict[str, Any]]:
+    """재주문이 필요한 품목과 주문 수량"""
+    return [
+        {**row._asdict(), "qty": get_reorder_qty(row)}
+        for row in db.execute(reorder_statement(since, recheck))
+    ]
+
+
+def get_last_run(db: Session) -> Optional[ReorderRun]:
+    return db.execute(select(ReorderRun).order_by(ReorderRun.started_at.desc()).limit(1)).scalars().first()
+
+
+def _make_purchase_orders(db: Session, items: List[Dict[str, Any]], now: datetime) -> List[str]:
+    """공급업체/회사별 임시 구매주문 생성 (세션에 추가만 하고 커밋하지 않음)"""
+    po_model = get_doctype_model("Purchase Order")
+    po_item_model = get_doctype_model("Purchase Order Item")
+    supplier_model = get_doctype_model("Supplier")
+
+    by_supplier: Dict[Tuple[str, Optional[str]], List[Dict[str, Any]]] = {}
+    for item in items:
+        by_supplier.setdefault((item["default_supplier"], item["company"]), []).append(item)
+    if not by_supplier:
+        return []
+
+    suppliers = list({supplier for supplier, _ in by_supplier})
+    supplier_names = dict(db.execute(
+        select(supplier_model.name, supplier_model.supplier_name).where(supplier_model.name.in_(suppliers))
+    ).all())
+
+    names = []
+    for (supplier, company), rows in by_supplier.items():
+        po = po_model(
+            name=f"Purchase Order-{uuid.uuid4().hex[:8]}",
+            supplier=supplier,
+            supplier_name=supplier_names.get(supplier, supplier),
+            company=company,
+            transaction_date=now,
+            status='Draft',
+            docstatus=0,
+            creation=now,
+            modified=now,
+        )
+        children = [
+            po_item_model(
+                name=uuid.uuid4().hex[:10],
+                parent=po.name,
+                parenttype="Purchase Order",
+                idx=idx,
+                item_code=row["item_code"],
+                item_name=row["item_name"],
+                qty=row["qty"],
+                received_qty=0,
+                uom=row["stock_uom"],
+                stock_uom=row["stock_uom"],
+                conversion_factor=1,
+                rate=row["rate"],
+                amount=row["qty"] * row["rate"],
+                warehouse=row["default_warehouse"],
+                creation=now,
+                modified=now,
+            )
+            for idx, row in enumerate(rows, start=1)
+        ]
+        po.total_qty = sum(child.qty for child in children)
+        po.total = po.net_total = po.grand_total = sum(child.amount for child in children)
+
+        errors = po.validate()
+        for idx, child in enumerate(children, start=1):
+            errors.extend(f"items {idx}행: {error}" for error in child.validate())
+        if errors:
+            raise ValueError(f"유효성 검사 실패: {', '.join(errors)}")
+
+        db.add(po)
+        db.add_all(children)
+        names.append(po.name)
+    return names
+
+
+def run_reorder(db: Session, full: bool = False, dry_run: bool = False) -> Dict[str, Any]:
+    """
+    재주문 검사 실행
+
+    마지막 실행 이후 바뀐 품목과 지난 실행에서 공급업체가 없던 품목만 검사해 공급업체/회사별 임시 구매주문을
+    만들고, 실행 기록과 함께 한 트랜잭션으로 커밋합니다. dry_run이면 부족 품목만 반환하고 아무것도 기록하지 않습니다.
+    """
+    started_at = datetime.utcnow()
+    since = None
+    recheck: List[str] = []
+    if not full:
+        last_run = get_last_run(db)
+        if last_run is not None:
+            since = last_run.started_at - RESCAN_OVERLAP
+            recheck = json.loads(last_run.items_without_supplier or '[]')
+
+    items = [item for item in get_items_to_reorder(db, since, recheck) if item["qty"] > PRECISION]
+    orderable = [item for item in items if item["default_supplier"]]
+    without_supplier = [item["item_code"] for item in items if not item["default_supplier"]]
+
+    result = {
+        "since": since,
+        "items": items,
+        "purchase_orders": [],
+        "items_without_supplier": without_supplier,
+    }
+    if dry_run:
+        return result
+
+    try:
+        result["purchase_orders"] = _make_purchase_orders(db, orderable, started_at)
+        db.add(ReorderRun(
+            name=f"Reorder Run-{uuid.uuid4().hex[:8]}",
+            started_at=started_at,
+            since=since,
+            items_below_level=len(items),
+            purchase_orders=json.dumps(result["purchase_orders"]),
+            items_without_supplier=json.dumps(without_supplier),
+            creation=started_at,
+            modified=started_at,
+        ))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    if result["purchase_orders"]:
+        run_doc_event('after_save', get_doctype_model("Purchase Order"), db, result["purchase_orders"])
+    return result
+
+
+# Reorder Run DocType 메타데이터
+reorder_run_meta = DocTypeMeta({
+    "name": "Reorder Run",
+    "module": "Stock",
+    "sort_field": "started_at",
+    "sort_order": "DESC",
+    "is_read_only": 1,
+    "fields": [
+        {
+            "fieldname": "started_at",
+            "fieldtype": "Datetime",
+            "label": "실행 시각",
+            "reqd": 1,
+            "read_only": 1
+        },
+        {
+            "fieldname": "since",
+            "fieldtype": "Datetime",
+            "label": "검사 기준 시각",
+            "read_only": 1
+        },
+        {
+            "fieldname": "items_below_level",
+            "fieldtype": "Int",
+            "label": "부족 품목 수",
+            "read_only": 1
+        },
+        {
+            "fieldname": "purchase_orders",
+            "fieldtype": "Text",
+            "label": "생성된 구매주문",
+            "read_only": 1
+        },
+        {
+            "fieldname": "items_without_supplier",
+            "fieldtype": "Text",
+            "label": "공급업체 미지정 품목",
+            "read_only": 1
+        }
+    ],
+    "permissions": [
+        {
+            "role": "Stock Manager",
+            "read": 1
+        },
+        {
+            "role": "Purchase Manager",
+            "read": 1
+        }
+    ]
+})
+
+# DocType 등록
+register_doctype("Reorder Run", reorder_run_meta, ReorderRun)
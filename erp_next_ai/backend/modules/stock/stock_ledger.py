@@ -0,0 +1,766 @@
+"""
+재고 원장(Stock Ledger Entry)과 창고별 재고(Bin) DocType 정의
+ERPNext의 Stock Ledger Entry / Bin과 동일한 구조
+
+- 재고 전표가 제출되면 품목 행마다 원장 행을 기록하고 (품목, 창고)별 Bin 잔액을 증분 갱신
+- 평가(FIFO/LIFO/이동 평균)는 valuation 모듈로 계산하며, 과거 일자 전기/취소는 그 시점부터 재평가
+- 현재 재고는 Bin에서 바로 조회하고, 특정 시점 재고는 원장을 그 시점까지 합산해 조회
+- rebuild_bins로 원장에서 Bin을 일괄 재계산
+"""
+import heapq
+import json
+import uuid
+from datetime import date, datetime, time
+from itertools import groupby
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import (
+    Column, String, Float, Boolean, Date, DateTime, Index, UniqueConstraint,
+    Text, and_, delete, false, func, insert, select, tuple_, update
+)
+from sqlalchemy.orm import Session, aliased
+from core.doctype.base import DocTypeBase, Base, DocTypeMeta, register_doctype, get_doctype_model
+from core.doctype.chunks import chunks
+from core.doctype.nestedset import subtree_query
+from core.doctype.upsert import insert_missing
+from modules.accounts.item import Item
+from modules.stock.valuation import FIFO, PRECISION, ValuationState, iter_ledger, ledger_sort_key
+
+# IN 목록 하나에 넣을 최대 (품목, 창고) 조합 수
+BIN_CHUNK_SIZE = 500
+
+# 재평가할 원장 행을 서버 측 커서로 나눠 읽는 행 수 (바뀐 행도 이 수만큼 모아 UPDATE)
+REPOST_BATCH_SIZE = 1000
+
+
+class StockLedgerEntry(DocTypeBase, Base):
+    """재고 원장"""
+
+    __tablename__ = 'tabStockLedgerEntry'
+    __table_args__ = (
+        # 품목/창고별 시점 조회와 재계산 순서
+        Index('ix_tabstockledgerentry_item_warehouse_posting', 'item_code', 'warehouse', 'posting_datetime', 'creation'),
+        Index('ix_tabstockledgerentry_voucher', 'voucher_type', 'voucher_no'),
+    )
+
+    # 품목/창고
+    item_code = Column(String(140), nullable=False)
+    warehouse = Column(String(140), nullable=False)
+
+    # 전기 일시
+    posting_date = Column(Date, nullable=False)
+    posting_time = Column(String(10))
+    posting_datetime = Column(DateTime, nullable=False)
+
+    # 원천 전표
+    voucher_type = Column(String(50), nullable=False)
+    voucher_no = Column(String(140), nullable=False)
+    voucher_detail_no = Column(String(140))
+
+    # 수량 (입고 +, 출고 -)
+    actual_qty = Column(Float, default=0)
+    qty_after_transaction = Column(Float, default=0)
+
+    # 가액
+    incoming_rate = Column(Float, default=0)
+    valuation_rate = Column(Float, default=0)
+    stock_value = Column(Float, default=0)
+    stock_value_difference = Column(Float, default=0)
+
+    # 거래 후 입고 단위 큐 [[수량, 단가], ...] (FIFO/LIFO, JSON)
+    stock_queue = Column(Text)
+
+    # 회사 정보
+    company = Column(String(140))
+
+    # 취소된 전표의 원장 행 (잔액 계산에서 제외)
+    is_cancelled = Column(Boolean, default=False)
+
+    def get_required_fields(self):
+        return ['item_code', 'warehouse', 'posting_date', 'voucher_type', 'voucher_no']
+
+
+class Bin(DocTypeBase, Base):
+    """품목/창고별 현재 재고 (원장에서 증분 갱신되는 집계 테이블)"""
+
+    __tablename__ = 'tabBin'
+    __table_args__ = (
+        UniqueConstraint('item_code', 'warehouse', name='uq_tabbin_item_warehouse'),
+        # 마지막 재주문 검사 이후 재고가 움직인 품목 조회
+        Index('ix_tabbin_modified', 'modified'),
+    )
+
+    item_code = Column(String(140), nullable=False)
+    warehouse = Column(String(140), nullable=False)
+
+    actual_qty = Column(Float, default=0)
+    valuation_rate = Column(Float, default=0)
+    stock_value = Column(Float, default=0)
+
+    def get_required_fields(self):
+        return ['item_code', 'warehouse']
+
+
+def posting_datetime_of(posting_date, posting_time: Optional[str] = None) -> datetime:
+    """전기일과 전기시간(HH:MM[:SS])을 하나의 일시로 결합"""
+    if isinstance(posting_date, datetime):
+        posting_date, default_time = posting_date.date(), posting_date.time()
+    else:
+        default_time = time()
+
+    if posting_time:
+        return datetime.combine(posting_date, time.fromisoformat(posting_time))
+    return datetime.combine(posting_date, default_time)
+
+
+def get_bins_for_update(db: Session, keys: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], Bin]:
+    """
+    (품목, 창고) 조합의 Bin을 잠금 조회
+
+    없는 조합은 INSERT ... ON CONFLICT DO NOTHING으로 만든 뒤 다시 잠금 조회하므로, 같은 조합의 첫 입출고가
+    동시에 들어와도 유일 제약(uq_tabbin_item_warehouse) 위반 없이 한 트랜잭션씩 갱신합니다.
+    """
+    keys = list(dict.fromkeys(keys))
+    bins: Dict[Tuple[str, str], Bin] = {}
+
+    def lock(chunk_keys):
+        for chunk in chunks(chunk_keys, BIN_CHUNK_SIZE):
+            stmt = select(Bin).where(tuple_(Bin.item_code, Bin.warehouse).in_(chunk)).with_for_update()
+            for bin_doc in db.execute(stmt).scalars():
+                bins[(bin_doc.item_code, bin_doc.warehouse)] = bin_doc
+
+    lock(keys)
+    missing = [key for key in keys if key not in bins]
+    if missing:
+        now = datetime.utcnow()
+        insert_missing(db, Bin, [
+            {
+                "name": uuid.uuid4().hex[:10], "item_code": item_code, "warehouse": warehouse,
+                "actual_qty": 0, "valuation_rate": 0, "stock_value": 0, "creation": now, "modified": now,
+            }
+            for item_code, warehouse in missing
+        ], ('item_code', 'warehouse'), BIN_CHUNK_SIZE)
+        lock(missing)
+
+    return bins
+
+
+def get_valuation_methods(db: Session, item_codes: Iterable[str]) -> Dict[str, str]:
+    """
+    품목별 평가 방법 (품목 마스터에 없으면 FIFO)
+
+    재고 전표/원장/Bin의 item_code는 Item 링크이므로 재주문 조회와 같이 Item.name으로 찾습니다.
+    """
+    methods = {}
+    for chunk in chunks(list(dict.fromkeys(item_codes))):
+        stmt = select(Item.name, Item.valuation_method).where(Item.name.in_(chunk))
+        methods.update({item_code: method or FIFO for item_code, method in db.execute(stmt)})
+    return methods
+
+
+def _ledger_order(descending: bool = False):
+    """ledger_sort_key와 같은 원장 처리 순서 (상세 행 번호가 없는 행은 빈 문자열로 정렬)"""
+    columns = (
+        StockLedgerEntry.posting_datetime, StockLedgerEntry.creation, StockLedgerEntry.voucher_no,
+        func.coalesce(StockLedgerEntry.voucher_detail_no, ''), StockLedgerEntry.actual_qty, StockLedgerEntry.name
+    )
+    return [column.desc() for column in columns] if descending else list(columns)
+
+
+def _previous_states(
+    db: Session,
+    keys: List[Tuple[str, str]],
+    before: datetime,
+    methods: Dict[str, str]
+) -> Dict[Tuple[str, str], ValuationState]:
+    """before 직전의 마지막 유효 원장 행으로 (품목, 창고)별 평가 상태 복원"""
+    ranked = select(
+        StockLedgerEntry.item_code,
+        StockLedgerEntry.warehouse,
+        StockLedgerEntry.qty_after_transaction,
+        StockLedgerEntry.stock_value,
+        StockLedgerEntry.valuation_rate,
+        StockLedgerEntry.stock_queue,
+        func.row_number().over(
+            partition_by=(StockLedgerEntry.item_code, StockLedgerEntry.warehouse),
+            order_by=_ledger_order(descending=True)
+        ).label('rank')
+    ).where(
+        tuple_(StockLedgerEntry.item_code, StockLedgerEntry.warehouse).in_(keys),
+        StockLedgerEntry.is_cancelled == false(),
+        StockLedgerEntry.posting_datetime < before
+    ).subquery()
+
+    states = {}
+    for row in db.execute(select(ranked).where(ranked.c.rank == 1)):
+        method = methods.get(row.item_code, FIFO)
+        states[(row.item_code, row.warehouse)] = ValuationState.from_ledger(
+            method, row.qty_after_transaction, row.stock_value, row.valuation_rate, row.stock_queue
+        )
+    return states
+
+
+_COMPUTED_FIELDS = ('qty_after_transaction', 'incoming_rate', 'valuation_rate', 'stock_value', 'stock_value_difference')
+
+
+def _future_rows(db: Session, keys: List[Tuple[str, str]], since: Optional[datetime]) -> Iterator[Dict[str, Any]]:
+    """
+    since 이후의 유효 원장 행 (재평가 입력과 현재 계산값, since가 없으면 전체 이력)
+
+    품목별로 모아 원장 처리 순서로 정렬하고, 서버 측 커서로 REPOST_BATCH_SIZE행씩 나눠 읽습니다.
+    """
+    stmt = select(
+        StockLedgerEntry.name,
+        StockLedgerEntry.item_code,
+        StockLedgerEntry.warehouse,
+        StockLedgerEntry.posting_datetime,
+        StockLedgerEntry.creation,
+        StockLedgerEntry.voucher_no,
+        StockLedgerEntry.voucher_detail_no,
+        StockLedgerEntry.actual_qty,
+        StockLedgerEntry.stock_queue,
+        *[getattr(StockLedgerEntry, field) for field in _COMPUTED_FIELDS]
+    ).where(
+        tuple_(StockLedgerEntry.item_code, StockLedgerEntry.warehouse).in_(keys),
+        StockLedgerEntry.is_cancelled == false()
+    ).order_by(StockLedgerEntry.item_code, *_ledger_order())
+    if since is not None:
+        stmt = stmt.where(StockLedgerEntry.posting_datetime >= since)
+
+    for row in db.execute(stmt.execution_options(yield_per=REPOST_BATCH_SIZE)).mappings():
+        yield dict(row)
+
+
+def _merge_pending(
+    rows: Iterator[Dict[str, Any]],
+    pending_rows: Dict[str, List[Dict[str, Any]]]
+) -> Iterator[Dict[str, Any]]:
+    """품목별로 정렬된 원장 행 사이에 아직 기록되지 않은 새 원장 행을 처리 순서대로 끼워 넣음"""
+    merged = set()
+    for item_code, item_rows in groupby(rows, key=itemgetter('item_code')):
+        merged.add(item_code)
+        yield from heapq.merge(item_rows, pending_rows.get(item_code, ()), key=ledger_sort_key)
+    for item_code, item_rows in pending_rows.items():
+        if item_code not in merged:
+            yield from item_rows
+
+
+def _with_transfer_targets(db: Session, keys: List[Tuple[str, str]], since: Optional[datetime]) -> List[Tuple[str, str]]:
+    """
+    재평가 범위에 창고 이동 입고 창고를 추가
+
+    since 이후 keys에서 출고된 창고 이동의 입고 (품목, 창고)는 출고 원가가 바뀌면 함께 다시 평가해야 하므로,
+    새로 찾은 조합이 없을 때까지 반복해서 추가합니다.
+    """
+    keys = list(dict.fromkeys(keys))
+    known = set(keys)
+    frontier = keys
+    issue = aliased(StockLedgerEntry)
+    while frontier:
+        found = []
+        for chunk in chunks(frontier, BIN_CHUNK_SIZE):
+            stmt = select(StockLedgerEntry.item_code, StockLedgerEntry.warehouse).distinct().join(
+                issue, and_(
+                    issue.voucher_no == StockLedgerEntry.voucher_no,
+                    issue.voucher_detail_no == StockLedgerEntry.voucher_detail_no,
+                    issue.item_code == StockLedgerEntry.item_code
+                )
+            ).where(
+                tuple_(issue.item_code, issue.warehouse).in_(chunk),
+                issue.actual_qty < 0,
+                issue.is_cancelled == false(),
+                StockLedgerEntry.actual_qty > 0,
+                StockLedgerEntry.is_cancelled == false()
+            )
+            if since is not None:
+                stmt = stmt.where(issue.posting_datetime >= since)
+            for key in db.execute(stmt):
+                key = tuple(key)
+                if key not in known:
+                    known.add(key)
+                    found.append(key)
+        keys.extend(found)
+        frontier = found
+    return keys
+
+
+def _changed(current: Dict[str, Any], result: Dict[str, Any]) -> bool:
+    queue = current.get('stock_queue')
+    if queue != result['stock_queue'] and (
+        queue is None or result['stock_queue'] is None or json.loads(queue) != json.loads(result['stock_queue'])
+    ):
+        # 입고 단위 큐는 표기(10과 10.0)만 다르면 같은 값으로 봄
+        return True
+    return any(abs((current.get(field) or 0) - result[field]) > PRECISION for field in _COMPUTED_FIELDS)
+
+
+def repost_future_sle(
+    db: Session,
+    keys: Iterable[Tuple[str, str]],
+    from_datetime: Optional[datetime],
+    pending: Iterable[StockLedgerEntry] = ()
+) -> int:
+    """
+    (품목, 창고) 조합의 from_datetime 이후 원장 행 재평가와 Bin 갱신 (커밋하지 않음)
+
+    직전 원장 행의 저장된 상태에서 시작해 그 이후 행만 다시 계산합니다 (from_datetime이 없으면 전체 이력).
+    원장 행은 품목 순서로 나눠 읽으며 계산하고, 값이 바뀐 행만 REPOST_BATCH_SIZE개씩 기본 키 기준
+    다중 행 UPDATE로 기록하므로 이력이 길어도 메모리 사용량이 일정합니다.
+    pending은 아직 기록되지 않은 새 원장 행으로, 계산 결과를 객체에 직접 설정합니다.
+    keys에서 출고된 창고 이동의 입고 창고도 함께 다시 평가합니다.
+
+    반환값: 갱신된 기존 원장 행 수
+    """
+    keys = _with_transfer_targets(db, keys, from_datetime)
+    pending = {sle.name: sle for sle in pending}
+
+    # 같은 품목의 창고 이동 행이 한 배치에 들어가도록 품목 단위로 나눔
+    keys_by_item: Dict[str, List[Tuple[str, str]]] = {}
+    for key in keys:
+        keys_by_item.setdefault(key[0], []).append(key)
+
+    pending_rows: Dict[str, List[Dict[str, Any]]] = {}
+    for sle in pending.values():
+        pending_rows.setdefault(sle.item_code, []).append({field: getattr(sle, field) for field in (
+            'name', 'item_code', 'warehouse', 'posting_datetime', 'creation',
+            'voucher_no', 'voucher_detail_no', 'actual_qty', 'incoming_rate'
+        )})
+    for item_rows in pending_rows.values():
+        item_rows.sort(key=ledger_sort_key)
+
+    updated = 0
+    for items in chunks(list(keys_by_item), BIN_CHUNK_SIZE):
+        chunk_keys = [key for item_code in items for key in keys_by_item[item_code]]
+        bins = get_bins_for_update(db, chunk_keys)
+        methods = get_valuation_methods(db, items)
+        states = _previous_states(db, chunk_keys, from_datetime, methods) if from_datetime is not None else {}
+
+        rows = (row for row in _future_rows(db, chunk_keys, from_datetime) if row['name'] not in pending)
+        rows = _merge_pending(rows, {item_code: pending_rows[item_code] for item_code in items if item_code in pending_rows})
+
+        updates = []
+        for row, result in iter_ledger(rows, states, methods):
+            sle = pending.get(result['name'])
+            if sle is not None:
+                for field, value in result.items():
+                    setattr(sle, field, value)
+            elif _changed(row, result):
+                updates.append(result)
+                if len(updates) >= REPOST_BATCH_SIZE:
+                    db.execute(update(StockLedgerEntry), updates)
+                    updated += len(updates)
+                    updates = []
+        if updates:
+            db.execute(update(StockLedgerEntry), updates)
+            updated += len(updates)
+
+        now = datetime.utcnow()
+        for key, bin_doc in bins.items():
+            state = states.get(key) or ValuationState()
+            bin_doc.actual_qty = state.qty
+            bin_doc.stock_value = state.value
+            bin_doc.valuation_rate = state.rate
+            bin_doc.modified = now
+
+    return updated
+
+
+def make_sl_entries(db: Session, entries: List[Dict[str, Any]]) -> List[StockLedgerEntry]:
+    """
+    원장 행 기록과 Bin 갱신 (커밋하지 않음)
+
+    entries 항목: item_code, warehouse, actual_qty(입고 +, 출고 -), posting_date, posting_time,
+    voucher_type, voucher_no, voucher_detail_no, company, incoming_rate
+
+    평가는 품목의 평가 방법(FIFO/LIFO/이동 평균)을 따르며, 같은 상세 행의 창고 이동 입고는
+    출고 원가로 평가합니다. 과거 일자로 전기하면 그 이후 원장 행도 함께 재평가됩니다.
+    """
+    if not entries:
+        return []
+
+    now = datetime.utcnow()
+    ledger = []
+    for entry in entries:
+        posting_datetime = posting_datetime_of(entry['posting_date'], entry.get('posting_time'))
+        sle = StockLedgerEntry(
+            name=uuid.uuid4().hex[:10],
+            item_code=entry['item_code'],
+            warehouse=entry['warehouse'],
+            posting_date=posting_datetime.date(),
+            posting_time=entry.get('posting_time'),
+            posting_datetime=posting_datetime,
+            voucher_type=entry['voucher_type'],
+            voucher_no=entry['voucher_no'],
+            voucher_detail_no=entry.get('voucher_detail_no'),
+            actual_qty=entry['actual_qty'] or 0,
+            incoming_rate=entry.get('incoming_rate') or 0,
+            company=entry.get('company'),
+            is_cancelled=False,
+            docstatus=1,
+            creation=now,
+            modified=now
+        )
+        ledger.append(sle)
+
+    repost_future_sle(
+        db,
+        [(sle.item_code, sle.warehouse) for sle in ledger],
+        min(sle.posting_datetime for sle in ledger),
+        pending=ledger
+    )
+    db.add_all(ledger)
+    return ledger
+
+
+def cancel_sl_entries(db: Session, voucher_type: str, voucher_no: str) -> int:
+    """전표의 원장 행을 취소 표시하고 해당 시점부터 재평가해 Bin을 갱신 (커밋하지 않음)"""
+    stmt = select(StockLedgerEntry).where(
+        StockLedgerEntry.voucher_type == voucher_type,
+        StockLedgerEntry.voucher_no == voucher_no,
+        StockLedgerEntry.is_cancelled == false()
+    )
+    entries = list(db.execute(stmt).scalars())
+    if not entries:
+        return 0
+
+    for sle in entries:
+        sle.is_cancelled = True
+        sle.docstatus = 2
+    db.flush(entries)
+
+    repost_future_sle(
+        db,
+        [(sle.item_code, sle.warehouse) for sle in entries],
+        min(sle.posting_datetime for sle in entries)
+    )
+    return len(entries)
+
+
+def repost_item_valuation(
+    db: Session,
+    from_date=None,
+    item_codes: Optional[List[str]] = None,
+    warehouses: Optional[List[str]] = None
+) -> int:
+    """
+    전기일 이후 재고 평가 재계산 (범위를 지정하면 해당 품목/창고만)
+
+    평가 방법 변경이나 과거 일자 수정 후 from_date부터 다시 계산합니다.
+    from_date가 없으면 전체 이력을 다시 계산합니다.
+
+    반환값: 갱신된 원장 행 수
+    """
+    if from_date is None:
+        from_datetime = None
+    else:
+        from_datetime = posting_datetime_of(from_date) if isinstance(from_date, datetime) \
+            else datetime.combine(from_date, time.min)
+
+    keys = set()
+    for model in (StockLedgerEntry, Bin):
+        stmt = select(model.item_code, model.warehouse).distinct()
+        if item_codes:
+            stmt = stmt.where(model.item_code.in_(item_codes))
+        if warehouses:
+            stmt = stmt.where(model.warehouse.in_(warehouses))
+        keys.update(tuple(row) for row in db.execute(stmt))
+
+    try:
+        updated = repost_future_sle(db, sorted(keys), from_datetime)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return updated
+
+
+def _balance(qty: Optional[float], value: Optional[float], rate: Optional[float] = None) -> Dict[str, float]:
+    qty, value = qty or 0, value or 0
+    if rate is None:
+        rate = value / qty if qty else 0
+    return {"actual_qty": qty, "stock_value": value, "valuation_rate": rate or 0}
+
+
+def get_stock_balances(
+    db: Session,
+    as_of: Optional[datetime] = None,
+    item_codes: Optional[List[str]] = None,
+    warehouses: Optional[List[str]] = None,
+    warehouse_group: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    품목/창고별 재고 잔액
+
+    as_of가 없으면 Bin(현재 잔액)을 읽고, 있으면 그 시점까지의 유효한 원장 행을
+    한 번의 GROUP BY로 합산합니다. 단일 쿼리로 계산하므로 조회 도중 기록되는 전표와 섞이지 않습니다.
+    warehouse_group을 주면 그 창고와 모든 하위 창고(트리 범위 조회)로 한정합니다.
+    """
+    group_warehouses = None
+    if warehouse_group:
+        group_warehouses = subtree_query(get_doctype_model("Warehouse"), warehouse_group)
+
+    if as_of is None:
+        stmt = select(Bin.item_code, Bin.warehouse, Bin.actual_qty, Bin.stock_value, Bin.valuation_rate)
+        if item_codes:
+            stmt = stmt.where(Bin.item_code.in_(item_codes))
+        if warehouses:
+            stmt = stmt.where(Bin.warehouse.in_(warehouses))
+        if group_warehouses is not None:
+            stmt = stmt.where(Bin.warehouse.in_(group_warehouses))
+        stmt = stmt.order_by(Bin.item_code, Bin.warehouse)
+        return [
+            {"item_code": row[0], "warehouse": row[1], **_balance(row[2], row[3], row[4])}
+            for row in db.execute(stmt)
+        ]
+
+    if isinstance(as_of, date) and not isinstance(as_of, datetime):
+        as_of = datetime.combine(as_of, time.max)
+
+    stmt = select(
+        StockLedgerEntry.item_code,
+        StockLedgerEntry.warehouse,
+        func.sum(StockLedgerEntry.actual_qty),
+        func.sum(StockLedgerEntry.stock_value_difference)
+    ).where(
+        StockLedgerEntry.is_cancelled == false(),
+        StockLedgerEntry.posting_datetime <= as_of
+    )
+    if item_codes:
+        stmt = stmt.where(StockLedgerEntry.item_code.in_(item_codes))
+    if warehouses:
+        stmt = stmt.where(StockLedgerEntry.warehouse.in_(warehouses))
+    if group_warehouses is not None:
+        stmt = stmt.where(StockLedgerEntry.warehouse.in_(group_warehouses))
+    stmt = stmt.group_by(StockLedgerEntry.item_code, StockLedgerEntry.warehouse).order_by(
+        StockLedgerEntry.item_code, StockLedgerEntry.warehouse
+    )
+
+    return [
+        {"item_code": row[0], "warehouse": row[1], **_balance(row[2], row[3])}
+        for row in db.execute(stmt)
+    ]
+
+
+def get_stock_balance(
+    db: Session,
+    item_code: str,
+    warehouse: str,
+    as_of: Optional[datetime] = None
+) -> Dict[str, float]:
+    """품목 하나의 창고 재고 잔액 (기록이 없으면 0)"""
+    balances = get_stock_balances(db, as_of, [item_code], [warehouse])
+    if balances:
+        return {key: balances[0][key] for key in ("actual_qty", "stock_value", "valuation_rate")}
+    return _balance(0, 0)
+
+
+def rebuild_bins(
+    db: Session,
+    item_codes: Optional[List[str]] = None,
+    warehouses: Optional[List[str]] = None
+) -> int:
+    """
+    원장에서 Bin 일괄 재계산 (범위를 지정하면 해당 품목/창고만)
+
+    유효한 원장 행을 (품목, 창고)별로 한 번에 합산한 뒤 대상 Bin을 지우고 다중 행 INSERT로 다시 기록합니다.
+    """
+    balances = get_stock_balances_from_ledger(db, item_codes, warehouses)
+
+    scope = delete(Bin)
+    if item_codes:
+        scope = scope.where(Bin.item_code.in_(item_codes))
+    if warehouses:
+        scope = scope.where(Bin.warehouse.in_(warehouses))
+
+    now = datetime.utcnow()
+    rows = [
+        {
+            "name": uuid.uuid4().hex[:10],
+            "item_code": balance["item_code"],
+            "warehouse": balance["warehouse"],
+            "actual_qty": balance["actual_qty"],
+            "stock_value": balance["stock_value"],
+            "valuation_rate": balance["valuation_rate"],
+            "creation": now,
+            "modified": now,
+            "docstatus": 0,
+        }
+        for balance in balances
+    ]
+
+    try:
+        db.execute(scope)
+        for chunk in chunks(rows):
+            db.execute(insert(Bin), chunk)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return len(rows)
+
+
+def get_stock_balances_from_ledger(
+    db: Session,
+    item_codes: Optional[List[str]] = None,
+    warehouses: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
+    """원장 전체 합산 잔액 (Bin과 무관하게 계산)"""
+    return get_stock_balances(db, datetime.max, item_codes, warehouses)
+
+
+# Stock Ledger Entry DocType 메타데이터
+stock_ledger_entry_meta = DocTypeMeta({
+    "name": "Stock Ledger Entry",
+    "module": "Stock",
+    "search_fields": ["item_code", "warehouse", "voucher_no"],
+    "sort_field": "posting_datetime",
+    "sort_order": "DESC",
+    "is_read_only": 1,
+    "fields": [
+        {
+            "fieldname": "item_code",
+            "fieldtype": "Link",
+            "label": "제품 코드",
+            "options": "Item",
+            "reqd": 1
+        },
+        {
+            "fieldname": "warehouse",
+            "fieldtype": "Link",
+            "label": "창고",
+            "options": "Warehouse",
+            "reqd": 1
+        },
+        {
+            "fieldname": "posting_date",
+            "fieldtype": "Date",
+            "label": "전기일",
+            "reqd": 1
+        },
+        {
+            "fieldname": "posting_time",
+            "fieldtype": "Time",
+            "label": "전기시간"
+        },
+        {
+            "fieldname": "voucher_type",
+            "fieldtype": "Data",
+            "label": "전표 유형",
+            "reqd": 1
+        },
+        {
+            "fieldname": "voucher_no",
+            "fieldtype": "Data",
+            "label": "전표 번호",
+            "reqd": 1
+        },
+        {
+            "fieldname": "actual_qty",
+            "fieldtype": "Float",
+            "label": "수량 변동",
+            "read_only": 1,
+            "precision": 2
+        },
+        {
+            "fieldname": "qty_after_transaction",
+            "fieldtype": "Float",
+            "label": "거래 후 수량",
+            "read_only": 1,
+            "precision": 2
+        },
+        {
+            "fieldname": "valuation_rate",
+            "fieldtype": "Float",
+            "label": "평가단가",
+            "read_only": 1,
+            "precision": 2
+        },
+        {
+            "fieldname": "stock_value_difference",
+            "fieldtype": "Float",
+            "label": "재고 가액 변동",
+            "read_only": 1,
+            "precision": 2
+        },
+        {
+            "fieldname": "is_cancelled",
+            "fieldtype": "Check",
+            "label": "취소됨",
+            "read_only": 1
+        }
+    ],
+    "permissions": [
+        {
+            "role": "Stock User",
+            "read": 1
+        },
+        {
+            "role": "Stock Manager",
+            "read": 1
+        }
+    ]
+})
+
+# Bin DocType 메타데이터
+bin_meta = DocTypeMeta({
+    "name": "Bin",
+    "module": "Stock",
+    "search_fields": ["item_code", "warehouse"],
+    "sort_field": "item_code",
+    "sort_order": "ASC",
+    "is_read_only": 1,
+    "fields": [
+        {
+            "fieldname": "item_code",
+            "fieldtype": "Link",
+            "label": "제품 코드",
+            "options": "Item",
+            "reqd": 1
+        },
+        {
+            "fieldname": "warehouse",
+            "fieldtype": "Link",
+            "label": "창고",
+            "options": "Warehouse",
+            "reqd": 1
+        },
+        {
+            "fieldname": "actual_qty",
+            "fieldtype": "Float",
+            "label": "실제 수량",
+            "read_only": 1,
+            "precision": 2
+        },
+        {
+            "fieldname": "valuation_rate",
+            "fieldtype": "Float",
+            "label": "평가단가",
+            "read_only": 1,
+            "precision": 2
+        },
+        {
+            "fieldname": "stock_value",
+            "fieldtype": "Float",
+            "label": "재고 가액",
+            "read_only": 1,
+            "precision": 2
+        }
+    ],
+    "permissions": [
+        {
+            "role": "Stock User",
+            "read": 1
+        },
+        {
+            "role": "Stock Manager",
+            "read": 1
+        }
+    ]
+})
+
+# DocType 등록
+register_doctype("Stock Ledger Entry", stock_ledger_entry_meta, StockLedgerEntry)
+register_doctype("Bin", bin_meta, Bin)
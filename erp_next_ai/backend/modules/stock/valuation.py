@@ -0,0 +1,205 @@
+"""
+재고 평가 계산 (FIFO / LIFO / 이동 평균)
+ERPNext의 stock_ledger 평가 로직과 같은 규칙으로, 데이터베이스와 무관하게
+(품목, 창고)별 평가 상태에 원장 행을 순서대로 적용합니다.
+
+- 여러 품목의 원장 행을 한 번에 받아 전기 순서대로 처리 (배치 계산, iter_ledger는 나눠 읽는 행을 순차 계산)
+- 상태(수량, 가액, 평가단가, 입고 단위 큐)는 원장 행의 stock_queue에 저장되어
+  특정 전기일 이후만 다시 계산(증분 재전기)할 때 시작 상태로 사용
+"""
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+FIFO = 'FIFO'
+LIFO = 'LIFO'
+MOVING_AVERAGE = 'Moving Average'
+VALUATION_METHODS = (FIFO, LIFO, MOVING_AVERAGE)
+
+# 부동소수점 비교 허용 오차
+PRECISION = 1e-9
+
+
+class ValuationState:
+    """(품목, 창고) 하나의 평가 상태"""
+
+    __slots__ = ('method', 'qty', 'value', 'rate', 'queue')
+
+    def __init__(
+        self,
+        method: str = FIFO,
+        qty: float = 0,
+        value: float = 0,
+        rate: float = 0,
+        queue: Optional[List[List[float]]] = None
+    ):
+        self.method = method if method in VALUATION_METHODS else FIFO
+        self.qty = qty or 0
+        self.value = value or 0
+        self.rate = rate or 0
+        if queue is None:
+            queue = [[self.qty, self.rate]] if self.qty else []
+        self.queue = queue
+
+    @classmethod
+    def from_ledger(cls, method: str, qty: float, value: float, rate: float, stock_queue: Optional[str]) -> 'ValuationState':
+        """원장 행에 저장된 거래 후 상태로 복원"""
+        queue = json.loads(stock_queue) if stock_queue else None
+        return cls(method, qty, value, rate, queue)
+
+    def dump_queue(self) -> Optional[str]:
+        if self.method == MOVING_AVERAGE:
+            return None
+        return json.dumps(self.queue)
+
+    def apply(self, qty: float, incoming_rate: Optional[float] = None) -> Tuple[float, float]:
+        """
+        수량 변동 적용
+
+        반환값: (적용 단가, 재고 가액 변동)
+        입고는 incoming_rate(없으면 현재 평가단가)로, 출고는 평가 방법에 따른 원가로 계산합니다.
+        """
+        if not qty:
+            return self.rate, 0.0
+
+        if self.method == MOVING_AVERAGE:
+            value_difference = self._apply_moving_average(qty, incoming_rate)
+        else:
+            value_difference = self._apply_queue(qty, incoming_rate)
+
+        self.qty += qty
+        self.value += value_difference
+        if abs(self.qty) > PRECISION:
+            if self.method == MOVING_AVERAGE:
+                self.rate = self.value / self.qty
+            elif self.qty > 0:
+                self.rate = self.value / self.qty
+        else:
+            self.qty = 0.0
+            self.value = 0.0
+
+        return abs(value_difference / qty), value_difference
+
+    def _apply_moving_average(self, qty: float, incoming_rate: Optional[float]) -> float:
+        if qty > 0:
+            rate = incoming_rate if incoming_rate else self.rate
+            return qty * rate
+        return qty * self.rate
+
+    def _apply_queue(self, qty: float, incoming_rate: Optional[float]) -> float:
+        queue = self.queue
+        if qty > 0:
+            rate = incoming_rate if incoming_rate else self.rate
+            if queue and queue[-1][0] < 0:
+                # 선출고(음수 재고) 단위를 먼저 상계
+                remaining = queue[-1][0] + qty
+                if remaining > PRECISION:
+                    queue[-1] = [remaining, rate]
+                elif remaining < -PRECISION:
+                    queue[-1][0] = remaining
+                else:
+                    queue.pop()
+                # 음수 재고 구간은 출고 당시 단가로 가액을 맞춤
+                value_after = sum(bin_qty * bin_rate for bin_qty, bin_rate in queue)
+                self.rate = rate
+                return value_after - self.value
+            if queue and abs(queue[-1][1] - rate) <= PRECISION:
+                queue[-1][0] += qty
+            else:
+                queue.append([qty, rate])
+            return qty * rate
+
+        to_issue = -qty
+        issued_value = 0.0
+        index = 0 if self.method == FIFO else -1
+        while to_issue > PRECISION and queue and queue[index][0] > 0:
+            bin_qty, bin_rate = queue[index]
+            taken = min(bin_qty, to_issue)
+            issued_value += taken * bin_rate
+            to_issue -= taken
+            if bin_qty - taken > PRECISION:
+                queue[index][0] = bin_qty - taken
+            else:
+                queue.pop(index)
+
+        if to_issue > PRECISION:
+            # 재고가 부족하면 마지막 평가단가로 음수 재고 단위를 남김
+            issued_value += to_issue * self.rate
+            if queue and queue[-1][0] < 0:
+                queue[-1][0] -= to_issue
+            else:
+                queue.append([-to_issue, self.rate])
+
+        return -issued_value
+
+
+def ledger_sort_key(row: Dict[str, Any]):
+    """
+    원장 처리 순서
+
+    같은 전표의 창고 이동은 출고 행(음수)이 입고 행보다 먼저 오도록 정렬해
+    입고 행이 출고 원가를 그대로 이어받게 합니다.
+    """
+    return (
+        row['posting_datetime'], row['creation'], row['voucher_no'] or '',
+        row['voucher_detail_no'] or '', row['actual_qty'] or 0, row['name']
+    )
+
+
+def iter_ledger(
+    rows: Iterable[Dict[str, Any]],
+    states: Dict[Tuple[str, str], ValuationState],
+    methods: Dict[str, str]
+) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """
+    원장 행 순차 평가 (입력 행을 하나씩 읽어 (행, 계산 결과)를 차례로 반환)
+
+    rows를 목록으로 모으지 않으므로 데이터베이스에서 나눠 읽는 원장 행을 그대로 넘길 수 있습니다.
+    인자와 계산 결과는 compute_ledger와 같습니다.
+    """
+    transfer_rates: Dict[Tuple[str, str, str], float] = {}
+
+    for row in rows:
+        key = (row['item_code'], row['warehouse'])
+        state = states.get(key)
+        if state is None:
+            state = states[key] = ValuationState(methods.get(row['item_code'], FIFO))
+
+        qty = row['actual_qty'] or 0
+        transfer_key = (row['item_code'], row['voucher_no'], row['voucher_detail_no'])
+        incoming_rate = row.get('incoming_rate')
+        if qty > 0 and row['voucher_detail_no'] and transfer_key in transfer_rates:
+            # 창고 이동 입고는 같은 상세 행의 출고 원가로 평가
+            incoming_rate = transfer_rates[transfer_key]
+
+        rate, value_difference = state.apply(qty, incoming_rate)
+        if qty < 0 and row['voucher_detail_no']:
+            transfer_rates[transfer_key] = rate
+
+        yield row, {
+            "name": row['name'],
+            "qty_after_transaction": state.qty,
+            "incoming_rate": rate if qty > 0 else 0,
+            "valuation_rate": state.rate,
+            "stock_value": state.value,
+            "stock_value_difference": value_difference,
+            "stock_queue": state.dump_queue(),
+        }
+
+
+def compute_ledger(
+    rows: Iterable[Dict[str, Any]],
+    states: Dict[Tuple[str, str], ValuationState],
+    methods: Dict[str, str]
+) -> List[Dict[str, Any]]:
+    """
+    원장 행 일괄 평가
+
+    rows: 전기 순서로 정렬된 원장 행 (name, item_code, warehouse, actual_qty, incoming_rate,
+          voucher_no, voucher_detail_no 포함)
+    states: (품목, 창고)별 시작 상태 (없으면 빈 상태에서 시작, 처리 후 최종 상태로 갱신됨)
+    methods: 품목별 평가 방법
+
+    반환값: 행별 계산 결과 (name, qty_after_transaction, incoming_rate, valuation_rate,
+            stock_value, stock_value_difference, stock_queue)
+    """
+    return [result for _, result in iter_ledger(rows, states, methods)]
@@ -4,12 +4,16 @@ ERPNext의 Warehouse와 동일한 구조
 """
 from sqlalchemy import Column, String, Integer, Float, Text, Boolean, DateTime
 from core.doctype.base import DocTypeBase, Base, DocTypeMeta, register_doctype
+from core.doctype.nestedset import NestedSetMixin
+from core.doctype.validation import is_valid_email
+from modules.stock.stock_ledger import make_sl_entries, cancel_sl_entries
 
 
-class Warehouse(DocTypeBase, Base):
+class Warehouse(NestedSetMixin, DocTypeBase, Base):
     """창고 마스터"""
     
     __tablename__ = 'tabWarehouse'
+    nsm_parent_field = 'parent_warehouse'
     
     # 기본 정보
     warehouse_name = Column(String(140), nullable=False)
@@ -56,9 +60,7 @@ class Warehouse(DocTypeBase, Base):
         
         # 이메일 유효성 검사
         if self.email_id:
-            import re
-            email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-            if not re.match(email_pattern, self.email_id):
+            if not is_valid_email(self.email_id):
                 errors.append("올바른 이메일 주소를 입력하세요.")
         
         return errors
@@ -114,6 +116,34 @@ class StockEntry(DocTypeBase, Base):
                 errors.append(f"{self.purpose}에는 입고 창고가 필요합니다.")
         
         return errors
+    
+    def get_sl_entries(self, db) -> list:
+        """상세 행별 원장 기록 내용 (출고 창고는 -수량, 입고 창고는 +수량)"""
+        entries = []
+        for detail in self.get_child_docs(db, 'items'):
+            qty = detail.transfer_qty or (detail.qty or 0) * (detail.conversion_factor or 1)
+            source = detail.s_warehouse or self.from_warehouse
+            target = detail.t_warehouse or self.to_warehouse
+            common = {
+                "item_code": detail.item_code,
+                "posting_date": self.posting_date,
+                "posting_time": self.posting_time,
+                "voucher_type": "Stock Entry",
+                "voucher_no": self.name,
+                "voucher_detail_no": detail.name,
+            }
+            
+            if source:
+                entries.append({**common, "warehouse": source, "actual_qty": -qty})
+            if target:
+                entries.append({**common, "warehouse": target, "actual_qty": qty, "incoming_rate": detail.basic_rate})
+        return entries
+    
+    def on_submit(self, db):
+        make_sl_entries(db, self.get_sl_entries(db))
+    
+    def on_cancel(self, db):
+        cancel_sl_entries(db, "Stock Entry", self.name)
 
 
 class StockEntryDetail(DocTypeBase, Base):
@@ -342,6 +372,12 @@ stock_entry_meta = DocTypeMeta({
             "fieldtype": "Link",
             "label": "프로젝트",
             "options": "Project"
+        },
+        {
+            "fieldname": "items",
+            "fieldtype": "Table",
+            "label": "이동 품목",
+            "options": "Stock Entry Detail"
         }
     ],
     "permissions": [
@@ -0,0 +1,43 @@
+"""
+스크립트: 총계정원장에서 계정 기간 잔액 재계산
+증분 갱신된 (계정, 회사, 월) 잔액이 원장과 어긋났을 때(데이터 이관, 수동 수정 등) 원장을 기준으로 다시 계산합니다.
+
+사용법: python scripts/rebuild_gl_balances.py [--company 회사]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from core.config import get_database_url
+from core.doctype.base import load_doctype_modules
+from modules.accounts.general_ledger import rebuild_period_balances
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="총계정원장에서 계정 기간 잔액 재계산")
+    parser.add_argument("--company", help="재계산할 회사 (없으면 전체)")
+    args = parser.parse_args()
+    
+    load_doctype_modules()
+    engine = create_engine(get_database_url())
+    db = sessionmaker(bind=engine)()
+    
+    try:
+        print("🔄 계정 기간 잔액 재계산 중...")
+        count = rebuild_period_balances(db, args.company)
+        print(f"✅ {count}개의 기간 잔액을 다시 계산했습니다.")
+    finally:
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
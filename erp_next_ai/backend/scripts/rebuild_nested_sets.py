@@ -0,0 +1,43 @@
+"""
+스크립트: 트리 DocType(Account, Warehouse 등)의 lft/rgt 번호 재계산
+기존 데이터에 트리 번호를 채우거나, 직접 수정한 상위 항목을 반영할 때 사용합니다.
+"""
+
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from core.config import get_database_url
+from core.doctype.base import DOCTYPE_REGISTRY, load_doctype_modules
+from core.doctype.nestedset import NestedSetMixin, rebuild_tree
+
+
+def main():
+    """메인 함수"""
+    load_doctype_modules()
+    engine = create_engine(get_database_url())
+    db = sessionmaker(bind=engine)()
+    
+    try:
+        for doctype_name, info in DOCTYPE_REGISTRY.items():
+            if not issubclass(info['model'], NestedSetMixin):
+                continue
+            print(f"🔄 {doctype_name} 트리 번호 재계산 중...")
+            count = rebuild_tree(db, info['model'])
+            db.commit()
+            print(f"✅ {doctype_name}: {count}개 항목")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+스크립트: 프로젝트 진행 집계 재계산
+데이터 이관이나 대량 작업 뒤에 근무시간/작업에서 작업의 실제 시간·진행률과
+프로젝트의 시간·원가·청구 합계·진행률을 다시 집계합니다.
+
+사용법: python scripts/rebuild_project_rollups.py [--project 프로젝트 ...]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from core.config import get_database_url
+from core.doctype.base import load_doctype_modules
+from modules.projects.rollup import rebuild_project_rollups
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="프로젝트 진행 집계 재계산")
+    parser.add_argument("--project", action="append", dest="projects", help="재계산할 프로젝트 (여러 번 지정 가능, 없으면 전체)")
+    args = parser.parse_args()
+    
+    load_doctype_modules()
+    engine = create_engine(get_database_url())
+    db = sessionmaker(bind=engine)()
+    
+    try:
+        print(f"🔄 프로젝트 집계 재계산 중... ({', '.join(args.projects) if args.projects else '전체'})")
+        result = rebuild_project_rollups(db, args.projects)
+        print(f"✅ 작업 {result['tasks']}개, 프로젝트 {result['projects']}개를 다시 집계했습니다.")
+    finally:
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
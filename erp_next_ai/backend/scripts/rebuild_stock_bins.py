@@ -0,0 +1,44 @@
+"""
+스크립트: 재고 원장에서 Bin(품목/창고별 현재 재고) 재계산
+증분 갱신된 Bin이 원장과 어긋났을 때(데이터 이관, 수동 수정 등) 원장을 기준으로 다시 계산합니다.
+
+사용법: python scripts/rebuild_stock_bins.py [--item 품목코드 ...] [--warehouse 창고 ...]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from core.config import get_database_url
+from core.doctype.base import load_doctype_modules
+from modules.stock.stock_ledger import rebuild_bins
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="재고 원장에서 Bin 재계산")
+    parser.add_argument("--item", action="append", dest="items", help="재계산할 품목 코드 (여러 번 지정 가능)")
+    parser.add_argument("--warehouse", action="append", dest="warehouses", help="재계산할 창고 (여러 번 지정 가능)")
+    args = parser.parse_args()
+    
+    load_doctype_modules()
+    engine = create_engine(get_database_url())
+    db = sessionmaker(bind=engine)()
+    
+    try:
+        print("🔄 재고 원장에서 Bin 재계산 중...")
+        count = rebuild_bins(db, args.items, args.warehouses)
+        print(f"✅ {count}개의 Bin을 다시 계산했습니다.")
+    finally:
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+스크립트: 재고 평가 재계산 (재전기)
+평가 방법을 바꾸었거나 과거 일자의 원장을 수정한 뒤, 지정한 전기일부터 원장 평가와 Bin을 다시 계산합니다.
+
+사용법: python scripts/repost_item_valuation.py [--from-date YYYY-MM-DD] [--item 품목코드 ...] [--warehouse 창고 ...]
+"""
+
+import argparse
+import sys
+from datetime import date
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from core.config import get_database_url
+from core.doctype.base import load_doctype_modules
+from modules.stock.stock_ledger import repost_item_valuation
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="재고 평가 재계산")
+    parser.add_argument("--from-date", type=date.fromisoformat, help="재계산 시작 전기일 (없으면 전체 이력)")
+    parser.add_argument("--item", action="append", dest="items", help="재계산할 품목 코드 (여러 번 지정 가능)")
+    parser.add_argument("--warehouse", action="append", dest="warehouses", help="재계산할 창고 (여러 번 지정 가능)")
+    args = parser.parse_args()
+    
+    load_doctype_modules()
+    engine = create_engine(get_database_url())
+    db = sessionmaker(bind=engine)()
+    
+    try:
+        print(f"🔄 재고 평가 재계산 중... (시작일: {args.from_date or '전체'})")
+        count = repost_item_valuation(db, args.from_date, args.items, args.warehouses)
+        print(f"✅ {count}개의 원장 행을 다시 평가했습니다.")
+    finally:
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
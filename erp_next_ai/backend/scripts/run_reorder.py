@@ -0,0 +1,52 @@
+"""
+스크립트: 재주문 검사
+예상 재고가 재주문 수준 아래인 품목을 찾아 공급업체별 임시 구매주문을 만듭니다.
+마지막 실행 이후 재고가 바뀐 품목만 검사하므로 cron 등으로 주기 실행합니다.
+
+사용법: python scripts/run_reorder.py [--full] [--dry-run]
+예) */30 * * * * cd /app/backend && python scripts/run_reorder.py
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from core.config import get_database_url
+from core.doctype.base import load_doctype_modules
+from modules.stock.reorder import run_reorder
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="재주문 검사")
+    parser.add_argument("--full", action="store_true", help="마지막 실행과 관계없이 전체 품목 검사")
+    parser.add_argument("--dry-run", action="store_true", help="구매주문을 만들지 않고 부족 품목만 출력")
+    args = parser.parse_args()
+    
+    load_doctype_modules()
+    engine = create_engine(get_database_url())
+    db = sessionmaker(bind=engine)()
+    
+    try:
+        print(f"🔄 재주문 검사 중... ({'전체' if args.full else '변경된 품목'})")
+        result = run_reorder(db, full=args.full, dry_run=args.dry_run)
+        print(f"📦 재주문 수준 미달 품목: {len(result['items'])}개")
+        for item in result["items"]:
+            print(f"   - {item['item_code']}: 예상 재고 {item['projected_qty']:g} < {item['reorder_level']:g}, 주문 {item['qty']:g}")
+        if result["items_without_supplier"]:
+            print(f"⚠️  기본 공급업체가 없는 품목: {', '.join(result['items_without_supplier'])}")
+        if not args.dry_run:
+            print(f"✅ {len(result['purchase_orders'])}개의 임시 구매주문을 만들었습니다.")
+    finally:
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+스크립트: DocType 인덱스 점검 및 동기화
+DocTypeMeta에서 자동 선언된 인덱스와 데이터베이스의 실제 인덱스를 비교하고,
+--apply 옵션을 주면 누락된 인덱스를 생성합니다.
+(신규 테이블은 create_all/alembic autogenerate로 인덱스까지 함께 생성됩니다)
+"""
+
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine
+from core.config import get_database_url
+from core.doctype.base import Base, load_doctype_modules
+from core.doctype.indexes import compare_indexes, create_missing_indexes
+
+
+def print_report(report):
+    """비교 결과 출력"""
+    for table_name, table_report in report.items():
+        if table_report.get("table_missing"):
+            print(f"⚠️ {table_name}: 테이블이 없습니다")
+            continue
+        
+        missing = table_report["missing"]
+        extra = table_report["extra"]
+        status = "✅" if not missing else "❌"
+        print(f"{status} {table_name}: 선언 {len(missing) + len(table_report['present'])}개, 누락 {len(missing)}개, 미선언 {len(extra)}개")
+        for item in missing:
+            print(f"   - 누락: {item['name']} ({', '.join(item['columns'])})")
+        for item in extra:
+            print(f"   + 미선언: {item['name']} ({', '.join(item['columns'])})")
+
+
+def main():
+    """메인 함수"""
+    apply = "--apply" in sys.argv[1:]
+    
+    load_doctype_modules()
+    engine = create_engine(get_database_url())
+    
+    try:
+        print("🔍 DocType 인덱스 비교 중...")
+        print_report(compare_indexes(engine, Base.metadata))
+        
+        if apply:
+            print("🔄 누락된 인덱스 생성 중...")
+            created = create_missing_indexes(engine, Base.metadata)
+            print(f"✅ {len(created)}개의 인덱스를 생성했습니다.")
+            for index_name in created:
+                print(f"   - {index_name}")
+        else:
+            print("💡 누락된 인덱스를 생성하려면 --apply 옵션을 사용하세요.")
+    finally:
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+백엔드 테스트 공용 설정
+
+DocType 모듈 전체를 임포트한 뒤 테스트마다 메모리 SQLite 데이터베이스에 테이블을 만들고,
+프로세스 단위 캐시(일정, 조직도, 매출채권 연령, 링크, 검색 역색인)를 비웁니다.
+"""
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# 백엔드 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.doctype.base import Base, load_doctype_modules  # noqa: E402
+
+load_doctype_modules()
+
+from core.doctype.search import memory_search_backend  # noqa: E402
+from core.doctype.validation import shared_link_cache  # noqa: E402
+from modules.accounts.receivables import aging_cache  # noqa: E402
+from modules.hr.org_chart import org_chart_cache  # noqa: E402
+from modules.projects.scheduling import schedule_cache  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """프로세스 캐시 초기화 (테스트 간 결과 공유 방지)"""
+    for cache in (schedule_cache, org_chart_cache, aging_cache):
+        cache.clear()
+    shared_link_cache.invalidate()
+    memory_search_backend.indexes.clear()
+    yield
+
+
+@pytest.fixture
+def engine():
+    """테이블을 만든 메모리 SQLite 엔진"""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    """동기 세션"""
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+# 동시 조회 제한 시간 (초)
+CONCURRENCY_TIMEOUT = 10
+
+
+async def _prepared_async_engine(url: str, rows):
+    """테이블을 만들고 rows((모델, 행 목록))를 넣은 비동기 엔진"""
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    engine = create_async_engine(url)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        for model_class, values in rows:
+            await connection.execute(insert(model_class.__table__), values)
+    return engine
+
+
+@pytest.fixture
+def run_async(tmp_path):
+    """
+    비동기 세션으로 코루틴 함수를 실행하는 함수
+
+    run(rows, fn): rows는 (모델, 행 목록)으로 미리 넣을 데이터, fn은 AsyncSession을 받는 코루틴 함수이며 결과를 반환.
+    """
+    pytest.importorskip('aiosqlite')
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    url = f"sqlite+aiosqlite:///{tmp_path / 'async.db'}"
+
+    async def main(rows, fn):
+        engine = await _prepared_async_engine(url, rows)
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+                return await fn(db)
+        finally:
+            await engine.dispose()
+
+    return lambda rows, fn: asyncio.run(main(rows, fn))
+
+
+@pytest.fixture
+def run_concurrently(tmp_path):
+    """
+    비동기 세션의 run_sync로 동기 함수들을 동시에 실행하는 함수
+
+    run(rows, calls): rows는 (모델, 행 목록)으로 미리 넣을 데이터, calls는 (함수, 인자)이며 결과는 calls 순서.
+    run_sync는 이벤트 루프 스레드에서 실행되므로 잠금을 잡은 채 쿼리를 기다리면 루프 전체가 멈추고
+    wait_for도 동작하지 않습니다. 그래서 별도 스레드의 이벤트 루프에서 실행하고 스레드 대기로 시간을 제한합니다.
+    """
+    pytest.importorskip('aiosqlite')
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    url = f"sqlite+aiosqlite:///{tmp_path / 'concurrent.db'}"
+
+    async def main(rows, calls):
+        engine = await _prepared_async_engine(url, rows)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        try:
+            async def call(fn, args):
+                async with session_factory() as db:
+                    return await db.run_sync(lambda session: fn(session, *args))
+
+            return await asyncio.gather(*(call(fn, args) for fn, args in calls))
+        finally:
+            await engine.dispose()
+
+    def run(rows, calls):
+        outcome = {}
+
+        def target():
+            try:
+                outcome['result'] = asyncio.run(main(rows, calls))
+            except BaseException as e:
+                outcome['error'] = e
+
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        thread.join(CONCURRENCY_TIMEOUT)
+        if thread.is_alive():
+            pytest.fail(f"동시 조회가 {CONCURRENCY_TIMEOUT}초 안에 끝나지 않았습니다 (교착 상태)")
+        if 'error' in outcome:
+            raise outcome['error']
+        return outcome['result']
+
+    return run
+
+
+@pytest.fixture
+def api_client(tmp_path):
+    """
+    생성된 DocType 라우터를 파일 SQLite 데이터베이스에 연결한 TestClient를 만드는 함수
+
+    client(doctypes, rows): doctypes는 라우터를 만들 DocType 이름 목록, rows는 (모델, 행 목록)으로 미리 넣을 데이터.
+    쓰기/읽기 세션 의존성을 모두 같은 aiosqlite 데이터베이스로 바꿉니다.
+    """
+    pytest.importorskip('aiosqlite')
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from core.api.generator import APIGenerator
+    from core.database import get_async_db, get_async_read_db
+
+    path = tmp_path / 'api.db'
+    clients = []
+
+    def client(doctypes, rows=()):
+        sync_engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(sync_engine)
+        with sync_engine.begin() as connection:
+            for model_class, values in rows:
+                connection.execute(insert(model_class.__table__), values)
+        sync_engine.dispose()
+
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        session_factory = async_sessionmaker(async_engine, expire_on_commit=False)
+
+        async def session():
+            async with session_factory() as db:
+                yield db
+
+        app = FastAPI()
+        generator = APIGenerator()
+        for doctype in doctypes:
+            app.include_router(generator.generate_router(doctype))
+        app.dependency_overrides[get_async_db] = session
+        app.dependency_overrides[get_async_read_db] = session
+        app.add_event_handler('shutdown', async_engine.dispose)
+        clients.append(TestClient(app).__enter__())
+        return clients[-1]
+
+    yield client
+    for test_client in clients:
+        test_client.__exit__(None, None, None)
@@ -0,0 +1,112 @@
+"""
+문서 작업 단위 테스트 (전체 검증 후 한 번에 커밋, 실패 시 롤백과 docstatus 복원, 배치 안 링크)
+"""
+from datetime import date
+
+import pytest
+from sqlalchemy import func, select
+
+from core.doctype.base import get_doctype_model
+from core.doctype.batch import DocBatch, doc_batch
+from core.doctype.nestedset import rebuild_tree
+from modules.accounts.account import Account
+from modules.accounts.general_ledger import GLEntry
+from modules.sales.sales_invoice import SalesInvoice
+from modules.stock.warehouse import Warehouse
+
+Customer = get_doctype_model("Customer")
+
+
+def _count(db, model_class):
+    return db.execute(select(func.count()).select_from(model_class)).scalar()
+
+
+def _invoice(name, **values):
+    values = {'customer': 'CU1', 'company': 'C1', 'posting_date': date(2024, 1, 1), 'grand_total': 100,
+              'outstanding_amount': 100, 'docstatus': 0, **values}
+    return SalesInvoice(name=name, **values)
+
+
+@pytest.fixture
+def masters(db):
+    db.add(Customer(name='CU1', customer_name='CU1', customer_type='Company'))
+    db.add_all(
+        Account(name=name, account_name=name, root_type=root_type, is_group=False, company='C1')
+        for name, root_type in (('Receivable', 'Asset'), ('Sales', 'Income'))
+    )
+    db.commit()
+    rebuild_tree(db, Account)
+    db.commit()
+
+
+class TestCommit:
+    """전체 문서를 한 트랜잭션으로 기록"""
+
+    def test_documents_linked_within_batch(self, db):
+        with doc_batch(db) as batch:
+            batch.save(Warehouse(name='Root', warehouse_name='Root', company='C1'))
+            batch.save(Warehouse(name='Child', warehouse_name='Child', company='C1', parent_warehouse='Root'))
+
+        assert batch.committed
+        assert _count(db, Warehouse) == 2
+
+    def test_link_error_writes_nothing(self, db):
+        with pytest.raises(ValueError, match='MISSING'):
+            with doc_batch(db) as batch:
+                batch.save(Warehouse(name='W1', warehouse_name='W1', company='C1'))
+                batch.save(Warehouse(name='W2', warehouse_name='W2', company='C1', parent_warehouse='MISSING'))
+
+        assert _count(db, Warehouse) == 0
+
+    def test_error_in_block_writes_nothing(self, db):
+        with pytest.raises(RuntimeError):
+            with doc_batch(db) as batch:
+                batch.save(Warehouse(name='W1', warehouse_name='W1', company='C1'))
+                raise RuntimeError()
+
+        assert not batch.committed
+        assert _count(db, Warehouse) == 0
+
+    def test_conflicting_actions_are_rejected(self, db):
+        batch = DocBatch(db)
+        invoice = batch.save(_invoice('SI-1'))
+        batch.submit(invoice)
+        with pytest.raises(ValueError):
+            batch.delete(invoice)
+        assert len(batch) == 1
+
+
+class TestDocstatusRollback:
+    """커밋 실패 시 제출/취소 전 docstatus 복원"""
+
+    def test_failed_submit_restores_draft(self, db, masters):
+        invoice = _invoice('SI-1')
+        other = _invoice('SI-2', debit_to='Receivable', income_account='Sales')
+        batch = DocBatch(db)
+        batch.submit(other)
+        batch.submit(invoice)
+        with pytest.raises(ValueError, match='매출채권'):
+            batch.commit()
+
+        assert (invoice.docstatus, other.docstatus) == (0, 0)
+        assert not batch.committed
+        assert _count(db, SalesInvoice) == 0
+        assert _count(db, GLEntry) == 0
+
+        invoice.debit_to, invoice.income_account = 'Receivable', 'Sales'
+        batch.commit()
+
+        assert (invoice.docstatus, other.docstatus) == (1, 1)
+        assert _count(db, GLEntry) == 4
+
+    def test_invalid_document_leaves_others_as_draft(self, db, masters):
+        valid = _invoice('SI-1', debit_to='Receivable', income_account='Sales')
+        invalid = _invoice('SI-2', grand_total=-1)
+        batch = DocBatch(db)
+        batch.submit(valid)
+        batch.submit(invalid)
+        with pytest.raises(ValueError, match='SI-2'):
+            batch.commit()
+
+        assert (valid.docstatus, invalid.docstatus) == (0, 0)
+        assert _count(db, SalesInvoice) == 0
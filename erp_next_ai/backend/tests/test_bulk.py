@@ -0,0 +1,219 @@
+"""
+대량 생성/수정/삭제 테스트
+"""
+from datetime import date
+
+import pytest
+from sqlalchemy import func, select
+
+from core.doctype.bulk import bulk_delete, bulk_insert, bulk_update, has_document_hooks
+from modules.accounts.item import Item
+from modules.projects.project import Project, Task
+from modules.sales.sales_invoice import SalesInvoice
+from modules.stock.warehouse import Warehouse
+
+
+def _items(*names):
+    return [{'name': name, 'item_code': name, 'item_name': name, 'item_group': 'Products', 'stock_uom': 'Nos'} for name in names]
+
+
+def _count(db, model_class):
+    return db.execute(select(func.count()).select_from(model_class)).scalar()
+
+
+def _errors(result):
+    return {error['index']: error for error in result.to_dict()['errors']}
+
+
+class TestRowErrors:
+    """행별 오류 보고와 atomic 롤백"""
+
+    def test_insert_reports_row_errors(self, db):
+        rows = _items('A', 'B') + [{'name': 'C', 'item_name': 'C'}] + _items('A')
+        result = bulk_insert(db, 'Item', Item, rows)
+
+        assert result.succeeded == ['A', 'B']
+        errors = _errors(result)
+        assert set(errors) == {2, 3}
+        assert errors[3]['name'] == 'A'
+        assert _count(db, Item) == 2
+
+    def test_atomic_insert_writes_nothing(self, db):
+        rows = _items('A', 'B') + [{'name': 'C', 'item_name': 'C'}]
+        result = bulk_insert(db, 'Item', Item, rows, atomic=True)
+
+        assert result.succeeded == []
+        assert list(_errors(result)) == [2]
+        assert _count(db, Item) == 0
+
+    def test_update_reports_row_errors(self, db):
+        bulk_insert(db, 'Item', Item, _items('A', 'B'))
+        rows = [
+            {'name': 'A', 'description': 'x'},
+            {'description': 'no name'},
+            {'name': 'missing', 'description': 'x'},
+            {'name': 'A', 'description': 'again'},
+        ]
+        result = bulk_update(db, Item, rows)
+
+        assert result.succeeded == ['A']
+        assert set(_errors(result)) == {1, 2, 3}
+        db.expire_all()
+        assert db.get(Item, 'A').description == 'x'
+
+    def test_atomic_update_writes_nothing(self, db):
+        bulk_insert(db, 'Item', Item, _items('A'))
+        result = bulk_update(db, Item, [{'name': 'A', 'description': 'x'}, {'name': 'missing'}], atomic=True)
+
+        assert result.succeeded == []
+        db.expire_all()
+        assert db.get(Item, 'A').description is None
+
+    def test_delete_reports_missing(self, db):
+        bulk_insert(db, 'Item', Item, _items('A', 'B'))
+        result = bulk_delete(db, Item, ['A', 'missing', 'A'])
+
+        assert result.succeeded == ['A']
+        assert list(_errors(result)) == [1]
+        assert _count(db, Item) == 1
+
+    def test_bad_link_is_a_row_error(self, db):
+        result = bulk_insert(db, 'Warehouse', Warehouse, [
+            {'name': 'W1', 'warehouse_name': 'W1'},
+            {'name': 'W2', 'warehouse_name': 'W2', 'parent_warehouse': 'missing'},
+            {'name': 'W3', 'warehouse_name': 'W3', 'parent_warehouse': 'W1'},
+        ])
+
+        assert result.succeeded == ['W1', 'W3']
+        assert list(_errors(result)) == [1]
+
+
+class TestDocstatus:
+    """대량 작업은 초안 문서만 다룸"""
+
+    @pytest.fixture
+    def invoices(self, db):
+        for name, docstatus in (('SI-DRAFT', 0), ('SI-SUBMITTED', 1)):
+            db.add(SalesInvoice(
+                name=name, customer='A', company='C', posting_date=date(2024, 1, 1),
+                grand_total=100, outstanding_amount=100, docstatus=docstatus
+            ))
+        db.commit()
+        return db
+
+    def test_insert_rejects_submitted(self, db):
+        rows = _items('A')
+        rows[0]['docstatus'] = 1
+        result = bulk_insert(db, 'Item', Item, rows)
+
+        assert result.succeeded == []
+        assert _count(db, Item) == 0
+
+    def test_update_rejects_docstatus_change(self, invoices):
+        result = bulk_update(invoices, SalesInvoice, [{'name': 'SI-DRAFT', 'docstatus': 1}])
+
+        assert result.succeeded == []
+        invoices.expire_all()
+        assert invoices.get(SalesInvoice, 'SI-DRAFT').docstatus == 0
+
+    def test_update_rejects_submitted_document(self, invoices):
+        result = bulk_update(invoices, SalesInvoice, [{'name': 'SI-SUBMITTED', 'grand_total': 1}])
+
+        assert result.succeeded == []
+        invoices.expire_all()
+        assert invoices.get(SalesInvoice, 'SI-SUBMITTED').grand_total == 100
+
+    def test_delete_rejects_submitted_document(self, invoices):
+        result = bulk_delete(invoices, SalesInvoice, ['SI-SUBMITTED', 'SI-DRAFT'])
+
+        assert result.succeeded == ['SI-DRAFT']
+        assert list(_errors(result)) == [0]
+        assert invoices.get(SalesInvoice, 'SI-SUBMITTED') is not None
+
+
+class TestDocumentHooks:
+    """훅이 있는 DocType은 문서마다 저장/삭제 훅을 거침"""
+
+    @pytest.fixture
+    def project(self, db):
+        Project(name='P', project_name='P', percent_complete=0, percent_complete_method='Task Progress').save(db)
+        for name in ('T1', 'T2'):
+            Task(name=name, subject=name, project='P', progress=0).save(db)
+        return db
+
+    def _percent(self, db):
+        db.expire_all()
+        return db.get(Project, 'P').percent_complete
+
+    def test_hook_detection(self):
+        assert has_document_hooks(Task)
+        assert has_document_hooks(SalesInvoice)
+        assert not has_document_hooks(Item)
+        # 트리 번호 훅만 있는 DocType은 rebuild_tree로 처리
+        assert not has_document_hooks(Warehouse)
+
+    @pytest.mark.parametrize('atomic', [False, True])
+    def test_update_runs_rollups(self, project, atomic):
+        result = bulk_update(project, Task, [{'name': 'T1', 'progress': 100}, {'name': 'T2', 'progress': 50}], atomic)
+
+        assert result.succeeded == ['T1', 'T2']
+        assert self._percent(project) == pytest.approx(75)
+
+    def test_insert_runs_rollups(self, project):
+        result = bulk_insert(project, 'Task', Task, [{'name': 'T3', 'subject': 'T3', 'project': 'P', 'progress': 90}])
+
+        assert result.succeeded == ['T3']
+        assert self._percent(project) == pytest.approx(30)
+
+    def test_delete_runs_rollups(self, project):
+        bulk_update(project, Task, [{'name': 'T1', 'progress': 100}])
+        result = bulk_delete(project, Task, ['T2'])
+
+        assert result.succeeded == ['T2']
+        assert self._percent(project) == pytest.approx(100)
+
+    def test_hook_error_is_a_row_error(self, project):
+        bulk_update(project, Task, [{'name': 'T2', 'depends_on': 'T1'}])
+        result = bulk_update(project, Task, [{'name': 'T1', 'depends_on': 'T2'}, {'name': 'T2', 'progress': 40}])
+
+        assert result.succeeded == ['T2']
+        assert "순환" in _errors(result)[0]['errors'][0]
+        assert self._percent(project) == pytest.approx(20)
+
+    def test_atomic_hook_error_rolls_back(self, project):
+        bulk_update(project, Task, [{'name': 'T2', 'depends_on': 'T1'}])
+        result = bulk_update(
+            project, Task, [{'name': 'T2', 'progress': 40}, {'name': 'T1', 'depends_on': 'T2'}], atomic=True
+        )
+
+        assert result.succeeded == []
+        assert list(_errors(result)) == [1]
+        assert self._percent(project) == 0
+
+
+class TestTreeDelete:
+    """남는 하위 항목이 있는 트리 항목은 삭제하지 않음"""
+
+    @pytest.fixture
+    def tree(self, db):
+        bulk_insert(db, 'Warehouse', Warehouse, [
+            {'name': 'Root', 'warehouse_name': 'Root'},
+            {'name': 'Mid', 'warehouse_name': 'Mid', 'parent_warehouse': 'Root'},
+            {'name': 'Leaf', 'warehouse_name': 'Leaf', 'parent_warehouse': 'Mid'},
+        ])
+        return db
+
+    def test_parent_with_remaining_child(self, tree):
+        result = bulk_delete(tree, Warehouse, ['Root', 'Mid'])
+
+        assert result.succeeded == []
+        assert set(_errors(result)) == {0, 1}
+        assert _count(tree, Warehouse) == 3
+
+    def test_whole_subtree(self, tree):
+        result = bulk_delete(tree, Warehouse, ['Mid', 'Leaf'])
+
+        assert result.succeeded == ['Mid', 'Leaf']
+        root = tree.get(Warehouse, 'Root')
+        tree.refresh(root)
+        assert (root.lft, root.rgt) == (1, 2)
@@ -0,0 +1,109 @@
+"""
+자식 테이블 테스트 (부모와 함께 저장/교체/삭제, 부모별 일괄 조회, API expand와 자식 행 저장)
+"""
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import func, select
+
+from core.doctype.base import get_child_tables, load_child_rows
+from modules.hr.employee import Employee
+from modules.projects.project import Timesheet, TimesheetDetail
+
+EMPLOYEE = {'name': 'E1', 'employee_name': 'E1', 'first_name': 'E1', 'company': 'C1',
+            'date_of_joining': date(2020, 1, 1)}
+
+
+def _log(activity, hours=1, day=2):
+    return {'activity_type': activity, 'hours': hours,
+            'from_time': datetime(2024, 1, day, 9), 'to_time': datetime(2024, 1, day, 9 + hours)}
+
+
+def _timesheet(db, name, *logs):
+    timesheet = Timesheet(name=name, employee='E1', start_date=date(2024, 1, 1), end_date=date(2024, 1, 31))
+    timesheet.set_children('time_logs', list(logs))
+    return timesheet.save(db)
+
+
+def _activities(db, parent):
+    return [row['activity_type'] for row in load_child_rows(db, Timesheet, 'time_logs', [parent])[parent]]
+
+
+@pytest.fixture
+def employee(db):
+    db.add(Employee(**EMPLOYEE))
+    db.commit()
+
+
+class TestChildRows:
+    """부모 저장 트랜잭션 안의 자식 행"""
+
+    def test_child_tables_from_metadata(self):
+        assert get_child_tables(Timesheet) == {'time_logs': TimesheetDetail}
+        with pytest.raises(ValueError):
+            Timesheet().set_children('employee', [])
+
+    def test_saved_with_parent_link_and_order(self, db, employee):
+        _timesheet(db, 'TS1', _log('Design'), _log('Build', day=3))
+
+        rows = db.execute(select(TimesheetDetail).order_by(TimesheetDetail.idx)).scalars().all()
+        assert [(row.parent, row.parenttype, row.idx) for row in rows] == [('TS1', 'Timesheet', 1), ('TS1', 'Timesheet', 2)]
+        assert _activities(db, 'TS1') == ['Design', 'Build']
+
+    def test_children_are_replaced(self, db, employee):
+        timesheet = _timesheet(db, 'TS1', _log('Design'), _log('Build'))
+        timesheet.set_children('time_logs', [_log('Test')])
+        timesheet.save(db)
+
+        assert _activities(db, 'TS1') == ['Test']
+
+    def test_resave_keeps_unchanged_children(self, db, employee):
+        timesheet = _timesheet(db, 'TS1', _log('Design'))
+        timesheet.set_children('time_logs', timesheet.get_children('time_logs'))
+        timesheet.submit(db)
+
+        assert db.execute(select(TimesheetDetail.docstatus)).scalars().all() == [1]
+
+    def test_loaded_per_parent(self, db, employee):
+        _timesheet(db, 'TS1', _log('Design'))
+        _timesheet(db, 'TS2', _log('Build'), _log('Test'))
+
+        children = load_child_rows(db, Timesheet, 'time_logs', ['TS2', 'TS1', 'TS3'])
+        assert {name: [row['activity_type'] for row in rows] for name, rows in children.items()} == {
+            'TS2': ['Build', 'Test'], 'TS1': ['Design'], 'TS3': []
+        }
+
+    def test_deleted_with_parent(self, db, employee):
+        _timesheet(db, 'TS1', _log('Design'))
+        _timesheet(db, 'TS2', _log('Build'))
+        db.get(Timesheet, 'TS1').delete(db)
+
+        assert db.execute(select(func.count()).select_from(TimesheetDetail)).scalar() == 1
+
+
+class TestChildrenApi:
+    """API의 expand 파라미터와 자식 행 저장"""
+
+    @pytest.fixture
+    def client(self, api_client):
+        return api_client(['Timesheet'], [(Employee, [EMPLOYEE])])
+
+    def test_create_and_expand(self, client):
+        response = client.post('/api/timesheet/', json={
+            'name': 'TS1', 'employee': 'E1', 'start_date': '2024-01-01', 'end_date': '2024-01-31',
+            'time_logs': [
+                {**_log('Design'), 'from_time': '2024-01-02T09:00:00', 'to_time': '2024-01-02T10:00:00'},
+            ],
+        })
+        assert response.status_code == 200, response.text
+        assert [row['activity_type'] for row in response.json()['time_logs']] == ['Design']
+
+        document = client.get('/api/timesheet/TS1', params={'expand': 'time_logs', 'fields': 'employee'}).json()
+        assert document['employee'] == 'E1'
+        assert [row['from_time'] for row in document['time_logs']] == ['2024-01-02T09:00:00']
+
+        listed = client.get('/api/timesheet/', params={'expand': 'time_logs'}).json()['data']
+        assert [len(row['time_logs']) for row in listed] == [1]
+
+    def test_unknown_expand_field_is_400(self, client):
+        assert client.get('/api/timesheet/', params={'expand': 'employee'}).status_code == 400
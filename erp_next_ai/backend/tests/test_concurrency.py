@@ -0,0 +1,144 @@
+"""
+낙관적 동시성 테스트 (버전 선점, 읽은 버전 지정, 대량 수정 modified, API 409)
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from core.doctype.base import DocumentConflictError
+from core.doctype.bulk import bulk_update
+from modules.accounts.item import Item
+
+READ_AT = datetime(2024, 1, 1, 9, 0)
+
+
+def _item_row(name, **values):
+    return {'name': name, 'item_code': name, 'item_name': name, 'item_group': 'Products', 'stock_uom': 'Nos',
+            'modified': READ_AT, **values}
+
+
+def _errors(result):
+    return {error['index']: error for error in result.to_dict()['errors']}
+
+
+@pytest.fixture
+def item(db):
+    db.add(Item(**_item_row('A')))
+    db.commit()
+    return db.get(Item, 'A')
+
+
+@pytest.fixture
+def other_session(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+class TestClaimVersion:
+    """단건 저장의 버전 선점"""
+
+    def test_save_advances_version(self, db, item):
+        item.description = 'x'
+        item.save(db)
+
+        assert item.modified > READ_AT
+
+    def test_save_after_other_update_conflicts(self, db, item, other_session):
+        item.description = 'mine'
+        other = other_session.get(Item, 'A')
+        other.description = 'theirs'
+        other.save(other_session)
+
+        with pytest.raises(DocumentConflictError):
+            item.save(db)
+        db.rollback()
+        assert db.get(Item, 'A').description == 'theirs'
+
+    def test_expected_version_from_client(self, db, item):
+        item.description = 'x'
+        item.expect_modified(READ_AT - timedelta(seconds=1))
+        with pytest.raises(DocumentConflictError):
+            item.save(db)
+        db.rollback()
+
+        item.description = 'y'
+        item.expect_modified(READ_AT)
+        item.save(db)
+        assert item.description == 'y'
+
+    def test_same_timestamp_still_changes_version(self, db):
+        future = datetime.utcnow() + timedelta(days=1)
+        db.add(Item(**_item_row('A', modified=future)))
+        db.commit()
+
+        item = db.get(Item, 'A')
+        item.description = 'x'
+        item.save(db)
+        assert item.modified > future
+
+
+class TestBulkModified:
+    """대량 수정 행의 modified"""
+
+    def test_stale_row_is_409(self, db, item):
+        result = bulk_update(db, Item, [
+            {'name': 'A', 'description': 'stale', 'modified': READ_AT - timedelta(seconds=1)},
+        ])
+
+        assert result.succeeded == []
+        assert _errors(result)[0]['status'] == 409
+        db.expire_all()
+        assert db.get(Item, 'A').description is None
+
+    def test_current_row_is_updated(self, db, item):
+        db.add(Item(**_item_row('B')))
+        db.commit()
+        result = bulk_update(db, Item, [
+            {'name': 'A', 'description': 'x', 'modified': READ_AT},
+            {'name': 'B', 'description': 'y'},
+        ])
+
+        assert result.succeeded == ['A', 'B']
+        db.expire_all()
+        assert db.get(Item, 'A').modified > READ_AT
+
+    def test_atomic_conflict_rolls_back(self, db, item):
+        db.add(Item(**_item_row('B')))
+        db.commit()
+        result = bulk_update(db, Item, [
+            {'name': 'B', 'description': 'y'},
+            {'name': 'A', 'description': 'x', 'modified': READ_AT + timedelta(seconds=1)},
+        ], atomic=True)
+
+        assert result.succeeded == []
+        assert _errors(result)[1]['status'] == 409
+        db.expire_all()
+        assert db.get(Item, 'B').description is None
+
+
+class TestConflictResponses:
+    """API의 409 응답"""
+
+    def test_update_with_stale_modified(self, api_client):
+        client = api_client(['Item'], [(Item, [_item_row('A')])])
+
+        response = client.put('/api/item/A', json={'description': 'x', 'modified': '2023-12-31T00:00:00'})
+        assert response.status_code == 409
+
+        response = client.put('/api/item/A', json={'description': 'x', 'modified': READ_AT.isoformat()})
+        assert response.status_code == 200
+        assert response.json()['description'] == 'x'
+
+    def test_bulk_update_reports_409_rows(self, api_client):
+        client = api_client(['Item'], [(Item, [_item_row('A'), _item_row('B')])])
+
+        response = client.put('/api/item/bulk', json=[
+            {'name': 'A', 'description': 'x', 'modified': '2023-12-31T00:00:00'},
+            {'name': 'B', 'description': 'y', 'modified': READ_AT.isoformat()},
+        ])
+        assert response.status_code == 200
+        body = response.json()
+        assert body['succeeded'] == ['B']
+        assert [(error['index'], error['status']) for error in body['errors']] == [(0, 409)]
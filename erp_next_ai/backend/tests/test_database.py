@@ -0,0 +1,69 @@
+"""
+비동기 데이터베이스 세션 테스트 (비동기 드라이버 URL, 세션 생성/정리, run_sync 문서 저장)
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, select
+
+from core import database
+from core.config import get_async_database_url
+from core.doctype.base import Base
+from modules.stock.warehouse import Warehouse
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    """테이블을 만든 파일 SQLite 데이터베이스 URL"""
+    pytest.importorskip('aiosqlite')
+    url = f"sqlite:///{tmp_path / 'primary.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    return url
+
+
+def _run(database_url, fn):
+    """비동기 엔진을 초기화해 fn()을 실행하고 같은 이벤트 루프에서 정리"""
+    async def main():
+        database.init_async_database(database_url, replica_urls=[])
+        try:
+            return await fn()
+        finally:
+            await database.close_async_database()
+    return asyncio.run(main())
+
+
+class TestAsyncDatabaseUrl:
+    """동기 URL → 비동기 드라이버 URL"""
+
+    @pytest.mark.parametrize('url, expected', [
+        ('postgresql://u:p@db:5432/erp', 'postgresql+asyncpg://u:p@db:5432/erp'),
+        ('postgres://u:p@db/erp', 'postgresql+asyncpg://u:p@db/erp'),
+        ('postgresql+psycopg2://u:p@db/erp', 'postgresql+asyncpg://u:p@db/erp'),
+        ('sqlite:///./erp.db', 'sqlite+aiosqlite:///./erp.db'),
+        ('mysql://u:p@db/erp', 'mysql://u:p@db/erp'),
+    ])
+    def test_drivers(self, url, expected):
+        assert get_async_database_url(url) == expected
+
+
+class TestAsyncSession:
+    """요청/라우터 외부용 비동기 세션"""
+
+    def test_document_saved_through_run_sync(self, database_url):
+        async def save_and_read():
+            async with database.get_async_db_session() as db:
+                warehouse = Warehouse(name='W1', warehouse_name='W1', company='C1')
+                await db.run_sync(warehouse.save)
+            async with database.get_async_db_session(read_only=True) as db:
+                return (await db.execute(select(Warehouse.name))).scalars().all()
+
+        assert _run(database_url, save_and_read) == ['W1']
+
+    def test_close_resets_engines(self, database_url):
+        async def noop():
+            return None
+
+        _run(database_url, noop)
+        assert (database.async_engine, database.AsyncSessionLocal, database.replica_router) == (None, None, None)
@@ -0,0 +1,97 @@
+"""
+스트리밍 내보내기 테스트 (NDJSON/CSV 형식, 목록과 같은 필터/정렬, 필드 선택, 청크 단위)
+"""
+import asyncio
+import csv
+import io
+import json
+from datetime import datetime
+
+from core.api.export import iter_csv, iter_ndjson
+from core.doctype.serializer import get_serializer
+from modules.accounts.item import Item
+
+
+def _item_rows():
+    return [
+        {'name': code, 'item_code': code, 'item_name': item_name, 'item_group': group, 'stock_uom': 'Nos',
+         'standard_rate': rate, 'creation': datetime(2024, 1, 1, 9, 30)}
+        for code, item_name, group, rate in [
+            ('I1', 'Widget', 'Products', 10), ('I2', '볼트, 대형', 'Products', 2.5), ('I3', 'Assembly', 'Services', 0),
+        ]
+    ]
+
+
+async def _rows(rows):
+    for row in rows:
+        yield row
+
+
+def _chunks(iterator):
+    async def collect():
+        return [chunk async for chunk in iterator]
+    return asyncio.run(collect())
+
+
+class TestExportEndpoint:
+    """생성된 /export 경로"""
+
+    def test_ndjson_uses_list_sort_and_filters(self, api_client):
+        client = api_client(['Item'], [(Item, _item_rows())])
+
+        response = client.get('/api/item/export', params={
+            'filters': json.dumps([['item_group', '=', 'Products']]), 'fields': 'item_name,creation'
+        })
+        assert response.status_code == 200
+        assert response.headers['content-type'].startswith('application/x-ndjson')
+        assert response.headers['content-disposition'] == 'attachment; filename="Item.ndjson"'
+        assert [json.loads(line) for line in response.text.splitlines()] == [
+            {'item_name': 'Widget', 'creation': '2024-01-01T09:30:00'},
+            {'item_name': '볼트, 대형', 'creation': '2024-01-01T09:30:00'},
+        ]
+
+    def test_csv_has_header_and_quoted_values(self, api_client):
+        client = api_client(['Item'], [(Item, _item_rows())])
+
+        response = client.get('/api/item/export', params={'format': 'csv', 'fields': 'name,item_name,standard_rate'})
+        assert response.status_code == 200
+        assert list(csv.reader(io.StringIO(response.text))) == [
+            ['name', 'item_name', 'standard_rate'],
+            ['I3', 'Assembly', '0.0'],
+            ['I1', 'Widget', '10.0'],
+            ['I2', '볼트, 대형', '2.5'],
+        ]
+
+    def test_invalid_filter_is_400(self, api_client):
+        client = api_client(['Item'], [(Item, _item_rows())])
+
+        assert client.get('/api/item/export', params={'filters': '[["password", "=", 1]]'}).status_code == 400
+        assert client.get('/api/item/export', params={'format': 'xml'}).status_code == 422
+
+
+class TestChunks:
+    """batch_size 행마다 한 청크"""
+
+    def test_ndjson_chunks(self):
+        serializer = get_serializer(Item).project(['name', 'creation'])
+        rows = [('I1', datetime(2024, 1, 1)), ('I2', None), ('I3', datetime(2024, 1, 3))]
+
+        chunks = _chunks(iter_ndjson(_rows(rows), serializer, batch_size=2))
+        assert len(chunks) == 2
+        assert [json.loads(line) for line in ''.join(chunks).splitlines()] == [
+            {'name': 'I1', 'creation': '2024-01-01T00:00:00'},
+            {'name': 'I2', 'creation': None},
+            {'name': 'I3', 'creation': '2024-01-03T00:00:00'},
+        ]
+
+    def test_csv_chunks_ignore_extra_columns(self):
+        serializer = get_serializer(Item).project(['name'], extra=['modified'])
+        rows = [('I1', datetime(2024, 1, 1)), ('I2', None)]
+
+        chunks = _chunks(iter_csv(_rows(rows), serializer, batch_size=1))
+        assert chunks == ['name\r\nI1\r\n', 'I2\r\n']
+
+    def test_empty_export_has_header_only(self):
+        serializer = get_serializer(Item).project(['name', 'item_name'])
+        assert _chunks(iter_csv(_rows([]), serializer)) == ['name,item_name\r\n']
+        assert _chunks(iter_ndjson(_rows([]), serializer)) == []
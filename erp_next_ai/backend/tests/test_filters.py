@@ -0,0 +1,98 @@
+"""
+목록 필터 테스트 (형식 정규화, 연산자별 조건, 필드/연산자 검증, 인덱스 사용 보고)
+"""
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+
+from core.doctype.base import get_doctype_meta
+from core.doctype.filters import FilterError, apply_filters, compile_filters, index_report, parse_filters
+from modules.accounts.item import Item
+
+META = get_doctype_meta('Item')
+
+
+@pytest.fixture
+def items(db):
+    for index, (code, brand, rate) in enumerate([('A', 'Acme', 10), ('B', None, 25), ('C', 'Bolt', 40)]):
+        db.add(Item(
+            name=code, item_code=code, item_name=f'{code} Item', item_group='Products', brand=brand,
+            standard_rate=rate, creation=datetime(2024, 1, index + 1)
+        ))
+    db.commit()
+
+
+def _names(db, filters):
+    stmt = apply_filters(select(Item.name), compile_filters(META, Item, filters)).order_by(Item.name)
+    return db.execute(stmt).scalars().all()
+
+
+class TestParseFilters:
+    """입력 형식별 (field, op, value) 정규화"""
+
+    @pytest.mark.parametrize('filters, expected', [
+        (None, []),
+        ('', []),
+        ('[["brand", "=", "Acme"]]', [('brand', '=', 'Acme')]),
+        ([['Item', 'standard_rate', '>', 5]], [('standard_rate', '>', 5)]),
+        ({'brand': 'Acme', 'standard_rate': ['>=', 10]}, [('brand', '=', 'Acme'), ('standard_rate', '>=', 10)]),
+        ({'item_group': ['Products', 'Services']}, [('item_group', '=', ['Products', 'Services'])]),
+    ])
+    def test_formats(self, filters, expected):
+        assert parse_filters(filters) == expected
+
+    @pytest.mark.parametrize('filters', ['{broken', '"brand"', [['brand', '=']], ['brand']])
+    def test_invalid_formats(self, filters):
+        with pytest.raises(FilterError):
+            parse_filters(filters)
+
+
+class TestCompileFilters:
+    """컴파일된 조건의 조회 결과"""
+
+    @pytest.mark.parametrize('filters, expected', [
+        ([['brand', '=', 'Acme']], ['A']),
+        ([['brand', '<>', 'Acme']], ['C']),
+        ([['standard_rate', '>', 10], ['standard_rate', '<=', 40]], ['B', 'C']),
+        ([['name', 'in', 'A, C']], ['A', 'C']),
+        ([['name', 'not in', ['A']]], ['B', 'C']),
+        ([['standard_rate', 'between', [20, 40]]], ['B', 'C']),
+        ([['item_name', 'like', 'B%']], ['B']),
+        ([['brand', 'is', 'not set']], ['B']),
+        ([['brand', 'is', 'set']], ['A', 'C']),
+        ({'brand': None}, ['B']),
+        ([['creation', '>=', '2024-01-02']], ['B', 'C']),
+        ([['creation', 'between', ['2024-01-01', '2024-01-02T00:00:00']]], ['A', 'B']),
+    ])
+    def test_conditions(self, db, items, filters, expected):
+        assert _names(db, filters) == expected
+
+    @pytest.mark.parametrize('filters', [
+        [['password', '=', 'x']],
+        [['brand', 'regexp', 'A']],
+        [['name', 'in', 5]],
+        [['standard_rate', 'between', [1]]],
+        [['brand', 'like', 5]],
+        [['brand', 'is', 'empty']],
+        [['creation', '>', 'yesterday']],
+    ])
+    def test_rejected(self, filters):
+        with pytest.raises(FilterError):
+            compile_filters(META, Item, filters)
+
+
+class TestIndexReport:
+    """필터 필드별 사용 가능한 인덱스"""
+
+    def test_index_usable_conditions(self):
+        compiled = compile_filters(META, Item, [
+            ['name', '=', 'A'], ['item_group', '=', 'Products'], ['brand', 'like', '%cme'], ['standard_rate', '>', 1]
+        ])
+        assert index_report(Item, compiled) == {
+            'name': 'PRIMARY', 'item_group': 'ix_tabitem_item_group', 'brand': None, 'standard_rate': None
+        }
+
+    def test_negation_cannot_use_index(self):
+        compiled = compile_filters(META, Item, [['item_group', '!=', 'Products'], ['name', 'like', 'A%']])
+        assert index_report(Item, compiled) == {'item_group': None, 'name': 'PRIMARY'}
@@ -0,0 +1,185 @@
+"""
+총계정원장과 기간 잔액 테스트 (원장 합산 대조, 취소, 재계산, 시산표, 기간 잔액 동시 생성, 조회 전용 API)
+"""
+from datetime import date
+
+import pytest
+from sqlalchemy import func, select
+
+from core.api.generator import APIGenerator
+from core.config import settings
+from core.doctype.nestedset import rebuild_tree
+from modules.accounts.account import Account
+from modules.accounts.general_ledger import (
+    AccountPeriodBalance, _raw_sums, cancel_gl_entries, fiscal_year_start_of, get_period_sums, get_trial_balance,
+    make_gl_entries, rebuild_period_balances
+)
+
+COMPANY = 'C1'
+ACCOUNTS = [
+    ('Assets', None, 'Asset', True),
+    ('Cash', 'Assets', 'Asset', False),
+    ('Receivable', 'Assets', 'Asset', False),
+    ('Income', None, 'Income', True),
+    ('Sales', 'Income', 'Income', False),
+    ('Expenses', None, 'Expense', True),
+    ('Rent', 'Expenses', 'Expense', False),
+]
+
+
+def _account_rows():
+    return [
+        {'name': name, 'account_name': name, 'parent_account': parent, 'root_type': root_type,
+         'is_group': is_group, 'company': COMPANY}
+        for name, parent, root_type, is_group in ACCOUNTS
+    ]
+
+
+def _journal(voucher_no, posting_date, debit_account, credit_account, amount):
+    common = {'posting_date': posting_date, 'voucher_type': 'Journal Entry', 'voucher_no': voucher_no, 'company': COMPANY}
+    return [
+        {**common, 'account': debit_account, 'debit': amount, 'credit': 0},
+        {**common, 'account': credit_account, 'debit': 0, 'credit': amount},
+    ]
+
+
+def _post(db, *journals):
+    for journal in journals:
+        make_gl_entries(db, journal)
+    db.commit()
+
+
+@pytest.fixture
+def accounts(db):
+    db.add_all(Account(**row) for row in _account_rows())
+    db.commit()
+    rebuild_tree(db, Account)
+    db.commit()
+
+
+@pytest.fixture
+def ledger(db, accounts):
+    _post(
+        db,
+        _journal('JV1', date(2024, 1, 3), 'Cash', 'Sales', 100),
+        _journal('JV2', date(2024, 1, 20), 'Rent', 'Cash', 30),
+        _journal('JV3', date(2024, 2, 10), 'Receivable', 'Sales', 250),
+        _journal('JV4', date(2024, 3, 31), 'Cash', 'Receivable', 200),
+        _journal('JV5', date(2024, 4, 2), 'Rent', 'Cash', 40),
+    )
+
+
+class TestPeriodBalances:
+    """기간 잔액 기반 합계와 원장 행 직접 합산 대조"""
+
+    @pytest.mark.parametrize('from_date, to_date', [
+        (None, date(2024, 4, 30)),
+        (date(2024, 1, 1), date(2024, 3, 31)),
+        (date(2024, 1, 15), date(2024, 3, 30)),
+        (date(2024, 2, 5), date(2024, 2, 20)),
+        (date(2024, 3, 31), date(2024, 4, 2)),
+    ])
+    def test_matches_raw_sums(self, db, ledger, from_date, to_date):
+        expected = _raw_sums(db, COMPANY, from_date or date.min, to_date)
+        assert get_period_sums(db, COMPANY, from_date, to_date) == pytest.approx(expected)
+
+    def test_cancel_subtracts_original_entries(self, db, ledger):
+        assert cancel_gl_entries(db, 'Journal Entry', 'JV3') == 2
+        db.commit()
+
+        sums = get_period_sums(db, COMPANY, date(2024, 2, 1), date(2024, 2, 29))
+        assert sums.get('Sales', (0, 0)) == pytest.approx((0, 0))
+        assert get_period_sums(db, COMPANY, None, date(2024, 4, 30)) == \
+            pytest.approx(_raw_sums(db, COMPANY, date.min, date(2024, 4, 30)))
+
+    def test_rebuild_matches_incremental(self, db, ledger):
+        incremental = {
+            (row.account, row.period_start): (row.debit, row.credit)
+            for row in db.execute(select(AccountPeriodBalance)).scalars()
+            if row.debit or row.credit
+        }
+        assert rebuild_period_balances(db, COMPANY) == len(incremental)
+        rebuilt = {
+            (row.account, row.period_start): (row.debit, row.credit)
+            for row in db.execute(select(AccountPeriodBalance)).scalars()
+        }
+        assert rebuilt == pytest.approx(incremental)
+
+    def test_unbalanced_journal_is_rejected(self, db, accounts):
+        journal = _journal('JV1', date(2024, 1, 3), 'Cash', 'Sales', 100)
+        journal[1]['credit'] = 90
+        with pytest.raises(ValueError):
+            make_gl_entries(db, journal)
+
+
+class TestTrialBalance:
+    """시산표 기초/기간/기말과 그룹 계정 합계"""
+
+    def test_balance_sheet_opening_and_closing(self, db, ledger):
+        rows = {row['account']: row for row in get_trial_balance(db, COMPANY, date(2024, 2, 1), date(2024, 3, 31))}
+
+        assert rows['Cash']['opening_debit'] == pytest.approx(70)
+        assert rows['Cash']['debit'] == pytest.approx(200)
+        assert rows['Cash']['closing_debit'] == pytest.approx(270)
+        assert rows['Receivable']['closing_debit'] == pytest.approx(50)
+        assert rows['Assets']['closing_debit'] == pytest.approx(320)
+        assert sum(row['closing_debit'] - row['closing_credit'] for row in rows.values() if not row['is_group']) \
+            == pytest.approx(0)
+
+    def test_profit_and_loss_opening_resets_at_fiscal_year(self, db, ledger):
+        _post(db, _journal('JV0', date(2023, 11, 15), 'Cash', 'Sales', 1000))
+
+        rows = {row['account']: row for row in get_trial_balance(db, COMPANY, date(2024, 2, 1), date(2024, 2, 29))}
+        assert rows['Sales']['opening_credit'] == pytest.approx(100)
+        assert rows['Income']['opening_credit'] == pytest.approx(100)
+        assert rows['Rent']['opening_debit'] == pytest.approx(30)
+        assert rows['Cash']['opening_debit'] == pytest.approx(1070)
+
+        rows = {row['account']: row for row in get_trial_balance(db, COMPANY, date(2024, 1, 1), date(2024, 1, 31))}
+        assert rows['Sales']['opening_credit'] == 0
+        assert rows['Sales']['closing_credit'] == pytest.approx(100)
+        assert rows['Cash']['opening_debit'] == pytest.approx(1000)
+
+    def test_fiscal_year_start_setting(self, db, ledger, monkeypatch):
+        monkeypatch.setattr(settings, 'FISCAL_YEAR_START', '04-01')
+        assert fiscal_year_start_of(date(2024, 3, 31)) == date(2023, 4, 1)
+        assert fiscal_year_start_of(date(2024, 4, 1)) == date(2024, 4, 1)
+
+        rows = {row['account']: row for row in get_trial_balance(db, COMPANY, date(2024, 4, 1), date(2024, 4, 30))}
+        assert rows['Rent']['opening_debit'] == 0
+        assert rows['Rent']['closing_debit'] == pytest.approx(40)
+
+        rows = {row['account']: row for row in get_trial_balance(db, COMPANY, date(2024, 3, 1), date(2024, 3, 31))}
+        assert rows['Sales']['opening_credit'] == pytest.approx(350)
+
+
+class TestConcurrentPosting:
+    """같은 (계정, 회사, 월)의 첫 전기 동시 기록"""
+
+    def test_first_postings_in_new_month(self, run_concurrently):
+        def post(db, voucher_no):
+            make_gl_entries(db, _journal(voucher_no, date(2024, 5, 1), 'Cash', 'Sales', 10))
+            db.commit()
+            return get_period_sums(db, COMPANY, date(2024, 5, 1), date(2024, 5, 31))['Cash']
+
+        results = run_concurrently([(Account, _account_rows())], [(post, ('JV1',)), (post, ('JV2',))])
+
+        assert max(results) == pytest.approx((20, 0))
+
+    def test_existing_period_row_is_updated(self, db, ledger):
+        _post(db, _journal('JV6', date(2024, 1, 31), 'Cash', 'Sales', 5))
+
+        count = db.execute(select(func.count()).select_from(AccountPeriodBalance).where(
+            AccountPeriodBalance.account == 'Cash', AccountPeriodBalance.period_start == date(2024, 1, 1)
+        )).scalar()
+        assert count == 1
+        assert get_period_sums(db, COMPANY, date(2024, 1, 1), date(2024, 1, 31))['Cash'] == pytest.approx((105, 30))
+
+
+class TestReadOnlyRoutes:
+    """원장/집계 DocType은 조회 API만 생성"""
+
+    @pytest.mark.parametrize('doctype', ['GL Entry', 'Account Period Balance'])
+    def test_only_read_routes(self, doctype):
+        router = APIGenerator().generate_router(doctype)
+        assert {method for route in router.routes for method in route.methods} == {'GET'}
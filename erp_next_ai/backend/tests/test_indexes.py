@@ -0,0 +1,78 @@
+"""
+DocType 인덱스 테스트 (메타데이터에서 도출한 인덱스, 이름 축약, 실제 데이터베이스와 비교/생성)
+"""
+import pytest
+from sqlalchemy import text
+
+from core.doctype.base import Base, get_doctype_meta, get_doctype_model
+from core.doctype.indexes import (
+    MAX_INDEX_NAME_LENGTH, compare_indexes, create_missing_indexes, derive_index_columns, index_name_for
+)
+from modules.accounts.item import Item
+
+TimesheetDetail = get_doctype_model("Timesheet Detail")
+
+
+def _declared(model_class):
+    """B-tree 인덱스 이름 → 컬럼 (트라이그램 검색 인덱스 제외)"""
+    return {
+        index.name: tuple(column.name for column in index.columns)
+        for index in model_class.__table__.indexes if not index.info.get('search')
+    }
+
+
+class TestDerivedIndexes:
+    """정렬/Link/parent 컬럼 인덱스"""
+
+    def test_item_indexes(self):
+        columns = derive_index_columns(get_doctype_meta('Item'), Item)
+
+        assert columns[0] == ('item_name', 'name')
+        assert {('item_group',), ('default_warehouse',), ('default_supplier',)} <= set(columns)
+        assert _declared(Item)['ix_tabitem_item_name_name'] == ('item_name', 'name')
+
+    def test_unique_column_is_not_indexed_again(self):
+        assert not any(columns == ('item_code',) for columns in _declared(Item).values())
+
+    def test_child_table_indexed_by_parent(self):
+        columns = derive_index_columns(get_doctype_meta('Timesheet Detail'), TimesheetDetail)
+
+        assert ('parent',) in columns
+        assert not any(len(column_set) > 1 for column_set in columns)
+
+    def test_long_names_are_shortened(self):
+        long_name = index_name_for('tabSomeVeryLongDocTypeName', ('first_long_column', 'second_long_column', 'name'))
+
+        assert len(long_name) == MAX_INDEX_NAME_LENGTH
+        assert long_name == index_name_for('tabSomeVeryLongDocTypeName', ('first_long_column', 'second_long_column', 'name'))
+        assert index_name_for('tabItem', ('brand',)) == 'ix_tabitem_brand'
+
+
+class TestCompareIndexes:
+    """선언된 인덱스와 데이터베이스 비교"""
+
+    def test_fresh_database_has_no_drift(self, engine):
+        report = compare_indexes(engine, Base.metadata)
+
+        assert report['tabItem']['missing'] == []
+        assert report['tabItem']['extra'] == []
+        # PostgreSQL 전용 트라이그램 인덱스는 SQLite에서 비교하지 않음
+        assert all(not item['name'].endswith('_trgm') for item in report['tabItem']['present'])
+
+    def test_missing_and_extra(self, engine):
+        with engine.begin() as connection:
+            connection.execute(text('DROP INDEX ix_tabitem_item_group'))
+            connection.execute(text('CREATE INDEX ix_manual_description ON "tabItem" (description)'))
+
+        report = compare_indexes(engine, Base.metadata)['tabItem']
+        assert report['missing'] == [{'name': 'ix_tabitem_item_group', 'columns': ['item_group']}]
+        assert report['extra'] == [{'name': 'ix_manual_description', 'columns': ['description']}]
+
+    @pytest.mark.parametrize('dry_run', [True, False])
+    def test_create_missing(self, engine, dry_run):
+        with engine.begin() as connection:
+            connection.execute(text('DROP INDEX ix_tabitem_item_group'))
+
+        assert create_missing_indexes(engine, Base.metadata, dry_run=dry_run) == ['ix_tabitem_item_group']
+        missing = compare_indexes(engine, Base.metadata)['tabItem']['missing']
+        assert missing == ([{'name': 'ix_tabitem_item_group', 'columns': ['item_group']}] if dry_run else [])
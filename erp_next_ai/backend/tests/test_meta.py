@@ -0,0 +1,56 @@
+"""
+DocType 메타데이터 테스트 (미리 계산한 필드 조회, 등록 후 고정, 필드 정의 변경 금지)
+"""
+import pytest
+
+from core.doctype.base import DocTypeMeta, get_doctype_meta
+
+
+def _meta(field_count=3):
+    fields = [{'fieldname': f'field_{index}', 'fieldtype': 'Data'} for index in range(field_count)]
+    fields += [
+        {'fieldname': 'customer', 'fieldtype': 'Link', 'options': 'Customer', 'reqd': 1},
+        {'fieldname': 'secret', 'fieldtype': 'Data', 'hidden': 1},
+        {'fieldname': 'items', 'fieldtype': 'Table', 'options': 'Sales Invoice Item', 'reqd': 1},
+    ]
+    return DocTypeMeta({'name': 'Test DocType', 'fields': fields})
+
+
+class TestLookups:
+    """생성 시 계산한 조회 결과"""
+
+    def test_fields_by_name(self):
+        meta = _meta()
+        assert meta.get_field('customer').options == 'Customer'
+        assert meta.get_field('missing') is None
+        assert meta.fieldnames == ('field_0', 'field_1', 'field_2', 'customer', 'secret', 'items')
+
+    def test_field_groups(self):
+        meta = _meta()
+        assert [field.fieldname for field in meta.get_form_fields()] == ['field_0', 'field_1', 'field_2', 'customer', 'items']
+        assert [field.fieldname for field in meta.get_table_fields()] == ['items']
+        assert meta.required_fieldnames == {'customer'}
+        assert meta.link_fields == {'customer': 'Customer'}
+
+    def test_list_fields_are_limited(self):
+        meta = _meta(field_count=10)
+        assert len(meta.get_list_fields()) == DocTypeMeta.LIST_FIELD_LIMIT
+        assert 'secret' not in [field.fieldname for field in meta.get_list_fields()]
+
+
+class TestImmutability:
+    """등록된 메타데이터와 필드 정의 변경 금지"""
+
+    def test_unregistered_meta_is_mutable(self):
+        meta = _meta()
+        meta.title_field = 'customer'
+        assert meta.freeze() is meta
+        with pytest.raises(AttributeError):
+            meta.title_field = 'field_0'
+
+    def test_registered_meta_is_frozen(self):
+        meta = get_doctype_meta('Item')
+        with pytest.raises(AttributeError):
+            meta.sort_field = 'name'
+        with pytest.raises(AttributeError):
+            meta.fields[0].required = 1
@@ -0,0 +1,120 @@
+"""
+트리 번호(Nested Set) 이동 테스트
+"""
+import pytest
+from sqlalchemy import select
+
+from core.doctype.nestedset import get_ancestors, get_descendants, rebuild_tree
+from modules.stock.warehouse import Warehouse
+
+#   Stores
+#   ├── North
+#   │   ├── N1
+#   │   └── N2
+#   └── South
+#       └── S1
+#   Transit
+TREE = [
+    ('Stores', None), ('North', 'Stores'), ('N1', 'North'), ('N2', 'North'),
+    ('South', 'Stores'), ('S1', 'South'), ('Transit', None),
+]
+
+
+def _save(db, name, parent):
+    doc = db.get(Warehouse, name) or Warehouse(name=name, warehouse_name=name)
+    doc.parent_warehouse = parent
+    return doc.save(db)
+
+
+def _bounds(db):
+    return {name: (lft, rgt) for name, lft, rgt in db.execute(select(Warehouse.name, Warehouse.lft, Warehouse.rgt))}
+
+
+def _assert_consistent(db):
+    """번호가 1..2n을 한 번씩 쓰고, 각 노드 범위가 상위 필드로 만든 트리와 일치"""
+    bounds = _bounds(db)
+    numbers = sorted(number for pair in bounds.values() for number in pair)
+    assert numbers == list(range(1, 2 * len(bounds) + 1))
+
+    parents = dict(db.execute(select(Warehouse.name, Warehouse.parent_warehouse)).all())
+    for name, parent in parents.items():
+        lft, rgt = bounds[name]
+        if parent is not None:
+            parent_lft, parent_rgt = bounds[parent]
+            assert parent_lft < lft < rgt < parent_rgt
+        subtree = {child for child in parents if _is_under(parents, child, name)}
+        assert rgt - lft + 1 == 2 * (len(subtree) + 1)
+
+
+def _is_under(parents, name, ancestor):
+    parent = parents[name]
+    while parent is not None:
+        if parent == ancestor:
+            return True
+        parent = parents[parent]
+    return False
+
+
+@pytest.fixture
+def tree(db):
+    for name, parent in TREE:
+        _save(db, name, parent)
+    _assert_consistent(db)
+    return db
+
+
+class TestMoveNode:
+    """상위 항목 변경 시 하위 트리 이동"""
+
+    def test_move_subtree_under_sibling(self, tree):
+        _save(tree, 'North', 'South')
+
+        _assert_consistent(tree)
+        assert get_descendants(tree, Warehouse, 'South') == ['South', 'S1', 'North', 'N1', 'N2']
+        assert get_ancestors(tree, Warehouse, 'N2') == ['Stores', 'South', 'North']
+
+    def test_move_subtree_to_later_root(self, tree):
+        _save(tree, 'North', 'Transit')
+
+        _assert_consistent(tree)
+        assert get_descendants(tree, Warehouse, 'Stores') == ['Stores', 'South', 'S1']
+        assert get_descendants(tree, Warehouse, 'Transit') == ['Transit', 'North', 'N1', 'N2']
+
+    def test_move_subtree_to_earlier_position(self, tree):
+        _save(tree, 'S1', 'N1')
+
+        _assert_consistent(tree)
+        assert get_ancestors(tree, Warehouse, 'S1') == ['Stores', 'North', 'N1']
+        assert get_descendants(tree, Warehouse, 'South') == ['South']
+
+    def test_detach_to_root(self, tree):
+        _save(tree, 'North', None)
+
+        _assert_consistent(tree)
+        assert get_ancestors(tree, Warehouse, 'N1') == ['North']
+        assert get_descendants(tree, Warehouse, 'Stores') == ['Stores', 'South', 'S1']
+
+    def test_loaded_siblings_see_new_bounds(self, tree):
+        south = tree.get(Warehouse, 'South')
+        _save(tree, 'North', 'Transit')
+
+        assert (south.lft, south.rgt) == _bounds(tree)['South']
+
+    def test_move_under_own_descendant_is_rejected(self, tree):
+        before = _bounds(tree)
+        with pytest.raises(ValueError, match="하위 항목을 상위 항목으로"):
+            _save(tree, 'Stores', 'N1')
+
+        tree.expire_all()
+        assert _bounds(tree) == before
+
+    def test_matches_rebuild(self, tree):
+        _save(tree, 'South', 'N2')
+        _save(tree, 'N1', 'Transit')
+        moved = {name: set(get_descendants(tree, Warehouse, name)) for name, _ in TREE}
+
+        rebuild_tree(tree, Warehouse)
+        tree.commit()
+
+        _assert_consistent(tree)
+        assert {name: set(get_descendants(tree, Warehouse, name)) for name, _ in TREE} == moved
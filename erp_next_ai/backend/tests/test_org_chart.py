@@ -0,0 +1,118 @@
+"""
+조직도(Employee.reports_to) 인덱스와 캐시 테스트
+"""
+from datetime import date
+
+import pytest
+
+import modules.hr.org_chart as org_chart
+from modules.hr.employee import Employee
+from modules.hr.org_chart import (
+    get_department_headcount, get_org_summary, get_reporting_chain, get_subordinates, org_chart_cache
+)
+
+#   CEO(Exec)
+#   ├── CFO(Fin) ── F1(Fin)
+#   └── CTO(Eng)
+#       ├── E1(Eng) ── E3(Eng)
+#       └── E2(Eng)
+#   X(C2 회사)
+STAFF = [
+    ('CEO', None, 'Exec', 'C'), ('CFO', 'CEO', 'Fin', 'C'), ('CTO', 'CEO', 'Eng', 'C'),
+    ('E1', 'CTO', 'Eng', 'C'), ('E2', 'CTO', 'Eng', 'C'), ('E3', 'E1', 'Eng', 'C'),
+    ('F1', 'CFO', 'Fin', 'C'), ('X', 'CEO', 'Eng', 'C2'),
+]
+
+
+def _save(db, name, reports_to, department='Eng', company='C', status='Active'):
+    employee = db.get(Employee, name) or Employee(
+        name=name, employee_name=name, first_name=name, company=company, date_of_joining=date(2020, 1, 1)
+    )
+    employee.reports_to = reports_to
+    employee.department = department
+    employee.status = status
+    return employee.save(db)
+
+
+@pytest.fixture
+def staff(db):
+    for name, reports_to, department, company in STAFF:
+        _save(db, name, reports_to, department, company)
+    return db
+
+
+class TestOrgChart:
+    """하위 조직, 상급자 체인, 부서별 인원"""
+
+    def test_subordinates_and_chain(self, staff):
+        assert set(get_subordinates(staff, 'CTO')) == {'E1', 'E2', 'E3'}
+        assert get_reporting_chain(staff, 'E3') == ['CEO', 'CTO', 'E1']
+
+    def test_other_company_manager_is_root(self, staff):
+        assert get_reporting_chain(staff, 'X') == []
+        assert 'X' not in get_subordinates(staff, 'CEO')
+
+    def test_headcount(self, staff):
+        assert get_department_headcount(staff, 'C') == {'Exec': 1, 'Fin': 2, 'Eng': 4}
+        assert get_department_headcount(staff, 'C', 'CTO') == {'Eng': 4}
+
+    def test_summary(self, staff):
+        summary = get_org_summary(staff, 'CTO')
+        assert summary['company'] == 'C'
+        assert [row['employee'] for row in summary['direct_reports']] == ['E1', 'E2']
+        assert summary['subordinate_count'] == 3
+
+    def test_unknown_employee(self, staff):
+        with pytest.raises(ValueError):
+            get_subordinates(staff, 'missing')
+
+    def test_cycle_is_rejected(self, staff):
+        with pytest.raises(ValueError, match="순환"):
+            _save(staff, 'CTO', 'E3')
+        assert get_reporting_chain(staff, 'E3') == ['CEO', 'CTO', 'E1']
+
+
+class TestOrgChartCache:
+    """직원 저장 시 조직도 무효화"""
+
+    def test_reassignment_refreshes_chart(self, staff):
+        assert get_department_headcount(staff, 'C', 'CTO') == {'Eng': 4}
+
+        _save(staff, 'F1', 'CTO', 'Fin')
+
+        assert get_department_headcount(staff, 'C', 'CTO') == {'Eng': 4, 'Fin': 1}
+
+    def test_inactive_manager_is_skipped(self, staff):
+        get_subordinates(staff, 'CEO')
+
+        _save(staff, 'E1', 'CTO', status='Left')
+
+        assert 'E1' not in get_subordinates(staff, 'CEO')
+        assert get_reporting_chain(staff, 'E3') == ['CEO', 'CTO']
+
+    def test_invalidated_during_build_is_not_cached(self, staff, monkeypatch):
+        build = org_chart.build_org_chart
+
+        def build_then_invalidate(db, company):
+            chart = build(db, company)
+            org_chart_cache.invalidate(employees=['E2'])
+            return chart
+
+        monkeypatch.setattr(org_chart, 'build_org_chart', build_then_invalidate)
+        first = org_chart_cache.get(staff, 'C')
+        monkeypatch.setattr(org_chart, 'build_org_chart', build)
+
+        assert org_chart_cache.get(staff, 'C') is not first
+
+    def test_concurrent_cache_misses_do_not_deadlock(self, run_concurrently):
+        companies = ['C0', 'C1', 'C2']
+        rows = [(Employee, [
+            {
+                'name': f'E-{company}', 'employee_name': company, 'first_name': company, 'company': company,
+                'department': 'D', 'status': 'Active', 'date_of_joining': date(2024, 1, 1),
+            }
+            for company in companies
+        ])]
+        results = run_concurrently(rows, [(get_department_headcount, (company,)) for company in companies] * 2)
+
+        assert results == [{'D': 1}] * (2 * len(companies))
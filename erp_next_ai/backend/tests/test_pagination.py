@@ -0,0 +1,104 @@
+"""
+목록 API 페이징 테스트 (키셋 커서 왕복, 같은 정렬값/NULL 정렬값 구간, 잘못된 커서, 전체 행 수)
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from core.api.pagination import (
+    CursorError, build_page_info, count_rows, decode_cursor, encode_cursor, paginate_keyset
+)
+from modules.accounts.item import Item
+
+START = datetime(2024, 1, 1, 9, 30)
+# (name, brand): 같은 브랜드가 여럿이고 브랜드가 없는 품목도 있음
+BRANDS = [('I1', 'B'), ('I2', 'A'), ('I3', None), ('I4', 'B'), ('I5', 'C'), ('I6', None), ('I7', 'A')]
+
+
+def _item_rows():
+    return [
+        {'name': name, 'item_code': name, 'item_name': name, 'item_group': 'Products', 'brand': brand,
+         'modified': START + timedelta(hours=index % 3)}
+        for index, (name, brand) in enumerate(BRANDS)
+    ]
+
+
+def _expected(sort_field, descending):
+    rows = _item_rows()
+    present = sorted((row for row in rows if row[sort_field] is not None),
+                     key=lambda row: (row[sort_field], row['name']), reverse=descending)
+    nulls = sorted((row for row in rows if row[sort_field] is None), key=lambda row: row['name'], reverse=descending)
+    return [row['name'] for row in present + nulls]
+
+
+@pytest.fixture
+def pages(run_async):
+    """limit씩 커서를 따라 끝까지 조회한 (페이지별 name 목록, 커서 목록)"""
+    def run(sort_field, sort_order, limit):
+        async def walk(db):
+            stmt = select(Item.name, Item.brand, Item.modified)
+            names, cursors, cursor = [], [], None
+            while True:
+                documents, cursor = await paginate_keyset(db, stmt, Item, sort_field, sort_order, limit, cursor)
+                names.append([document.name for document in documents])
+                cursors.append(cursor)
+                if cursor is None:
+                    return names, cursors
+
+        return run_async([(Item, _item_rows())], walk)
+
+    return run
+
+
+class TestKeysetPaging:
+    """커서를 따라간 전체 조회 결과"""
+
+    @pytest.mark.parametrize('sort_field', ['brand', 'modified', 'name'])
+    @pytest.mark.parametrize('sort_order', ['ASC', 'DESC'])
+    @pytest.mark.parametrize('limit', [1, 2, 3, 10])
+    def test_pages_cover_every_row_once(self, pages, sort_field, sort_order, limit):
+        names, cursors = pages(sort_field, sort_order, limit)
+
+        assert [name for page in names for name in page] == _expected(sort_field, sort_order == 'DESC')
+        assert all(len(page) == limit for page in names[:-1])
+        assert cursors[-1] is None
+
+    def test_unknown_sort_field_falls_back_to_name(self, pages):
+        names, _ = pages('missing', 'ASC', 4)
+        assert [name for page in names for name in page] == sorted(name for name, _ in BRANDS)
+
+
+class TestCursor:
+    """커서 인코딩/복원"""
+
+    def test_round_trip_restores_column_type(self):
+        cursor = encode_cursor('modified', START, 'I1')
+        assert decode_cursor(cursor, 'modified', Item.modified) == (START, 'I1', False)
+
+    def test_null_value_marks_null_section(self):
+        cursor = encode_cursor('brand', None, 'I3')
+        assert decode_cursor(cursor, 'brand', Item.brand) == (None, 'I3', True)
+
+    @pytest.mark.parametrize('cursor', ['not-a-cursor', encode_cursor('modified', 'yesterday', 'I1')])
+    def test_invalid_cursor(self, cursor):
+        with pytest.raises(CursorError):
+            decode_cursor(cursor, 'modified', Item.modified)
+
+    def test_cursor_for_other_sort_field(self):
+        with pytest.raises(CursorError):
+            decode_cursor(encode_cursor('brand', 'A', 'I2'), 'modified', Item.modified)
+
+
+class TestPageInfo:
+    """전체 행 수와 OFFSET 페이지 정보"""
+
+    def test_count_ignores_order(self, run_async):
+        async def count(db):
+            return await count_rows(db, select(Item.name).where(Item.brand.isnot(None)).order_by(Item.brand))
+
+        assert run_async([(Item, _item_rows())], count) == 5
+
+    def test_page_info(self):
+        assert build_page_info(7, 2, 3) == {'total': 7, 'page': 2, 'limit': 3, 'pages': 3}
+        assert build_page_info(None, 1, 20)['pages'] is None
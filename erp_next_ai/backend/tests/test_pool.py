@@ -0,0 +1,133 @@
+"""
+연결 풀 계측 테스트 (대기 시간/시간 초과 기록, 크기 조정, 적응형 정책, 상태 판단, 풀 설정)
+"""
+import pytest
+from sqlalchemy import create_engine, exc
+
+from core import database
+from core.config import settings
+from core.pool import (
+    AdaptivePoolPolicy, InstrumentedAsyncQueuePool, InstrumentedQueuePool, attach_monitor, pool_health, pool_metrics
+)
+
+
+@pytest.fixture
+def make_engine(tmp_path):
+    """계측 풀(pool_size, max_overflow 0)을 쓰는 파일 SQLite 엔진을 만드는 함수"""
+    engines = []
+
+    def make(pool_size=2, policy=None):
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedQueuePool,
+            pool_size=pool_size, max_overflow=0, pool_timeout=0.05
+        )
+        engines.append(engine)
+        attach_monitor(engine, 'test', policy)
+        return engine
+
+    yield make
+    for engine in engines:
+        engine.dispose()
+
+
+class TestMetrics:
+    """꺼낸 연결과 대기 시간"""
+
+    def test_checkouts_and_connection_ages(self, make_engine):
+        engine = make_engine()
+        with engine.connect(), engine.connect():
+            metrics = pool_metrics(engine)
+            assert (metrics['checked_out'], metrics['checkouts']) == (2, 2)
+            assert metrics['connection_age']['count'] == 2
+            assert pool_health(metrics) == 'degraded'
+
+        metrics = pool_metrics(engine)
+        assert (metrics['checked_out'], metrics['checked_in']) == (0, 2)
+        assert sum(metrics['wait_ms']['histogram'].values()) == 2
+        assert pool_health(metrics) == 'healthy'
+
+    def test_timeout_is_recorded(self, make_engine):
+        engine = make_engine(pool_size=1)
+        with engine.connect():
+            with pytest.raises(exc.TimeoutError):
+                engine.connect()
+
+        metrics = pool_metrics(engine)
+        assert metrics['timeouts'] == 1
+        assert pool_health(metrics) == 'degraded'
+
+    def test_dispose_keeps_monitor(self, make_engine):
+        engine = make_engine()
+        with engine.connect():
+            pass
+        engine.dispose()
+
+        assert pool_metrics(engine)['checkouts'] == 1
+
+    def test_uninstrumented_pool(self):
+        engine = create_engine('sqlite://')
+        assert attach_monitor(engine, 'plain') is None
+        assert pool_metrics(engine) is None
+        assert pool_health(None) == 'unknown'
+
+
+class TestResize:
+    """풀 크기 조정"""
+
+    def test_resize_keeps_open_connections(self, make_engine):
+        engine = make_engine(pool_size=1)
+        with engine.connect():
+            engine.pool.resize(3)
+            with engine.connect(), engine.connect():
+                assert engine.pool.checkedout() == 3
+            with pytest.raises(exc.TimeoutError):
+                with engine.connect(), engine.connect(), engine.connect():
+                    pass
+
+        assert engine.pool.size() == 3
+
+    def test_adaptive_growth_on_slow_waits(self, make_engine):
+        policy = AdaptivePoolPolicy(1, 4, grow_wait_ms=0, step=2, interval=0)
+        engine = make_engine(pool_size=1, policy=policy)
+        with engine.connect():
+            pass
+
+        metrics = pool_metrics(engine)
+        assert metrics['pool_size'] == 3
+        assert [(resize['from'], resize['to']) for resize in metrics['resizes']] == [(1, 3)]
+
+    @pytest.mark.parametrize('current, p95, peak, expected', [
+        (10, 80, 10, 12),
+        (49, 80, 49, 50),
+        (10, 0.5, 4, 8),
+        (6, 0.5, 1, 5),
+        (10, 0.5, 6, 10),
+        (10, 20, 1, 10),
+    ])
+    def test_policy_target_size(self, current, p95, peak, expected):
+        policy = AdaptivePoolPolicy(5, 50, grow_wait_ms=50, shrink_wait_ms=1, step=2)
+        assert policy.target_size(current, p95, peak) == expected
+
+
+class TestPoolOptions:
+    """Settings의 연결 풀 설정"""
+
+    def test_file_database_uses_instrumented_pool(self, monkeypatch):
+        monkeypatch.setattr(settings, 'DATABASE_POOL_SIZE', 2)
+        monkeypatch.setattr(settings, 'DATABASE_POOL_ADAPTIVE', True)
+        monkeypatch.setattr(settings, 'DATABASE_POOL_MIN_SIZE', 5)
+
+        options = database._pool_options('sqlite+aiosqlite:///./erp.db', is_async=True)
+        assert options['poolclass'] is InstrumentedAsyncQueuePool
+        assert options['pool_size'] == 5
+        assert database._pool_options('sqlite:///./erp.db', is_async=False)['poolclass'] is InstrumentedQueuePool
+
+    def test_in_memory_sqlite_keeps_default_pool(self):
+        assert database._pool_options('sqlite+aiosqlite://', is_async=True) == {}
+        assert database._pool_options('sqlite:///:memory:', is_async=False) == {}
+
+    def test_policy_only_in_adaptive_mode(self, monkeypatch):
+        monkeypatch.setattr(settings, 'DATABASE_POOL_ADAPTIVE', False)
+        assert database._pool_policy() is None
+        monkeypatch.setattr(settings, 'DATABASE_POOL_ADAPTIVE', True)
+        assert database._pool_policy().max_size == settings.DATABASE_POOL_MAX_SIZE
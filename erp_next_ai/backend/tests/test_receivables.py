@@ -0,0 +1,135 @@
+"""
+매출채권 연령 분석 캐시 테스트
+"""
+from datetime import date
+
+import pytest
+from sqlalchemy import insert
+
+from core.doctype.bulk import bulk_update
+from modules.accounts.customer import Customer
+from modules.accounts.receivables import AgingCache, get_receivables_aging
+from modules.sales.sales_invoice import SalesInvoice
+
+KEY = ('C', date(2024, 3, 31), 'due_date')
+OTHER_KEY = ('C2', date(2024, 3, 31), 'due_date')
+
+
+def _rows(*customers, total=100.0):
+    return {customer: {'customer': customer, 'total': total} for customer in customers}
+
+
+class TestAgingCachePut:
+    """버전 기준 저장 (집계 도중 무효화된 고객은 저장하지 않음)"""
+
+    def test_full_put(self):
+        cache = AgingCache()
+        _, _, version = cache.get(KEY)
+        cache.put(KEY, _rows('A', 'B'), version)
+
+        rows, stale, _ = cache.get(KEY)
+        assert rows == _rows('A', 'B')
+        assert stale == set()
+
+    def test_missing_report(self):
+        rows, stale, _ = AgingCache().get(KEY)
+        assert rows is None
+        assert stale == set()
+
+    def test_invalidated_during_full_compute(self):
+        cache = AgingCache()
+        _, _, version = cache.get(KEY)
+        cache.invalidate(['A', 'Z'])
+        cache.put(KEY, _rows('A', 'B'), version)
+
+        rows, stale, _ = cache.get(KEY)
+        assert rows == _rows('B')
+        # 집계 결과에 없던 고객도 다시 집계 대상
+        assert stale == {'A', 'Z'}
+
+    def test_refreshed_put_replaces_only_refreshed(self):
+        cache = AgingCache()
+        cache.put(KEY, _rows('A', 'B', 'C'), cache.get(KEY)[2])
+        cache.invalidate(['A', 'B'])
+
+        _, stale, version = cache.get(KEY)
+        assert stale == {'A', 'B'}
+        # B는 다시 집계해 보니 미수금이 없어 결과에서 빠짐
+        cache.put(KEY, _rows('A', total=5.0), version, refreshed=stale)
+
+        rows, stale, _ = cache.get(KEY)
+        assert rows == dict(_rows('A', total=5.0), **_rows('C'))
+        assert stale == set()
+
+    def test_invalidated_during_refresh(self):
+        cache = AgingCache()
+        cache.put(KEY, _rows('A', 'B'), cache.get(KEY)[2])
+        cache.invalidate(['A', 'B'])
+        _, stale, version = cache.get(KEY)
+        cache.invalidate(['B'])
+        cache.put(KEY, _rows('A', 'B', total=1.0), version, refreshed=stale)
+
+        rows, stale, _ = cache.get(KEY)
+        assert rows == _rows('A', total=1.0)
+        assert stale == {'B'}
+
+    def test_refreshed_put_without_report_is_ignored(self):
+        cache = AgingCache()
+        cache.put(KEY, _rows('A'), 0, refreshed={'A'})
+        assert cache.get(KEY)[0] is None
+
+    def test_clear_during_compute(self):
+        cache = AgingCache()
+        _, _, version = cache.get(KEY)
+        cache.clear()
+        cache.put(KEY, _rows('A'), version)
+        assert cache.get(KEY)[0] is None
+
+    def test_older_invalidation_does_not_block_put(self):
+        cache = AgingCache()
+        cache.invalidate(['A'])
+        _, _, version = cache.get(KEY)
+        cache.put(KEY, _rows('A'), version)
+        assert cache.get(KEY)[0] == _rows('A')
+
+    def test_evicts_least_recently_used(self):
+        cache = AgingCache(max_reports=1)
+        cache.put(KEY, _rows('A'), 0)
+        cache.put(OTHER_KEY, _rows('B'), 0)
+
+        assert cache.get(KEY)[0] is None
+        assert cache.get(OTHER_KEY)[0] == _rows('B')
+
+
+class TestInvoiceReassignment:
+    """송장의 고객이 바뀌면 이전 고객 행도 다시 집계"""
+
+    @pytest.fixture
+    def invoice(self, db):
+        db.execute(insert(Customer.__table__), [{'name': name, 'customer_name': name} for name in ('A', 'B', 'D')])
+        db.add(SalesInvoice(
+            name='SI-1', customer='A', company='C', posting_date=date(2024, 1, 1), due_date=date(2024, 1, 31),
+            grand_total=100, outstanding_amount=100, docstatus=1
+        ))
+        db.commit()
+        return db
+
+    def _totals(self, db):
+        return {row['customer']: row['total'] for row in get_receivables_aging(db, *KEY)['data']}
+
+    def test_save(self, invoice):
+        assert self._totals(invoice) == {'A': 100}
+
+        doc = invoice.get(SalesInvoice, 'SI-1')
+        doc.customer = 'B'
+        doc.save(invoice)
+
+        assert self._totals(invoice) == {'B': 100}
+
+    def test_bulk_update_rejects_submitted_invoice(self, invoice):
+        assert self._totals(invoice) == {'A': 100}
+
+        result = bulk_update(invoice, SalesInvoice, [{'name': 'SI-1', 'customer': 'D'}])
+
+        assert result.to_dict()['error_count'] == 1
+        assert self._totals(invoice) == {'A': 100}
@@ -0,0 +1,135 @@
+"""
+재주문 검사 테스트 (부족 품목 집계, 증분 검사, 공급업체 미지정 품목 재검사, 구매주문 회사)
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, update
+
+from core.api.generator import APIGenerator
+from core.doctype.base import get_doctype_model
+from modules.accounts.item import Item
+from modules.stock.reorder import ReorderRun, get_items_to_reorder, run_reorder
+from modules.stock.stock_ledger import Bin
+from modules.stock.warehouse import Warehouse
+
+PurchaseOrder = get_doctype_model("Purchase Order")
+PurchaseOrderItem = get_doctype_model("Purchase Order Item")
+Supplier = get_doctype_model("Supplier")
+
+
+def _item(code, supplier='S1', warehouse='Stores - C1', level=10, qty=20):
+    return Item(
+        name=code, item_code=code, item_name=code, item_group='Products', stock_uom='Nos',
+        default_supplier=supplier, default_warehouse=warehouse, reorder_level=level, reorder_qty=qty,
+        standard_rate=100, is_stock_item=True, is_purchase_item=True
+    )
+
+
+def _bin(code, qty, warehouse='Stores - C1'):
+    return Bin(name=f'{code}-{warehouse}', item_code=code, warehouse=warehouse, actual_qty=qty, stock_value=0)
+
+
+def _orders(db):
+    return {
+        row.item_code: (po.supplier, po.company, row.qty)
+        for po, row in db.execute(
+            select(PurchaseOrder, PurchaseOrderItem).join(PurchaseOrderItem, PurchaseOrderItem.parent == PurchaseOrder.name)
+        )
+    }
+
+
+def _age_documents(db):
+    """마지막 실행 이전에 바뀐 것으로 보이도록 Bin/품목/구매주문 수정 시각을 하루 앞당김"""
+    old = datetime.utcnow() - timedelta(days=1)
+    for model in (Bin, Item, PurchaseOrder):
+        db.execute(update(model).values(modified=old))
+    db.commit()
+
+
+@pytest.fixture
+def stock(db):
+    db.add_all([
+        Warehouse(name='Stores - C1', warehouse_name='Stores', company='C1'),
+        Warehouse(name='Stores - C2', warehouse_name='Stores', company='C2'),
+        Supplier(name='S1', supplier_name='Supplier 1', supplier_type='Company', supplier_group='All'),
+        _item('LOW'),
+        _item('OK'),
+        _item('OTHER', warehouse='Stores - C2', level=5, qty=1),
+        _item('NOSUP', supplier=None),
+        _bin('LOW', 4),
+        _bin('LOW', 100, warehouse='Stores - C2'),
+        _bin('OK', 50),
+        _bin('OTHER', 0, warehouse='Stores - C2'),
+        _bin('NOSUP', 0),
+    ])
+    db.commit()
+
+
+class TestItemsToReorder:
+    """예상 재고와 주문 수량"""
+
+    def test_projected_qty_uses_default_warehouse(self, db, stock):
+        items = {item['item_code']: item for item in get_items_to_reorder(db)}
+
+        assert set(items) == {'LOW', 'OTHER', 'NOSUP'}
+        assert items['LOW']['actual_qty'] == pytest.approx(4)
+        assert items['LOW']['qty'] == pytest.approx(20)
+        assert items['OTHER']['qty'] == pytest.approx(5)
+        assert items['LOW']['company'] == 'C1'
+
+
+class TestRunReorder:
+    """구매주문 생성과 증분 검사"""
+
+    def test_orders_grouped_by_supplier_and_company(self, db, stock):
+        result = run_reorder(db)
+
+        assert len(result['purchase_orders']) == 2
+        assert result['items_without_supplier'] == ['NOSUP']
+        assert _orders(db) == {'LOW': ('S1', 'C1', 20), 'OTHER': ('S1', 'C2', 5)}
+
+    def test_draft_orders_count_as_projected_stock(self, db, stock):
+        run_reorder(db)
+        result = run_reorder(db, full=True)
+
+        assert result['purchase_orders'] == []
+        assert [item['item_code'] for item in result['items']] == ['NOSUP']
+
+    def test_incremental_run_checks_changed_items_only(self, db, stock):
+        run_reorder(db)
+        _age_documents(db)
+        db.execute(update(Bin).where(Bin.item_code == 'OK').values(actual_qty=1, modified=Bin.modified))
+        db.commit()
+
+        result = run_reorder(db)
+        assert result['since'] is not None
+        assert result['purchase_orders'] == []
+
+        db.execute(update(Bin).where(Bin.item_code == 'OK').values(modified=datetime.utcnow()))
+        db.commit()
+        result = run_reorder(db)
+        assert [item['item_code'] for item in result['items'] if item['item_code'] != 'NOSUP'] == ['OK']
+        assert _orders(db)['OK'] == ('S1', 'C1', 20)
+
+    def test_item_without_supplier_is_rechecked(self, db, stock):
+        run_reorder(db)
+        _age_documents(db)
+        # modified를 바꾸지 않는 경로로 공급업체 지정
+        db.execute(update(Item).where(Item.name == 'NOSUP').values(default_supplier='S1', modified=Item.modified))
+        db.commit()
+
+        result = run_reorder(db)
+        assert result['items_without_supplier'] == []
+        assert _orders(db)['NOSUP'] == ('S1', 'C1', 20)
+
+    def test_dry_run_records_nothing(self, db, stock):
+        result = run_reorder(db, dry_run=True)
+
+        assert len(result['items']) == 3
+        assert db.execute(select(ReorderRun)).first() is None
+        assert _orders(db) == {}
+
+    def test_reorder_run_has_only_read_routes(self):
+        router = APIGenerator().generate_router('Reorder Run')
+        assert {method for route in router.routes for method in route.methods} == {'GET'}
@@ -0,0 +1,144 @@
+"""
+읽기 복제본 라우팅 테스트 (읽기/쓰기 세션 분리, 쓰기 뒤 주 데이터베이스 읽기, 상태 확인, 라운드 로빈)
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, insert, select
+
+from core import database
+from core.doctype.base import Base
+from core.replica import ReplicaRouter, client_key_for
+from modules.stock.warehouse import Warehouse
+
+
+def _database(path, warehouse):
+    """warehouse 하나가 들어 있는 파일 SQLite 데이터베이스 URL (어느 쪽에서 읽었는지 구분용)"""
+    url = f"sqlite:///{path}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(Warehouse.__table__), [{'name': warehouse, 'warehouse_name': warehouse}])
+    engine.dispose()
+    return url
+
+
+@pytest.fixture
+def run_routed(tmp_path):
+    """주 데이터베이스(PRIMARY)와 복제본(REPLICA)으로 비동기 엔진을 초기화해 fn(router)을 실행"""
+    pytest.importorskip('aiosqlite')
+    primary = _database(tmp_path / 'primary.db', 'PRIMARY')
+    replica = _database(tmp_path / 'replica.db', 'REPLICA')
+
+    def run(fn, replica_urls=None):
+        async def main():
+            database.init_async_database(primary, replica_urls=[replica] if replica_urls is None else replica_urls)
+            try:
+                return await fn(database.replica_router)
+            finally:
+                await database.close_async_database()
+        return asyncio.run(main())
+
+    return run
+
+
+async def _read(read_only=True, client_key=None):
+    async with database._open_async_session(read_only=read_only, client_key=client_key) as db:
+        return (await db.execute(select(Warehouse.name))).scalars().all()
+
+
+class TestRouting:
+    """세션 종류별 실행 대상"""
+
+    def test_read_and_write_sessions(self, run_routed):
+        async def reads(router):
+            return await _read(), await _read(read_only=False)
+
+        assert run_routed(reads) == (['REPLICA'], ['PRIMARY'])
+
+    def test_session_reads_primary_after_write(self, run_routed):
+        async def write_then_read(router):
+            async with database.get_async_db_session(read_only=True) as db:
+                before = (await db.execute(select(Warehouse.name))).scalars().all()
+                db.add(Warehouse(name='W1', warehouse_name='W1'))
+                await db.flush()
+                after = (await db.execute(select(Warehouse.name).order_by(Warehouse.name))).scalars().all()
+                await db.rollback()
+            return before, after
+
+        assert run_routed(write_then_read) == (['REPLICA'], ['PRIMARY', 'W1'])
+
+    def test_read_your_writes(self, run_routed):
+        async def write_then_read(router):
+            async with database._open_async_session(read_only=False, client_key='c1') as db:
+                await db.run_sync(Warehouse(name='W1', warehouse_name='W1').save)
+            return await _read(client_key='c1'), await _read(client_key='c2')
+
+        assert run_routed(write_then_read) == (['PRIMARY', 'W1'], ['REPLICA'])
+
+    def test_without_replicas_reads_primary(self, run_routed):
+        async def reads(router):
+            return await _read()
+
+        assert run_routed(reads, replica_urls=[]) == ['PRIMARY']
+
+
+class TestHealth:
+    """복제본 상태 확인"""
+
+    def test_unhealthy_replica_is_skipped(self, run_routed):
+        async def reads(router):
+            router.mark_unhealthy(router.replicas[0], 'down')
+            before = await _read()
+            await router.check_health()
+            return before, await _read(), router.status()
+
+        before, after, status = run_routed(reads)
+        assert (before, after) == (['PRIMARY'], ['REPLICA'])
+        assert status == [{'name': 'replica-0', 'healthy': True, 'last_error': None}]
+
+    def test_unreachable_replica(self, run_routed, tmp_path):
+        async def check(router):
+            await router.check_health()
+            return router.status()[0]['healthy'], await _read()
+
+        unreachable = f"sqlite:///{tmp_path / 'missing' / 'replica.db'}"
+        assert run_routed(check, replica_urls=[unreachable]) == (False, ['PRIMARY'])
+
+
+class TestRouter:
+    """복제본 선택과 클라이언트 식별"""
+
+    def test_round_robin_skips_unhealthy(self):
+        pytest.importorskip('aiosqlite')
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        engines = [create_async_engine('sqlite+aiosqlite://') for _ in range(4)]
+        router = ReplicaRouter(engines[0], engines[1:])
+        router.mark_unhealthy(router.replicas[1], 'down')
+
+        assert [router.choose_replica().name for _ in range(4)] == ['replica-0', 'replica-2', 'replica-0', 'replica-2']
+        for node in router.replicas:
+            router.mark_unhealthy(node, 'down')
+        assert router.choose_replica() is None
+
+    def test_read_your_writes_window(self, monkeypatch):
+        router = ReplicaRouter(None, [], read_your_writes_seconds=5)
+        router.replicas = [object()]
+        now = [100.0]
+        monkeypatch.setattr('core.replica.time.monotonic', lambda: now[0])
+
+        router.mark_write('c1')
+        assert router.recently_wrote('c1') and not router.recently_wrote('c2')
+        now[0] = 106.0
+        assert not router.recently_wrote('c1')
+
+    def test_client_key(self):
+        def request(headers, host):
+            return SimpleNamespace(headers=headers, client=SimpleNamespace(host=host) if host else None)
+
+        assert client_key_for(request({'X-Client-Id': 'tab-1'}, '10.0.0.1')) == 'tab-1'
+        assert client_key_for(request({}, '10.0.0.1')) == '10.0.0.1'
+        assert client_key_for(request({}, None)) is None
+        assert client_key_for(None) is None
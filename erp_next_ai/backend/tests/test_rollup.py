@@ -0,0 +1,126 @@
+"""
+프로젝트 진행 집계 테스트 (근무시간 → 작업/프로젝트 합계, 진행률 계산 방법, 취소, 작업 이동, 일괄 재계산)
+"""
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import update
+
+from modules.hr.employee import Employee
+from modules.projects.project import Project, Task, Timesheet
+from modules.projects.rollup import rebuild_project_rollups
+
+
+def _log(task, hours, costing, billing=0, billable=True, day=2):
+    return {
+        'activity_type': 'Development', 'task': task, 'project': 'P', 'hours': hours,
+        'from_time': datetime(2024, 1, day, 9), 'to_time': datetime(2024, 1, day, 9 + hours),
+        'costing_amount': costing, 'billing_amount': billing, 'is_billable': billable,
+    }
+
+
+def _timesheet(db, name, *logs):
+    timesheet = Timesheet(name=name, employee='E1', start_date=date(2024, 1, 1), end_date=date(2024, 1, 31))
+    timesheet.set_children('time_logs', list(logs))
+    timesheet.save(db)
+    return timesheet
+
+
+def _reload(db, model_class, name):
+    db.expire_all()
+    return db.get(model_class, name)
+
+
+@pytest.fixture
+def project(db):
+    Employee(
+        name='E1', employee_name='E1', first_name='E1', company='C1', date_of_joining=date(2020, 1, 1)
+    ).save(db)
+    Project(name='P', project_name='P', percent_complete=0, percent_complete_method='Task Progress').save(db)
+    Task(name='T1', subject='T1', project='P', expected_time=10, task_weight=3, progress=0).save(db)
+    Task(name='T2', subject='T2', project='P', task_weight=1, progress=0).save(db)
+    return db
+
+
+class TestTimesheetRollups:
+    """제출된 근무시간의 작업/프로젝트 합계"""
+
+    def test_draft_timesheet_is_not_counted(self, project):
+        _timesheet(project, 'TS1', _log('T1', 4, 40, 60))
+
+        assert _reload(project, Task, 'T1').actual_time == 0
+        assert _reload(project, Project, 'P').actual_time == 0
+
+    def test_submit_rolls_up_to_task_and_project(self, project):
+        _timesheet(project, 'TS1', _log('T1', 4, 40, 60), _log('T2', 2, 20, 30, billable=False, day=5)).submit(project)
+
+        task = _reload(project, Task, 'T1')
+        assert task.actual_time == pytest.approx(4)
+        assert task.progress == pytest.approx(40)
+        assert (task.act_start_date, task.act_end_date) == (date(2024, 1, 2), date(2024, 1, 2))
+        assert _reload(project, Task, 'T2').progress == 0
+
+        project_doc = _reload(project, Project, 'P')
+        assert project_doc.actual_time == pytest.approx(6)
+        assert project_doc.total_costing_amount == pytest.approx(60)
+        assert project_doc.total_billable_amount == pytest.approx(60)
+        assert project_doc.percent_complete == pytest.approx(20)
+
+    def test_cancel_removes_hours(self, project):
+        timesheet = _timesheet(project, 'TS1', _log('T1', 4, 40, 60))
+        timesheet.submit(project)
+        _reload(project, Timesheet, 'TS1').cancel(project)
+
+        assert _reload(project, Task, 'T1').actual_time == 0
+        project_doc = _reload(project, Project, 'P')
+        assert (project_doc.actual_time, project_doc.total_costing_amount) == (0, 0)
+
+
+class TestProjectProgress:
+    """진행률 계산 방법"""
+
+    @pytest.mark.parametrize('method, expected', [
+        ('Task Completion', 50),
+        ('Task Progress', 70),
+        ('Task Weight', 85),
+    ])
+    def test_methods(self, project, method, expected):
+        project.execute(update(Project).values(percent_complete_method=method))
+        project.commit()
+        task = _reload(project, Task, 'T1')
+        task.status = 'Completed'
+        task.save(project)
+        task = _reload(project, Task, 'T2')
+        task.progress = 40
+        task.save(project)
+
+        assert _reload(project, Project, 'P').percent_complete == pytest.approx(expected)
+
+    def test_task_moved_to_other_project(self, project):
+        Project(name='Q', project_name='Q', percent_complete=0, percent_complete_method='Task Completion').save(project)
+        task = _reload(project, Task, 'T1')
+        task.status = 'Completed'
+        task.save(project)
+        assert _reload(project, Project, 'P').percent_complete == pytest.approx(50)
+
+        task = _reload(project, Task, 'T1')
+        task.project = 'Q'
+        task.save(project)
+
+        assert _reload(project, Project, 'P').percent_complete == 0
+        assert _reload(project, Project, 'Q').percent_complete == pytest.approx(100)
+
+
+class TestRebuild:
+    """저장 훅을 거치지 않은 변경 뒤 일괄 재계산"""
+
+    def test_rebuild_restores_rollups(self, project):
+        _timesheet(project, 'TS1', _log('T1', 5, 50, 75)).submit(project)
+        project.execute(update(Task).values(actual_time=0, progress=0))
+        project.execute(update(Project).values(actual_time=0, percent_complete=0))
+        project.commit()
+
+        assert rebuild_project_rollups(project, ['P']) == {'tasks': 2, 'projects': 1}
+        assert _reload(project, Task, 'T1').progress == pytest.approx(50)
+        assert _reload(project, Project, 'P').actual_time == pytest.approx(5)
+        assert _reload(project, Project, 'P').percent_complete == pytest.approx(25)
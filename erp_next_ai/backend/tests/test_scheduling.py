@@ -0,0 +1,143 @@
+"""
+작업 의존성 일정(CPM) 테스트
+
+증분 계산(compute(changed=...))이 같은 그래프를 처음부터 계산한 결과와 같은지 확인합니다.
+"""
+from datetime import date, timedelta
+
+import pytest
+
+from modules.projects.project import Project, Task
+from modules.projects.scheduling import ProjectSchedule, TaskNode, build_schedule, get_project_schedule
+
+START = date(2024, 1, 1)
+
+#   A(3) ─┬─ B(2) ─┬─ D(1) ── F(2)
+#         └─ C(4) ─┘
+#   E(5)
+GRAPH = {
+    'A': (3, []),
+    'B': (2, ['A']),
+    'C': (4, ['A']),
+    'D': (1, ['B', 'C']),
+    'E': (5, []),
+    'F': (2, ['D']),
+}
+
+
+def _schedule(graph):
+    schedule = ProjectSchedule('P', START)
+    for name, (duration, depends_on) in graph.items():
+        schedule.upsert(TaskNode(name, name, 'Open', float(duration), list(depends_on)))
+    schedule.compute()
+    return schedule
+
+
+def _edit(schedule, name, duration, depends_on):
+    """refresh_schedule과 같은 방식으로 작업 하나를 바꾸고 증분 계산"""
+    previous = schedule.nodes.get(name)
+    resort = previous is None or previous.depends_on != depends_on
+    upstream = schedule.upsert(TaskNode(name, name, 'Open', float(duration), list(depends_on)))
+    schedule.compute({name}, upstream, resort=resort)
+
+
+def _drop(schedule, name):
+    upstream = schedule.remove(name)
+    changed = {dependent for dependent in schedule.dependents.get(name, ()) if dependent in schedule.nodes}
+    schedule.compute(changed, upstream, resort=True)
+
+
+class TestIncrementalCompute:
+    """바뀐 작업만 다시 계산한 결과 = 전체 계산 결과"""
+
+    @pytest.mark.parametrize('name, duration, depends_on', [
+        ('C', 10, ['A']),       # 주공정 작업이 길어짐 → 종료 시점 변경
+        ('B', 1, ['A']),        # 여유 있는 작업이 짧아짐 → 종료 시점 유지
+        ('B', 5, ['A']),        # 여유 안에서 길어짐
+        ('E', 20, []),          # 독립 작업이 주공정이 됨
+        ('F', 2, ['D', 'E']),   # 선행 작업 추가
+        ('D', 1, ['C']),        # 선행 작업 제거 (B는 후속 작업이 없어짐)
+        ('G', 3, ['B']),        # 새 작업
+    ])
+    def test_edit_matches_full_compute(self, name, duration, depends_on):
+        schedule = _schedule(GRAPH)
+        _edit(schedule, name, duration, depends_on)
+
+        graph = dict(GRAPH, **{name: (duration, depends_on)})
+        assert schedule.to_dict() == _schedule(graph).to_dict()
+
+    def test_remove_matches_full_compute(self):
+        schedule = _schedule(GRAPH)
+        _drop(schedule, 'C')
+
+        graph = {name: spec for name, spec in GRAPH.items() if name != 'C'}
+        assert schedule.to_dict() == _schedule(graph).to_dict()
+
+    def test_sequence_of_edits(self):
+        schedule = _schedule(GRAPH)
+        graph = dict(GRAPH)
+        for name, duration, depends_on in [
+            ('A', 1, []), ('C', 1, ['A']), ('E', 2, ['F']), ('B', 7, ['A']), ('E', 2, []),
+        ]:
+            _edit(schedule, name, duration, depends_on)
+            graph[name] = (duration, depends_on)
+            assert schedule.to_dict() == _schedule(graph).to_dict()
+
+    def test_cycle_and_recovery(self):
+        schedule = _schedule(GRAPH)
+        _edit(schedule, 'A', 3, ['F'])
+
+        result = schedule.to_dict()
+        assert result['cycle'] == ['A', 'B', 'C', 'D', 'F']
+        assert [task['task'] for task in result['tasks']] == ['E']
+
+        _edit(schedule, 'A', 3, [])
+        assert schedule.to_dict() == _schedule(GRAPH).to_dict()
+
+    def test_critical_path(self):
+        result = _schedule(GRAPH).to_dict()
+        assert result['duration'] == 10
+        assert result['finish_date'] == START + timedelta(days=10)
+        assert result['critical_path'] == ['A', 'C', 'D', 'F']
+
+
+class TestScheduleCache:
+    """저장된 작업만 다시 읽어 갱신한 캐시 = 데이터베이스에서 새로 구성한 일정"""
+
+    def _task(self, db, name, days, depends_on=(), project='P'):
+        task = db.get(Task, name) or Task(name=name, subject=name, progress=0)
+        task.project = project
+        task.exp_start_date = START
+        task.exp_end_date = START + timedelta(days=days)
+        task.set_children('depends_on_tasks', [{'task': dependency} for dependency in depends_on])
+        return task.save(db)
+
+    def test_refresh_matches_rebuild(self, db):
+        Project(name='P', project_name='P', percent_complete=0, expected_start_date=START).save(db)
+        Project(name='Q', project_name='Q', percent_complete=0, expected_start_date=START).save(db)
+        for name, (days, depends_on) in GRAPH.items():
+            self._task(db, name, days, depends_on)
+        assert get_project_schedule(db, 'P') == build_schedule(db, 'P').to_dict()
+
+        self._task(db, 'C', 9, ['A'])
+        self._task(db, 'F', 2, ['D', 'E'])
+        db.get(Task, 'B').delete(db)
+        self._task(db, 'E', 5, project='Q')
+
+        assert get_project_schedule(db, 'P') == build_schedule(db, 'P').to_dict()
+        assert get_project_schedule(db, 'Q')['critical_path'] == ['E']
+
+    def test_concurrent_cache_misses_do_not_deadlock(self, run_concurrently):
+        projects = [f'P{index}' for index in range(3)]
+        rows = [
+            (Project, [{'name': name, 'project_name': name, 'percent_complete': 0} for name in projects]),
+            (Task, [{'name': f'T-{name}', 'subject': name, 'project': name, 'progress': 0} for name in projects]),
+        ]
+        results = run_concurrently(rows, [(get_project_schedule, (name,)) for name in projects] * 2)
+
+        assert [result['project'] for result in results] == projects * 2
+        assert [result['critical_path'] for result in results] == [[f'T-{name}'] for name in projects] * 2
+
+    def test_unknown_project(self, db):
+        with pytest.raises(ValueError):
+            get_project_schedule(db, 'missing')
@@ -0,0 +1,114 @@
+"""
+DocType 검색 테스트 (트라이그램 역색인, 문서 이벤트로 색인 갱신, LIKE 백엔드 이스케이프, API search 파라미터)
+"""
+import pytest
+from sqlalchemy import select
+
+from core.doctype import search
+from core.doctype.base import get_doctype_meta
+from core.doctype.search import InvertedSearchIndex, LikeSearchBackend, memory_search_backend, search_condition
+from modules.accounts.item import Item
+
+META = get_doctype_meta('Item')
+ITEMS = [('I1', 'Steel Bolt', 'M8 50% zinc'), ('I2', 'Steel Nut', None), ('I3', 'Washer', 'for bolts'),
+         ('I4', 'Bolt_Cutter', 'tool')]
+
+
+def _item_rows():
+    return [
+        {'name': code, 'item_code': code, 'item_name': item_name, 'item_group': 'Products', 'description': description}
+        for code, item_name, description in ITEMS
+    ]
+
+
+def _found(db, condition):
+    stmt = select(Item.name).order_by(Item.name)
+    if condition is not None:
+        stmt = stmt.where(condition)
+    return db.execute(stmt).scalars().all()
+
+
+@pytest.fixture
+def items(db):
+    db.add_all(Item(stock_uom='Nos', **row) for row in _item_rows())
+    db.commit()
+
+
+class TestInvertedIndex:
+    """프로세스 내 트라이그램 역색인"""
+
+    @pytest.fixture
+    def index(self, db, items):
+        index = InvertedSearchIndex(Item, ['item_name', 'description'])
+        index.ensure_loaded(db)
+        return index
+
+    @pytest.mark.parametrize('term, expected', [
+        ('bolt', {'I1', 'I3', 'I4'}),
+        ('STEEL N', {'I2'}),
+        ('ut', {'I2', 'I4'}),
+        ('x', set()),
+        ('50%', {'I1'}),
+    ])
+    def test_substring_match(self, index, term, expected):
+        assert index.search(term) == expected
+
+    def test_no_match_across_fields(self, index):
+        # item_name 'Washer'와 description 'for bolts' 경계를 넘는 문자열
+        assert index.search('washerfor') == set()
+
+    def test_refresh_and_remove(self, db, index):
+        db.get(Item, 'I2').item_name = 'Hex Nut'
+        db.commit()
+        index.refresh(db, ['I2', 'I3'])
+        assert index.search('steel') == {'I1'}
+        assert index.search('hex') == {'I2'}
+
+        index.remove(['I1'])
+        assert index.search('bolt') == {'I3', 'I4'}
+
+
+class TestSearchCondition:
+    """데이터베이스별 검색 조건"""
+
+    def test_memory_backend_follows_document_events(self, db, items):
+        assert _found(db, search_condition(db, META, Item, 'bolt')) == ['I1', 'I3', 'I4']
+
+        item = db.get(Item, 'I2')
+        item.description = 'fits bolt'
+        item.save(db)
+        db.get(Item, 'I4').delete(db)
+
+        assert _found(db, search_condition(db, META, Item, 'bolt')) == ['I1', 'I2', 'I3']
+        assert _found(db, search_condition(db, META, Item, 'missing')) == []
+
+    def test_large_result_falls_back_to_like(self, db, items, monkeypatch):
+        monkeypatch.setattr(search, 'MAX_IN_LIST_SIZE', 1)
+        condition = search_condition(db, META, Item, 'Steel')
+
+        assert 'LIKE' in str(condition)
+        assert _found(db, condition) == ['I1', 'I2']
+
+    def test_empty_term_has_no_condition(self, db):
+        assert search_condition(db, META, Item, '') is None
+        assert memory_search_backend.indexes == {}
+
+    @pytest.mark.parametrize('term, expected', [
+        ('bolt', ['I1', 'I3', 'I4']),
+        ('50%', ['I1']),
+        ('t_c', ['I4']),
+        ('5_%', []),
+    ])
+    def test_like_backend_escapes_wildcards(self, db, items, term, expected):
+        assert _found(db, LikeSearchBackend().condition(db, META, Item, term)) == expected
+
+
+class TestSearchParameter:
+    """목록 API의 search 파라미터"""
+
+    def test_list_search(self, api_client):
+        client = api_client(['Item'], [(Item, _item_rows())])
+
+        response = client.get('/api/item/', params={'search': 'steel', 'fields': 'name'})
+        assert response.json()['data'] == [{'name': 'I1'}, {'name': 'I2'}]
+        assert response.json()['total'] == 2
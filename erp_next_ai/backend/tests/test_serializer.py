@@ -0,0 +1,114 @@
+"""
+행 직렬화기 테스트 (행/ORM 직렬화, 필드 선택 순서와 캐시, 입력값 변환, API fields 파라미터)
+"""
+from datetime import date, datetime
+
+import pytest
+
+from core.doctype.serializer import RowSerializer, _projection, get_serializer, parse_fields
+from modules.accounts.item import Item
+from modules.sales.sales_invoice import SalesInvoice
+
+CREATED = datetime(2024, 1, 1, 9, 30)
+
+
+@pytest.fixture
+def serializer():
+    return get_serializer(Item)
+
+
+class TestSerialize:
+    """행/ORM 인스턴스 → 딕셔너리"""
+
+    def test_row_with_extra_columns(self, serializer):
+        projection = serializer.project(['item_name', 'creation'], extra=['name'])
+
+        assert [column.key for column in projection.columns] == ['item_name', 'creation', 'name']
+        assert projection.serialize_row(('Widget', CREATED, 'I1')) == {
+            'item_name': 'Widget', 'creation': '2024-01-01T09:30:00'
+        }
+
+    def test_orm_instance_matches_row(self, serializer):
+        item = Item(name='I1', item_code='I1', item_name='Widget', item_group='Products', creation=CREATED)
+        row = tuple(getattr(item, column.key) for column in serializer.columns)
+
+        assert serializer.serialize(item) == serializer.serialize_row(row)
+        assert serializer.serialize(item)['creation'] == '2024-01-01T09:30:00'
+        assert serializer.project(['creation']).serialize(item) == {'creation': '2024-01-01T09:30:00'}
+
+    def test_date_column(self):
+        projection = get_serializer(SalesInvoice).project(['posting_date'])
+        assert projection.serialize_row((date(2024, 2, 29),)) == {'posting_date': '2024-02-29'}
+
+    def test_unknown_field(self, serializer):
+        with pytest.raises(ValueError, match='password'):
+            serializer.project(['name', 'password'])
+
+
+class TestProjection:
+    """필드 선택 직렬화기 캐시"""
+
+    def test_request_order_is_kept(self, serializer):
+        projection = serializer.project(['item_name', 'creation', 'name'])
+
+        assert projection.fieldnames == ('item_name', 'creation', 'name')
+        assert projection.serialize_row(('Widget', CREATED, 'I1')) == {
+            'item_name': 'Widget', 'creation': '2024-01-01T09:30:00', 'name': 'I1'
+        }
+
+    def test_same_fields_share_cache_entry(self, serializer):
+        _projection.cache_clear()
+        serializer.project(['item_name', 'name'])
+        serializer.project(['name', 'item_name'])
+        serializer.project(['name', 'item_name', 'name'])
+
+        assert _projection.cache_info().currsize == 1
+
+    def test_all_fields_returns_serializer(self, serializer):
+        assert serializer.project(None) is serializer
+        assert isinstance(serializer.project(['name']), RowSerializer)
+
+
+class TestDeserialize:
+    """API 입력 문자열 → 컬럼 타입"""
+
+    def test_dates_and_times(self):
+        values = get_serializer(SalesInvoice).deserialize({
+            'posting_date': '2024-02-29T00:00:00', 'creation': '2024-01-01T09:30:00', 'customer': 'CU1'
+        })
+        assert values == {'posting_date': date(2024, 2, 29), 'creation': CREATED, 'customer': 'CU1'}
+
+    def test_date_for_datetime_column(self, serializer):
+        assert serializer.deserialize({'creation': date(2024, 1, 1)})['creation'] == datetime(2024, 1, 1)
+
+    def test_invalid_value(self, serializer):
+        with pytest.raises(ValueError, match='creation'):
+            serializer.deserialize({'creation': 'yesterday'})
+
+    @pytest.mark.parametrize('fields, expected', [
+        (None, None),
+        ('', None),
+        (' , ', None),
+        ('name, item_name,name', ['name', 'item_name']),
+    ])
+    def test_parse_fields(self, fields, expected):
+        assert parse_fields(fields) == expected
+
+
+class TestFieldsParameter:
+    """목록/단건 API의 fields 파라미터"""
+
+    @pytest.fixture
+    def client(self, api_client):
+        return api_client(['Item'], [(Item, [
+            {'name': 'I1', 'item_code': 'I1', 'item_name': 'Widget', 'item_group': 'Products', 'creation': CREATED},
+        ])])
+
+    def test_list_and_get_return_selected_fields(self, client):
+        assert client.get('/api/item/', params={'fields': 'item_name,creation'}).json()['data'] == [
+            {'item_name': 'Widget', 'creation': '2024-01-01T09:30:00'}
+        ]
+        assert client.get('/api/item/I1', params={'fields': 'item_group'}).json() == {'item_group': 'Products'}
+
+    def test_unknown_field_is_400(self, client):
+        assert client.get('/api/item/', params={'fields': 'password'}).status_code == 400
@@ -0,0 +1,186 @@
+"""
+재고 원장과 Bin 테스트 (과거 일자 전기 재평가, 취소, 전체 재평가, Bin 동시 생성, 조회 전용 API)
+"""
+import json
+from datetime import date
+
+import pytest
+from sqlalchemy import func, select
+
+from core.api.generator import APIGenerator
+from modules.accounts.item import Item
+from modules.stock import stock_ledger
+from modules.stock.stock_ledger import (
+    Bin, StockLedgerEntry, cancel_sl_entries, get_bins_for_update, get_stock_balance,
+    get_stock_balances_from_ledger, make_sl_entries, repost_item_valuation
+)
+
+ITEM = {'item_group': 'Products', 'stock_uom': 'Nos'}
+
+
+def _entry(voucher_no, qty, posting_date, rate=None, item_code='A', warehouse='W1', detail=None):
+    return {
+        'item_code': item_code,
+        'warehouse': warehouse,
+        'actual_qty': qty,
+        'incoming_rate': rate,
+        'posting_date': posting_date,
+        'voucher_type': 'Stock Entry',
+        'voucher_no': voucher_no,
+        'voucher_detail_no': detail,
+    }
+
+
+def _computed(db):
+    fields = ('qty_after_transaction', 'incoming_rate', 'valuation_rate', 'stock_value', 'stock_value_difference')
+    return {
+        sle.name: tuple(round(getattr(sle, field), 6) for field in fields) + (json.loads(sle.stock_queue or 'null'),)
+        for sle in db.execute(select(StockLedgerEntry)).scalars()
+    }
+
+
+def _post(db, *entries):
+    make_sl_entries(db, list(entries))
+    db.commit()
+
+
+def _bin(db, item_code='A', warehouse='W1'):
+    return db.execute(select(Bin).where(Bin.item_code == item_code, Bin.warehouse == warehouse)).scalar_one()
+
+
+def _assert_bins_match_ledger(db):
+    ledger = {(row['item_code'], row['warehouse']): row for row in get_stock_balances_from_ledger(db)}
+    for bin_doc in db.execute(select(Bin)).scalars():
+        balance = ledger.get((bin_doc.item_code, bin_doc.warehouse), {'actual_qty': 0, 'stock_value': 0})
+        assert bin_doc.actual_qty == pytest.approx(balance['actual_qty'])
+        assert bin_doc.stock_value == pytest.approx(balance['stock_value'])
+
+
+@pytest.fixture
+def item(db):
+    db.add(Item(name='A', item_code='A', item_name='A', **ITEM))
+    db.commit()
+
+
+@pytest.fixture
+def items(db):
+    db.add_all(Item(name=code, item_code=code, item_name=code, **ITEM) for code in ('A', 'B'))
+    db.commit()
+
+
+class TestRepost:
+    """과거 일자 전기/취소 후 원장 행과 Bin"""
+
+    def test_backdated_receipt_revalues_later_issue(self, db, item):
+        _post(db, _entry('V1', 10, date(2024, 1, 1), 5))
+        _post(db, _entry('V3', -10, date(2024, 1, 10)))
+        _post(db, _entry('V2', 10, date(2024, 1, 5), 8))
+
+        issue = db.execute(select(StockLedgerEntry).where(StockLedgerEntry.voucher_no == 'V3')).scalar_one()
+        assert issue.stock_value_difference == pytest.approx(-50)
+        assert issue.qty_after_transaction == pytest.approx(10)
+        assert _bin(db).actual_qty == pytest.approx(10)
+        assert _bin(db).stock_value == pytest.approx(80)
+        _assert_bins_match_ledger(db)
+
+    def test_cancel_reposts_from_cancelled_entry(self, db, item):
+        _post(db, _entry('V1', 10, date(2024, 1, 1), 5))
+        _post(db, _entry('V2', 10, date(2024, 1, 5), 8))
+        _post(db, _entry('V3', -15, date(2024, 1, 10)))
+
+        assert cancel_sl_entries(db, 'Stock Entry', 'V1') == 1
+        db.commit()
+
+        issue = db.execute(select(StockLedgerEntry).where(StockLedgerEntry.voucher_no == 'V3')).scalar_one()
+        assert issue.qty_after_transaction == pytest.approx(-5)
+        assert get_stock_balance(db, 'A', 'W1')['actual_qty'] == pytest.approx(-5)
+        _assert_bins_match_ledger(db)
+
+    def test_full_repost_restores_tampered_values(self, db, item):
+        _post(db, _entry('V1', 10, date(2024, 1, 1), 5), _entry('V2', 4, date(2024, 1, 1), 5, warehouse='W2'))
+        _post(db, _entry('V3', -3, date(2024, 2, 1)))
+        for sle in db.execute(select(StockLedgerEntry)).scalars():
+            sle.stock_value = 0
+        _bin(db).actual_qty = 99
+        db.commit()
+
+        assert repost_item_valuation(db) == 3
+        assert _bin(db).actual_qty == pytest.approx(7)
+        assert _bin(db, warehouse='W2').stock_value == pytest.approx(20)
+        _assert_bins_match_ledger(db)
+        assert repost_item_valuation(db) == 0
+
+
+class TestStreamedRepost:
+    """원장 행을 나눠 읽고 나눠 기록하는 재평가"""
+
+    def _history(self, db):
+        day = date(2024, 1, 1)
+        _post(db, _entry('V1', 10, day, 5), _entry('V2', 6, day, 3, item_code='B'))
+        _post(db, _entry('V3', -4, date(2024, 1, 2), warehouse='W1', detail='D1'),
+              _entry('V3', 4, date(2024, 1, 2), warehouse='W2', detail='D1'))
+        _post(db, _entry('V4', 10, date(2024, 1, 3), 8), _entry('V5', -2, date(2024, 1, 3), item_code='B'))
+        _post(db, _entry('V6', -12, date(2024, 1, 4)), _entry('V7', -1, date(2024, 1, 5), warehouse='W2'))
+
+    def test_small_batches_match_single_pass(self, db, items, monkeypatch):
+        self._history(db)
+        expected = _computed(db)
+        for sle in db.execute(select(StockLedgerEntry)).scalars():
+            sle.stock_value, sle.stock_queue = 0, None
+        db.commit()
+
+        monkeypatch.setattr(stock_ledger, 'REPOST_BATCH_SIZE', 2)
+        assert repost_item_valuation(db) == len(expected)
+        assert _computed(db) == expected
+        _assert_bins_match_ledger(db)
+
+    def test_backdated_posting_with_small_batches(self, db, items, monkeypatch):
+        monkeypatch.setattr(stock_ledger, 'REPOST_BATCH_SIZE', 2)
+        self._history(db)
+        _post(db, _entry('V0', 5, date(2023, 12, 31), 2), _entry('V0B', 1, date(2024, 1, 2), 4, item_code='B'))
+
+        transfer_in = db.execute(select(StockLedgerEntry).where(
+            StockLedgerEntry.voucher_no == 'V3', StockLedgerEntry.actual_qty > 0
+        )).scalar_one()
+        assert transfer_in.incoming_rate == pytest.approx(2)
+        assert _bin(db, warehouse='W2').stock_value == pytest.approx(6)
+        expected = _computed(db)
+        assert repost_item_valuation(db) == 0
+        assert _computed(db) == expected
+        _assert_bins_match_ledger(db)
+
+
+class TestBinCreation:
+    """(품목, 창고) 첫 입출고의 Bin 생성"""
+
+    def test_existing_bin_is_reused(self, db, item):
+        _post(db, _entry('V1', 1, date(2024, 1, 1), 1))
+        bins = get_bins_for_update(db, [('A', 'W1'), ('A', 'W1'), ('A', 'W2')])
+        db.commit()
+
+        assert set(bins) == {('A', 'W1'), ('A', 'W2')}
+        assert db.execute(select(func.count()).select_from(Bin)).scalar() == 2
+
+    def test_concurrent_first_receipts(self, run_concurrently):
+        def receive(db, voucher_no):
+            make_sl_entries(db, [_entry(voucher_no, 5, date(2024, 1, 1), 2)])
+            db.commit()
+            return get_stock_balance(db, 'A', 'W1')['actual_qty']
+
+        rows = [(Item, [{'name': 'A', 'item_code': 'A', 'item_name': 'A', **ITEM}])]
+        results = run_concurrently(rows, [(receive, ('V1',)), (receive, ('V2',))])
+
+        assert max(results) == pytest.approx(10)
+
+
+class TestReadOnlyRoutes:
+    """원장/집계 DocType은 조회 API만 생성"""
+
+    @pytest.mark.parametrize('doctype', ['Stock Ledger Entry', 'Bin'])
+    def test_only_read_routes(self, doctype):
+        router = APIGenerator().generate_router(doctype)
+        assert {method for route in router.routes for method in route.methods} == {'GET'}
+
+    def test_writable_doctype_keeps_bulk_routes(self):
+        router = APIGenerator().generate_router('Item')
+        assert ('/api/item/bulk', frozenset({'PUT'})) in {(route.path, frozenset(route.methods)) for route in router.routes}
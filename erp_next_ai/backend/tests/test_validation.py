@@ -0,0 +1,172 @@
+"""
+유효성 검사 테스트 (컴파일된 필드 검사, autoname 문서 이름, LinkCheck 일괄 조회, 세션 캐시, 마스터 공용 캐시 게시/무효화)
+"""
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from core.config import get_link_cache_doctypes
+from core.doctype.base import DOCTYPE_VALIDATORS, get_doctype_meta, get_doctype_model, get_validator
+from core.doctype.naming import make_autoname
+from core.doctype.validation import LinkCheck, compile_validator, existing_names, shared_link_cache
+from modules.stock.warehouse import Warehouse
+
+Customer = get_doctype_model("Customer")
+
+
+@pytest.fixture
+def queries(engine):
+    """실행된 SELECT 문 수"""
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', count)
+    yield statements
+    event.remove(engine, 'before_cursor_execute', count)
+
+
+@pytest.fixture
+def warehouses(db):
+    for name in ('W1', 'W2'):
+        Warehouse(name=name, warehouse_name=name, company='C1').save(db)
+
+
+class TestCompiledValidator:
+    """메타데이터에서 만든 필수/길이/Select 옵션 검사"""
+
+    def test_field_checks(self):
+        validator = compile_validator(Customer, get_doctype_meta('Customer'), ['customer_name'])
+        customer = Customer(customer_name=' ', customer_type='Partner', email_id='x' * 141)
+
+        assert validator(customer) == [
+            "customer_name은(는) 필수 항목입니다.",
+            "customer_type: 허용되지 않는 값입니다: Partner",
+            "email_id은(는) 140자를 넘을 수 없습니다.",
+        ]
+        assert validator(Customer(customer_name='CU1', customer_type='Company')) == []
+
+    def test_compiled_once_per_model(self):
+        customer = Customer(customer_name='CU1', customer_type='Company')
+        validator = get_validator(Customer, customer)
+
+        assert DOCTYPE_VALIDATORS[Customer] is validator
+        assert get_validator(Customer, customer) is validator
+
+    def test_module_rules_are_added(self):
+        errors = Customer(name='CU1', customer_name='CU1', customer_type='Other', email_id='bad').validate()
+        assert errors == ["customer_type: 허용되지 않는 값입니다: Other", "올바른 이메일 주소를 입력하세요."]
+
+
+class TestAutoname:
+    """autoname field: 규칙으로 새 문서 이름 결정"""
+
+    @pytest.mark.parametrize('doctype, values, expected', [
+        ('Customer', {'customer_name': ' CU1 ', 'name': 'IGNORED'}, 'CU1'),
+        ('Customer', {'customer_name': '', 'name': 'GIVEN'}, 'GIVEN'),
+        ('Sales Invoice', {'name': 'GIVEN'}, 'GIVEN'),
+    ])
+    def test_name(self, doctype, values, expected):
+        assert make_autoname(doctype, get_doctype_meta(doctype), values) == expected
+
+    def test_generated_name(self):
+        name = make_autoname('Sales Invoice', get_doctype_meta('Sales Invoice'), {})
+        assert name.startswith('Sales Invoice-') and len(name) == len('Sales Invoice-') + 8
+
+    def test_create_api_uses_autoname(self, api_client):
+        client = api_client(['Customer'])
+        payload = {'customer_name': 'CU1', 'customer_type': 'Company'}
+
+        assert client.post('/api/customer/', json=payload).json()['name'] == 'CU1'
+        assert client.post('/api/customer/', json=payload).status_code == 400
+
+
+class TestLinkCheck:
+    """대상 DocType별 일괄 확인과 소유자별 오류"""
+
+    def test_errors_by_owner(self, db, warehouses, queries):
+        check = LinkCheck()
+        check.add(0, 'warehouse', 'Warehouse', Warehouse, 'W1')
+        check.add(1, 'warehouse', 'Warehouse', Warehouse, 'MISSING')
+        check.add(1, 'items 1행: warehouse', 'Warehouse', Warehouse, 'W2')
+
+        assert check.run(db) == {1: ["warehouse: Warehouse 'MISSING'을(를) 찾을 수 없습니다."]}
+        assert len(queries) == 1
+
+    def test_assumed_documents_are_not_queried(self, db, queries):
+        check = LinkCheck()
+        check.add(0, 'warehouse', 'Warehouse', Warehouse, 'NEW')
+        check.assume_exists(Warehouse, ['NEW'])
+
+        assert check.run(db) == {}
+        assert queries == []
+
+
+class TestSessionCache:
+    """세션(요청) 캐시"""
+
+    def test_found_names_are_cached(self, db, queries):
+        Customer(name='CU1', customer_name='CU1', customer_type='Company').save(db)
+        queries.clear()
+
+        assert existing_names(db, Customer, ['CU1', 'CU2'], 'Customer') == {'CU1'}
+        assert existing_names(db, Customer, ['CU1'], 'Customer') == {'CU1'}
+        assert len(queries) == 1
+
+    def test_missing_names_are_not_cached(self, db):
+        assert existing_names(db, Customer, ['CU1'], 'Customer') == set()
+        Customer(name='CU1', customer_name='CU1', customer_type='Company').save(db)
+
+        assert existing_names(db, Customer, ['CU1'], 'Customer') == {'CU1'}
+
+    def test_rollback_clears_session_cache(self, db):
+        db.add(Customer(name='CU1', customer_name='CU1', customer_type='Company'))
+        db.flush()
+        assert existing_names(db, Customer, ['CU1'], 'Customer') == {'CU1'}
+        db.rollback()
+
+        assert existing_names(db, Customer, ['CU1'], 'Customer') == set()
+
+
+class TestSharedCache:
+    """마스터 DocType 공용 캐시"""
+
+    def test_default_doctypes_are_registered(self):
+        assert get_link_cache_doctypes()
+        assert all(get_doctype_model(doctype) is not None for doctype in get_link_cache_doctypes())
+
+    def test_published_after_commit_only(self, db):
+        db.add(Warehouse(name='W1', warehouse_name='W1', company='C1'))
+        db.flush()
+        assert existing_names(db, Warehouse, ['W1'], 'Warehouse') == {'W1'}
+        assert shared_link_cache.known('Warehouse', ['W1']) == set()
+        db.rollback()
+        assert shared_link_cache.known('Warehouse', ['W1']) == set()
+
+        Warehouse(name='W1', warehouse_name='W1', company='C1').save(db)
+        assert existing_names(db, Warehouse, ['W1'], 'Warehouse') == {'W1'}
+        db.commit()
+        assert shared_link_cache.known('Warehouse', ['W1']) == {'W1'}
+
+    def test_other_sessions_use_shared_cache(self, db, warehouses, engine, queries):
+        existing_names(db, Warehouse, ['W1'], 'Warehouse')
+        db.commit()
+        queries.clear()
+
+        other = sessionmaker(bind=engine)()
+        try:
+            assert existing_names(other, Warehouse, ['W1'], 'Warehouse') == {'W1'}
+        finally:
+            other.close()
+        assert queries == []
+
+    def test_delete_evicts_shared_entry(self, db, warehouses):
+        existing_names(db, Warehouse, ['W1', 'W2'], 'Warehouse')
+        db.commit()
+
+        db.get(Warehouse, 'W1').delete(db)
+
+        assert shared_link_cache.known('Warehouse', ['W1', 'W2']) == {'W2'}
+        assert existing_names(db, Warehouse, ['W1'], 'Warehouse') == set()
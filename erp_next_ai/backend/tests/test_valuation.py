@@ -0,0 +1,129 @@
+"""
+재고 평가 계산 테스트 (FIFO / LIFO / 이동 평균)
+"""
+import json
+
+import pytest
+
+from modules.stock.valuation import FIFO, LIFO, MOVING_AVERAGE, ValuationState, compute_ledger
+
+
+def _row(name, qty, rate=None, item_code='ITEM', warehouse='W1', voucher_no=None, voucher_detail_no=None):
+    return {
+        'name': name,
+        'item_code': item_code,
+        'warehouse': warehouse,
+        'actual_qty': qty,
+        'incoming_rate': rate,
+        'voucher_no': voucher_no,
+        'voucher_detail_no': voucher_detail_no,
+    }
+
+
+RECEIVE_RECEIVE_ISSUE = [_row('SLE-1', 10, 5), _row('SLE-2', 10, 7), _row('SLE-3', -15)]
+
+
+class TestValuationMethods:
+    """평가 방법별 출고 원가와 남은 재고"""
+
+    @pytest.mark.parametrize('method, issue_value, value, rate, queue', [
+        (FIFO, -85.0, 35.0, 7.0, [[5, 7]]),
+        (LIFO, -95.0, 25.0, 5.0, [[5, 5]]),
+        (MOVING_AVERAGE, -90.0, 30.0, 6.0, None),
+    ])
+    def test_issue_cost(self, method, issue_value, value, rate, queue):
+        states = {}
+        results = compute_ledger(RECEIVE_RECEIVE_ISSUE, states, {'ITEM': method})
+
+        issue = results[-1]
+        assert issue['stock_value_difference'] == pytest.approx(issue_value)
+        assert issue['qty_after_transaction'] == pytest.approx(5)
+        assert issue['stock_value'] == pytest.approx(value)
+        assert issue['valuation_rate'] == pytest.approx(rate)
+        assert issue['incoming_rate'] == 0
+        assert issue['stock_queue'] == (json.dumps(queue) if queue is not None else None)
+        assert states[('ITEM', 'W1')].qty == pytest.approx(5)
+
+    def test_unknown_method_falls_back_to_fifo(self):
+        assert ValuationState('Standard').method == FIFO
+
+    def test_same_rate_receipts_share_queue_bin(self):
+        results = compute_ledger([_row('SLE-1', 2, 3), _row('SLE-2', 4, 3)], {}, {})
+        assert json.loads(results[-1]['stock_queue']) == [[6, 3]]
+
+    def test_items_and_warehouses_are_valued_separately(self):
+        rows = [
+            _row('SLE-1', 10, 5, item_code='A'),
+            _row('SLE-2', 10, 9, item_code='B'),
+            _row('SLE-3', 4, 2, item_code='A', warehouse='W2'),
+            _row('SLE-4', -1, item_code='A'),
+        ]
+        states = {}
+        results = compute_ledger(rows, states, {'A': FIFO, 'B': FIFO})
+
+        assert results[-1]['stock_value_difference'] == pytest.approx(-5)
+        assert states[('A', 'W1')].qty == pytest.approx(9)
+        assert states[('A', 'W2')].value == pytest.approx(8)
+        assert states[('B', 'W1')].rate == pytest.approx(9)
+
+
+class TestNegativeStock:
+    """재고가 부족한 출고와 이후 입고의 상계"""
+
+    def test_receipt_offsets_negative_bin(self):
+        states = {('ITEM', 'W1'): ValuationState(FIFO, 2, 8, 4)}
+        results = compute_ledger([_row('SLE-1', -5), _row('SLE-2', 10, 6)], states, {})
+
+        issue, receipt = results
+        assert issue['qty_after_transaction'] == pytest.approx(-3)
+        assert issue['stock_value_difference'] == pytest.approx(-20)
+        assert json.loads(issue['stock_queue']) == [[-3, 4]]
+
+        assert receipt['qty_after_transaction'] == pytest.approx(7)
+        assert json.loads(receipt['stock_queue']) == [[7, 6]]
+        assert receipt['stock_value'] == pytest.approx(42)
+        assert receipt['valuation_rate'] == pytest.approx(6)
+
+    def test_zero_balance_resets_value(self):
+        results = compute_ledger([_row('SLE-1', 3, 1.1), _row('SLE-2', -3)], {}, {'ITEM': MOVING_AVERAGE})
+        assert results[-1]['qty_after_transaction'] == 0
+        assert results[-1]['stock_value'] == 0
+
+
+class TestTransfers:
+    """같은 상세 행의 창고 이동"""
+
+    def test_transfer_receipt_uses_issue_cost(self):
+        rows = [
+            _row('SLE-1', 10, 5),
+            _row('SLE-2', 10, 7),
+            _row('SLE-3', -12, voucher_no='STE-1', voucher_detail_no='ROW-1'),
+            _row('SLE-4', 12, 100, warehouse='W2', voucher_no='STE-1', voucher_detail_no='ROW-1'),
+        ]
+        results = compute_ledger(rows, {}, {'ITEM': FIFO})
+
+        issue, receipt = results[-2:]
+        assert receipt['incoming_rate'] == pytest.approx(64 / 12)
+        assert receipt['stock_value_difference'] == pytest.approx(-issue['stock_value_difference'])
+
+
+class TestIncrementalRepost:
+    """원장 행에 저장한 상태에서 이어서 계산 (증분 재전기)"""
+
+    @pytest.mark.parametrize('method', [FIFO, LIFO, MOVING_AVERAGE])
+    def test_resume_matches_full_run(self, method):
+        rows = RECEIVE_RECEIVE_ISSUE + [_row('SLE-4', 8, 4), _row('SLE-5', -9), _row('SLE-6', -6)]
+        methods = {'ITEM': method}
+        full = compute_ledger(rows, {}, methods)
+
+        head = full[1]
+        state = ValuationState.from_ledger(
+            method, head['qty_after_transaction'], head['stock_value'], head['valuation_rate'], head['stock_queue']
+        )
+        tail = compute_ledger(rows[2:], {('ITEM', 'W1'): state}, methods)
+
+        for expected, actual in zip(full[2:], tail):
+            assert actual['name'] == expected['name']
+            for field in ('qty_after_transaction', 'stock_value', 'valuation_rate', 'stock_value_difference'):
+                assert actual[field] == pytest.approx(expected[field])
+            assert actual['stock_queue'] == expected['stock_queue']